@@ -4,6 +4,7 @@ from .db import SessionLocal
 from .models import Account, OTP, Resident, Admin, StaffAuditLog, ResidentLog
 from .config import OTP_EXPIRY_SECONDS, DEV_PRINT_OTP, get_philippine_time
 from .emailer import Emailer
+from .dto import AccountInfo, OtpInfo, from_instance
 import secrets
 
 
@@ -22,9 +23,10 @@ def register_account(resident_obj, username, password, role='Resident'):
         )
         account.set_password(password)
         db.add(account)
+        db.flush()
+        created = from_instance(AccountInfo, account)
         db.commit()
-        db.refresh(account)
-        return {"success": True, "account": account}
+        return {"success": True, "account": created}
     except Exception as e:
         db.rollback()
         return {"success": False, "error": str(e)}
@@ -51,8 +53,9 @@ def generate_and_send_otp(account, purpose='login'):
             expires_at=expires
         )
         db.add(otp)
+        db.flush()
+        otp = from_instance(OtpInfo, otp)
         db.commit()
-        db.refresh(otp)
 
         # DEV MODE: Print to console
         if DEV_PRINT_OTP:
@@ -77,7 +80,7 @@ def generate_and_send_otp(account, purpose='login'):
 
 
 def verify_otp(account, code):
-    """Verify OTP code for account"""
+    """Verify OTP code for account (an Account or a UserSession: account_id, user_role and resident_id are used)"""
     db = SessionLocal()
     try:
         otp = db.query(OTP).filter(
@@ -94,7 +97,10 @@ def verify_otp(account, code):
 
         # Mark as used
         otp.is_used = True
-        account.last_login = get_philippine_time()
+        # (account belongs to the caller's session, not this one)
+        db.query(Account).filter(Account.account_id == account.account_id).update(
+            {Account.last_login: get_philippine_time()}, synchronize_session=False
+        )
         
         # LOGGING: Record the login action
         if account.user_role in ['Admin', 'Staff']:
@@ -0,0 +1,187 @@
+# app/change_feed.py
+"""
+Cross-station change feed.
+
+Every transaction that writes a certificate request, payment, resident or
+notification also appends (table, key, operation, station) rows to
+change_log, inside the same transaction, so other stations only ever see
+committed changes. The key is the id the admin tables work with
+(FEED_TABLES): payments are keyed by their request, notifications by their
+resident.
+
+* ORM flushes are recorded by the after_flush listener.
+* ORM bulk INSERTs (session.execute(insert(Model), rows)) are recorded from
+  their parameters.
+* Bulk UPDATE/DELETE statements cannot tell which rows they touched. The
+  controller names them with record_changes(); otherwise the table gets one
+  row_id NULL entry at commit ("reload the whole table").
+
+ChangeReader is the reading side: poll() returns {table: {keys}} of the
+changes made by OTHER stations since the previous call. gui/change_poller.py
+runs it on a thread and turns the result into Qt signals.
+
+Change ids are handed out when a row is inserted, not when its transaction
+commits, so a reader can see id 12 before id 11 commits. Skipped ids are
+re-checked for CHANGE_FEED_GAP_POLLS polls before they are given up (a
+rolled-back transaction leaves a permanent gap).
+
+The listeners are registered when app.models is imported. MySQL installs
+need db/create_change_log.sql; without the table nothing is recorded.
+"""
+from datetime import timedelta
+from sqlalchemy import event, inspect, insert, select, delete, func, or_
+from sqlalchemy.orm import Session
+from .db import engine
+from .models import ChangeLog
+from .config import (CHANGE_FEED_ENABLED, CHANGE_FEED_BATCH_SIZE, CHANGE_FEED_GAP_POLLS,
+                     CHANGE_FEED_RETENTION_HOURS, STATION_NAME, get_philippine_time)
+
+# table -> column holding the key the views refresh by
+FEED_TABLES = {
+    "certificate_requests": "request_id",
+    "certificate_payments": "request_id",
+    "residents": "resident_id",
+    "notifications": "resident_id",
+}
+RELOAD = None                       # key meaning "the rows are unknown, reload the table"
+MAX_GAP = 1000                      # a larger jump in change ids is not waited for
+PENDING_KEY = "change_feed_bulk"
+
+_available = {}                     # engine url -> bool (change_log table exists)
+
+
+def feed_available(connection) -> bool:
+    """True if change_log exists (checked once per database)"""
+    if not CHANGE_FEED_ENABLED:
+        return False
+    key = str(connection.engine.url)
+    if key not in _available:
+        try:
+            _available[key] = inspect(connection).has_table(ChangeLog.__tablename__)
+        except Exception as e:
+            print(f"⚠️ Could not check for {ChangeLog.__tablename__}: {e}")
+            _available[key] = False
+        if not _available[key]:
+            print(f"ℹ️ {ChangeLog.__tablename__} table missing - other stations will not see this one's changes live")
+    return _available[key]
+
+
+def write_changes(connection, changes, station: str = STATION_NAME):
+    """Append (table, key, operation) changes to change_log on the caller's connection"""
+    changes = set(changes)
+    if not changes or not feed_available(connection):
+        return
+    now = get_philippine_time()
+    connection.execute(insert(ChangeLog), [
+        {"table_name": table, "row_id": key, "operation": operation, "station": station, "created_at": now}
+        for table, key, operation in sorted(changes, key=lambda c: (c[0], c[1] is None, c[1] or 0, c[2]))
+    ])
+
+
+def record_changes(session, table: str, keys, operation: str = "update"):
+    """Name the rows of a bulk UPDATE/DELETE (call in the same transaction, after the statement)"""
+    session.info.get(PENDING_KEY, set()).discard(table)
+    write_changes(session.connection(), [(table, key, operation) for key in keys])
+
+
+def flushed_changes(session) -> set:
+    changes = set()
+    for objects, operation in ((session.new, "insert"), (session.dirty, "update"), (session.deleted, "delete")):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table not in FEED_TABLES or (operation == "update" and not session.is_modified(obj)):
+                continue
+            changes.add((table, getattr(obj, FEED_TABLES[table], None), operation))
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    write_changes(session.connection(), flushed_changes(session))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_statement(state):
+    if not (state.is_insert or state.is_update or state.is_delete) or state.bind_mapper is None:
+        return
+    table = state.bind_mapper.local_table.name
+    if table not in FEED_TABLES:
+        return
+    rows = state.parameters
+    rows = [rows] if isinstance(rows, dict) else rows or []
+    column = FEED_TABLES[table]
+    if state.is_insert and rows and all(row.get(column) is not None for row in rows):
+        write_changes(state.session.connection(), [(table, row[column], "insert") for row in rows])
+    else:
+        state.session.info.setdefault(PENDING_KEY, set()).add(table)
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    tables = session.info.pop(PENDING_KEY, None)
+    if tables:
+        write_changes(session.connection(), [(table, RELOAD, "update") for table in tables])
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+class ChangeReader:
+    """Changes made by other stations, read incrementally by change_id"""
+
+    def __init__(self, bind=None, station: str = STATION_NAME, batch_size: int = CHANGE_FEED_BATCH_SIZE,
+                 gap_polls: int = CHANGE_FEED_GAP_POLLS):
+        self.bind = bind or engine
+        self.station = station
+        self.batch_size = batch_size
+        self.gap_polls = gap_polls
+        self.last_id = None
+        self.gaps = {}              # skipped change_id -> polls left
+
+    def start(self):
+        """Skip the existing history: only changes from now on are reported"""
+        with self.bind.connect() as conn:
+            self.last_id = conn.execute(select(func.max(ChangeLog.change_id))).scalar() or 0
+        self.gaps.clear()
+
+    def poll(self) -> dict:
+        """{table: {keys}} changed by other stations since the last poll (RELOAD in the set: reload it)"""
+        if self.last_id is None:
+            self.start()
+            return {}
+        changes = {}
+        with self.bind.connect() as conn:
+            while True:
+                condition = ChangeLog.change_id > self.last_id
+                if self.gaps:
+                    condition = or_(condition, ChangeLog.change_id.in_(list(self.gaps)))
+                rows = conn.execute(
+                    select(ChangeLog.change_id, ChangeLog.table_name, ChangeLog.row_id, ChangeLog.station)
+                    .where(condition).order_by(ChangeLog.change_id).limit(self.batch_size)
+                ).all()
+                for change_id, table, row_id, station in rows:
+                    if change_id in self.gaps:
+                        del self.gaps[change_id]
+                    elif change_id > self.last_id:
+                        if change_id - self.last_id <= MAX_GAP:
+                            self.gaps.update((missing, self.gap_polls)
+                                             for missing in range(self.last_id + 1, change_id))
+                        self.last_id = change_id
+                    if station != self.station:
+                        changes.setdefault(table, set()).add(row_id)
+                if len(rows) < self.batch_size:
+                    break
+        for change_id in list(self.gaps):
+            self.gaps[change_id] -= 1
+            if self.gaps[change_id] <= 0:
+                del self.gaps[change_id]
+        return changes
+
+
+def purge(bind=None, hours: int = CHANGE_FEED_RETENTION_HOURS) -> int:
+    """Delete change rows older than the retention period"""
+    with (bind or engine).begin() as conn:
+        return conn.execute(delete(ChangeLog).where(
+            ChangeLog.created_at < get_philippine_time() - timedelta(hours=hours))).rowcount
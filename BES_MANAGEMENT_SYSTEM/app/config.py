@@ -1,4 +1,6 @@
 # app/config.py
+import os
+import socket
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -13,7 +15,60 @@ def get_philippine_time():
 
 # Database connection
 # Using localhost since we're running on Windows (Laragon default: root user, no password)
-SQLALCHEMY_DATABASE_URI = "mysql+pymysql://root:@127.0.0.1:3306/barangay_db"
+MYSQL_DATABASE_URI = "mysql+pymysql://root:@127.0.0.1:3306/barangay_db"
+
+# Embedded mode for stations without a database server: set DB_BACKEND = "sqlite"
+# (or the BES_DB_BACKEND environment variable). Tables are created on first start.
+DB_BACKEND = os.environ.get("BES_DB_BACKEND", "mysql")
+SQLITE_DATABASE_PATH = BASE_DIR / "barangay.db"
+SQLITE_PRAGMAS = {                  # applied to every new SQLite connection
+    "journal_mode": "WAL",          # readers never block the writer
+    "synchronous": "NORMAL",        # fsync at checkpoints only (safe with WAL)
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,           # ms to wait for another writer
+    "cache_size": -65536,           # page cache in KiB (64MB)
+    "mmap_size": 268435456,         # memory-map up to 256MB of the file
+    "temp_store": "MEMORY",
+}
+
+# Offline-first replica (app/sync.py): the app reads and writes a local SQLite copy and a
+# background worker pushes local changes to SYNC_REMOTE_URI / pulls remote ones
+SYNC_ENABLED = os.environ.get("BES_SYNC", "0") == "1"
+SYNC_REPLICA_PATH = BASE_DIR / "replica.db"
+SYNC_REMOTE_URI = MYSQL_DATABASE_URI
+SYNC_INTERVAL_SECONDS = 30          # wait between sync cycles (also the retry delay while offline)
+SYNC_BATCH_SIZE = 200               # journal entries per upstream transaction / rows per pull page
+SYNC_CONNECT_TIMEOUT = 5            # seconds before the central server counts as unreachable
+SYNC_PULL_OVERLAP_SECONDS = 300     # re-read this much before the watermark (station clocks drift)
+
+if SYNC_ENABLED:
+    _default_uri = f"sqlite:///{SYNC_REPLICA_PATH}"
+elif DB_BACKEND == "sqlite":
+    _default_uri = f"sqlite:///{SQLITE_DATABASE_PATH}"
+else:
+    _default_uri = MYSQL_DATABASE_URI
+SQLALCHEMY_DATABASE_URI = os.environ.get("BES_DATABASE_URI") or _default_uri
+
+# SQL profiler (app/sql_profiler.py): per-page/controller statement counts and N+1 warnings,
+# printed on every page navigation (Ctrl+Shift+Q in the sidebar windows shows the recent ones)
+SQL_PROFILE_ENABLED = os.environ.get("BES_SQL_PROFILE", "0") == "1"
+SQL_PROFILE_N_PLUS_ONE = 10         # same statement shape this many times in one page/action = N+1
+SQL_PROFILE_SLOW_MS = 100           # flag a page's slowest statement above this
+SQL_PROFILE_HISTORY = 50            # page/action reports kept for the panel
+
+# GUI stall watchdog (gui/stall_watchdog.py): records where the window freezes (Ctrl+Shift+F12 shows the report)
+STALL_WATCHDOG_ENABLED = os.environ.get("BES_STALL_WATCHDOG", "1") == "1"
+STALL_THRESHOLD_MS = 100            # event loop blocked this long = a stall
+STALL_HEARTBEAT_MS = 50             # heartbeat timer interval
+STALL_HISTORY = 500                 # stalls kept for the report
+
+# Action profiler (gui/action_profiler.py): a profile per page navigation / controller call,
+# summarized with scripts/profile_report.py
+ACTION_PROFILE_ENABLED = os.environ.get("BES_ACTION_PROFILE", "0") == "1"
+ACTION_PROFILE_MODE = os.environ.get("BES_ACTION_PROFILE_MODE", "cprofile")   # or "sample" (collapsed stacks)
+ACTION_PROFILE_DIR = BASE_DIR / "profiles"   # one folder per app run
+ACTION_PROFILE_SAMPLE_MS = 1        # stack sampling interval in "sample" mode
+ACTION_PROFILE_MIN_MS = 20          # faster actions are listed in the index without a profile file
 
 # SMTP Email Settings (System sender email)
 SMTP_HOST = "smtp.gmail.com"
@@ -23,21 +78,100 @@ SMTP_PASSWORD = "your_16_char_app_password_here"      # Gmail App Password
 EMAIL_USE_TLS = True
 EMAIL_FROM_NAME = "Barangay Balibago E-Services"
 
+# Email outbox (emails are queued in the email_outbox table and sent by a background worker)
+EMAIL_OUTBOX_ENABLED = True
+OUTBOX_BATCH_SIZE = 50             # messages claimed per batch
+OUTBOX_POLL_SECONDS = 5            # wait between polls when the outbox is empty
+OUTBOX_MAX_ATTEMPTS = 6            # give up (status 'Failed') after this many tries
+OUTBOX_RETRY_BASE_SECONDS = 30     # retry delay doubles on every failed attempt...
+OUTBOX_RETRY_MAX_SECONDS = 3600    # ...up to one hour
+OUTBOX_SEND_LEASE_SECONDS = 300    # claimed rows become due again if a worker dies mid-batch
+SMTP_IDLE_DISCONNECT_SECONDS = 120 # close the kept-alive SMTP connection after this much idle time
+
 # Dev mode (print OTP to console instead of sending email)
 DEV_PRINT_OTP = True  # Set to False in production
 
 # OTP settings
 OTP_EXPIRY_SECONDS = 600  # 10 minutes
 
+# Post-login dashboard prefetch (gui/prefetch.py)
+LOGIN_TRANSITION_MS = 1500          # "Login successful" stays up at least this long
+PREFETCH_WORKERS = 4                # threads loading the dashboard's first screen meanwhile
+
 # File upload settings
 UPLOAD_FOLDER = BASE_DIR / "uploads"
 MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf'}
 
+# Image normalization at upload (decoded once, downscaled, re-encoded without EXIF)
+IMAGE_MAX_DIMENSIONS = {            # (max width, max height) per kind of upload
+    'photo': (1024, 1024),          # resident photos on request forms
+    'id': (2000, 2000),             # valid IDs / documents - must stay legible
+    'official': (800, 800),         # official portraits
+    'announcement': (1600, 1600),   # announcement images
+}
+IMAGE_JPEG_QUALITY = 85
+KEEP_ORIGINAL_KINDS = {'id'}        # keep the untouched upload as an audit copy
+
+# Upload garbage collector (scripts/upload_gc.py)
+UPLOAD_GC_GRACE_HOURS = 24          # never quarantine files younger than this
+UPLOAD_GC_HASH_WORKERS = 4          # threads verifying content hashes
+
+# Blotter records table
+BLOTTER_PAGE_SIZE = 50              # rows fetched per scroll step
+BLOTTER_SEARCH_DELAY_MS = 300       # wait for typing to pause before searching
+
+# Reference data cache (services, officials, announcements)
+CACHE_SHARED_VERSIONS = True        # watch the cache_versions table for other stations' changes
+CACHE_VERSION_CHECK_SECONDS = 5     # how often that table is re-read
+
+# Request status tracker (resident side)
+TRACKER_PAGE_SIZE = 20              # requests loaded at a time; older ones load on "Next Request"
+
+# Payments page and ledger (app/payment_ledger.py)
+PAYMENT_PAGE_SIZE = 100             # payments table rows per page
+PAYMENT_WINDOW_DAYS = 30            # default date window of the payments table (by created date)
+
+# Name of this PC in or_number_blocks and change_log (set BES_STATION if two PCs share a hostname)
+STATION_NAME = os.environ.get("BES_STATION", socket.gethostname())
+
+# Official receipt numbers (app/or_numbers.py)
+OR_PREFIX = "OR"                    # numbers look like OR-2025-0000123, one series per year
+OR_BLOCK_SIZE = 50                  # numbers a station reserves from the shared sequence at a time
+
+# Cross-station change feed (app/change_feed.py, gui/change_poller.py).
+# Off with the local replica: those stations see other PCs' changes after the next sync pull
+CHANGE_FEED_ENABLED = os.environ.get("BES_CHANGE_FEED", "1") == "1" and not SYNC_ENABLED
+CHANGE_FEED_POLL_MS = 2000          # how often other stations' changes are fetched
+CHANGE_FEED_BATCH_SIZE = 500        # change_log rows read per query
+CHANGE_FEED_GAP_POLLS = 10          # polls to wait for a skipped change id (a still-open transaction)
+CHANGE_FEED_RETENTION_HOURS = 24    # older change_log rows are purged
+
 # Backup settings
 BACKUP_FOLDER = BASE_DIR / "backups"
 
+# Exports (app/exports.py, scripts/export_data.py)
+EXPORT_FOLDER = BASE_DIR / "exports"
+EXPORT_BATCH_SIZE = 2000            # rows fetched from the cursor and written at a time
+
 # QR Code for GCash payment (you can replace with actual image path)
 GCASH_QR_IMAGE_PATH = BASE_DIR / "assets" / "gcash_qr.png"
 GCASH_NUMBER = "09123456789"
-GCASH_NAME = "BARANGAY BALIBAGO"
\ No newline at end of file
+GCASH_NAME = "BARANGAY BALIBAGO"
+# Certificate prices (PHP per copy)
+CERTIFICATE_PRICES = {
+    'Barangay Indigency': 0.00,  # Free
+    'Barangay Clearance': 50.00,
+    'Barangay ID': 100.00,
+    'Business Permit': 500.00
+}
+
+
+def certificate_price(certificate_type) -> float:
+    """Price per copy; types without a price are free until one is added above"""
+    return CERTIFICATE_PRICES.get(certificate_type or '', 0.00)
+
+# Batch certificate printing
+BATCH_PRINT_WORKERS = 4          # render processes (capped at the CPU count)
+BATCH_PRINT_MIN_PARALLEL = 8     # smaller batches are rendered in a single background thread
+BATCH_PRINT_FOLDER = BASE_DIR / "prints"
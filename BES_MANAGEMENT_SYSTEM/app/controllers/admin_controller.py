@@ -1,10 +1,45 @@
 # app/controllers/admin_controller.py
 from app.db import SessionLocal
-from app.models import DocumentUpload, Resident, StaffAuditLog, Request, Payment, Announcement, Notification
+from sqlalchemy import insert, update, bindparam, func
+from app.models import (
+    DocumentUpload, Resident, StaffAuditLog, Request, Payment, Announcement, Notification,
+    CertificateRequest, CertificatePayment, CertificateRequestEvent
+)
 from app.emailer import Emailer
-from app.config import get_philippine_time
+from app.email_outbox import wake_outbox_sender
+from app.request_events import set_request_status
+from app.change_feed import record_changes
+from app.or_numbers import get_or_allocator
+from app.events import publish_on_commit, RequestStatusChanged, PaymentRecorded
+from app.config import get_philippine_time, certificate_price
 from datetime import datetime
 
+# Certificate request workflow: new status -> statuses it may be reached from
+REQUEST_TRANSITIONS = {
+    'Under Review': {'Pending'},
+    'Processing': {'Pending', 'Under Review'},              # accepted
+    'Declined': {'Pending', 'Under Review'},
+    'Ready for Pickup': {'Processing'},
+    'Completed': {'Processing', 'Ready for Pickup'},
+}
+# Statuses that need an (unpaid) CertificatePayment row
+PAYMENT_STATUSES = {'Processing', 'Ready for Pickup'}
+TRANSITION_NOTIFICATIONS = {
+    'Processing': ("✅ Request Accepted",
+                   "Your {type} request has been accepted and is now being processed. Please wait for further updates."),
+    'Declined': ("❌ Request Declined",
+                 "Your {type} request has been declined. Please visit the Barangay Hall for more information."),
+    'Ready for Pickup': ("💳 Ready for Payment",
+                         "Your {type} request is ready! Please proceed to the Barangay Hall for payment and pickup."),
+    'Completed': ("🎉 Request Completed",
+                  "Your {type} request has been completed! Thank you for using Barangay E-Services."),
+}
+
+
+def admin_actor(admin_account_id: int = None) -> str:
+    return f"admin #{admin_account_id}" if admin_account_id else "admin"
+
+
 class AdminController:
     @staticmethod
     def list_pending_uploads():
@@ -28,14 +63,14 @@ class AdminController:
             upload.verified = 'Approved' if decision == 'Approved' else 'Rejected'
             upload.verifier_admin_id = admin_account_id
             upload.verifier_reason = reason
-            db.commit()
 
-            # Send email to resident
+            # Queue email to resident (sent by the outbox worker, committed with the decision)
             resident = db.query(Resident).filter(Resident.resident_id == upload.resident_id).first()
+            resident_email = getattr(resident, 'email', None)
             if upload.verified == 'Approved':
-                Emailer.send_document_approved_email(resident.email, resident.first_name)
+                Emailer.send_document_approved_email(resident_email, resident.first_name, db=db)
             else:
-                Emailer.send_document_rejected_email(resident.email, resident.first_name, reason or "Not specified")
+                Emailer.send_document_rejected_email(resident_email, resident.first_name, reason or "Not specified", db=db)
 
             # write staff audit log
             log = StaffAuditLog(
@@ -46,6 +81,7 @@ class AdminController:
             )
             db.add(log)
             db.commit()
+            wake_outbox_sender()
             return {"success": True}
         except Exception as e:
             db.rollback()
@@ -63,11 +99,11 @@ class AdminController:
             req.status = new_status
             if pickup_datetime:
                 req.pickup_datetime = pickup_datetime
-            db.commit()
 
-            # notify user
+            # notify user (queued - the admin's click no longer waits on SMTP)
             resident = db.query(Resident).filter(Resident.resident_id == req.resident_id).first()
-            Emailer.send_request_status_update_email(resident.email, resident.first_name, "Service", new_status)
+            Emailer.send_request_status_update_email(getattr(resident, 'email', None), resident.first_name,
+                                                     "Service", new_status, db=db)
             # audit
             alog = StaffAuditLog(
                 admin_id=admin_account_id,
@@ -77,9 +113,240 @@ class AdminController:
             )
             db.add(alog)
             db.commit()
+            wake_outbox_sender()
             return {"success": True}
         except Exception as e:
             db.rollback()
             return {"success": False, "error": str(e)}
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+
+    @staticmethod
+    def mark_certificates_printed(request_ids, admin_account_id: int = None,
+                                  audit_action: str = "Batch Print Certificates"):
+        """
+        After a batch print: set every request to 'Ready for Pickup', create the missing
+        CertificatePayment rows and notify the residents - all in ONE transaction.
+        Reprints of requests already Ready for Pickup are only audited.
+        """
+        db = SessionLocal()
+        try:
+            requests = db.query(CertificateRequest).filter(CertificateRequest.request_id.in_(request_ids)).all()
+            if not requests:
+                return {"success": False, "error": "No matching requests"}
+            has_payment = {
+                request_id for (request_id,) in db.query(CertificatePayment.request_id).filter(
+                    CertificatePayment.request_id.in_(request_ids)
+                )
+            }
+            now = datetime.now()
+            actor = admin_actor(admin_account_id)
+            new_rows = []
+            changed = set()
+            for req in requests:
+                if req.status != 'Ready for Pickup':
+                    set_request_status(req, 'Ready for Pickup', actor=actor, note="Certificate printed")
+                    changed.add(req.request_id)
+                if req.request_id not in has_payment:
+                    unit_price = certificate_price(req.certificate_type)
+                    quantity = req.quantity or 1
+                    new_rows.append(CertificatePayment(
+                        request_id=req.request_id,
+                        resident_id=req.resident_id,
+                        certificate_type=req.certificate_type,
+                        requestor_name=f"{req.first_name} {req.last_name}",
+                        quantity=quantity,
+                        unit_price=unit_price,
+                        total_amount=unit_price * quantity,
+                        is_paid=False,
+                        payment_method='Cash'
+                    ))
+                if req.request_id in changed:
+                    new_rows.append(Notification(
+                        resident_id=req.resident_id,
+                        title="💳 Ready for Payment",
+                        message=f"Your {req.certificate_type} request is ready! Please proceed to the Barangay Hall for payment and pickup.",
+                        is_read=False,
+                        created_at=now
+                    ))
+            reprinted = len(requests) - len(changed)
+            new_rows.append(StaffAuditLog(
+                admin_id=admin_account_id,
+                action=audit_action,
+                description=f"{len(requests)} certificate request(s) printed and set to Ready for Pickup"
+                            + (f" ({reprinted} reprint(s))" if reprinted else ""),
+                created_at=get_philippine_time()
+            ))
+            db.add_all(new_rows)
+            if changed:
+                publish_on_commit(db, RequestStatusChanged(changed))
+            db.commit()
+            return {"success": True, "updated": len(requests)}
+        except Exception as e:
+            db.rollback()
+            return {"success": False, "error": str(e)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def bulk_transition(request_ids, new_status: str, admin_account_id: int = None, note: str = None):
+        """
+        Move many certificate requests to new_status in ONE transaction: a single
+        UPDATE ... WHERE request_id IN (...), then bulk inserts of the status events,
+        missing payment rows, notifications and one audit row.
+        Requests whose current status cannot move to new_status are skipped.
+        Returns {"success": True, "updated": [ids], "skipped": [ids]}.
+        """
+        allowed_from = REQUEST_TRANSITIONS.get(new_status)
+        if allowed_from is None:
+            return {"success": False, "error": f"Unknown status: {new_status}"}
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                CertificateRequest.request_id, CertificateRequest.status, CertificateRequest.resident_id,
+                CertificateRequest.certificate_type, CertificateRequest.quantity,
+                CertificateRequest.first_name, CertificateRequest.last_name
+            ).filter(CertificateRequest.request_id.in_(request_ids)).with_for_update().all()
+            eligible = [row for row in rows if (row.status or 'Pending') in allowed_from]
+            ids = [row.request_id for row in eligible]
+            skipped = sorted(set(request_ids) - set(ids))
+            if not ids:
+                return {"success": True, "updated": [], "skipped": skipped}
+
+            now = datetime.now()
+            values = {"status": new_status, "updated_at": now}
+            if new_status in ('Processing', 'Declined'):
+                values.update(reviewed_at=now, reviewed_by_admin_id=admin_account_id)
+            db.execute(
+                update(CertificateRequest)
+                .where(CertificateRequest.request_id.in_(ids))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+            # A Core UPDATE skips the ORM flush listeners, so write the status events and feed rows here
+            record_changes(db, "certificate_requests", ids)
+            actor = admin_actor(admin_account_id)
+            db.execute(insert(CertificateRequestEvent), [
+                {"request_id": row.request_id, "from_status": row.status or 'Pending', "to_status": new_status,
+                 "actor": actor, "note": note, "created_at": now}
+                for row in eligible
+            ])
+
+            if new_status in PAYMENT_STATUSES:
+                has_payment = {
+                    request_id for (request_id,) in db.query(CertificatePayment.request_id).filter(
+                        CertificatePayment.request_id.in_(ids)
+                    )
+                }
+                payments = []
+                for row in eligible:
+                    if row.request_id in has_payment:
+                        continue
+                    unit_price = certificate_price(row.certificate_type)
+                    quantity = row.quantity or 1
+                    payments.append({
+                        "request_id": row.request_id, "resident_id": row.resident_id,
+                        "certificate_type": row.certificate_type,
+                        "requestor_name": f"{row.first_name or ''} {row.last_name or ''}".strip(),
+                        "quantity": quantity, "unit_price": unit_price, "total_amount": unit_price * quantity,
+                        "is_paid": False, "payment_method": 'Cash', "created_at": now,
+                    })
+                if payments:
+                    db.execute(insert(CertificatePayment), payments)
+
+            if new_status in TRANSITION_NOTIFICATIONS:
+                title, message = TRANSITION_NOTIFICATIONS[new_status]
+                db.execute(insert(Notification), [
+                    {"resident_id": row.resident_id, "title": title,
+                     "message": message.format(type=row.certificate_type), "is_read": False, "created_at": now}
+                    for row in eligible
+                ])
+
+            db.add(StaffAuditLog(
+                admin_id=admin_account_id,
+                action="Bulk Update Request Status",
+                description=f"{len(ids)} certificate request(s) set to {new_status}: {', '.join(map(str, ids))}",
+                created_at=get_philippine_time()
+            ))
+            publish_on_commit(db, RequestStatusChanged(ids))
+            db.commit()
+            return {"success": True, "updated": ids, "skipped": skipped}
+        except Exception as e:
+            db.rollback()
+            return {"success": False, "error": str(e)}
+        finally:
+            db.close()
+
+    @staticmethod
+    def bulk_mark_paid(request_ids, payment_method: str = 'Cash', admin_account_id: int = None):
+        """
+        Mark the unpaid payments of many requests as paid in ONE transaction (single UPDATE).
+        Cash payments without an OR number get one each from the station's allocator.
+        Returns {"success": True, "updated": [request ids], "total": amount collected,
+        "receipts": {request id: OR number assigned}}.
+        """
+        db = SessionLocal()
+        allocator, receipts, issued, committed = None, [], {}, False
+        try:
+            if payment_method == 'Cash':
+                # Drawn before the transaction, like a single confirmation's: reserving a new
+                # block is its own transaction and must not wait on this one's locks
+                needed = db.query(func.count(CertificatePayment.payment_id)).filter(
+                    CertificatePayment.request_id.in_(request_ids),
+                    CertificatePayment.is_paid == False,
+                    CertificatePayment.or_number.is_(None)
+                ).scalar()
+                db.rollback()
+                allocator = get_or_allocator()
+                receipts = [allocator.allocate() for _ in range(needed)]
+            unpaid = db.query(
+                CertificatePayment.request_id, CertificatePayment.total_amount, CertificatePayment.or_number
+            ).filter(
+                CertificatePayment.request_id.in_(request_ids),
+                CertificatePayment.is_paid == False
+            ).order_by(CertificatePayment.request_id).with_for_update().all()
+            ids = [row.request_id for row in unpaid]
+            if not ids:
+                return {"success": True, "updated": [], "total": 0.0, "receipts": {}}
+            now = datetime.now()
+            db.execute(
+                update(CertificatePayment)
+                .where(CertificatePayment.request_id.in_(ids), CertificatePayment.is_paid == False)
+                .values(is_paid=True, payment_method=payment_method, received_at=now,
+                        received_by_admin_id=admin_account_id, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            issued = dict(zip([row.request_id for row in unpaid if not row.or_number], receipts))
+            if issued:
+                table = CertificatePayment.__table__
+                db.connection().execute(
+                    update(table).where(table.c.request_id == bindparam("paid_request_id"))
+                    .values(or_number=bindparam("receipt")),
+                    [{"paid_request_id": request_id, "receipt": receipt} for request_id, receipt in issued.items()]
+                )
+            record_changes(db, "certificate_payments", ids)
+            total = sum(float(row.total_amount or 0) for row in unpaid)
+            db.add(StaffAuditLog(
+                admin_id=admin_account_id,
+                action="Bulk Mark Paid",
+                description=f"{len(ids)} payment(s) received ({payment_method}, ₱{total:.2f}): {', '.join(map(str, ids))}"
+                            + (f"; OR {', '.join(issued.values())}" if issued else ""),
+                created_at=get_philippine_time()
+            ))
+            publish_on_commit(db, PaymentRecorded(ids))
+            db.commit()
+            committed = True
+            return {"success": True, "updated": ids, "total": total, "receipts": issued}
+        except Exception as e:
+            db.rollback()
+            return {"success": False, "error": str(e)}
+        finally:
+            db.close()
+            # Numbers of payments paid elsewhere in the meantime (or of a failed transaction)
+            unused = receipts[len(issued):] if committed else receipts
+            if unused:
+                try:
+                    allocator.give_back(unused)
+                except Exception as e:
+                    print(f"⚠️ Could not record unused OR numbers {unused}: {e}")
@@ -6,7 +6,9 @@ from app.emailer import Emailer
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from app.config import UPLOAD_FOLDER, get_philippine_time
-import shutil
+from app.uploads import store_upload
+from app.dto import AccountInfo, ResidentInfo, UploadInfo, from_instance
+from app.user_session import UserSession, session_query
 from pathlib import Path
 
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
@@ -19,7 +21,8 @@ class AuthController:
         files: list of dicts: [{"path": "/local/path/to/file", "doc_type":"PSA" or "ID", "id_type":"National ID"}]
         Flow:
           - create resident row
-          - save uploaded files into uploads/ and create DocumentUpload rows with verified='Pending'
+          - save uploaded files into the upload store (checked for size/type, deduplicated by hash)
+            and create DocumentUpload rows with verified='Pending'
           - return resident object or error
         """
         db = SessionLocal()
@@ -51,24 +54,28 @@ class AuthController:
                 src = Path(f["path"])
                 if not src.exists():
                     continue
-                dest_name = f"{resident.resident_id}_{src.name}"
-                dest = UPLOAD_FOLDER / dest_name
-                shutil.copy(src, dest)
+                # Valid IDs/documents keep an audit copy of the original file
+                stored = store_upload(src, kind='id')
+                if not stored["success"]:
+                    db.rollback()
+                    return {"success": False, "error": f"{src.name}: {stored['error']}"}
                 upload = DocumentUpload(
                     resident_id=resident.resident_id,
                     doc_type=f.get("doc_type", "Other"),
                     id_type=f.get("id_type"),
                     filename=src.name,
-                    file_path=str(dest),
+                    file_path=stored["path"],
+                    original_file_path=stored["original_path"],
                     verified='Pending'
                 )
                 db.add(upload)
                 saved_uploads.append(upload)
 
+            db.flush()
+            result = {"success": True, "resident": from_instance(ResidentInfo, resident),
+                      "uploads": [from_instance(UploadInfo, upload) for upload in saved_uploads]}
             db.commit()
-            # refresh resident
-            db.refresh(resident)
-            return {"success": True, "resident": resident, "uploads": saved_uploads}
+            return result
         except IntegrityError as e:
             db.rollback()
             return {"success": False, "error": "Integrity error: " + str(e)}
@@ -122,12 +129,12 @@ class AuthController:
             )
             account.set_password(password)
             db.add(account)
+            db.flush()
+            result = {"success": True, "account": from_instance(AccountInfo, account),
+                      "resident": from_instance(ResidentInfo, resident)}
             db.commit()
             
-            db.refresh(account)
-            db.refresh(resident)
-            
-            return {"success": True, "account": account, "resident": resident}
+            return result
             
         except IntegrityError as e:
             db.rollback()
@@ -181,12 +188,19 @@ class AuthController:
 
     @staticmethod
     def verify_login_otp(username: str, code: str):
+        """
+        Check the login OTP. On success the result carries the UserSession
+        ("session") the dashboard and its pages work with from then on.
+        """
         db = SessionLocal()
         try:
-            account = db.query(Account).filter(Account.username == username).first()
-            if not account:
+            row = session_query(db).filter(Account.username == username).first()
+            if not row:
                 return {"success": False, "error": "Account not found"}
-            res = verify_otp(account, code)
+            user_session = UserSession._make(row)
+            res = verify_otp(user_session, code)
+            if res.get("success"):
+                res["session"] = user_session
             return res
         finally:
             db.close()
@@ -205,9 +219,10 @@ class AuthController:
             account = Account(resident_id=resident.resident_id, username=username, account_status='Active', user_role='Resident')
             account.set_password(password)
             db.add(account)
+            db.flush()
+            created = from_instance(AccountInfo, account)
             db.commit()
-            db.refresh(account)
-            return {"success": True, "account": account}
+            return {"success": True, "account": created}
         except IntegrityError:
             db.rollback()
             return {"success": False, "error": "Username already exists"}
@@ -230,10 +245,10 @@ class AuthController:
                 return {"success": False, "error": "Account not found"}
             
             account.account_status = 'Active'
+            approved = from_instance(AccountInfo, account)
             db.commit()
-            db.refresh(account)
             
-            return {"success": True, "account": account, "message": "Account approved successfully"}
+            return {"success": True, "account": approved, "message": "Account approved successfully"}
         except Exception as e:
             db.rollback()
             return {"success": False, "error": str(e)}
@@ -0,0 +1,165 @@
+# app/controllers/blotter_controller.py
+"""
+Blotter search with keyset paging.
+
+Results are ordered newest first by (created_at, blotter_id) and fetched one
+page at a time: the last row of a page is the cursor for the next one, so
+page 100 costs the same as page 1 (no OFFSET scan).
+
+Text search uses the FULLTEXT index on MySQL (db/add_blotter_search_indexes.sql)
+and an FTS5 table on SQLite (see ensure_search_index). Other databases, or a
+MySQL server without the index, fall back to LIKE.
+"""
+import re
+from datetime import date, datetime, timedelta
+from sqlalchemy import text, or_, and_, tuple_
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from app.db import SessionLocal
+from app.models import Blotter
+from app.config import BLOTTER_PAGE_SIZE
+
+SEARCH_COLUMNS = ("reason", "complainant_name", "respondent_name")
+DATE_FIELDS = {"incident_date": Blotter.incident_date, "created_at": Blotter.created_at}
+WORD = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blotters_fts USING fts5("
+    "reason, complainant_name, respondent_name, content='blotters', content_rowid='blotter_id')",
+    "CREATE TRIGGER IF NOT EXISTS blotters_fts_ai AFTER INSERT ON blotters BEGIN "
+    "INSERT INTO blotters_fts(rowid, reason, complainant_name, respondent_name) "
+    "VALUES (new.blotter_id, new.reason, new.complainant_name, new.respondent_name); END",
+    "CREATE TRIGGER IF NOT EXISTS blotters_fts_ad AFTER DELETE ON blotters BEGIN "
+    "INSERT INTO blotters_fts(blotters_fts, rowid, reason, complainant_name, respondent_name) "
+    "VALUES ('delete', old.blotter_id, old.reason, old.complainant_name, old.respondent_name); END",
+    "CREATE TRIGGER IF NOT EXISTS blotters_fts_au AFTER UPDATE ON blotters BEGIN "
+    "INSERT INTO blotters_fts(blotters_fts, rowid, reason, complainant_name, respondent_name) "
+    "VALUES ('delete', old.blotter_id, old.reason, old.complainant_name, old.respondent_name); "
+    "INSERT INTO blotters_fts(rowid, reason, complainant_name, respondent_name) "
+    "VALUES (new.blotter_id, new.reason, new.complainant_name, new.respondent_name); END",
+]
+
+
+def search_terms(query: str):
+    """Split user input into words; punctuation is dropped so it cannot break the MATCH syntax"""
+    return WORD.findall(query or "")
+
+
+def mysql_boolean_query(terms) -> str:
+    """'broken window' -> '+broken* +window*' (every word required, prefix match)"""
+    return " ".join(f"+{term}*" for term in terms)
+
+
+def fts5_query(terms) -> str:
+    """'broken window' -> '"broken"* "window"*' (implicit AND, prefix match)"""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def date_bounds(date_from=None, date_to=None):
+    """Turn an inclusive date range into [start, end) datetimes; either side may be None"""
+    start = datetime.combine(date_from, datetime.min.time()) if isinstance(date_from, date) \
+        and not isinstance(date_from, datetime) else date_from
+    end = date_to
+    if isinstance(date_to, date) and not isinstance(date_to, datetime):
+        end = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+    return start, end
+
+
+def blotter_row(blotter: Blotter) -> dict:
+    return {
+        "blotter_id": blotter.blotter_id,
+        "complainant_name": blotter.complainant_name,
+        "respondent_name": blotter.respondent_name,
+        "reason": blotter.reason,
+        "incident_date": blotter.incident_date,
+        "location": blotter.location,
+        "handled_by": blotter.handled_by,
+        "created_at": blotter.created_at,
+    }
+
+
+class BlotterController:
+    @staticmethod
+    def ensure_search_index(engine):
+        """Create the FTS5 table and its sync triggers on SQLite (no-op elsewhere)"""
+        if engine.dialect.name != "sqlite":
+            return
+        with engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'blotters_fts'")).first()
+            for statement in SQLITE_FTS_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                # Index rows that were inserted before the triggers existed
+                conn.execute(text("INSERT INTO blotters_fts(blotters_fts) VALUES ('rebuild')"))
+
+    @staticmethod
+    def build_query(db, query: str = None, date_field: str = "incident_date", date_from=None, date_to=None,
+                    after=None, use_index: bool = True):
+        """SQLAlchemy query for one search, newest first; after is the (created_at, blotter_id) cursor"""
+        q = db.query(Blotter)
+        terms = search_terms(query)
+        if terms:
+            dialect = db.get_bind().dialect.name
+            if use_index and dialect == "mysql":
+                q = q.filter(text(
+                    "MATCH (blotters.reason, blotters.complainant_name, blotters.respondent_name) "
+                    "AGAINST (:fulltext IN BOOLEAN MODE)").bindparams(fulltext=mysql_boolean_query(terms)))
+            elif use_index and dialect == "sqlite":
+                q = q.filter(text(
+                    "blotters.blotter_id IN (SELECT rowid FROM blotters_fts WHERE blotters_fts MATCH :fulltext)"
+                ).bindparams(fulltext=fts5_query(terms)))
+            else:
+                for term in terms:
+                    pattern = f"%{term}%"
+                    q = q.filter(or_(*(getattr(Blotter, column).ilike(pattern) for column in SEARCH_COLUMNS)))
+
+        column = DATE_FIELDS.get(date_field)
+        if column is None:
+            raise ValueError(f"Unknown date field: {date_field}")
+        start, end = date_bounds(date_from, date_to)
+        if start is not None:
+            q = q.filter(column >= start)
+        if end is not None:
+            q = q.filter(column < end)
+
+        if after is not None:
+            created_at, blotter_id = after
+            if created_at is None:
+                # Legacy rows without created_at sort last; only the id orders them
+                q = q.filter(and_(Blotter.created_at.is_(None), Blotter.blotter_id < blotter_id))
+            else:
+                q = q.filter(or_(tuple_(Blotter.created_at, Blotter.blotter_id) < tuple_(created_at, blotter_id),
+                                 Blotter.created_at.is_(None)))
+        # MySQL and SQLite both sort NULL created_at last in descending order
+        return q.order_by(Blotter.created_at.desc(), Blotter.blotter_id.desc())
+
+    @staticmethod
+    def search(query: str = None, date_field: str = "incident_date", date_from=None, date_to=None,
+               after=None, limit: int = BLOTTER_PAGE_SIZE):
+        """
+        One page of blotter records matching the filters.
+        Returns {"success": True, "rows": [dict, ...], "next_cursor": (created_at, blotter_id) or None}.
+        Pass next_cursor back as after to get the following page.
+        """
+        db = SessionLocal()
+        try:
+            try:
+                blotters = BlotterController.build_query(
+                    db, query, date_field, date_from, date_to, after).limit(limit + 1).all()
+            except (OperationalError, ProgrammingError) as e:
+                # e.g. the FULLTEXT index / FTS5 table has not been created yet
+                print(f"⚠️ Blotter full-text search unavailable, using LIKE: {e.orig}")
+                db.rollback()
+                blotters = BlotterController.build_query(
+                    db, query, date_field, date_from, date_to, after, use_index=False).limit(limit + 1).all()
+
+            rows = [blotter_row(b) for b in blotters[:limit]]
+            next_cursor = None
+            if len(blotters) > limit:
+                last = rows[-1]
+                next_cursor = (last["created_at"], last["blotter_id"])
+            return {"success": True, "rows": rows, "next_cursor": next_cursor}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        finally:
+            db.close()
@@ -1,6 +1,8 @@
 # app/controllers/data_collection_controller.py
 from app.db import SessionLocal
 from app.models import Resident, Account
+from app.events import publish, ResidentUpdated
+from app.dto import ResidentInfo, from_instance
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
 
@@ -18,7 +20,7 @@ class DataCollectionController:
             data: Dictionary containing resident information from the form
             
         Returns:
-            dict: {"success": True/False, "resident": Resident object, "error": str}
+            dict: {"success": True/False, "resident": ResidentInfo, "error": str}
         """
         db = SessionLocal()
         try:
@@ -92,13 +94,16 @@ class DataCollectionController:
                     print(f"✅ Auto-approved account for {full_name}")
                     break
             
+            db.flush()
+            saved = from_instance(ResidentInfo, resident)
+            full_name = resident.full_name()
             db.commit()
-            db.refresh(resident)
+            publish(ResidentUpdated({saved.resident_id}))
             
             return {
                 "success": True,
-                "resident": resident,
-                "message": f"Resident {resident.full_name()} registered successfully"
+                "resident": saved,
+                "message": f"Resident {full_name} registered successfully"
             }
             
         except IntegrityError as e:
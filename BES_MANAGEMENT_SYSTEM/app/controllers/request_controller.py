@@ -2,18 +2,16 @@
 from app.db import SessionLocal
 from app.models import Request, Service, DocumentUpload, Payment, Resident, ResidentLog
 from app.emailer import Emailer
+from app.reference_cache import all_services
 from app.config import get_philippine_time
+from app.dto import RequestInfo, UploadInfo, from_instance
 from datetime import datetime
 
 class RequestController:
     @staticmethod
     def list_services():
-        db = SessionLocal()
-        try:
-            services = db.query(Service).all()
-            return services
-        finally:
-            db.close()
+        """Services as immutable snapshots (cached, see app/reference_cache.py)"""
+        return all_services()
 
     @staticmethod
     def create_request(resident_id: int, service_id: int, fields: dict, payment_method: str = 'None', payment_proof_path: str = None):
@@ -58,9 +56,10 @@ class RequestController:
                 details=f"Service: {service.name}"
             )
             db.add(rlog)
+            db.flush()
+            request = from_instance(RequestInfo, req)
             db.commit()
-            db.refresh(req)
-            return {"success": True, "request": req}
+            return {"success": True, "request": request}
         except Exception as e:
             db.rollback()
             return {"success": False, "error": str(e)}
@@ -86,8 +85,9 @@ class RequestController:
             req = db.query(Request).filter(Request.request_id == request_id).first()
             req.payment_proof_upload_id = upload.upload_id
             req.status = 'Payment Pending'
+            uploaded = from_instance(UploadInfo, upload)
             db.commit()
-            return {"success": True, "upload": upload}
+            return {"success": True, "upload": uploaded}
         except Exception as e:
             db.rollback()
             return {"success": False, "error": str(e)}
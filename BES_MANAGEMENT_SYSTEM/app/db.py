@@ -1,13 +1,79 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, BigInteger, Integer
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker, declarative_base
-from . config import SQLALCHEMY_DATABASE_URI
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=False,
-    pool_recycle=3600
-)
+from sqlalchemy.types import TypeDecorator, DECIMAL
+from decimal import Decimal
+from . config import SQLALCHEMY_DATABASE_URI, SQLITE_PRAGMAS
+from . import sql_profiler
+
+
+# --- SQLite support ---
+# Enum columns are created as VARCHAR and JSON as TEXT by SQLAlchemy itself;
+# BIGINT keys and DECIMAL amounts need the shims below.
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    # Only an INTEGER PRIMARY KEY is an alias of the rowid (auto-increments); SQLite integers are 64-bit anyway
+    return "INTEGER"
+
+
+class SQLiteMoney(TypeDecorator):
+    """Exact DECIMAL on SQLite: stored as an integer number of cents instead of a float"""
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, scale: int = 2):
+        super().__init__()
+        self.scale = scale
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 10 ** self.scale).to_integral_value())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(int(value)).scaleb(-self.scale)
+
+
+def money(precision: int = 10, scale: int = 2):
+    """DECIMAL(precision, scale) on MySQL, integer cents on SQLite"""
+    return DECIMAL(precision, scale).with_variant(SQLiteMoney(scale), "sqlite")
+
+
+def apply_sqlite_pragmas(engine, pragmas=SQLITE_PRAGMAS):
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself (pysqlite delays it until the first write otherwise)
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def create_app_engine(uri: str = SQLALCHEMY_DATABASE_URI):
+    if uri.startswith("sqlite"):
+        # check_same_thread: the outbox sender and background loaders use pooled connections from other threads
+        engine = create_engine(uri, echo=False, connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(engine)
+        return engine
+    return create_engine(
+        uri,
+        pool_pre_ping=True,
+        echo=False,
+        pool_recycle=3600
+    )
+
+
+engine = create_app_engine()
+if sql_profiler.ENABLED:
+    sql_profiler.install(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
@@ -17,4 +83,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,53 @@
+# app/dto.py
+"""
+Read-only rows returned by the controllers and kept by the views.
+
+Controllers used to hand out detached ORM instances - re-read with an extra
+db.refresh() after the commit - and the views kept those or ad hoc dicts.
+A detached instance carries its identity-map state and a __dict__ per row,
+and touching an unloaded attribute after db.close() raises
+DetachedInstanceError. These types are namedtuples instead: no per-row
+__dict__, immutable, nothing left to lazy-load.
+
+Two ways to build one:
+
+* rows(query_columns(db, Dto, Model)...) selects only the DTO's columns, so
+  no ORM instances are created at all;
+* from_instance(Dto, obj) right after db.flush(), before the commit. The
+  flush has already fetched the primary key (lastrowid / RETURNING) and
+  applied the Python-side column defaults, so nothing has to be re-read -
+  the commit would only expire the instance.
+
+Field names match the model's column names.
+"""
+from collections import namedtuple
+
+AccountInfo = namedtuple("AccountInfo", "account_id resident_id username user_role account_status")
+ResidentInfo = namedtuple("ResidentInfo", "resident_id first_name middle_name last_name suffix")
+UploadInfo = namedtuple("UploadInfo", "upload_id resident_id doc_type filename file_path verified")
+OtpInfo = namedtuple("OtpInfo", "otp_id account_id purpose expires_at")
+# Legacy service requests (app/controllers/request_controller.py)
+RequestInfo = namedtuple("RequestInfo", "request_id resident_id service_id status fee_amount created_at")
+# Certificate requests as the request tracker shows them, and their status history
+TrackedRequest = namedtuple("TrackedRequest", "request_id certificate_type status first_name last_name purpose "
+                                              "quantity created_at updated_at")
+StatusEvent = namedtuple("StatusEvent", "request_id from_status to_status note created_at")
+
+
+def columns(dto, model):
+    """The model's columns named by the DTO's fields, in field order"""
+    return [getattr(model, field) for field in dto._fields]
+
+
+def query_columns(db, dto, model):
+    """A query selecting only the DTO's columns (filter/order it, then pass it to rows())"""
+    return db.query(*columns(dto, model))
+
+
+def rows(dto, query) -> list:
+    return [dto._make(row) for row in query]
+
+
+def from_instance(dto, obj):
+    """Snapshot of a flushed (or loaded) instance"""
+    return dto._make(getattr(obj, field) for field in dto._fields)
@@ -0,0 +1,271 @@
+# app/email_outbox.py
+"""
+Background delivery of queued emails.
+
+Emailer.queue_email() writes a row to the email_outbox table (in the caller's
+transaction when a session is passed). OutboxSender runs on a daemon thread,
+claims due rows in batches, sends them over ONE kept-alive SMTP connection and
+records the result: Sent, or a retry with exponential backoff, or Failed once
+OUTBOX_MAX_ATTEMPTS is reached.
+"""
+import smtplib
+import threading
+import time
+from datetime import timedelta
+from email.message import EmailMessage
+from .db import SessionLocal
+from .models import EmailOutbox
+from .config import (
+    SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, EMAIL_USE_TLS, EMAIL_FROM_NAME,
+    OUTBOX_BATCH_SIZE, OUTBOX_POLL_SECONDS, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE_SECONDS,
+    OUTBOX_RETRY_MAX_SECONDS, OUTBOX_SEND_LEASE_SECONDS, SMTP_IDLE_DISCONNECT_SECONDS,
+    get_philippine_time
+)
+
+
+def retry_delay(attempts: int) -> int:
+    """Seconds to wait before the next try: 30s, 60s, 120s, ... capped at OUTBOX_RETRY_MAX_SECONDS"""
+    return min(OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), OUTBOX_RETRY_MAX_SECONDS)
+
+
+def build_message(to_address: str, subject: str, body: str, sender: str = SMTP_USERNAME) -> EmailMessage:
+    """Build the plain-text message the same way Emailer.send_email does"""
+    msg = EmailMessage()
+    msg['Subject'] = subject or ""
+    msg['From'] = f"{EMAIL_FROM_NAME} <{sender}>"
+    msg['To'] = to_address
+    msg.set_content(body or "")
+    return msg
+
+
+def is_message_error(error: Exception) -> bool:
+    """Errors caused by this one message; anything else means the server/connection is the problem"""
+    return isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError))
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Refused recipients and 5xx replies to a message will not succeed on retry"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if is_message_error(error):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class SMTPConnection:
+    """
+    One authenticated SMTP session that is reused for many messages.
+    Connects lazily, reconnects once if the server dropped the session,
+    and can be closed after a period of inactivity.
+    """
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, username=SMTP_USERNAME, password=SMTP_PASSWORD,
+                 use_tls=EMAIL_USE_TLS, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.server = None
+        self.connect_count = 0
+        self.last_used = 0.0
+
+    def connect(self):
+        """Open the connection, run STARTTLS and log in"""
+        self.close()
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self.server = server
+        self.connect_count += 1
+        self.last_used = time.monotonic()
+
+    def send(self, msg: EmailMessage):
+        """Send a message, reconnecting once if the kept-alive session was dropped"""
+        if self.server is None:
+            self.connect()
+        try:
+            self.server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self.connect()
+            self.server.send_message(msg)
+        self.last_used = time.monotonic()
+
+    def close_if_idle(self, idle_seconds=SMTP_IDLE_DISCONNECT_SECONDS):
+        if self.server is not None and time.monotonic() - self.last_used > idle_seconds:
+            self.close()
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            pass
+        self.server = None
+
+
+class OutboxSender(threading.Thread):
+    """Daemon thread that drains the email_outbox table"""
+
+    def __init__(self, session_factory=SessionLocal, connection=None,
+                 batch_size=OUTBOX_BATCH_SIZE, poll_seconds=OUTBOX_POLL_SECONDS):
+        super().__init__(name="email-outbox-sender", daemon=True)
+        self.session_factory = session_factory
+        self.connection = connection or SMTPConnection()
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def run(self):
+        print("📧 Email outbox sender started")
+        while not self._stop_event.is_set():
+            try:
+                sent = self.process_batch()
+            except Exception as e:
+                # Database unreachable etc. - keep the thread alive and try again later
+                print(f"❌ Email outbox error: {e}")
+                sent = 0
+            if sent:
+                continue
+            self.connection.close_if_idle()
+            self._wake_event.wait(self.poll_seconds)
+            self._wake_event.clear()
+        self.connection.close()
+        print("📧 Email outbox sender stopped")
+
+    def wake(self):
+        """Check the outbox now instead of waiting for the next poll"""
+        self._wake_event.set()
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def claim_batch(self):
+        """
+        Mark up to batch_size due rows as 'Sending' and return them as plain dicts.
+        The lease in next_attempt_at makes rows due again if this worker dies mid-batch,
+        and SKIP LOCKED lets several stations run a sender against the same outbox.
+        """
+        db = self.session_factory()
+        try:
+            now = get_philippine_time()
+            rows = db.query(EmailOutbox).filter(
+                EmailOutbox.status.in_(['Pending', 'Sending']),
+                EmailOutbox.next_attempt_at <= now
+            ).order_by(EmailOutbox.next_attempt_at, EmailOutbox.outbox_id).limit(
+                self.batch_size
+            ).with_for_update(skip_locked=True).all()
+
+            lease_until = now + timedelta(seconds=OUTBOX_SEND_LEASE_SECONDS)
+            batch = []
+            for row in rows:
+                row.status = 'Sending'
+                row.next_attempt_at = lease_until
+                batch.append({
+                    "outbox_id": row.outbox_id,
+                    "to_address": row.to_address,
+                    "subject": row.subject,
+                    "body": row.body,
+                    "attempts": row.attempts or 0,
+                })
+            db.commit()
+            return batch
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def process_batch(self) -> int:
+        """Send one batch; returns the number of rows handled"""
+        batch = self.claim_batch()
+        if not batch:
+            return 0
+
+        results = []
+        for index, item in enumerate(batch):
+            try:
+                msg = build_message(item["to_address"], item["subject"], item["body"])
+                self.connection.send(msg)
+                results.append((item, None))
+            except Exception as e:
+                # Drop the connection so the next message starts from a clean session
+                self.connection.close()
+                results.append((item, e))
+                if not is_message_error(e):
+                    # Server unreachable or login failed - the rest of the batch would fail the same way
+                    results.extend((rest, e) for rest in batch[index + 1:])
+                    break
+
+        self.record_results(results)
+        return len(batch)
+
+    def record_results(self, results):
+        """Write delivery status for a whole batch in one transaction"""
+        db = self.session_factory()
+        try:
+            now = get_philippine_time()
+            rows = db.query(EmailOutbox).filter(
+                EmailOutbox.outbox_id.in_([item["outbox_id"] for item, _ in results])
+            ).all()
+            by_id = {row.outbox_id: row for row in rows}
+
+            for item, error in results:
+                row = by_id.get(item["outbox_id"])
+                if row is None:
+                    continue
+                row.attempts = item["attempts"] + 1
+                if error is None:
+                    row.status = 'Sent'
+                    row.sent_at = now
+                    row.last_error = None
+                elif is_permanent_error(error) or row.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    row.status = 'Failed'
+                    row.last_error = str(error)
+                    print(f"❌ Email to {row.to_address} failed permanently: {error}")
+                else:
+                    row.status = 'Pending'
+                    row.last_error = str(error)
+                    row.next_attempt_at = now + timedelta(seconds=retry_delay(row.attempts))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def start_outbox_sender(**kwargs):
+    """Start the shared background sender (no-op if it is already running)"""
+    global _sender
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive():
+            _sender = OutboxSender(**kwargs)
+            _sender.start()
+        return _sender
+
+
+def stop_outbox_sender(timeout=10):
+    global _sender
+    with _sender_lock:
+        if _sender is not None:
+            _sender.stop(timeout)
+            _sender = None
+
+
+def wake_outbox_sender():
+    """Called after new mail is queued so it goes out without waiting for the next poll"""
+    if _sender is not None:
+        _sender.wake()
@@ -2,6 +2,9 @@
 import smtplib
 from email.message import EmailMessage
 from .config import SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, EMAIL_USE_TLS, EMAIL_FROM_NAME
+from .db import SessionLocal
+from .models import EmailOutbox
+from .email_outbox import wake_outbox_sender
 
 
 class Emailer:
@@ -12,6 +15,7 @@ class Emailer:
         to_address: recipient email (user's email from database)
         subject: email subject
         body: email body (plain text)
+        Sends immediately on a new connection - use queue_email() from controllers.
         """
         try:
             msg = EmailMessage()
@@ -35,7 +39,38 @@ class Emailer:
             return {"success": False, "error": str(e)}
 
     @staticmethod
-    def send_document_approved_email(recipient_email: str, resident_name: str):
+    def queue_email(to_address: str, subject: str, body: str, db=None):
+        """
+        Queue email in the email_outbox table; the background sender delivers it.
+        db: pass the caller's session to queue in the same transaction as the change
+            being announced (the caller commits). Without it the row is committed here.
+        """
+        if not to_address:
+            return {"success": False, "error": "No recipient address"}
+
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            row = EmailOutbox(to_address=to_address, subject=subject, body=body, status='Pending')
+            db.add(row)
+            db.flush()
+            outbox_id = row.outbox_id
+            if own_session:
+                db.commit()
+                wake_outbox_sender()
+            return {"success": True, "queued": True, "outbox_id": outbox_id}
+        except Exception as e:
+            if own_session:
+                db.rollback()
+            print(f"❌ Email queue failed: {e}")
+            return {"success": False, "error": str(e)}
+        finally:
+            if own_session:
+                db.close()
+
+    @staticmethod
+    def send_document_approved_email(recipient_email: str, resident_name: str, db=None):
         """Email template: Document approved"""
         subject = "Document Verification - Approved ✅"
         body = f"""
@@ -51,10 +86,10 @@ Sincerely,
 Barangay Balibago E-Services Team
 Barangay Balibago, Calatagan, Batangas
         """
-        return Emailer.send_email(recipient_email, subject, body)
+        return Emailer.queue_email(recipient_email, subject, body, db=db)
 
     @staticmethod
-    def send_document_rejected_email(recipient_email: str, resident_name: str, reason: str):
+    def send_document_rejected_email(recipient_email: str, resident_name: str, reason: str, db=None):
         """Email template: Document rejected"""
         subject = "Document Verification - Action Required ❌"
         body = f"""
@@ -73,10 +108,10 @@ Sincerely,
 Barangay Balibago E-Services Team
 Barangay Balibago, Calatagan, Batangas
         """
-        return Emailer.send_email(recipient_email, subject, body)
+        return Emailer.queue_email(recipient_email, subject, body, db=db)
 
     @staticmethod
-    def send_payment_verified_email(recipient_email: str, resident_name: str, service_name: str, amount: float):
+    def send_payment_verified_email(recipient_email: str, resident_name: str, service_name: str, amount: float, db=None):
         """Email template: Payment verified"""
         subject = "Payment Verified - Request Approved ✅"
         body = f"""
@@ -92,10 +127,10 @@ Sincerely,
 Barangay Balibago E-Services Team
 Barangay Balibago, Calatagan, Batangas
         """
-        return Emailer.send_email(recipient_email, subject, body)
+        return Emailer.queue_email(recipient_email, subject, body, db=db)
 
     @staticmethod
-    def send_document_ready_email(recipient_email: str, resident_name: str, service_name: str, pickup_date: str):
+    def send_document_ready_email(recipient_email: str, resident_name: str, service_name: str, pickup_date: str, db=None):
         """Email template: Document ready for pickup"""
         subject = "Document Ready for Pickup 📄"
         body = f"""
@@ -117,10 +152,10 @@ Sincerely,
 Barangay Balibago E-Services Team
 Barangay Balibago, Calatagan, Batangas
         """
-        return Emailer.send_email(recipient_email, subject, body)
+        return Emailer.queue_email(recipient_email, subject, body, db=db)
 
     @staticmethod
-    def send_request_status_update_email(recipient_email: str, resident_name: str, service_name: str, status: str):
+    def send_request_status_update_email(recipient_email: str, resident_name: str, service_name: str, status: str, db=None):
         """Email template: Request status update"""
         subject = f"Request Status Update - {status}"
         body = f"""
@@ -138,4 +173,4 @@ Sincerely,
 Barangay Balibago E-Services Team
 Barangay Balibago, Calatagan, Batangas
         """
-        return Emailer.send_email(recipient_email, subject, body)
\ No newline at end of file
+        return Emailer.queue_email(recipient_email, subject, body, db=db)
\ No newline at end of file
@@ -0,0 +1,130 @@
+# app/events.py
+"""
+In-process domain events.
+
+Controllers (and the views that still write to the database themselves)
+publish an event once their transaction has committed; open pages subscribe
+to the events they display and update just those rows or cards instead of
+rebuilding the page:
+
+    bus.subscribe(RequestStatusChanged, self.on_requests_changed)
+    publish_on_commit(db, RequestStatusChanged({request_id}))   # then db.commit()
+
+An event names the ids that changed; the subscriber re-reads them (an id
+that no longer exists was deleted). Events of one type are coalesced until
+they are delivered - their id sets are merged - so a bulk action, or several
+saves in a row, reach each subscriber once.
+
+The GUI installs a scheduler (gui/event_dispatch.py) that delivers on the Qt
+thread on the next pass of the event loop, whichever thread published.
+Without one (scripts, tests) events are delivered immediately.
+
+Subscribers are held weakly, so a page that goes away needs no unsubscribe;
+one whose Qt object was already deleted (RuntimeError) is dropped.
+
+Changes made on other stations arrive through the change feed
+(app/change_feed.py), not through this bus.
+"""
+import threading
+import weakref
+from collections import namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Every field is a frozenset of ids (publish() converts any iterable)
+RequestStatusChanged = namedtuple("RequestStatusChanged", "request_ids")
+PaymentRecorded = namedtuple("PaymentRecorded", "request_ids")
+ResidentUpdated = namedtuple("ResidentUpdated", "resident_ids")
+AnnouncementPublished = namedtuple("AnnouncementPublished", "announcement_ids")
+BlotterUpdated = namedtuple("BlotterUpdated", "blotter_ids")
+
+PENDING_KEY = "domain_events"
+
+
+def coalesce(first, second):
+    """One event of the same type carrying both events' ids"""
+    return type(first)(*(a | b for a, b in zip(first, second)))
+
+
+class EventBus:
+    """Typed publish/subscribe with per-type coalescing; thread-safe"""
+
+    def __init__(self):
+        self._subscribers = {}          # event type -> [weak callback]
+        self._pending = {}              # event type -> coalesced event, in publish order
+        self._lock = threading.Lock()
+        self._scheduler = None
+
+    def set_scheduler(self, scheduler):
+        """scheduler() must arrange for flush() to run later (None: deliver at once)"""
+        self._scheduler = scheduler
+
+    def subscribe(self, event_type, callback):
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+        with self._lock:
+            self._subscribers.setdefault(event_type, []).append(ref)
+
+    def unsubscribe(self, event_type, callback):
+        with self._lock:
+            refs = self._subscribers.get(event_type, [])
+            self._subscribers[event_type] = [ref for ref in refs if ref() not in (None, callback)]
+
+    def publish(self, event):
+        event = type(event)(*(frozenset(ids) for ids in event))
+        with self._lock:
+            first = not self._pending
+            pending = self._pending.get(type(event))
+            self._pending[type(event)] = event if pending is None else coalesce(pending, event)
+        if self._scheduler is None:
+            self.flush()
+        elif first:
+            self._scheduler()
+
+    def flush(self):
+        """Deliver everything published since the last flush"""
+        with self._lock:
+            events, self._pending = list(self._pending.values()), {}
+        for evt in events:
+            with self._lock:
+                refs = list(self._subscribers.get(type(evt), []))
+            for ref in refs:
+                callback = ref()
+                if callback is None:
+                    self._drop(type(evt), ref)
+                    continue
+                try:
+                    callback(evt)
+                except RuntimeError:
+                    # The subscribing widget was deleted on the C++ side
+                    self._drop(type(evt), ref)
+                except Exception as e:
+                    print(f"⚠️ {type(evt).__name__} subscriber failed: {e}")
+
+    def _drop(self, event_type, ref):
+        with self._lock:
+            refs = self._subscribers.get(event_type, [])
+            if ref in refs:
+                refs.remove(ref)
+
+
+bus = EventBus()
+
+
+def publish(event):
+    bus.publish(event)
+
+
+def publish_on_commit(session, event):
+    """Publish the event once the session's transaction commits (dropped on rollback)"""
+    session.info.setdefault(PENDING_KEY, []).append(event)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    for evt in session.info.pop(PENDING_KEY, []):
+        bus.publish(evt)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,193 @@
+# app/exports.py
+"""
+Streaming CSV/XLSX exports of residents, certificate requests and payments.
+
+Rows are read with a server-side cursor (stream_results, yield_per) and
+written as they arrive, EXPORT_BATCH_SIZE at a time, so memory stays flat
+however large the table is. XLSX files are written with openpyxl in
+write-only mode (optional dependency: pip install openpyxl).
+
+Filters (all optional): sitio, date_from / date_to (inclusive dates, on the
+kind's date field - see EXPORTS), status. For payments the status is
+'Paid' or 'Unpaid'.
+
+Used by scripts/export_data.py and the admin window's Export buttons
+(gui/export_worker.py runs it on a worker thread).
+"""
+import csv
+import os
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from sqlalchemy import select, func
+from .db import engine
+from .models import Resident, CertificateRequest, CertificatePayment
+from .config import EXPORT_BATCH_SIZE
+
+ExportSpec = namedtuple("ExportSpec", "model title date_fields default_columns")
+
+EXPORTS = {
+    "residents": ExportSpec(Resident, "Residents", ("created_at",), [
+        "resident_id", "last_name", "first_name", "middle_name", "suffix", "gender", "birth_date", "age",
+        "civil_status", "sitio", "barangay", "municipality", "contact_number", "occupation",
+        "registered_voter", "indigent", "solo_parent", "fourps_member",
+    ]),
+    "requests": ExportSpec(CertificateRequest, "Certificate Requests", ("created_at", "updated_at"), [
+        "request_id", "resident_id", "certificate_type", "last_name", "first_name", "middle_name",
+        "purpose", "quantity", "status", "created_at", "updated_at",
+    ]),
+    "payments": ExportSpec(CertificatePayment, "Payments", ("created_at", "received_at"), [
+        "payment_id", "request_id", "resident_id", "certificate_type", "requestor_name", "quantity",
+        "unit_price", "total_amount", "is_paid", "payment_method", "or_number", "reference_number",
+        "received_at", "created_at",
+    ]),
+}
+FORMATS = (".csv", ".xlsx")
+REQUEST_STATUSES = ["Pending", "Under Review", "Processing", "Ready for Pickup", "Completed", "Declined", "Cancelled"]
+PAYMENT_STATUSES = ["Paid", "Unpaid"]
+
+
+def column_names(kind: str):
+    """Every exportable column of a kind, in table order"""
+    return [column.key for column in EXPORTS[kind].model.__table__.columns]
+
+
+def column_label(name: str) -> str:
+    return name.replace("_", " ").title().replace("Id", "ID").replace("Or ", "OR ")
+
+
+def build_query(kind: str, columns=None, filters=None):
+    spec = EXPORTS[kind]
+    model = spec.model
+    columns = columns or spec.default_columns
+    unknown = set(columns) - set(column_names(kind))
+    if unknown:
+        raise ValueError(f"Unknown {kind} column(s): {', '.join(sorted(unknown))}")
+    stmt = select(*[getattr(model, name) for name in columns])
+
+    filters = filters or {}
+    if filters.get("sitio"):
+        if model is Resident:
+            stmt = stmt.where(Resident.sitio == filters["sitio"])
+        else:
+            stmt = stmt.where(model.resident_id.in_(select(Resident.resident_id).where(Resident.sitio == filters["sitio"])))
+    date_field = filters.get("date_field") or spec.date_fields[0]
+    if date_field not in spec.date_fields:
+        raise ValueError(f"{kind} can be filtered by {', '.join(spec.date_fields)}, not {date_field}")
+    date_column = getattr(model, date_field)
+    if filters.get("date_from"):
+        stmt = stmt.where(date_column >= datetime.combine(filters["date_from"], time.min))
+    if filters.get("date_to"):
+        stmt = stmt.where(date_column < datetime.combine(filters["date_to"] + timedelta(days=1), time.min))
+    if filters.get("status"):
+        if model is CertificateRequest:
+            stmt = stmt.where(CertificateRequest.status == filters["status"])
+        elif model is CertificatePayment:
+            stmt = stmt.where(CertificatePayment.is_paid == (filters["status"] == "Paid"))
+        else:
+            raise ValueError("Residents have no status filter")
+    return stmt.order_by(*model.__table__.primary_key.columns)
+
+
+def count_rows(kind: str, filters=None, bind=None) -> int:
+    stmt = build_query(kind, filters=filters).order_by(None)
+    with (bind or engine).connect() as conn:
+        return conn.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+
+
+def iter_batches(kind: str, columns=None, filters=None, bind=None, batch_size=EXPORT_BATCH_SIZE):
+    """Lists of row tuples, batch_size at a time, from a server-side cursor"""
+    stmt = build_query(kind, columns, filters)
+    with (bind or engine).connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        for partition in result.partitions():
+            yield partition
+
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+class CsvWriter:
+    def __init__(self, path, header, title):
+        # utf-8-sig: Excel opens names with ñ correctly
+        self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(header)
+
+    def write(self, rows):
+        self.writer.writerows([csv_value(v) for v in row] for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxWriter:
+    def __init__(self, path, header, title):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError("XLSX export needs openpyxl (pip install openpyxl); export as .csv instead")
+        self.path = path
+        # Write-only: rows go straight to the zipped sheet XML instead of staying in memory
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(title[:31])
+        self.sheet.append(header)
+
+    def write(self, rows):
+        for row in rows:
+            self.sheet.append([float(v) if isinstance(v, Decimal) else v for v in row])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+def export_table(kind: str, path, columns=None, filters=None, progress=None, cancelled=None, bind=None,
+                 batch_size=EXPORT_BATCH_SIZE):
+    """
+    Write the rows of `kind` to path (.csv or .xlsx), batch by batch.
+    progress(done, total) is called after every batch; cancelled() is polled between batches.
+    The file only appears once complete.
+    """
+    path = Path(path)
+    if kind not in EXPORTS:
+        return {"success": False, "error": f"Unknown export {kind!r} (choose from {', '.join(EXPORTS)})"}
+    if path.suffix.lower() not in FORMATS:
+        return {"success": False, "error": f"Export to .csv or .xlsx, not {path.suffix or 'no extension'}"}
+    spec = EXPORTS[kind]
+    columns = columns or spec.default_columns
+    partial = path.with_name(path.name + ".part")
+    writer = None
+    try:
+        build_query(kind, columns, filters)      # validates columns and filters before touching the file
+        total = count_rows(kind, filters, bind) if progress else None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer_class = XlsxWriter if path.suffix.lower() == ".xlsx" else CsvWriter
+        writer = writer_class(partial, [column_label(name) for name in columns], spec.title)
+        done = 0
+        for batch in iter_batches(kind, columns, filters, bind, batch_size):
+            if cancelled and cancelled():
+                raise InterruptedError("Export cancelled")
+            writer.write(batch)
+            done += len(batch)
+            if progress:
+                progress(done, total)
+        writer.close()
+        writer = None
+        os.replace(partial, path)
+        return {"success": True, "rows": done, "path": str(path)}
+    except Exception as e:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:
+                pass
+        partial.unlink(missing_ok=True)
+        return {"success": False, "error": str(e)}
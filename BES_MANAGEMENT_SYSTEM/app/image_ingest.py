@@ -0,0 +1,57 @@
+# app/image_ingest.py
+"""
+Image normalization at upload time.
+
+Each image is decoded once (EXIF orientation applied), shrunk to the maximum
+size configured for its kind and re-encoded as JPEG at IMAGE_JPEG_QUALITY.
+Qt's JPEG writer does not copy EXIF/GPS metadata, so re-encoding strips it.
+Images with transparency are kept as PNG.
+"""
+from PyQt5 import QtCore, QtGui
+from .config import IMAGE_MAX_DIMENSIONS, IMAGE_JPEG_QUALITY
+
+
+def target_size(width: int, height: int, max_width: int, max_height: int):
+    """Fit (width, height) inside the maximum box, never upscaling"""
+    scale = min(max_width / width, max_height / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def encode_image(image: QtGui.QImage, fmt: str, quality: int = -1) -> bytes:
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    writer = QtGui.QImageWriter(buffer, fmt.encode())
+    if quality >= 0:
+        writer.setQuality(quality)
+    if fmt == "jpg":
+        writer.setOptimizedWrite(True)
+        writer.setProgressiveScanWrite(True)
+    ok = writer.write(image)
+    buffer.close()
+    if not ok:
+        raise ValueError(f"Could not encode image: {writer.errorString()}")
+    return bytes(data)
+
+
+def normalize_image(path, kind: str, quality: int = IMAGE_JPEG_QUALITY):
+    """
+    Decode the image at path and return (data, extension) of the normalized copy.
+    kind is a key of IMAGE_MAX_DIMENSIONS ('photo', 'id', 'official', 'announcement').
+    Raises ValueError if the file is not a readable image.
+    """
+    reader = QtGui.QImageReader(str(path))
+    reader.setAutoTransform(True)  # rotate per EXIF orientation before the tag is dropped
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Not a readable image: {reader.errorString()}")
+
+    max_width, max_height = IMAGE_MAX_DIMENSIONS[kind]
+    width, height = target_size(image.width(), image.height(), max_width, max_height)
+    if (width, height) != (image.width(), image.height()):
+        image = image.scaled(width, height, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+
+    if image.hasAlphaChannel():
+        return encode_image(image, "png"), "png"
+    image = image.convertToFormat(QtGui.QImage.Format_RGB888)
+    return encode_image(image, "jpg", quality), "jpg"
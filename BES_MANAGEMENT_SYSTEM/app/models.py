@@ -1,8 +1,8 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Boolean, Text, ForeignKey, Enum, JSON, \
-    DECIMAL
+    Index
 from sqlalchemy.orm import relationship
-from .db import Base
+from .db import Base, money
 from passlib.hash import pbkdf2_sha256
 from .config import get_philippine_time
 
@@ -152,10 +152,12 @@ class DocumentUpload(Base):
     id_type = Column(String(100))  # National ID, Voter's ID, etc.
     filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
+    original_file_path = Column(String(500))  # untouched upload kept as an audit copy
     uploaded_at = Column(DateTime, default=get_philippine_time)
     verified = Column(Enum('Pending', 'Approved', 'Rejected'), default='Pending')
     verifier_admin_id = Column(BigInteger)
     verifier_reason = Column(Text)
+    updated_at = Column(DateTime, default=get_philippine_time, onupdate=get_philippine_time)  # replica sync watermark
 
 
 class Service(Base):
@@ -164,7 +166,7 @@ class Service(Base):
     service_id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(150), nullable=False)
     description = Column(Text)
-    fee = Column(DECIMAL(10, 2), default=0.00)
+    fee = Column(money(), default=0.00)
     requires_payment = Column(Boolean, default=True)
     requires_documents = Column(JSON)
     created_at = Column(DateTime, default=get_philippine_time)
@@ -182,7 +184,7 @@ class Request(Base):
     payment_proof_upload_id = Column(BigInteger)
     status = Column(Enum('Pending', 'Payment Pending', 'Approved', 'Declined', 'Cancelled', 'Completed'),
                     default='Pending')
-    fee_amount = Column(DECIMAL(10, 2), default=0.00)
+    fee_amount = Column(money(), default=0.00)
     created_at = Column(DateTime, default=get_philippine_time)
     updated_at = Column(DateTime, default=get_philippine_time, onupdate=get_philippine_time)
     pickup_datetime = Column(DateTime)
@@ -211,6 +213,7 @@ class CertificateRequest(Base):
     
     # Upload
     uploaded_file_path = Column(String(500))  # Path to uploaded ID/document
+    original_file_path = Column(String(500))  # Untouched upload kept as an audit copy (valid IDs)
     
     # Status Management - workflow: Pending -> Under Review -> Processing -> Ready for Pickup -> Completed (or Declined)
     status = Column(String(50), default='Pending')  # Pending, Under Review, Processing, Ready for Pickup, Completed, Declined
@@ -223,6 +226,28 @@ class CertificateRequest(Base):
     
     # Relationship
     resident = relationship("Resident", backref="certificate_requests")
+    events = relationship("CertificateRequestEvent", back_populates="request",
+                          order_by="CertificateRequestEvent.event_id", cascade="all, delete-orphan")
+
+
+class CertificateRequestEvent(Base):
+    """Status history of a certificate request - written by app/request_events.py on every status change"""
+    __tablename__ = "certificate_request_events"
+
+    # SQLite only auto-increments INTEGER primary keys
+    event_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    request_id = Column(BigInteger, ForeignKey('certificate_requests.request_id', ondelete='CASCADE'), nullable=False)
+    from_status = Column(String(50))     # NULL for the submission
+    to_status = Column(String(50), nullable=False)
+    actor = Column(String(100))          # username, 'admin' or 'system'
+    note = Column(Text)
+    created_at = Column(DateTime, default=get_philippine_time)
+
+    request = relationship("CertificateRequest", back_populates="events")
+
+    __table_args__ = (
+        Index('idx_request_events_request', 'request_id', 'event_id'),
+    )
 
 
 class CertificatePayment(Base):
@@ -239,8 +264,8 @@ class CertificatePayment(Base):
     
     # Payment details
     quantity = Column(Integer, default=1)
-    unit_price = Column(DECIMAL(10, 2), default=0.00)  # Price per certificate
-    total_amount = Column(DECIMAL(10, 2), default=0.00)  # quantity * unit_price
+    unit_price = Column(money(), default=0.00)  # Price per certificate
+    total_amount = Column(money(), default=0.00)  # quantity * unit_price
     
     # Payment status
     is_paid = Column(Boolean, default=False)
@@ -260,6 +285,63 @@ class CertificatePayment(Base):
     certificate_request = relationship("CertificateRequest", backref="payment")
     resident = relationship("Resident", backref="certificate_payments")
 
+    __table_args__ = (
+        Index('idx_payments_paid_received', 'is_paid', 'received_at'),   # daily / per-cashier totals
+        Index('idx_payments_created', 'created_at'),                     # payments table date window
+        Index('uq_payments_or_number', 'or_number', unique=True),        # NULLs (no receipt) may repeat
+    )
+
+
+class PaymentLedgerDay(Base):
+    """End-of-day payment totals per cashier, written once a day is closed (app/payment_ledger.py)"""
+    __tablename__ = "payment_ledger_days"
+
+    ledger_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    ledger_date = Column(Date, nullable=False)
+    received_by_admin_id = Column(BigInteger)  # NULL: payments recorded without a cashier
+    payment_count = Column(Integer, default=0)
+    total_amount = Column(money(12, 2), default=0.00)
+    closed_at = Column(DateTime, default=get_philippine_time)
+
+    __table_args__ = (
+        Index('idx_ledger_date', 'ledger_date', 'received_by_admin_id'),
+    )
+
+
+class PaymentLedgerLock(Base):
+    """The single row payment_ledger_days writes are serialized on (app/payment_ledger.py)"""
+    __tablename__ = "payment_ledger_lock"
+
+    lock_id = Column(Integer, primary_key=True)  # always 1
+    close_count = Column(BigInteger, nullable=False, default=0)
+    locked_at = Column(DateTime)
+
+
+class OrNumberSequence(Base):
+    """Next unreserved official receipt number of each series (app/or_numbers.py)"""
+    __tablename__ = "or_sequences"
+
+    series = Column(String(20), primary_key=True)  # year, e.g. '2025'
+    next_number = Column(BigInteger, nullable=False, default=1)
+
+
+class OrNumberBlock(Base):
+    """A block of OR numbers reserved by one station; unused_from is set when the station returns the rest"""
+    __tablename__ = "or_number_blocks"
+
+    block_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    station = Column(String(100), nullable=False)
+    series = Column(String(20), nullable=False)
+    first_number = Column(BigInteger, nullable=False)
+    last_number = Column(BigInteger, nullable=False)
+    reserved_at = Column(DateTime, default=get_philippine_time)
+    unused_from = Column(BigInteger)  # first number never issued (up to last_number)
+    released_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('idx_or_blocks_series', 'series', 'first_number'),
+    )
+
 
 class Payment(Base):
     __tablename__ = "payments"
@@ -267,13 +349,14 @@ class Payment(Base):
     payment_id = Column(BigInteger, primary_key=True, autoincrement=True)
     request_id = Column(BigInteger, ForeignKey('requests.request_id'))
     resident_id = Column(BigInteger)
-    amount = Column(DECIMAL(10, 2))
+    amount = Column(money())
     method = Column(Enum('GCash', 'Cash'), default='Cash')
     proof_upload_id = Column(BigInteger)
     status = Column(Enum('Pending', 'Verified', 'Rejected'), default='Pending')
     verified_by_admin_id = Column(BigInteger)
     verified_at = Column(DateTime)
     created_at = Column(DateTime, default=get_philippine_time)
+    updated_at = Column(DateTime, default=get_philippine_time, onupdate=get_philippine_time)  # replica sync watermark
 
 
 class Announcement(Base):
@@ -301,6 +384,13 @@ class Blotter(Base):
     posted_by_admin_id = Column(BigInteger)
     created_at = Column(DateTime, default=get_philippine_time)
 
+    __table_args__ = (
+        Index('idx_blotters_created', 'created_at', 'blotter_id'),   # keyset paging
+        Index('idx_blotters_incident', 'incident_date'),
+        Index('ft_blotters_text', 'reason', 'complainant_name', 'respondent_name',
+              mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
+
 
 class Notification(Base):
     __tablename__ = "notifications"
@@ -356,4 +446,58 @@ class BarangayOfficial(Base):
     category = Column(String(50), default='Sanggunian')  # Sanggunian, Other
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=get_philippine_time)
-    updated_at = Column(DateTime, default=get_philippine_time, onupdate=get_philippine_time)
\ No newline at end of file
+    updated_at = Column(DateTime, default=get_philippine_time, onupdate=get_philippine_time)
+
+
+class EmailOutbox(Base):
+    """Queued outgoing emails - delivered by the background sender in app/email_outbox.py"""
+    __tablename__ = "email_outbox"
+
+    outbox_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    to_address = Column(String(255), nullable=False)
+    subject = Column(String(255))
+    body = Column(Text)
+
+    # Delivery status - Pending -> Sending -> Sent (or Failed after OUTBOX_MAX_ATTEMPTS)
+    status = Column(Enum('Pending', 'Sending', 'Sent', 'Failed'), default='Pending')
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime, default=get_philippine_time)
+
+    # Timestamps
+    created_at = Column(DateTime, default=get_philippine_time)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        Index('idx_outbox_due', 'status', 'next_attempt_at'),
+    )
+
+
+class ChangeLog(Base):
+    """Keys of rows written by any station, read by the others' open tables - see app/change_feed.py"""
+    __tablename__ = "change_log"
+
+    change_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(BigInteger)  # the key the views use (FEED_TABLES); NULL: reload the whole table
+    operation = Column(String(10), nullable=False)  # insert, update, delete
+    station = Column(String(100))
+    created_at = Column(DateTime, default=get_philippine_time)
+
+    __table_args__ = (
+        Index('idx_change_log_created', 'created_at'),
+    )
+
+
+class CacheVersion(Base):
+    """Per-table change counter shared by all stations - see app/reference_cache.py"""
+    __tablename__ = "cache_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# Registers the listener that writes CertificateRequestEvent rows on every status change
+from . import request_events  # noqa: E402,F401
+# Registers the listeners that write change_log rows for the other stations
+from . import change_feed  # noqa: E402,F401
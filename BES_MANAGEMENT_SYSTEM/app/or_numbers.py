@@ -0,0 +1,204 @@
+# app/or_numbers.py
+"""
+Official receipt (OR) numbers without duplicates or a lock per payment.
+
+Every station reserves a block of OR_BLOCK_SIZE numbers from the shared
+or_sequences row of the year in ONE short transaction (an UPDATE that moves
+next_number past the block), then hands the numbers out from memory. Two
+stations never get overlapping blocks, and a payment never waits on the
+sequence row unless its station just ran out of numbers.
+
+Each block is recorded in or_number_blocks. On shutdown release() stores
+where the station stopped (unused_from), so an auditor can tell numbers that
+were never issued from missing receipts. Numbers drawn but then not printed
+(give_back()) are handed out again if nothing was drawn after them, and
+otherwise recorded there as well. The unique index on
+certificate_payments.or_number (uq_payments_or_number) catches anything
+else, e.g. a hand-typed number from a pre-printed booklet that was used twice.
+
+With the offline replica (BES_SYNC=1), blocks are reserved on the central
+database. A station keeps issuing receipts from the block it holds while the
+server is unreachable.
+"""
+import threading
+from datetime import datetime
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
+from .db import engine
+from .models import CertificatePayment, OrNumberSequence, OrNumberBlock
+from .config import STATION_NAME, OR_PREFIX, OR_BLOCK_SIZE, SYNC_ENABLED, get_philippine_time
+
+
+def format_or_number(series: str, number: int, prefix: str = OR_PREFIX) -> str:
+    return f"{prefix}-{series}-{number:07d}"
+
+
+def parse_or_number(or_number: str):
+    """(series, number) of a formatted OR number"""
+    _, series, number = or_number.rsplit("-", 2)
+    return series, int(number)
+
+
+def consecutive_runs(numbers):
+    """Sorted numbers as (first, last) runs of consecutive numbers"""
+    result = []
+    for number in sorted(numbers):
+        if result and result[-1][1] == number - 1:
+            result[-1] = (result[-1][0], number)
+        else:
+            result.append((number, number))
+    return result
+
+
+class Block:
+    def __init__(self, block_id, series, first, last):
+        self.block_id = block_id
+        self.series = series
+        self.first = first
+        self.next = first
+        self.last = last
+
+    def remaining(self) -> int:
+        return self.last - self.next + 1
+
+
+class OrNumberAllocator:
+    """OR numbers of one station; thread-safe"""
+
+    def __init__(self, station: str = STATION_NAME, bind=None, block_size: int = OR_BLOCK_SIZE,
+                 prefix: str = OR_PREFIX, clock=datetime.now):
+        self.station = station
+        self.bind = bind or engine
+        self.block_size = block_size
+        self.prefix = prefix
+        self.clock = clock
+        self._blocks = {}          # series -> Block in use
+        self._lock = threading.Lock()
+
+    def series(self) -> str:
+        return str(self.clock().year)
+
+    def highest_issued(self, conn, series: str) -> int:
+        """Highest number of the series already on a payment (imported data, hand-typed receipts)"""
+        pattern = f"{self.prefix}-{series}-"
+        highest = conn.execute(select(func.max(CertificatePayment.or_number))
+                               .where(CertificatePayment.or_number.like(pattern + "%"))).scalar()
+        try:
+            return int(highest[len(pattern):]) if highest else 0
+        except ValueError:
+            return 0
+
+    def reserve(self, series: str) -> Block:
+        """Take the next block of the series from the shared sequence"""
+        size = self.block_size
+        for _ in range(2):
+            with self.bind.begin() as conn:
+                # The UPDATE comes first: it takes the row (or SQLite's write) lock before anything is read
+                moved = conn.execute(update(OrNumberSequence).where(OrNumberSequence.series == series)
+                                     .values(next_number=OrNumberSequence.next_number + size)).rowcount
+                if moved:
+                    end = conn.execute(select(OrNumberSequence.next_number)
+                                       .where(OrNumberSequence.series == series)).scalar()
+                    first, last = end - size, end - 1
+                    block_id = conn.execute(OrNumberBlock.__table__.insert().values(
+                        station=self.station, series=series, first_number=first, last_number=last,
+                        reserved_at=get_philippine_time())).inserted_primary_key[0]
+                    return Block(block_id, series, first, last)
+            # First block of the year: start the series after any number already used
+            with self.bind.connect() as conn:
+                start = self.highest_issued(conn, series) + 1
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(OrNumberSequence.__table__.insert().values(series=series, next_number=start))
+            except IntegrityError:
+                pass                # another station created it first
+        raise RuntimeError(f"Could not reserve OR numbers for {series}")
+
+    def current_block(self, series: str) -> Block:
+        # Caller holds self._lock
+        block = self._blocks.get(series)
+        if block is None or block.remaining() == 0:
+            block = self._blocks[series] = self.reserve(series)
+        return block
+
+    def allocate(self) -> str:
+        """The next OR number of this station"""
+        series = self.series()
+        with self._lock:
+            block = self.current_block(series)
+            number = block.next
+            block.next += 1
+        return format_or_number(series, number, self.prefix)
+
+    def peek(self) -> str:
+        """The number allocate() will return next (reserves a block if needed)"""
+        series = self.series()
+        with self._lock:
+            return format_or_number(series, self.current_block(series).next, self.prefix)
+
+    def give_back(self, or_numbers):
+        """
+        Numbers allocated but never printed on a receipt: the last ones drawn are
+        handed out again, any others are recorded in or_number_blocks as never issued.
+        """
+        by_series = {}
+        for or_number in or_numbers:
+            series, number = parse_or_number(or_number)
+            by_series.setdefault(series, []).append(number)
+        unused = []
+        with self._lock:
+            for series, numbers in by_series.items():
+                numbers.sort()
+                block = self._blocks.get(series)
+                if block and numbers[0] >= block.first and numbers == list(range(numbers[0], block.next)):
+                    block.next = numbers[0]
+                else:
+                    unused += [(series, first, last) for first, last in consecutive_runs(numbers)]
+        if not unused:
+            return
+        now = get_philippine_time()
+        with self.bind.begin() as conn:
+            conn.execute(OrNumberBlock.__table__.insert(), [
+                {"station": self.station, "series": series, "first_number": first, "last_number": last,
+                 "reserved_at": now, "unused_from": first, "released_at": now}
+                for series, first, last in unused])
+
+    def release(self):
+        """Record the numbers this station never issued (call on shutdown)"""
+        with self._lock:
+            blocks, self._blocks = list(self._blocks.values()), {}
+        if not blocks:
+            return
+        now = get_philippine_time()
+        with self.bind.begin() as conn:
+            for block in blocks:
+                conn.execute(update(OrNumberBlock).where(OrNumberBlock.block_id == block.block_id)
+                             .values(unused_from=block.next if block.remaining() else None, released_at=now))
+
+
+_allocator = None
+_allocator_lock = threading.Lock()
+
+
+def get_or_allocator() -> OrNumberAllocator:
+    """The station's shared allocator (created on first use)"""
+    global _allocator
+    with _allocator_lock:
+        if _allocator is None:
+            bind = None
+            if SYNC_ENABLED:
+                from .sync import remote_engine
+                bind = remote_engine()
+            _allocator = OrNumberAllocator(bind=bind)
+        return _allocator
+
+
+def release_or_numbers():
+    global _allocator
+    with _allocator_lock:
+        if _allocator is not None:
+            try:
+                _allocator.release()
+            except Exception as e:
+                print(f"⚠️ Could not record unused OR numbers: {e}")
+            _allocator = None
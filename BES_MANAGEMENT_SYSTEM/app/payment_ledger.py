@@ -0,0 +1,283 @@
+# app/payment_ledger.py
+"""
+Payments ledger: daily, monthly and per-cashier totals of received
+certificate payments.
+
+Totals are computed in SQL (SUM/COUNT over is_paid, received_at - see
+idx_payments_paid_received), never by loading payments into Python. Days
+that are over are closed into payment_ledger_days, one row per cashier
+(received_by_admin_id), so reports over months of history read a few
+hundred ledger rows instead of every payment. Only open days (normally
+just today) are summed live.
+
+A day is closed by close_days(), which the Payment Management page calls on
+load; it only does work for days that ended since the last call. A day can
+be re-closed with close_day() if payments were entered for it afterwards
+(e.g. pulled in by an offline replica). Both run in ledger_transaction():
+its first statement locks the single payment_ledger_lock row, so
+two stations opening the page after midnight close each day once - the
+second one waits, then finds the days already closed.
+
+Also here: the paged, date-windowed query behind the payments table.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import select, update, func, delete, and_
+from sqlalchemy.exc import IntegrityError
+from .db import engine
+from .models import CertificatePayment, CertificateRequest, PaymentLedgerDay, Account, PaymentLedgerLock
+from .config import PAYMENT_PAGE_SIZE, certificate_price
+
+Totals = namedtuple("Totals", "count total")
+ACCEPTED_STATUSES = ('Processing', 'Ready for Pickup', 'Completed')
+LEDGER_LOCK_ID = 1
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+
+def as_date(value) -> date:
+    # func.date() is a DATE on MySQL and a 'YYYY-MM-DD' string on SQLite
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def received_between(start: date, end: date):
+    """WHERE clause for payments received on the days start..end (inclusive), on the index"""
+    return and_(CertificatePayment.is_paid == True,
+                CertificatePayment.received_at >= day_start(start),
+                CertificatePayment.received_at < day_start(end + timedelta(days=1)))
+
+
+def closed_days(conn, start: date, end: date) -> set:
+    return set(conn.execute(
+        select(PaymentLedgerDay.ledger_date).distinct()
+        .where(PaymentLedgerDay.ledger_date >= start, PaymentLedgerDay.ledger_date <= end)
+    ).scalars())
+
+
+def open_span(conn, start: date, end: date):
+    """(closed days, first open day, last open day) of start..end; the span is None when all are closed"""
+    closed = closed_days(conn, start, end)
+    open_days = [start + timedelta(days=i) for i in range((end - start).days + 1)
+                 if start + timedelta(days=i) not in closed]
+    if not open_days:
+        return closed, None, None
+    return closed, open_days[0], open_days[-1]
+
+
+def daily_totals(date_from: date, date_to: date, bind=None) -> dict:
+    """{day: Totals(count, total)} for every day of date_from..date_to (days without payments are zero)"""
+    result = {date_from + timedelta(days=i): Totals(0, Decimal("0.00"))
+              for i in range((date_to - date_from).days + 1)}
+    with (bind or engine).connect() as conn:
+        closed, first_open, last_open = open_span(conn, date_from, date_to)
+        rows = conn.execute(
+            select(PaymentLedgerDay.ledger_date, func.sum(PaymentLedgerDay.payment_count),
+                   func.sum(PaymentLedgerDay.total_amount))
+            .where(PaymentLedgerDay.ledger_date >= date_from, PaymentLedgerDay.ledger_date <= date_to)
+            .group_by(PaymentLedgerDay.ledger_date)
+        ).all()
+        if first_open is not None:
+            day = func.date(CertificatePayment.received_at)
+            rows += [row for row in conn.execute(
+                select(day, func.count(), func.sum(CertificatePayment.total_amount))
+                .where(received_between(first_open, last_open))
+                .group_by(day)
+            ).all() if as_date(row[0]) not in closed]
+    for day, count, total in rows:
+        result[as_date(day)] = Totals(int(count or 0), total or Decimal("0.00"))
+    return result
+
+
+def monthly_totals(year: int, bind=None) -> dict:
+    """{month number: Totals(count, total)} of one year"""
+    result = {month: Totals(0, Decimal("0.00")) for month in range(1, 13)}
+    for day, totals in daily_totals(date(year, 1, 1), date(year, 12, 31), bind).items():
+        count, total = result[day.month]
+        result[day.month] = Totals(count + totals.count, total + totals.total)
+    return result
+
+
+def cashier_totals(date_from: date, date_to: date, bind=None) -> list:
+    """
+    Payments received per cashier over date_from..date_to, largest total first:
+    [{"admin_id", "username", "count", "total"}, ...] (admin_id None: no cashier recorded)
+    """
+    totals = {}
+
+    def add(admin_id, count, total):
+        previous = totals.get(admin_id, Totals(0, Decimal("0.00")))
+        totals[admin_id] = Totals(previous.count + int(count or 0), previous.total + (total or Decimal("0.00")))
+
+    with (bind or engine).connect() as conn:
+        closed, first_open, last_open = open_span(conn, date_from, date_to)
+        for row in conn.execute(
+            select(PaymentLedgerDay.received_by_admin_id, func.sum(PaymentLedgerDay.payment_count),
+                   func.sum(PaymentLedgerDay.total_amount))
+            .where(PaymentLedgerDay.ledger_date >= date_from, PaymentLedgerDay.ledger_date <= date_to,
+                   PaymentLedgerDay.payment_count > 0)
+            .group_by(PaymentLedgerDay.received_by_admin_id)
+        ):
+            add(*row)
+        if first_open is not None:
+            day = func.date(CertificatePayment.received_at)
+            for admin_id, received_on, count, total in conn.execute(
+                select(CertificatePayment.received_by_admin_id, day, func.count(),
+                       func.sum(CertificatePayment.total_amount))
+                .where(received_between(first_open, last_open))
+                .group_by(CertificatePayment.received_by_admin_id, day)
+            ):
+                if as_date(received_on) not in closed:
+                    add(admin_id, count, total)
+        ids = [admin_id for admin_id in totals if admin_id is not None]
+        names = dict(conn.execute(
+            select(Account.account_id, Account.username).where(Account.account_id.in_(ids))
+        ).all()) if ids else {}
+    rows = [{"admin_id": admin_id, "username": names.get(admin_id), "count": t.count, "total": t.total}
+            for admin_id, t in totals.items()]
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+
+def day_rows(conn, start: date, end: date, closed_at: datetime) -> list:
+    """Ledger rows (per day and cashier) for start..end; a day without payments gets one zero row"""
+    day = func.date(CertificatePayment.received_at)
+    rows = []
+    seen = set()
+    for received_on, admin_id, count, total in conn.execute(
+        select(day, CertificatePayment.received_by_admin_id, func.count(), func.sum(CertificatePayment.total_amount))
+        .where(received_between(start, end))
+        .group_by(day, CertificatePayment.received_by_admin_id)
+    ):
+        received_on = as_date(received_on)
+        seen.add(received_on)
+        rows.append({"ledger_date": received_on, "received_by_admin_id": admin_id, "payment_count": count,
+                     "total_amount": total or Decimal("0.00"), "closed_at": closed_at})
+    for i in range((end - start).days + 1):
+        if start + timedelta(days=i) not in seen:
+            rows.append({"ledger_date": start + timedelta(days=i), "received_by_admin_id": None,
+                         "payment_count": 0, "total_amount": Decimal("0.00"), "closed_at": closed_at})
+    return rows
+
+
+@contextmanager
+def ledger_transaction(bind=None):
+    """A transaction holding the ledger lock: one station at a time writes payment_ledger_days"""
+    bind = bind or engine
+    for _ in range(2):
+        with bind.begin() as conn:
+            # The UPDATE comes first: it takes the row (or SQLite's write) lock before anything is read
+            if conn.execute(update(PaymentLedgerLock).where(PaymentLedgerLock.lock_id == LEDGER_LOCK_ID)
+                            .values(close_count=PaymentLedgerLock.close_count + 1,
+                                    locked_at=datetime.now())).rowcount:
+                yield conn
+                return
+        try:
+            with bind.begin() as conn:
+                conn.execute(PaymentLedgerLock.__table__.insert().values(lock_id=LEDGER_LOCK_ID, close_count=0))
+        except IntegrityError:
+            pass                # another station created it first
+    raise RuntimeError("Could not lock the payments ledger")
+
+
+def close_day(day: date, bind=None, now: datetime = None) -> int:
+    """(Re)write the ledger rows of one finished day; returns the number of payments it holds"""
+    now = now or datetime.now()
+    if day >= now.date():
+        raise ValueError(f"{day} is not over yet")
+    with ledger_transaction(bind) as conn:
+        conn.execute(delete(PaymentLedgerDay).where(PaymentLedgerDay.ledger_date == day))
+        rows = day_rows(conn, day, day, now)
+        conn.execute(PaymentLedgerDay.__table__.insert(), rows)
+    return sum(row["payment_count"] for row in rows)
+
+
+def close_days(bind=None, now: datetime = None) -> int:
+    """
+    Close every finished day after the last closed one (or since the first payment),
+    in one grouped query. Returns the number of days closed.
+    """
+    now = now or datetime.now()
+    until = now.date() - timedelta(days=1)
+    with ledger_transaction(bind) as conn:
+        last_closed = conn.execute(select(func.max(PaymentLedgerDay.ledger_date))).scalar()
+        if last_closed is not None:
+            start = as_date(last_closed) + timedelta(days=1)
+        else:
+            first = conn.execute(select(func.min(CertificatePayment.received_at))
+                                 .where(CertificatePayment.is_paid == True)).scalar()
+            if first is None:
+                return 0
+            start = as_date(first)
+        if start > until:
+            return 0
+        conn.execute(PaymentLedgerDay.__table__.insert(), day_rows(conn, start, until, now))
+    return (until - start).days + 1
+
+
+def summary(bind=None, now: datetime = None) -> dict:
+    """Stat cards of the payments page: {"pending", "paid_today", "collected_today"}"""
+    today = (now or datetime.now()).date()
+    with (bind or engine).connect() as conn:
+        pending = conn.execute(select(func.count()).select_from(CertificatePayment)
+                               .where(CertificatePayment.is_paid == False)).scalar()
+        count, total = conn.execute(select(func.count(), func.sum(CertificatePayment.total_amount))
+                                    .where(received_between(today, today))).one()
+    return {"pending": pending, "paid_today": count, "collected_today": total or Decimal("0.00")}
+
+
+def ensure_payment_records(db) -> int:
+    """Create the missing payment record of every accepted request (one query to find them)"""
+    missing = db.query(CertificateRequest).outerjoin(
+        CertificatePayment, CertificatePayment.request_id == CertificateRequest.request_id
+    ).filter(
+        CertificateRequest.status.in_(ACCEPTED_STATUSES),
+        CertificatePayment.payment_id.is_(None)
+    ).all()
+    for req in missing:
+        cert_type = req.certificate_type or ''
+        unit_price = certificate_price(cert_type)
+        quantity = req.quantity or 1
+        # Completed requests were paid at pickup
+        is_paid = (req.status == 'Completed')
+        db.add(CertificatePayment(
+            request_id=req.request_id,
+            resident_id=req.resident_id,
+            certificate_type=cert_type,
+            requestor_name=f"{req.first_name or ''} {req.last_name or ''}".strip(),
+            quantity=quantity,
+            unit_price=unit_price,
+            total_amount=unit_price * quantity,
+            is_paid=is_paid,
+            payment_method='Cash',
+            created_at=req.created_at or datetime.now(),
+            received_at=req.updated_at if is_paid else None
+        ))
+        print(f"💰 Created missing payment record for request #{req.request_id} ({cert_type})")
+    if missing:
+        db.commit()
+    return len(missing)
+
+
+def payment_page(db, date_from: date, date_to: date, page: int = 0, page_size: int = PAYMENT_PAGE_SIZE):
+    """
+    One page of the payments table: payments created on date_from..date_to, unpaid first, newest first.
+    Returns ([(CertificateRequest, CertificatePayment), ...], total rows in the window).
+    """
+    window = and_(CertificatePayment.created_at >= day_start(date_from),
+                  CertificatePayment.created_at < day_start(date_to + timedelta(days=1)))
+    total = db.query(func.count(CertificatePayment.payment_id)).filter(window).scalar()
+    rows = db.query(CertificateRequest, CertificatePayment).join(
+        CertificatePayment, CertificatePayment.request_id == CertificateRequest.request_id
+    ).filter(window).order_by(
+        CertificatePayment.is_paid.asc(),
+        CertificatePayment.created_at.desc(),
+        CertificatePayment.payment_id.desc()
+    ).offset(page * page_size).limit(page_size).all()
+    return rows, total
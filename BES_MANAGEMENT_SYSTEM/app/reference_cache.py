@@ -0,0 +1,197 @@
+# app/reference_cache.py
+"""
+Read-through cache for reference data (services, officials, announcements).
+
+These tables change a few times a month but were queried on every page
+visit. Query results are cached per key as tuples of immutable snapshots
+(named tuples with the row's column values), so callers can keep them after
+the session is closed and cannot change them by accident.
+
+Each cached table has a version counter:
+
+* Local: every Session flush that inserts, updates or deletes a Service,
+  BarangayOfficial or Announcement row marks the table; the counter is
+  bumped when that transaction commits (rolled back changes bump nothing).
+* Shared: the same flush also increments the table's row in cache_versions
+  (db/create_cache_versions.sql) inside the writer's transaction. Other
+  stations read those few rows at most every CACHE_VERSION_CHECK_SECONDS
+  instead of reloading the data itself.
+
+A cache entry is reused while the versions it was loaded at still match.
+"""
+import time
+import threading
+from collections import namedtuple
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import Session
+from .db import SessionLocal
+from .models import Service, BarangayOfficial, Announcement, CacheVersion
+from .config import CACHE_VERSION_CHECK_SECONDS, CACHE_SHARED_VERSIONS
+
+CACHED_MODELS = (Service, BarangayOfficial, Announcement)
+CACHED_TABLES = {model.__tablename__ for model in CACHED_MODELS}
+PENDING_KEY = "reference_cache_dirty"
+
+_lock = threading.Lock()
+_entries = {}                       # key -> (versions, rows)
+_local_versions = {table: 0 for table in CACHED_TABLES}
+_shared_versions = {}               # table -> last version read from cache_versions
+_shared_checked_at = 0.0
+_shared_available = {}              # engine url -> bool (cache_versions table exists)
+_snapshot_types = {}
+
+
+def snapshot(obj):
+    """Immutable copy of an ORM row's column values (a named tuple)"""
+    mapper = inspect(obj).mapper
+    snapshot_type = _snapshot_types.get(mapper.class_)
+    if snapshot_type is None:
+        names = [attr.key for attr in mapper.column_attrs]
+        snapshot_type = namedtuple(f"{mapper.class_.__name__}Snapshot", names)
+        _snapshot_types[mapper.class_] = snapshot_type
+    return snapshot_type(*(getattr(obj, name) for name in snapshot_type._fields))
+
+
+def shared_versions_available(connection) -> bool:
+    """True if the cache_versions table exists (checked once per database)"""
+    if not CACHE_SHARED_VERSIONS:
+        return False
+    key = str(connection.engine.url)
+    if key not in _shared_available:
+        try:
+            # Inspect on the caller's connection: a second connection could block or roll back its transaction
+            _shared_available[key] = inspect(connection).has_table(CacheVersion.__tablename__)
+        except Exception as e:
+            print(f"⚠️ Could not check for {CacheVersion.__tablename__}: {e}")
+            _shared_available[key] = False
+        if not _shared_available[key]:
+            print(f"ℹ️ {CacheVersion.__tablename__} table missing - reference cache only sees this station's changes")
+    return _shared_available[key]
+
+
+def read_shared_versions(db, force=False) -> dict:
+    """Versions from cache_versions, re-read at most every CACHE_VERSION_CHECK_SECONDS"""
+    global _shared_checked_at
+    now = time.monotonic()
+    if not force and now - _shared_checked_at < CACHE_VERSION_CHECK_SECONDS:
+        return dict(_shared_versions)
+    if shared_versions_available(db.connection()):
+        rows = db.execute(select(CacheVersion.table_name, CacheVersion.version)
+                          .where(CacheVersion.table_name.in_(CACHED_TABLES))).all()
+        with _lock:
+            _shared_versions.update(rows)
+    _shared_checked_at = now
+    return dict(_shared_versions)
+
+
+def current_versions(db, tables) -> tuple:
+    shared = read_shared_versions(db)
+    return tuple((_local_versions[table], shared.get(table)) for table in tables)
+
+
+def cached_query(key, tables, loader):
+    """
+    Return the cached snapshots for key, running loader(db) -> list of ORM rows
+    when any of the tables changed since the entry was stored.
+    """
+    db = SessionLocal()
+    try:
+        versions = current_versions(db, tables)
+        with _lock:
+            entry = _entries.get(key)
+        if entry and entry[0] == versions:
+            return entry[1]
+        # Versions are read before loading: a concurrent change only causes one extra reload
+        rows = tuple(snapshot(obj) for obj in loader(db))
+        with _lock:
+            _entries[key] = (versions, rows)
+        return rows
+    finally:
+        db.close()
+
+
+def invalidate(*tables):
+    """Drop cached results for the given tables (all tables if none given)"""
+    with _lock:
+        for table in tables or CACHED_TABLES:
+            _local_versions[table] += 1
+
+
+def clear():
+    global _shared_checked_at
+    with _lock:
+        _entries.clear()
+        _shared_versions.clear()
+        _shared_available.clear()
+    _shared_checked_at = 0.0
+
+
+# --- Version bookkeeping (SQLAlchemy session events) ---
+
+def changed_tables(session) -> set:
+    tables = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in CACHED_TABLES and (obj not in session.dirty or session.is_modified(obj)):
+            tables.add(table)
+    return tables
+
+
+def mark_changed(session, tables):
+    if not tables:
+        return
+    session.info.setdefault(PENDING_KEY, set()).update(tables)
+    connection = session.connection()
+    if shared_versions_available(connection):
+        # Part of the writer's transaction, so other stations only see committed changes
+        connection.execute(
+            update(CacheVersion)
+            .where(CacheVersion.table_name.in_(tables))
+            .values(version=CacheVersion.version + 1)
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    mark_changed(session, changed_tables(session))
+
+
+@event.listens_for(Session, "after_bulk_update")
+@event.listens_for(Session, "after_bulk_delete")
+def _after_bulk(context):
+    table = getattr(context.mapper.class_, "__tablename__", None)
+    if table in CACHED_TABLES:
+        mark_changed(context.session, {table})
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    global _shared_checked_at
+    tables = session.info.pop(PENDING_KEY, None)
+    if tables:
+        invalidate(*tables)
+        _shared_checked_at = 0.0   # pick up our own shared bump on the next read
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+# --- Cached queries ---
+
+def all_services():
+    return cached_query("services:all", ("services",),
+                        lambda db: db.query(Service).order_by(Service.service_id).all())
+
+
+def active_officials():
+    return cached_query("officials:active", ("barangay_officials",),
+                        lambda db: db.query(BarangayOfficial).filter(BarangayOfficial.is_active == True)
+                        .order_by(BarangayOfficial.display_order).all())
+
+
+def visible_announcements():
+    return cached_query("announcements:visible", ("announcements",),
+                        lambda db: db.query(Announcement).filter(Announcement.visible == True)
+                        .order_by(Announcement.posted_at.desc()).all())
@@ -0,0 +1,65 @@
+# app/request_events.py
+"""
+Status history for certificate requests.
+
+Every flush that creates a CertificateRequest or changes its status adds a
+CertificateRequestEvent (from_status, to_status, actor, note, timestamp) in
+the same transaction, so the history cannot disagree with the request.
+Callers that know who made the change and why use set_request_status();
+changes made any other way are still recorded, with actor 'system'.
+
+The listener is registered when app.models is imported.
+"""
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from .models import CertificateRequest, CertificateRequestEvent
+from .config import get_philippine_time
+
+DEFAULT_STATUS = 'Pending'
+SYSTEM_ACTOR = 'system'
+PENDING_ACTOR = '_status_actor'
+PENDING_NOTE = '_status_note'
+
+
+def set_request_status(request: CertificateRequest, status: str, actor: str = None, note: str = None):
+    """Change a request's status; the event is written on the next flush"""
+    request.status = status
+    request.updated_at = get_philippine_time()
+    # Plain instance attributes (not columns) read back by the flush listener
+    setattr(request, PENDING_ACTOR, actor)
+    setattr(request, PENDING_NOTE, note)
+
+
+def status_change(session, request):
+    """(from_status, to_status) if this flush creates the request or changes its status, else None"""
+    if request in session.new:
+        return None, request.status or DEFAULT_STATUS
+    history = inspect(request).attrs.status.history
+    if not history.added:
+        return None
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0]
+    return None if old == new else (old, new)
+
+
+@event.listens_for(CertificateRequest.status, "set", active_history=True)
+def _load_old_status(target, value, oldvalue, initiator):
+    """active_history loads the old status before it is replaced (after a commit it is expired)"""
+
+
+@event.listens_for(Session, "before_flush")
+def _record_status_events(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, CertificateRequest):
+            continue
+        change = status_change(session, obj)
+        if change is None:
+            continue
+        session.add(CertificateRequestEvent(
+            request=obj,
+            from_status=change[0],
+            to_status=change[1],
+            actor=obj.__dict__.pop(PENDING_ACTOR, None) or SYSTEM_ACTOR,
+            note=obj.__dict__.pop(PENDING_NOTE, None),
+            created_at=get_philippine_time()
+        ))
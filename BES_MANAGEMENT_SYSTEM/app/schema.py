@@ -0,0 +1,40 @@
+# app/schema.py
+"""
+Schema bootstrap from the models (Base.metadata).
+
+MySQL installs are set up with the scripts in db/. The embedded SQLite
+database has no such step, so create_schema() runs on every start: it creates
+missing tables and indexes (existing ones are left alone), adds columns the
+models gained since the file was created, seeds the cache_versions counters
+and builds the blotter full-text index.
+"""
+from sqlalchemy import select, inspect
+from .db import engine, Base
+from .models import CacheVersion
+from .reference_cache import CACHED_TABLES
+from .controllers.blotter_controller import BlotterController
+
+
+def add_missing_columns(bind):
+    """SQLite only: ALTER TABLE ... ADD COLUMN for model columns an existing file lacks (MySQL: db/*.sql)"""
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=conn.dialect)
+                    conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+
+
+def create_schema(bind=engine):
+    Base.metadata.create_all(bind)
+    add_missing_columns(bind)
+    with bind.begin() as conn:
+        existing = set(conn.execute(select(CacheVersion.table_name)).scalars())
+        missing = sorted(CACHED_TABLES - existing)
+        if missing:
+            conn.execute(CacheVersion.__table__.insert(), [{"table_name": t, "version": 0} for t in missing])
+    BlotterController.ensure_search_index(bind)
@@ -0,0 +1,188 @@
+# app/sql_profiler.py
+"""
+SQL statement profiler and N+1 detector (developer tool).
+
+Enabled with SQL_PROFILE_ENABLED (BES_SQL_PROFILE=1): app.db installs cursor
+hooks on the engine, run_app wraps every public controller method in a scope
+and the sidebar windows wrap every show_*_page navigation in one
+(gui/widgets/sql_profile_panel.py).
+
+A scope is entered with `with profile("name"):` or the @profiled decorator.
+Every statement executed inside it counts towards that scope and every scope
+around it (a context variable, so each thread has its own stack). For each
+scope the profiler keeps the number of statements, total and slowest time,
+and the statements grouped by shape - the SQL with literals and parameter
+lists collapsed. A shape repeated SQL_PROFILE_N_PLUS_ONE times or more in one
+scope is reported as a likely N+1 (a query per row of an earlier result).
+
+When an outermost scope ends its report is printed and kept in `recent`.
+Statements run outside any scope (background threads, startup) are tallied
+in `unscoped`.
+"""
+import re
+import time
+import threading
+import functools
+import importlib
+import pkgutil
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from .config import SQL_PROFILE_ENABLED, SQL_PROFILE_N_PLUS_ONE, SQL_PROFILE_SLOW_MS, SQL_PROFILE_HISTORY
+
+ENABLED = SQL_PROFILE_ENABLED
+START_TIMES = "sql_profiler_start"       # key in Connection.info
+
+_scopes = ContextVar("sql_profiler_scopes", default=())
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_COLUMNS = re.compile(r"^SELECT (?:DISTINCT )?.+? FROM ")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with literals and placeholders as ? and IN lists as (?...)"""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def short_shape(shape: str, width: int = 110) -> str:
+    """The shape without its SELECT column list (the FROM/WHERE part tells statements apart)"""
+    return _COLUMNS.sub("SELECT ... FROM ", shape)[:width]
+
+
+class Report:
+    """Statements executed in one scope"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.wall_ms = 0.0
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+        self.shapes = {}                # shape -> [count, total ms]
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, elapsed_ms: float):
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if elapsed_ms > self.slowest_ms:
+                self.slowest_ms, self.slowest_sql = elapsed_ms, shape
+            entry = self.shapes.setdefault(shape, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+
+    def n_plus_one(self, threshold: int = SQL_PROFILE_N_PLUS_ONE):
+        """[(shape, count, total ms)] of shapes repeated at least threshold times, most frequent first"""
+        repeated = [(shape, n, ms) for shape, (n, ms) in self.shapes.items() if n >= threshold]
+        return sorted(repeated, key=lambda item: -item[1])
+
+    def summary(self, shape_width: int = 110) -> str:
+        lines = [f"[SQL] {self.name}: {self.count} statements, {self.total_ms:.1f} ms in SQL"
+                 f" ({self.wall_ms:.0f} ms total), {len(self.shapes)} distinct"]
+        if self.slowest_sql is not None:
+            flag = "  ⚠️ slow" if self.slowest_ms >= SQL_PROFILE_SLOW_MS else ""
+            lines.append(f"      slowest {self.slowest_ms:.1f} ms: {short_shape(self.slowest_sql, shape_width)}{flag}")
+        for shape, n, ms in self.n_plus_one():
+            lines.append(f"      ⚠️ N+1? {n}x ({ms:.1f} ms): {short_shape(shape, shape_width)}")
+        return "\n".join(lines)
+
+
+recent = deque(maxlen=SQL_PROFILE_HISTORY)
+unscoped = Report("(no scope)")
+
+
+@contextmanager
+def profile(name: str, log=print):
+    """Attribute the statements executed inside the block to `name`"""
+    report = Report(name)
+    outer = _scopes.get()
+    token = _scopes.set(outer + (report,))
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.wall_ms = (time.perf_counter() - start) * 1000
+        _scopes.reset(token)
+        if not outer:
+            recent.append(report)
+            if log:
+                log(report.summary())
+
+
+def profiled(name: str = None):
+    """Decorator: run the function inside profile(name or its qualified name)"""
+    def decorate(func):
+        return scoped(profile, name or func.__qualname__, func)
+    return decorate
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(START_TIMES, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[START_TIMES].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    scopes = _scopes.get()
+    for report in scopes or (unscoped,):
+        report.add(statement, elapsed_ms)
+
+
+def install(engine):
+    """Register the cursor hooks on an engine (once)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def uninstall(engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def wrap_controllers(scope, package: str = "app.controllers"):
+    """
+    Run the public static methods of every *Controller class inside scope("Class.method")
+    (a context manager factory). Returns the number of methods wrapped.
+    """
+    wrapped = 0
+    for module_info in pkgutil.iter_modules(importlib.import_module(package).__path__):
+        module = importlib.import_module(f"{package}.{module_info.name}")
+        for cls in vars(module).values():
+            if not (isinstance(cls, type) and cls.__name__.endswith("Controller") and cls.__module__ == module.__name__):
+                continue
+            for attr, value in list(vars(cls).items()):
+                if attr.startswith("_") or not isinstance(value, staticmethod):
+                    continue
+                func = value.__func__
+                if scope in getattr(func, "__profile_scopes__", ()):
+                    continue
+                setattr(cls, attr, staticmethod(scoped(scope, f"{cls.__name__}.{attr}", func)))
+                wrapped += 1
+    return wrapped
+
+
+def scoped(scope, label, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with scope(label):
+            return func(*args, **kwargs)
+    wrapper.__profile_scopes__ = getattr(func, "__profile_scopes__", ()) + (scope,)
+    return wrapper
+
+
+def instrument_controllers(package: str = "app.controllers"):
+    """Attribute the statements of every controller call to Class.method"""
+    return wrap_controllers(profile, package)
@@ -0,0 +1,573 @@
+# app/sync.py
+"""
+Offline-first local replica of the central MySQL database.
+
+With SYNC_ENABLED the app's engine points at a local SQLite file, so every
+screen reads and writes locally and never waits on the LAN. This module keeps
+that file in step with SYNC_REMOTE_URI:
+
+* Journal: SQLite triggers on every table in SYNC_TABLES append
+  (table, row id, insert/update/delete) to sync_journal for each local write,
+  including Core UPDATEs and raw SQL. Rows written by the sync itself are not
+  journaled (the triggers check the 'applying' flag in sync_flags).
+* Push: pending entries are coalesced per row and sent in batches, one remote
+  transaction per batch, parents before children. Rows created offline are
+  inserted upstream without their id; the id the server assigns replaces the
+  local one (and every local reference to it). Updates of rows that also
+  exist upstream go through the table's conflict rule (SYNC_TABLES, resolve()).
+* Pull: after a complete push, remote changes are fetched page by page from a
+  watermark per table: (updated_at, id) for mutable tables, the id for
+  append-only ones, or the whole table for small reference tables (which also
+  picks up remote deletes). Local rows with unpushed changes are left alone;
+  an unpushed local insert that took the id of a remote row is moved to a
+  negative id first, so the remote row is still applied.
+
+Known limits: ids of requests created offline change once they are pushed,
+and rows deleted upstream are only noticed in the fully refreshed tables.
+Upload rows are synced, the files they point to stay in the uploads/ folder
+of the station that received them.
+"""
+import threading
+from collections import namedtuple
+from datetime import timedelta
+from sqlalchemy import (MetaData, Table, Column, Integer, String, DateTime, Text, create_engine, select,
+                        insert, update, delete, func, text, tuple_)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError, DBAPIError
+from .db import engine, Base, create_app_engine
+from .models import Notification, Resident, DocumentUpload, Request, Payment
+from . import reference_cache
+from .config import (SYNC_REMOTE_URI, SYNC_INTERVAL_SECONDS, SYNC_BATCH_SIZE, SYNC_CONNECT_TIMEOUT,
+                     SYNC_PULL_OVERLAP_SECONDS)
+
+TableSpec = namedtuple("TableSpec", "watermark rule")
+
+# watermark: 'updated_at' (keyset on updated_at, id), 'id' (append-only), None (full refresh)
+SYNC_TABLES = {
+    "residents": TableSpec("updated_at", "newest_wins"),
+    "accounts": TableSpec("updated_at", "newest_wins"),
+    "document_uploads": TableSpec("updated_at", "newest_wins"),
+    "services": TableSpec(None, "local_wins"),
+    # Legacy service requests (app/controllers/request_controller.py)
+    "requests": TableSpec("updated_at", "newest_wins"),
+    "payments": TableSpec("updated_at", "newest_wins"),
+    "barangay_officials": TableSpec("updated_at", "newest_wins"),
+    "announcements": TableSpec(None, "local_wins"),
+    "blotters": TableSpec("id", "local_wins"),
+    "certificate_requests": TableSpec("updated_at", "status_forward"),
+    "certificate_request_events": TableSpec("id", "append_only"),
+    "certificate_payments": TableSpec("updated_at", "paid_wins"),
+    "notifications": TableSpec("id", "local_wins"),
+    "staff_audit_logs": TableSpec("id", "append_only"),
+}
+
+# Later stages win over earlier ones whichever station wrote them last
+REQUEST_STAGE_RANK = {
+    "Pending": 0, "Under Review": 1, "Processing": 2, "Ready for Pickup": 3,
+    "Completed": 4, "Declined": 4, "Cancelled": 4,
+}
+
+# References the models do not declare as foreign keys, remapped together with the parent id
+LOGICAL_REFERENCES = [
+    (Notification.__table__.c.resident_id, Resident.__tablename__),
+    (DocumentUpload.__table__.c.request_id, Request.__tablename__),
+    (Request.__table__.c.payment_proof_upload_id, DocumentUpload.__tablename__),
+    (Payment.__table__.c.proof_upload_id, DocumentUpload.__tablename__),
+]
+
+sync_metadata = MetaData()
+sync_journal = Table(
+    "sync_journal", sync_metadata,
+    Column("journal_id", Integer, primary_key=True),
+    Column("table_name", String(64), nullable=False),
+    Column("row_id", Integer, nullable=False),
+    Column("operation", String(10), nullable=False),                   # insert, update, delete
+    Column("status", String(10), nullable=False, server_default="Pending"),   # Pending, Conflict
+    Column("error", Text),
+    Column("changed_at", DateTime, server_default=func.current_timestamp()),
+)
+sync_watermarks = Table(
+    "sync_watermarks", sync_metadata,
+    Column("table_name", String(64), primary_key=True),
+    Column("updated_at", DateTime),
+    Column("row_id", Integer),
+    Column("synced_at", DateTime),
+)
+sync_flags = Table(
+    "sync_flags", sync_metadata,
+    Column("name", String(32), primary_key=True),
+    Column("value", Integer, nullable=False),
+)
+
+TRIGGER_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS sync_{table}_{suffix} AFTER {event} ON {table} "
+    "WHEN (SELECT value FROM sync_flags WHERE name = 'applying') = 0 BEGIN "
+    "INSERT INTO sync_journal (table_name, row_id, operation) VALUES ('{table}', {row}.{pk}, '{operation}'); END"
+)
+TRIGGER_EVENTS = [("ai", "INSERT", "new", "insert"), ("au", "UPDATE", "new", "update"), ("ad", "DELETE", "old", "delete")]
+
+
+def synced_tables():
+    """Tables in SYNC_TABLES, parents before children"""
+    return [table for table in Base.metadata.sorted_tables if table.name in SYNC_TABLES]
+
+
+def pk_column(table):
+    return list(table.primary_key.columns)[0]
+
+
+def build_references():
+    """parent table name -> columns holding its id (declared foreign keys plus LOGICAL_REFERENCES)"""
+    references = {}
+    for table in Base.metadata.tables.values():
+        for fk in table.foreign_keys:
+            references.setdefault(fk.column.table.name, []).append(fk.parent)
+    for column, parent in LOGICAL_REFERENCES:
+        references.setdefault(parent, []).append(column)
+    return references
+
+
+REFERENCES = build_references()
+# child table name -> [(column name, parent table name)]
+PARENTS = {}
+for parent_name, columns in REFERENCES.items():
+    for column in columns:
+        PARENTS.setdefault(column.table.name, []).append((column.name, parent_name))
+
+
+def keep_onupdate(table) -> dict:
+    """Values that stop Column.onupdate (updated_at) from firing on bookkeeping UPDATEs"""
+    return {c.name: c for c in table.columns if c.onupdate is not None}
+
+
+def ensure_replica(local_engine=engine):
+    """Create the journal tables and triggers in the local replica (after create_schema)"""
+    sync_metadata.create_all(local_engine)
+    with local_engine.begin() as conn:
+        if conn.execute(select(sync_flags.c.value).where(sync_flags.c.name == "applying")).first() is None:
+            conn.execute(insert(sync_flags).values(name="applying", value=0))
+        for table in synced_tables():
+            pk = pk_column(table).name
+            for suffix, event_name, row, operation in TRIGGER_EVENTS:
+                conn.execute(text(TRIGGER_DDL.format(table=table.name, suffix=suffix, event=event_name,
+                                                     row=row, pk=pk, operation=operation)))
+
+
+def set_applying(conn, value: bool):
+    """Turn journaling off for the rest of this transaction (other connections keep seeing 0)"""
+    conn.execute(update(sync_flags).where(sync_flags.c.name == "applying").values(value=int(value)))
+
+
+def remap_row(conn, table, old_id, new_id):
+    """Change a local row's id and every local reference to it (inside a set_applying transaction)"""
+    if old_id == new_id:
+        return
+    pk = pk_column(table)
+    conn.execute(update(table).where(pk == old_id).values({pk.name: new_id, **keep_onupdate(table)}))
+    for column in REFERENCES.get(table.name, ()):
+        child = column.table
+        stale = []
+        if child.name in SYNC_TABLES:
+            # Rows already upstream that point at the old id (a reference cycle, e.g. an upload and
+            # its request) are journaled again, so the new id is pushed too
+            child_pk = pk_column(child)
+            pending = select(sync_journal.c.row_id).where(sync_journal.c.table_name == child.name,
+                                                          sync_journal.c.status == "Pending")
+            stale = conn.execute(select(child_pk).where(column == old_id, child_pk > 0,
+                                                        child_pk.notin_(pending))).scalars().all()
+        conn.execute(update(child).where(column == old_id)
+                     .values({column.name: new_id, **keep_onupdate(child)}))
+        if stale:
+            conn.execute(insert(sync_journal), [{"table_name": child.name, "row_id": row_id, "operation": "update"}
+                                                for row_id in stale])
+    conn.execute(update(sync_journal).where(sync_journal.c.table_name == table.name,
+                                            sync_journal.c.row_id == old_id).values(row_id=new_id))
+
+
+def detach_rows(conn, table, row_ids):
+    """Move local rows to unused negative ids (inside a set_applying transaction)"""
+    conn.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+    lowest = min(conn.execute(select(func.min(pk_column(table)))).scalar() or 0, 0)
+    for row_id in row_ids:
+        lowest -= 1
+        remap_row(conn, table, row_id, lowest)
+
+
+def newest(local, remote) -> bool:
+    """True if the local row is at least as new as the remote one"""
+    if local.get("updated_at") is None or remote.get("updated_at") is None:
+        return True
+    return local["updated_at"] >= remote["updated_at"]
+
+
+def resolve(rule: str, local: dict, remote: dict) -> bool:
+    """True if the local version of an existing row should overwrite the remote one"""
+    if rule == "append_only":
+        return False
+    if rule == "local_wins":
+        return True
+    if rule == "status_forward":
+        local_rank = REQUEST_STAGE_RANK.get(local.get("status"), 0)
+        remote_rank = REQUEST_STAGE_RANK.get(remote.get("status"), 0)
+        if local_rank != remote_rank:
+            return local_rank > remote_rank
+    if rule == "paid_wins" and bool(local.get("is_paid")) != bool(remote.get("is_paid")):
+        return bool(local.get("is_paid"))
+    return newest(local, remote)
+
+
+def remote_engine(uri: str = SYNC_REMOTE_URI):
+    if uri.startswith("sqlite"):
+        return create_app_engine(uri)
+    return create_engine(uri, pool_pre_ping=True, pool_recycle=3600,
+                         connect_args={"connect_timeout": SYNC_CONNECT_TIMEOUT})
+
+
+Change = namedtuple("Change", "table row_id operations journal_ids")
+
+
+class ReplicaSync:
+    """One local replica and its upstream database"""
+
+    def __init__(self, local_engine=engine, remote=None, batch_size=SYNC_BATCH_SIZE):
+        self.local = local_engine
+        self.remote = remote if remote is not None else remote_engine()
+        self.batch_size = batch_size
+        self.tables = {table.name: table for table in synced_tables()}
+
+    # --- Cycle ---
+
+    def sync_once(self) -> dict:
+        """
+        Push every pending local change, then pull remote changes.
+        Returns {"online", "pushed", "conflicts", "pulled"}; online is False when
+        the central server could not be reached (nothing is lost, the journal stays).
+        """
+        result = {"online": False, "pushed": 0, "conflicts": 0, "pulled": 0}
+        try:
+            with self.remote.connect() as conn:
+                conn.execute(select(1))
+        except DBAPIError as e:
+            print(f"📴 Central database unreachable, working offline: {e.orig}")
+            return result
+        result["online"] = True
+        self.detach_local_ids()
+        while True:
+            pushed, conflicts = self.push_batch()
+            result["pushed"] += pushed
+            result["conflicts"] += conflicts
+            if pushed + conflicts == 0:
+                break
+        if self.pending_count() == 0:
+            result["pulled"] = self.pull()
+        return result
+
+    def pending_count(self) -> int:
+        with self.local.connect() as conn:
+            return conn.execute(select(func.count()).select_from(sync_journal)
+                                .where(sync_journal.c.status == "Pending")).scalar()
+
+    # --- Push ---
+
+    def detach_local_ids(self):
+        """
+        Move rows created offline to negative ids before pushing them, so the id
+        the server assigns can never collide with another unpushed local row.
+        """
+        with self.local.begin() as conn:
+            inserted = conn.execute(
+                select(sync_journal.c.table_name, sync_journal.c.row_id).distinct().where(
+                    sync_journal.c.status == "Pending", sync_journal.c.operation == "insert",
+                    sync_journal.c.row_id > 0)
+            ).all()
+            if not inserted:
+                return
+            set_applying(conn, True)
+            by_table = {}
+            for table_name, row_id in inserted:
+                by_table.setdefault(table_name, []).append(row_id)
+            for table_name, row_ids in by_table.items():
+                detach_rows(conn, self.tables[table_name], row_ids)
+            set_applying(conn, False)
+
+    def pending_changes(self, conn):
+        """The next batch of journal entries, coalesced per row and ordered parents first"""
+        entries = conn.execute(
+            select(sync_journal).where(sync_journal.c.status == "Pending")
+            .order_by(sync_journal.c.journal_id).limit(self.batch_size)
+        ).all()
+        changes = {}
+        for entry in entries:
+            key = (entry.table_name, entry.row_id)
+            if key not in changes:
+                changes[key] = Change(self.tables[entry.table_name], entry.row_id, [], [])
+            changes[key].operations.append(entry.operation)
+            changes[key].journal_ids.append(entry.journal_id)
+        order = {name: index for index, name in enumerate(self.tables)}
+        return sorted(changes.values(), key=lambda c: (order[c.table.name], c.journal_ids[0]))
+
+    def push_batch(self):
+        """Send one batch upstream in a single remote transaction; returns (pushed, conflicts)"""
+        with self.local.connect() as conn:
+            changes = self.pending_changes(conn)
+            rows = {}
+            for change in changes:
+                pk = pk_column(change.table)
+                row = conn.execute(select(change.table).where(pk == change.row_id)).mappings().first()
+                rows[(change.table.name, change.row_id)] = dict(row) if row else None
+        if not changes:
+            return 0, 0
+
+        outcomes = []    # (change, new_id, remote_row, error)
+        new_ids = {}     # (table name, local id) -> server id, for children pushed in the same batch
+        with self.remote.begin() as rconn:
+            for change in changes:
+                local_row = rows[(change.table.name, change.row_id)]
+                if local_row is not None:
+                    for column, parent in PARENTS.get(change.table.name, ()):
+                        local_row[column] = new_ids.get((parent, local_row[column]), local_row[column])
+                savepoint = rconn.begin_nested()
+                try:
+                    outcome = self.push_change(rconn, change, local_row)
+                    savepoint.commit()
+                    if outcome[0] is not None:
+                        new_ids[(change.table.name, change.row_id)] = outcome[0]
+                    outcomes.append((change, *outcome, None))
+                except IntegrityError as e:
+                    savepoint.rollback()
+                    outcomes.append((change, None, None, str(e.orig)))
+                    print(f"⚠️ Sync conflict on {change.table.name} #{change.row_id}: {e.orig}")
+
+        with self.local.begin() as conn:
+            set_applying(conn, True)
+            conn.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+            for change, new_id, remote_row, error in outcomes:
+                if error:
+                    conn.execute(update(sync_journal).where(sync_journal.c.journal_id.in_(change.journal_ids))
+                                 .values(status="Conflict", error=error))
+                    continue
+                conn.execute(delete(sync_journal).where(sync_journal.c.journal_id.in_(change.journal_ids)))
+                if new_id is not None:
+                    remap_row(conn, change.table, change.row_id, new_id)
+                if remote_row is not None:
+                    # The remote version won: take it now instead of waiting for the pull
+                    self.upsert_local(conn, change.table, [remote_row])
+            set_applying(conn, False)
+        conflicts = sum(1 for outcome in outcomes if outcome[3])
+        return len(outcomes) - conflicts, conflicts
+
+    def push_change(self, rconn, change, local_row):
+        """
+        Apply one coalesced change upstream. Returns (new_id, remote_row):
+        new_id is the server id of a row created offline, remote_row the
+        remote version when it won the conflict rule.
+        """
+        table, operations = change.table, change.operations
+        pk = pk_column(table)
+        rule = SYNC_TABLES[table.name].rule
+        if "insert" in operations:
+            if local_row is None:
+                return None, None        # created and deleted while offline
+            values = {k: v for k, v in local_row.items() if k != pk.name}
+            new_id = rconn.execute(insert(table).values(values)).inserted_primary_key[0]
+            return new_id, None
+        if local_row is None:
+            if rule != "append_only":
+                rconn.execute(delete(table).where(pk == change.row_id))
+            return None, None
+        remote_row = rconn.execute(select(table).where(pk == change.row_id).with_for_update()).mappings().first()
+        if remote_row is None:
+            return None, None            # deleted upstream; the local copy stays until a full refresh
+        remote_row = dict(remote_row)
+        if not resolve(rule, local_row, remote_row):
+            return None, remote_row
+        rconn.execute(update(table).where(pk == change.row_id).values(
+            {k: v for k, v in local_row.items() if k != pk.name}))
+        return None, None
+
+    # --- Pull ---
+
+    def pull(self) -> int:
+        """Fetch remote changes for every synced table; returns the number of rows applied"""
+        total = 0
+        for table in self.tables.values():
+            changed = self.pull_table(table)
+            if changed and table.name in reference_cache.CACHED_TABLES:
+                reference_cache.invalidate(table.name)
+            total += changed
+        return total
+
+    def watermark(self, conn, table):
+        return conn.execute(select(sync_watermarks).where(sync_watermarks.c.table_name == table.name)).first()
+
+    def save_watermark(self, conn, table, updated_at=None, row_id=None):
+        values = {"table_name": table.name, "updated_at": updated_at, "row_id": row_id,
+                  "synced_at": func.current_timestamp()}
+        stmt = sqlite_insert(sync_watermarks).values(values)
+        conn.execute(stmt.on_conflict_do_update(index_elements=["table_name"], set_=values))
+
+    def pull_table(self, table) -> int:
+        spec = SYNC_TABLES[table.name]
+        pk = pk_column(table)
+        with self.local.connect() as conn:
+            mark = self.watermark(conn, table)
+        if spec.watermark is None:
+            return self.refresh_table(table)
+        if spec.watermark == "updated_at" and mark is not None and mark.updated_at is not None:
+            # Keyset from slightly before the watermark: rows written with a lagging station clock
+            position = (mark.updated_at - timedelta(seconds=SYNC_PULL_OVERLAP_SECONDS), None)
+            order = (table.c.updated_at, pk)
+        else:
+            # Append-only tables, and the first copy of a mutable table, go by id
+            position = (None, mark.row_id if mark is not None and mark.row_id is not None else None)
+            order = (pk,)
+            if spec.watermark == "updated_at":
+                with self.remote.connect() as rconn:
+                    # Taken before copying, so changes made during the copy are pulled next time
+                    first_mark = rconn.execute(select(func.max(table.c.updated_at))).scalar()
+
+        applied = 0
+        last_updated, last_id = position
+        while True:
+            query = select(table).order_by(*order).limit(self.batch_size)
+            if len(order) == 2:
+                if last_id is None:
+                    query = query.where(table.c.updated_at >= last_updated)
+                else:
+                    query = query.where(tuple_(table.c.updated_at, pk) > tuple_(last_updated, last_id))
+            elif last_id is not None:
+                query = query.where(pk > last_id)
+            with self.remote.connect() as rconn:
+                rows = [dict(row) for row in rconn.execute(query).mappings()]
+            if not rows:
+                break
+            with self.local.begin() as conn:
+                set_applying(conn, True)
+                applied += self.upsert_local(conn, table, rows)
+                last_id = rows[-1][pk.name]
+                if len(order) == 2:
+                    last_updated = rows[-1]["updated_at"]
+                    self.save_watermark(conn, table, updated_at=last_updated, row_id=last_id)
+                elif spec.watermark == "updated_at":
+                    self.save_watermark(conn, table, updated_at=None, row_id=last_id)
+                else:
+                    self.save_watermark(conn, table, row_id=last_id)
+                set_applying(conn, False)
+            if len(rows) < self.batch_size:
+                break
+        if len(order) == 1 and spec.watermark == "updated_at":
+            with self.local.begin() as conn:
+                self.save_watermark(conn, table, updated_at=first_mark, row_id=last_id)
+        return applied
+
+    def refresh_table(self, table) -> int:
+        """Copy a small reference table completely, removing rows deleted upstream"""
+        pk = pk_column(table)
+        with self.remote.connect() as rconn:
+            rows = [dict(row) for row in rconn.execute(select(table)).mappings()]
+        remote_ids = [row[pk.name] for row in rows]
+        with self.local.begin() as conn:
+            set_applying(conn, True)
+            applied = self.upsert_local(conn, table, rows)
+            pending = self.pending_ids(conn, table)
+            stale = conn.execute(delete(table).where(pk.notin_(remote_ids), pk > 0, pk.notin_(pending)))
+            self.save_watermark(conn, table)
+            set_applying(conn, False)
+        return applied + stale.rowcount
+
+    def pending_ids(self, conn, table) -> set:
+        return set(conn.execute(select(sync_journal.c.row_id).where(
+            sync_journal.c.table_name == table.name, sync_journal.c.status == "Pending")).scalars())
+
+    def upsert_local(self, conn, table, rows) -> int:
+        """Insert or overwrite local rows, skipping rows with unpushed local changes"""
+        pk = pk_column(table)
+        # A row inserted here since the last push may have taken the id of a remote row not pulled yet:
+        # move it out of the way (it gets a server id when pushed), otherwise the remote row would be
+        # skipped and the watermark would move past it for good
+        collided = conn.execute(select(sync_journal.c.row_id).distinct().where(
+            sync_journal.c.table_name == table.name, sync_journal.c.status == "Pending",
+            sync_journal.c.operation == "insert", sync_journal.c.row_id > 0,
+            sync_journal.c.row_id.in_([row[pk.name] for row in rows]))).scalars().all()
+        if collided:
+            detach_rows(conn, table, collided)
+        pending = self.pending_ids(conn, table)
+        rows = [row for row in rows if row[pk.name] not in pending]
+        if not rows:
+            return 0
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[pk.name],
+            set_={c.name: stmt.excluded[c.name] for c in table.columns if c.name != pk.name})
+        try:
+            with conn.begin_nested():
+                conn.execute(stmt, rows)
+        except IntegrityError:
+            # e.g. a username taken by an unpushed local account: apply the rest row by row
+            for row in rows:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(stmt, [row])
+                except IntegrityError as e:
+                    print(f"⚠️ Skipped remote {table.name} #{row[pk.name]}: {e.orig}")
+        return len(rows)
+
+
+class SyncWorker(threading.Thread):
+    """Daemon thread running ReplicaSync.sync_once every SYNC_INTERVAL_SECONDS"""
+
+    def __init__(self, sync=None, interval=SYNC_INTERVAL_SECONDS):
+        super().__init__(name="replica-sync", daemon=True)
+        self.sync = sync or ReplicaSync()
+        self.interval = interval
+        self.last_result = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def run(self):
+        print("🔄 Replica sync started")
+        while not self._stop_event.is_set():
+            try:
+                self.last_result = self.sync.sync_once()
+            except Exception as e:
+                print(f"❌ Replica sync error: {e}")
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+        print("🔄 Replica sync stopped")
+
+    def wake(self):
+        """Sync now instead of waiting for the next interval"""
+        self._wake_event.set()
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_sync_worker(**kwargs):
+    """Start the shared background sync (no-op if it is already running)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = SyncWorker(**kwargs)
+            _worker.start()
+        return _worker
+
+
+def stop_sync_worker(timeout=10):
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.stop(timeout)
+            _worker = None
+
+
+def wake_sync_worker():
+    if _worker is not None:
+        _worker.wake()
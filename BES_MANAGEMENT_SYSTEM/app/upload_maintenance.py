@@ -0,0 +1,177 @@
+# app/upload_maintenance.py
+"""
+Garbage collection and integrity checks for uploads/.
+
+1. Stream every path column that points into uploads/ and build a set of
+   referenced files (only the normalized path strings are kept in memory).
+   Deleted announcements are only hidden (visible = False), so their images
+   are not counted as referenced.
+2. Walk uploads/ with os.scandir, one directory at a time.
+3. Hash files in a thread pool with a bounded number of files in flight.
+   Files in the content-addressed store are named after their SHA-256, so
+   a mismatch means the file is corrupt.
+4. Report missing and corrupt files and move unreferenced files (orphans)
+   into uploads/quarantine/<timestamp>/ instead of deleting them.
+"""
+import os
+import re
+import time
+import shutil
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from .db import SessionLocal
+from .models import Resident, BarangayOfficial, Announcement, DocumentUpload, CertificateRequest
+from .config import BASE_DIR, UPLOAD_FOLDER, UPLOAD_GC_GRACE_HOURS, UPLOAD_GC_HASH_WORKERS
+
+# Every column that stores a path to an uploaded file, with the rows whose files are still in use
+PATH_COLUMNS = [
+    (Resident.photo_path, None),
+    (BarangayOfficial.photo_path, None),
+    (Announcement.image_path, Announcement.visible == True),
+    (DocumentUpload.file_path, None),
+    (DocumentUpload.original_file_path, None),
+    (CertificateRequest.uploaded_file_path, None),
+    (CertificateRequest.original_file_path, None),
+]
+QUARANTINE_FOLDER_NAME = "quarantine"
+HASHED_FOLDERS = {"store", "originals"}   # file names are <sha256>.<ext>
+SHA256_NAME = re.compile(r"[0-9a-f]{64}")
+SKIP_FILES = {".gitkeep"}
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def normalize_path(path) -> str:
+    """Comparable form of a stored path (relative paths are relative to the project root)"""
+    path = Path(path)
+    if not path.is_absolute():
+        path = BASE_DIR / path
+    return os.path.normcase(os.path.abspath(path))
+
+
+def iter_referenced_paths(session_factory=SessionLocal, batch_size=1000):
+    """Yield every non-empty upload path stored in the database, streamed in batches"""
+    db = session_factory()
+    try:
+        for column, in_use in PATH_COLUMNS:
+            query = db.query(column).filter(column.isnot(None), column != "")
+            if in_use is not None:
+                query = query.filter(in_use)
+            for (value,) in query.yield_per(batch_size):
+                yield value
+    finally:
+        db.close()
+
+
+def build_reference_set(paths) -> set:
+    return {normalize_path(path) for path in paths}
+
+
+def iter_upload_files(root: Path):
+    """Yield (top-level folder name, os.DirEntry) for every file below root, skipping quarantine"""
+    stack = [(str(root), None)]
+    while stack:
+        folder, top = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if top is None and entry.name == QUARANTINE_FOLDER_NAME:
+                            continue
+                        stack.append((entry.path, top or entry.name))
+                    elif entry.is_file(follow_symlinks=False) and entry.name not in SKIP_FILES:
+                        yield top, entry
+        except OSError as e:
+            print(f"❌ Cannot read {folder}: {e}")
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bounded_map(executor, func, items, max_in_flight):
+    """Like executor.map, but never holds more than max_in_flight pending items"""
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(func, item)))
+        if len(pending) >= max_in_flight:
+            done_item, future = pending.popleft()
+            yield done_item, future
+    while pending:
+        yield pending.popleft()
+
+
+def check_store_file(path: str):
+    """Returns an error string for a corrupt content-addressed file, else None"""
+    expected = Path(path).stem.lower()
+    try:
+        actual = sha256_file(path)
+    except OSError as e:
+        return f"unreadable: {e}"
+    if actual != expected:
+        return f"hash mismatch (content is {actual[:12]}...)"
+    return None
+
+
+def scan_uploads(references: set, root: Path = UPLOAD_FOLDER, workers: int = UPLOAD_GC_HASH_WORKERS,
+                 grace_hours: float = UPLOAD_GC_GRACE_HOURS, verify: bool = True):
+    """
+    Walk the upload tree and classify files. Returns a dict with
+    'scanned', 'bytes', 'orphans' (list of paths), 'corrupt' (list of (path, reason)),
+    'missing' (referenced paths that do not exist) and 'external' (referenced
+    files that exist outside root, e.g. legacy announcement images).
+    """
+    root_key = normalize_path(root)
+    cutoff = time.time() - grace_hours * 3600
+    result = {"scanned": 0, "bytes": 0, "orphans": [], "corrupt": [], "missing": [], "external": 0}
+    seen = set()
+
+    def to_hash():
+        for top, entry in iter_upload_files(root):
+            key = normalize_path(entry.path)
+            stat = entry.stat(follow_symlinks=False)
+            result["scanned"] += 1
+            result["bytes"] += stat.st_size
+            if key in references:
+                seen.add(key)
+            elif stat.st_mtime < cutoff:
+                # Recent files may belong to an upload whose row is not committed yet
+                result["orphans"].append(entry.path)
+            if stat.st_size == 0:
+                result["corrupt"].append((entry.path, "empty file"))
+            elif verify and top in HASHED_FOLDERS and SHA256_NAME.fullmatch(entry.name.split(".")[0]):
+                yield entry.path
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for path, future in bounded_map(executor, check_store_file, to_hash(), workers * 4):
+            error = future.result()
+            if error:
+                result["corrupt"].append((path, error))
+
+    # Referenced files the walk did not find (outside uploads/ counts if it no longer exists)
+    for ref in references:
+        if ref in seen:
+            continue
+        if not os.path.exists(ref):
+            result["missing"].append(ref)
+        elif not ref.startswith(root_key + os.sep):
+            result["external"] += 1
+    result["missing"].sort()
+    return result
+
+
+def quarantine_files(paths, root: Path = UPLOAD_FOLDER) -> Path:
+    """Move files to uploads/quarantine/<timestamp>/<relative path>; returns the folder"""
+    target = Path(root) / QUARANTINE_FOLDER_NAME / datetime.now().strftime("%Y%m%d_%H%M%S")
+    for path in paths:
+        relative = Path(path).resolve().relative_to(Path(root).resolve())
+        dest = target / relative
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(path, dest)
+    return target
@@ -0,0 +1,132 @@
+# app/uploads.py
+"""
+Content-addressed upload store.
+
+Files are checked against MAX_UPLOAD_SIZE and ALLOWED_EXTENSIONS before a
+single byte is copied, then streamed in chunks into a temp file while being
+hashed. The finished file is stored as uploads/store/<aa>/<sha256><ext>, so
+the same ID or photo uploaded twice is kept only once.
+
+When a kind is given ('photo', 'id', 'official', 'announcement') images are
+normalized first (see app/image_ingest.py); for KEEP_ORIGINAL_KINDS the
+untouched upload is also kept under uploads/originals/ as an audit copy.
+"""
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from .config import UPLOAD_FOLDER, MAX_UPLOAD_SIZE, ALLOWED_EXTENSIONS, KEEP_ORIGINAL_KINDS
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+STORE_FOLDER = UPLOAD_FOLDER / "store"
+ORIGINALS_FOLDER = UPLOAD_FOLDER / "originals"
+TEMP_FOLDER = UPLOAD_FOLDER / "tmp"    # same filesystem as the store so the final move is atomic
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg'} & ALLOWED_EXTENSIONS
+NORMALIZED_EXTENSIONS = IMAGE_EXTENSIONS
+
+
+def file_extension(path) -> str:
+    return Path(path).suffix.lower().lstrip('.')
+
+
+def validate_upload(src, allowed_extensions=ALLOWED_EXTENSIONS, max_size=MAX_UPLOAD_SIZE):
+    """Return an error message, or None if the file may be uploaded. Only stats the file."""
+    src = Path(src)
+    ext = file_extension(src)
+    if ext not in allowed_extensions:
+        allowed = ", ".join(sorted(allowed_extensions))
+        return f"File type '.{ext}' is not allowed (allowed: {allowed})"
+    try:
+        size = src.stat().st_size
+    except OSError:
+        return f"File not found: {src.name}"
+    if not src.is_file():
+        return f"Not a file: {src.name}"
+    if size == 0:
+        return f"File is empty: {src.name}"
+    if size > max_size:
+        return f"File is too large ({size / (1024 * 1024):.1f}MB, max {max_size / (1024 * 1024):.0f}MB)"
+    return None
+
+
+def stored_path(digest: str, ext: str, folder=None) -> Path:
+    return (folder or STORE_FOLDER) / digest[:2] / f"{digest}.{ext}"
+
+
+def move_into_store(temp_name: str, dest: Path) -> bool:
+    """Move a finished temp file to dest; returns True if dest already existed (duplicate)"""
+    if dest.exists():
+        os.remove(temp_name)
+        return True
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_name, dest)
+    return False
+
+
+def write_into_store(data: bytes, dest: Path) -> bool:
+    if dest.exists():
+        return True
+    fd, temp_name = tempfile.mkstemp(dir=TEMP_FOLDER, suffix=".part")
+    with os.fdopen(fd, "wb") as writer:
+        writer.write(data)
+    return move_into_store(temp_name, dest)
+
+
+def store_upload(src, allowed_extensions=ALLOWED_EXTENSIONS, max_size=MAX_UPLOAD_SIZE, progress=None, kind=None):
+    """
+    Copy src into the content-addressed store, normalizing images when kind is given.
+    progress(bytes_done, bytes_total) is called after every chunk.
+    Returns {"success": True, "path", "sha256", "size", "original_size", "original_path",
+    "filename", "deduplicated"} or {"success": False, "error"}.
+    """
+    src = Path(src)
+    error = validate_upload(src, allowed_extensions, max_size)
+    if error:
+        return {"success": False, "error": error}
+
+    TEMP_FOLDER.mkdir(parents=True, exist_ok=True)
+    total = src.stat().st_size
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_name = tempfile.mkstemp(dir=TEMP_FOLDER, suffix=".part")
+    try:
+        with open(src, "rb") as reader, os.fdopen(fd, "wb") as writer:
+            while True:
+                chunk = reader.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    # File grew after the size check
+                    raise ValueError(f"File is too large (max {max_size / (1024 * 1024):.0f}MB)")
+                digest.update(chunk)
+                writer.write(chunk)
+                if progress:
+                    progress(size, total)
+
+        ext = file_extension(src)
+        result = {"success": True, "filename": src.name, "original_size": size, "original_path": None}
+        if kind and ext in NORMALIZED_EXTENSIONS:
+            from .image_ingest import normalize_image
+            data, out_ext = normalize_image(temp_name, kind)
+            sha256 = hashlib.sha256(data).hexdigest()
+            dest = stored_path(sha256, out_ext)
+            deduplicated = write_into_store(data, dest)
+            if kind in KEEP_ORIGINAL_KINDS:
+                original = stored_path(digest.hexdigest(), ext, ORIGINALS_FOLDER)
+                move_into_store(temp_name, original)
+                result["original_path"] = str(original)
+            else:
+                os.remove(temp_name)
+            size = len(data)
+        else:
+            sha256 = digest.hexdigest()
+            dest = stored_path(sha256, ext)
+            deduplicated = move_into_store(temp_name, dest)
+
+        result.update(path=str(dest), sha256=sha256, size=size, deduplicated=deduplicated)
+        return result
+    except Exception as e:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        return {"success": False, "error": str(e)}
@@ -0,0 +1,57 @@
+# app/user_session.py
+"""
+The logged-in user, looked up once at login.
+
+AuthController.verify_login_otp() returns a UserSession with a successful
+OTP. The login window hands it to the dashboard, and the dashboard hands it
+to every page widget it creates, so no action has to look the account (and
+its resident) up by username again.
+
+It is an immutable snapshot. The ids and the role do not change while the
+user is logged in; the display fields are re-read with refresh_session()
+when the resident's profile changes (ResidentUpdated, or the change feed
+for edits made at another station).
+"""
+from collections import namedtuple
+from app.db import SessionLocal
+from app.models import Account, Resident
+
+ADMIN_ROLES = ('Admin', 'Staff')
+
+
+class UserSession(namedtuple("UserSession", "account_id username user_role resident_id first_name last_name")):
+    __slots__ = ()
+
+    def is_admin(self) -> bool:
+        return self.user_role in ADMIN_ROLES
+
+    def display_name(self) -> str:
+        return " ".join(part for part in (self.first_name, self.last_name) if part) or self.username
+
+
+def session_query(db):
+    """The account's and its resident's columns, in UserSession field order (one SELECT)"""
+    return db.query(
+        Account.account_id, Account.username, Account.user_role, Account.resident_id,
+        Resident.first_name, Resident.last_name,
+    ).outerjoin(Resident, Resident.resident_id == Account.resident_id)
+
+
+def load_session(username):
+    """UserSession of the account with this username (None if there is none)"""
+    db = SessionLocal()
+    try:
+        row = session_query(db).filter(Account.username == username).first()
+        return UserSession._make(row) if row else None
+    finally:
+        db.close()
+
+
+def refresh_session(user_session):
+    """Re-read the display fields (after a profile change); the old session if the account is gone"""
+    db = SessionLocal()
+    try:
+        row = session_query(db).filter(Account.account_id == user_session.account_id).first()
+        return UserSession._make(row) if row else user_session
+    finally:
+        db.close()
@@ -0,0 +1,87 @@
+# benchmarks/cases.py
+"""
+Benchmarked hot paths.
+
+Each case is registered with @case(name) and called once with the suite
+context; it returns run(), or (before, run) when every timed run needs fresh
+input (before() is not timed and its result is passed to run()).
+"""
+from collections import namedtuple
+from benchmarks.seed import BENCH_USERNAME, BENCH_PASSWORD
+
+Case = namedtuple("Case", "name factory repeat gui")
+CASES = {}
+
+
+def case(name, repeat=20, gui=False):
+    def register(factory):
+        CASES[name] = Case(name, factory, repeat, gui)
+        return factory
+    return register
+
+
+# --- Controllers ---
+
+@case("auth.start_login", repeat=5)
+def start_login(ctx):
+    from app.controllers.auth_controllers import AuthController
+    return lambda: AuthController.start_login(BENCH_USERNAME, BENCH_PASSWORD)
+
+
+@case("auth.verify_otp", repeat=5)
+def verify_otp(ctx):
+    from app.controllers.auth_controllers import AuthController
+
+    def before():
+        return AuthController.start_login(BENCH_USERNAME, BENCH_PASSWORD)["otp_code"]
+    return before, lambda code: AuthController.verify_login_otp(BENCH_USERNAME, code)
+
+
+@case("request.create_request")
+def create_request(ctx):
+    from app.controllers.request_controller import RequestController
+    return lambda: RequestController.create_request(1, 1, {"purpose": "Employment"})
+
+
+@case("dashboard.stats", gui=True)
+def dashboard_stats(ctx):
+    return ctx.window.get_comprehensive_dashboard_stats
+
+
+# --- Page loaders (admin window, offscreen) ---
+
+@case("page.dashboard", repeat=10, gui=True)
+def dashboard_page(ctx):
+    return ctx.window.show_dashboard_page
+
+
+@case("page.residents", repeat=10, gui=True)
+def residents_page(ctx):
+    return ctx.window.show_residents_page
+
+
+@case("page.services", repeat=10, gui=True)
+def services_page(ctx):
+    return ctx.window.show_services_page
+
+
+@case("page.payments", repeat=10, gui=True)
+def payments_page(ctx):
+    return ctx.window.show_payment_page
+
+
+@case("page.blotter", repeat=10, gui=True)
+def blotter_page(ctx):
+    return ctx.window.show_blotter_table
+
+
+@case("tracker.load", repeat=10, gui=True)
+def request_tracker(ctx):
+    from gui.widgets.request_status_tracker import RequestStatusWidget
+    from app.user_session import load_session
+    user_session = load_session(BENCH_USERNAME)     # looked up once at login
+
+    def run():
+        widget = RequestStatusWidget(user_session=user_session)
+        widget.deleteLater()
+    return run
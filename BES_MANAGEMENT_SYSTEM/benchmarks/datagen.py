@@ -0,0 +1,357 @@
+# benchmarks/datagen.py
+"""
+Deterministic synthetic data for load testing.
+
+Generates residents (sitios of Barangay Balibago, a population-shaped age
+pyramid, civil status by age), accounts, certificate requests with their full
+status history, payments, notifications and blotter records.
+
+Every table draws from its own random stream seeded from (seed, table), so
+the same seed always gives the same rows, and changing one table's size does
+not change the others. Values are drawn a whole batch column at a time
+(random.choices(..., k=n)) and written with Core bulk insert() in large
+batches; nothing goes through the ORM. New rows get ids after the current
+maximum, so the generator can also top up an existing database.
+"""
+import bisect
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, func
+from app.models import (Resident, Account, Service, CertificateRequest, CertificateRequestEvent, CertificatePayment,
+                        Notification, Blotter)
+from app.config import CERTIFICATE_PRICES
+
+DEFAULT_PASSWORD = "Resident123!"   # every generated account (hashed once)
+DEFAULT_NOW = datetime(2025, 6, 30, 17, 0)   # fixed, so output does not depend on the day it runs
+BATCH_SIZE = 20_000
+
+# Sitios as distributed by update_sitios.py (Sitio 1 -> 3 sitios, Sitio 2 -> 2, Sitio 3 -> 2)
+SITIOS = ["Pandayan", "Aplaya", "Centro", "Dita", "Tulay na Bato", "Kawayanan", "Kudrado"]
+SITIO_WEIGHTS = [14, 13, 13, 18, 17, 13, 12]
+
+MALE_NAMES = ["Juan", "Jose", "Pedro", "Mark", "John Paul", "Roberto", "Carlos", "Miguel", "Antonio", "Ramon",
+              "Eduardo", "Renato", "Ricardo", "Fernando", "Jerome", "Christian", "Joshua", "Angelo", "Rafael",
+              "Daniel", "Manuel", "Emmanuel", "Romeo", "Ernesto", "Noel"]
+FEMALE_NAMES = ["Maria", "Ana", "Rosa", "Liza", "Jenny", "Carmen", "Elena", "Teresa", "Cristina", "Josephine",
+                "Marites", "Angelica", "Kristine", "Michelle", "Jasmine", "Princess", "Lourdes", "Gloria",
+                "Rowena", "Divina", "Erlinda", "Luzviminda", "Mary Joy", "Andrea", "Nicole"]
+SURNAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Aquino", "Ramos", "Villanueva",
+            "Gonzales", "Fernandez", "Lopez", "Castillo", "Dela Cruz", "Mercado", "Flores", "Rivera", "Navarro",
+            "Pascual", "Manalo", "Dimaculangan", "Macaraig", "Panganiban", "Ilagan", "Magpantay", "Marasigan",
+            "Perez", "Medina", "De Guzman"]
+BIRTH_PLACES = ["Calatagan", "Calatagan", "Calatagan", "Batangas City", "Lipa City", "Nasugbu", "Balayan",
+                "Taal", "Manila", "Lemery"]
+RELIGIONS = ["Roman Catholic", "Iglesia ni Cristo", "Born Again Christian", "Aglipayan", "Islam", "Others"]
+RELIGION_WEIGHTS = [80, 6, 5, 3, 2, 4]
+OCCUPATIONS = ["Fisherman", "Farmer", "Vendor", "Tricycle Driver", "Housewife", "Sari-sari Store Owner",
+               "Construction Worker", "Teacher", "Government Employee", "OFW", "Resort Staff", "Unemployed"]
+
+# Age pyramid (share of the population per age band)
+AGE_BANDS = [(0, 14), (15, 24), (25, 34), (35, 44), (45, 54), (55, 64), (65, 90)]
+AGE_WEIGHTS = [30, 19, 16, 13, 10, 7, 5]
+# (oldest age in the bracket, civil statuses, weights)
+CIVIL_STATUS_BY_AGE = [
+    (17, ["Single"], [1]),
+    (24, ["Single", "Married", "Live-in"], [85, 8, 7]),
+    (34, ["Single", "Married", "Live-in", "Separated"], [40, 43, 15, 2]),
+    (59, ["Married", "Single", "Live-in", "Separated", "Widowed"], [68, 13, 8, 6, 5]),
+    (200, ["Married", "Widowed", "Single", "Separated"], [55, 35, 7, 3]),
+]
+CIVIL_STATUS_LIMITS = [limit for limit, _, _ in CIVIL_STATUS_BY_AGE]
+
+CERTIFICATE_TYPES = ["Barangay Clearance", "Barangay Indigency", "Barangay ID", "Business Permit"]
+CERTIFICATE_WEIGHTS = [45, 30, 15, 10]
+PURPOSES = {
+    "Barangay Clearance": ["Employment", "Police Clearance", "Loan Application", "Travel", "School Requirement"],
+    "Barangay Indigency": ["Medical Assistance", "Scholarship", "Burial Assistance", "PhilHealth", "Legal Aid"],
+    "Barangay ID": ["Identification", "Bank Account", "Senior Citizen Benefits", "Postal ID"],
+    "Business Permit": ["New Business", "Business Renewal", "Sari-sari Store", "Food Stall"],
+}
+# Final status of a request by its age in days: older requests are mostly finished
+FINAL_STATUSES = ["Pending", "Under Review", "Processing", "Ready for Pickup", "Completed", "Declined", "Cancelled"]
+FINAL_WEIGHTS_BY_AGE = [
+    (3, [40, 25, 20, 10, 0, 5, 0]),
+    (14, [5, 5, 15, 20, 45, 8, 2]),
+    (None, [0, 0, 1, 4, 84, 8, 3]),
+]
+STATUS_PATHS = {
+    "Pending": ["Pending"],
+    "Under Review": ["Pending", "Under Review"],
+    "Processing": ["Pending", "Under Review", "Processing"],
+    "Ready for Pickup": ["Pending", "Under Review", "Processing", "Ready for Pickup"],
+    "Completed": ["Pending", "Under Review", "Processing", "Ready for Pickup", "Completed"],
+    "Declined": ["Pending", "Under Review", "Declined"],
+    "Cancelled": ["Pending", "Cancelled"],
+}
+# Same wording as AdminController's status notifications
+NOTIFICATIONS = {
+    "Processing": ("✅ Request Accepted",
+                   "Your {type} request has been accepted and is now being processed. Please wait for further updates."),
+    "Declined": ("❌ Request Declined",
+                 "Your {type} request has been declined. Please visit the Barangay Hall for more information."),
+    "Ready for Pickup": ("💳 Ready for Payment",
+                         "Your {type} request is ready! Please proceed to the Barangay Hall for payment and pickup."),
+    "Completed": ("🎉 Request Completed",
+                  "Your {type} request has been completed! Thank you for using Barangay E-Services."),
+}
+BLOTTER_REASONS = ["Noise complaint", "Unpaid debt", "Boundary dispute", "Stray animals", "Physical altercation",
+                   "Theft", "Verbal abuse", "Property damage", "Trespassing", "Family dispute"]
+BLOTTER_REASON_WEIGHTS = [20, 18, 12, 10, 9, 8, 8, 7, 5, 3]
+HANDLERS = ["Kagawad Reyes", "Kagawad Santos", "Barangay Captain", "Tanod Garcia", "Lupon Chairman"]
+# Requests arrive on weekdays during office hours
+OFFICE_HOURS = list(range(8, 17))
+OFFICE_HOUR_WEIGHTS = [12, 14, 13, 10, 8, 12, 12, 11, 8]
+DAY_WEIGHTS = [10, 10, 10, 10, 9, 3, 1]     # Monday .. Sunday
+
+
+def chunks(total: int, size: int):
+    """(start offset, count) pairs covering total in steps of size"""
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+class DataGenerator:
+    def __init__(self, engine, seed: int = 42, batch_size: int = BATCH_SIZE, now: datetime = DEFAULT_NOW,
+                 password: str = DEFAULT_PASSWORD, log=print):
+        self.engine = engine
+        self.seed = seed
+        self.batch_size = batch_size
+        self.now = now
+        self.log = log
+        account = Account(username="generated")
+        account.set_password(password)
+        self.password_hash = account.password_hash
+        # Per-resident values the request tables copy (filled by residents())
+        self.resident_ids = []
+        self.resident_names = {}
+
+    def rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def next_id(self, conn, column) -> int:
+        return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+    # --- Reference data, residents and accounts ---
+
+    def services(self) -> int:
+        """One service per certificate type, if the table is empty"""
+        with self.engine.begin() as conn:
+            if conn.execute(select(func.count()).select_from(Service)).scalar():
+                return 0
+            conn.execute(insert(Service), [
+                {"service_id": i + 1, "name": name, "description": name, "fee": price}
+                for i, (name, price) in enumerate(CERTIFICATE_PRICES.items())
+            ])
+        return len(CERTIFICATE_PRICES)
+
+    def residents(self, count: int) -> int:
+        rng = self.rng("residents")
+        today = self.now.date()
+        with self.engine.begin() as conn:
+            first_id = self.next_id(conn, Resident.resident_id)
+            for start, n in chunks(count, self.batch_size):
+                ids = range(first_id + start, first_id + start + n)
+                genders = rng.choices(["Male", "Female"], k=n)
+                bands = rng.choices(AGE_BANDS, AGE_WEIGHTS, k=n)
+                ages = [rng.randint(low, high) for low, high in bands]
+                birth_days = [today - timedelta(days=age * 365 + rng.randrange(365)) for age in ages]
+                brackets = [bisect.bisect_left(CIVIL_STATUS_LIMITS, age) for age in ages]
+                civil = [rng.choices(CIVIL_STATUS_BY_AGE[b][1], CIVIL_STATUS_BY_AGE[b][2])[0] for b in brackets]
+                firsts = [rng.choice(MALE_NAMES if g == "Male" else FEMALE_NAMES) for g in genders]
+                lasts = rng.choices(SURNAMES, k=n)
+                middles = rng.choices(SURNAMES, k=n)
+                sitios = rng.choices(SITIOS, SITIO_WEIGHTS, k=n)
+                religions = rng.choices(RELIGIONS, RELIGION_WEIGHTS, k=n)
+                places = rng.choices(BIRTH_PLACES, k=n)
+                jobs = rng.choices(OCCUPATIONS, k=n)
+                flags = [rng.random() for _ in range(n)]
+                created = [self.now - timedelta(days=rng.randrange(1, 1500)) for _ in range(n)]
+                rows = []
+                for i, rid in enumerate(ids):
+                    adult = ages[i] >= 18
+                    rows.append({
+                        "resident_id": rid, "last_name": lasts[i], "first_name": firsts[i],
+                        "middle_name": middles[i], "gender": genders[i], "birth_date": birth_days[i],
+                        "birth_place": places[i], "age": ages[i], "civil_status": civil[i],
+                        "nationality": "Filipino", "religion": religions[i],
+                        "occupation": jobs[i] if adult else "Student",
+                        "contact_number": f"09{(rid * 7919) % 1_000_000_000:09d}",
+                        "sitio": sitios[i], "barangay": "Barangay Balibago", "municipality": "Calatagan",
+                        "registered_voter": adult and flags[i] < 0.8, "indigent": flags[i] > 0.85,
+                        "solo_parent": adult and 0.40 < flags[i] < 0.44, "fourps_member": flags[i] > 0.88,
+                        "created_at": created[i], "updated_at": created[i],
+                    })
+                    self.resident_ids.append(rid)
+                    self.resident_names[rid] = (firsts[i], lasts[i], middles[i], adult)
+                conn.execute(insert(Resident), rows)
+        return count
+
+    def accounts(self, share: float = 0.3, named: dict = None) -> int:
+        """Accounts for a share of the adult residents, plus named {resident_id: username} ones"""
+        rng = self.rng("accounts")
+        named = named or {}
+        rows, count = [], 0
+        with self.engine.begin() as conn:
+            next_id = self.next_id(conn, Account.account_id)
+            for rid in self.resident_ids:
+                first, last, _, adult = self.resident_names[rid]
+                if rid in named:
+                    username, status = named[rid], "Active"
+                elif adult and rng.random() < share:
+                    username = f"{first}.{last}{rid}".lower().replace(" ", "")
+                    status = rng.choices(["Active", "Pending", "Deactivated"], [90, 8, 2])[0]
+                else:
+                    continue
+                rows.append({"account_id": next_id, "resident_id": rid, "username": username,
+                             "password_hash": self.password_hash, "user_role": "Resident",
+                             "account_status": status, "created_at": self.now - timedelta(days=30),
+                             "updated_at": self.now - timedelta(days=30)})
+                next_id += 1
+                count += 1
+                if len(rows) >= self.batch_size:
+                    conn.execute(insert(Account), rows)
+                    rows = []
+            if rows:
+                conn.execute(insert(Account), rows)
+        return count
+
+    # --- Certificate requests with history, payments and notifications ---
+
+    def request_times(self, rng, n: int, days: int):
+        """n submission times over the last `days` days, weighted to weekday office hours"""
+        start = (self.now - timedelta(days=days)).date()
+        calendar = [start + timedelta(days=d) for d in range(days)]
+        weights = [DAY_WEIGHTS[day.weekday()] for day in calendar]
+        picked = rng.choices(calendar, weights, k=n)
+        hours = rng.choices(OFFICE_HOURS, OFFICE_HOUR_WEIGHTS, k=n)
+        times = [datetime(d.year, d.month, d.day, h, rng.randrange(60)) for d, h in zip(picked, hours)]
+        times.sort()
+        return times
+
+    def requests(self, count: int, days: int = 730, hot_residents: dict = None) -> dict:
+        """
+        Certificate requests submitted over the last `days` days. hot_residents
+        ({resident_id: share}) pins a share of all requests on given residents.
+        """
+        rng = self.rng("requests")
+        hot = list((hot_residents or {}).items())
+        counts = {"requests": 0, "events": 0, "payments": 0, "notifications": 0}
+        with self.engine.begin() as conn:
+            request_id = self.next_id(conn, CertificateRequest.request_id)
+            event_id = self.next_id(conn, CertificateRequestEvent.event_id)
+            payment_id = self.next_id(conn, CertificatePayment.payment_id)
+            notification_id = self.next_id(conn, Notification.notification_id)
+            for start, n in chunks(count, self.batch_size):
+                times = self.request_times(rng, n, days)
+                residents = rng.choices(self.resident_ids, k=n)
+                for i in range(n):
+                    for rid, share in hot:
+                        if (start + i) % round(1 / share) == 0:
+                            residents[i] = rid
+                types = rng.choices(CERTIFICATE_TYPES, CERTIFICATE_WEIGHTS, k=n)
+                quantities = rng.choices([1, 2, 3], [85, 12, 3], k=n)
+                gaps = [rng.randint(1, 48) for _ in range(n * 5)]
+                paid_draws = [rng.random() for _ in range(n)]
+                gcash = [rng.random() < 0.2 for _ in range(n)]
+                requests, events, payments, notifications = [], [], [], []
+                for i in range(n):
+                    created, rid, cert_type = times[i], residents[i], types[i]
+                    age = (self.now - created).days
+                    weights = next(w for limit, w in FINAL_WEIGHTS_BY_AGE if limit is None or age < limit)
+                    final = rng.choices(FINAL_STATUSES, weights)[0]
+                    first, last, middle, _ = self.resident_names[rid]
+
+                    # Status history: each stage a few hours after the previous one, never in the future
+                    at, previous, stamps = created, None, {}
+                    for step, stage in enumerate(STATUS_PATHS[final]):
+                        if step:
+                            at = min(at + timedelta(hours=gaps[i * 5 + step]), self.now)
+                        stamps[stage] = at
+                        events.append({"event_id": event_id, "request_id": request_id, "from_status": previous,
+                                       "to_status": stage, "actor": "resident" if step == 0 else "admin",
+                                       "created_at": at})
+                        event_id += 1
+                        if stage in NOTIFICATIONS:
+                            title, message = NOTIFICATIONS[stage]
+                            notifications.append({"notification_id": notification_id, "resident_id": rid,
+                                                  "title": title, "message": message.format(type=cert_type),
+                                                  "is_read": (self.now - at).days > 7, "created_at": at})
+                            notification_id += 1
+                        previous = stage
+                    requests.append({
+                        "request_id": request_id, "resident_id": rid, "certificate_type": cert_type,
+                        "last_name": last, "first_name": first, "middle_name": middle,
+                        "phone_number": f"09{(rid * 7919) % 1_000_000_000:09d}",
+                        "purpose": PURPOSES[cert_type][request_id % len(PURPOSES[cert_type])],
+                        "quantity": quantities[i], "status": final, "created_at": created, "updated_at": at,
+                        "reviewed_at": stamps.get("Processing") or stamps.get("Declined"),
+                    })
+
+                    if "Processing" in stamps:
+                        unit_price = CERTIFICATE_PRICES[cert_type]
+                        paid = final == "Completed" or (final == "Ready for Pickup" and paid_draws[i] < 0.4)
+                        received = stamps.get("Completed") or stamps.get("Ready for Pickup")
+                        payments.append({
+                            "payment_id": payment_id, "request_id": request_id, "resident_id": rid,
+                            "certificate_type": cert_type, "requestor_name": f"{first} {last}",
+                            "quantity": quantities[i], "unit_price": unit_price,
+                            "total_amount": unit_price * quantities[i], "is_paid": paid,
+                            "payment_method": "GCash" if gcash[i] else "Cash",
+                            "received_at": received if paid else None,
+                            "or_number": f"OR-{received.year}-{payment_id:07d}" if paid and not gcash[i] else None,
+                            "reference_number": f"{rid:06d}{request_id:07d}" if paid and gcash[i] else None,
+                            "created_at": stamps["Processing"], "updated_at": at,
+                        })
+                        payment_id += 1
+                    request_id += 1
+
+                conn.execute(insert(CertificateRequest), requests)
+                conn.execute(insert(CertificateRequestEvent), events)
+                if payments:
+                    conn.execute(insert(CertificatePayment), payments)
+                if notifications:
+                    conn.execute(insert(Notification), notifications)
+                counts["requests"] += len(requests)
+                counts["events"] += len(events)
+                counts["payments"] += len(payments)
+                counts["notifications"] += len(notifications)
+                self.log(f"  {counts['requests']:,}/{count:,} requests")
+        return counts
+
+    # --- Blotters ---
+
+    def blotters(self, count: int, days: int = 1095) -> int:
+        rng = self.rng("blotters")
+        with self.engine.begin() as conn:
+            first_id = self.next_id(conn, Blotter.blotter_id)
+            for start, n in chunks(count, self.batch_size):
+                parties = rng.choices(self.resident_ids, k=n * 2)
+                reasons = rng.choices(BLOTTER_REASONS, BLOTTER_REASON_WEIGHTS, k=n)
+                offsets = sorted(rng.randrange(days * 24 * 60) for _ in range(n))
+                rows = []
+                for i in range(n):
+                    incident = self.now - timedelta(minutes=days * 24 * 60 - offsets[i])
+                    complainant, respondent = (self.resident_names[rid] for rid in parties[i * 2:i * 2 + 2])
+                    rows.append({
+                        "blotter_id": first_id + start + i,
+                        "complainant_name": f"{complainant[0]} {complainant[1]}",
+                        "respondent_name": f"{respondent[0]} {respondent[1]}",
+                        "reason": f"{reasons[i]} reported in {rng.choice(SITIOS)}",
+                        "incident_date": incident, "location": f"Sitio {rng.choice(SITIOS)}",
+                        "handled_by": rng.choice(HANDLERS),
+                        "created_at": min(incident + timedelta(hours=rng.randint(1, 72)), self.now),
+                    })
+                conn.execute(insert(Blotter), rows)
+        return count
+
+
+def generate(engine, residents: int, requests: int, blotters: int = None, seed: int = 42,
+             batch_size: int = BATCH_SIZE, password: str = DEFAULT_PASSWORD, named_accounts: dict = None,
+             hot_residents: dict = None, log=print) -> dict:
+    """Fill the database; returns the number of rows written per table"""
+    generator = DataGenerator(engine, seed=seed, batch_size=batch_size, password=password, log=log)
+    counts = {"services": generator.services(), "residents": generator.residents(residents)}
+    counts["accounts"] = generator.accounts(named=named_accounts)
+    counts.update(generator.requests(requests, hot_residents=hot_residents))
+    counts["blotters"] = generator.blotters(residents // 10 if blotters is None else blotters)
+    return counts
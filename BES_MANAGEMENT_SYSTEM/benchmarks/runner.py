@@ -0,0 +1,143 @@
+# benchmarks/runner.py
+"""
+Times the registered cases and compares the results with a baseline.
+
+A result file holds, per case, the median / min / p95 wall time in ms and
+the number of SQL statements per run. A case regresses when its median is
+more than `threshold` slower than the baseline (and at least min_delta_ms,
+so sub-millisecond noise is ignored) or when it issues more statements.
+"""
+import io
+import json
+import time
+import platform
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import event
+from benchmarks.cases import CASES
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_THRESHOLD = 0.20            # 20% slower than the baseline median
+MIN_DELTA_MS = 2.0
+
+
+class SuiteContext:
+    """What the cases can use: the engine and, for GUI cases, one offscreen admin window"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.qt_app = None
+        self._window = None
+
+    @property
+    def window(self):
+        if self._window is None:
+            from gui.views.sidebar_home_view import SidebarHomeWindow
+            self._window = SidebarHomeWindow()
+        return self._window
+
+    def process_events(self):
+        if self.qt_app is not None:
+            self.qt_app.processEvents()
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def git_commit(cwd=None) -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=cwd, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, cwd=cwd).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def time_case(ctx, counter, bench_case, repeat=None, warmup=1):
+    made = bench_case.factory(ctx)
+    before, run = made if isinstance(made, tuple) else (None, made)
+    times, statements = [], []
+    for i in range(warmup + (repeat or bench_case.repeat)):
+        arg = before() if before else None
+        counter.count = 0
+        start = time.perf_counter()
+        run(arg) if before else run()
+        ctx.process_events()
+        elapsed = (time.perf_counter() - start) * 1000
+        if i >= warmup:
+            times.append(elapsed)
+            statements.append(counter.count)
+    return {
+        "runs": len(times),
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "p95_ms": round(percentile(times, 0.95), 3),
+        "queries": statistics.median_low(statements),
+    }
+
+
+def run_suite(ctx, names=None, repeat=None, log=print) -> dict:
+    counter = StatementCounter(ctx.engine)
+    results = {}
+    for name, bench_case in CASES.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        if bench_case.gui and ctx.qt_app is None:
+            log(f"⏭️  {name} skipped (no QApplication)")
+            continue
+        with redirect_stdout(io.StringIO()):      # controllers print OTPs and progress
+            results[name] = time_case(ctx, counter, bench_case, repeat)
+        r = results[name]
+        log(f"{name:<26} median {r['median_ms']:9.2f}ms  p95 {r['p95_ms']:9.2f}ms  {r['queries']:>5} queries")
+    return results
+
+
+def build_report(results, scale, backend, commit=None) -> dict:
+    return {
+        "commit": commit or git_commit(Path(__file__).resolve().parent),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "scale": scale,
+        "backend": backend,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "cases": results,
+    }
+
+
+def save_report(report, directory=RESULTS_DIR) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{report['commit']}-{report['scale']}-{report['backend']}.json"
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD, min_delta_ms=MIN_DELTA_MS):
+    """List of regression messages (empty when nothing got slower)"""
+    regressions = []
+    for name, now in report["cases"].items():
+        before = baseline.get("cases", {}).get(name)
+        if before is None:
+            continue
+        delta = now["median_ms"] - before["median_ms"]
+        if delta > min_delta_ms and now["median_ms"] > before["median_ms"] * (1 + threshold):
+            regressions.append(f"{name}: median {before['median_ms']:.2f}ms -> {now['median_ms']:.2f}ms "
+                               f"(+{delta / before['median_ms']:.0%})")
+        if now["queries"] > before["queries"]:
+            regressions.append(f"{name}: {before['queries']} -> {now['queries']} SQL statements per run")
+    return regressions
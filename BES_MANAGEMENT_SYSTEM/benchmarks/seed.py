@@ -0,0 +1,26 @@
+# benchmarks/seed.py
+"""
+Seed a benchmark database at a given scale (see benchmarks.datagen).
+
+The data is deterministic for a given seed, so timings from different
+commits are comparable. Every account's password is BENCH_PASSWORD (hashed
+once); the resident with id 1 has the username BENCH_USERNAME and one
+request in a hundred, so the tracker has a long history to load.
+"""
+from benchmarks.datagen import generate
+
+SCALES = {                          # name -> (residents, certificate requests)
+    "tiny": (100, 500),
+    "1k": (1_000, 5_000),
+    "10k": (10_000, 50_000),
+    "100k": (100_000, 1_000_000),
+}
+BENCH_USERNAME = "bench_resident"
+BENCH_PASSWORD = "BenchPass123!"
+
+
+def seed(engine, scale: str = "1k", seed: int = 42, log=print):
+    """Fill an empty database; returns the number of rows written per table"""
+    residents, requests = SCALES[scale]
+    return generate(engine, residents, requests, seed=seed, password=BENCH_PASSWORD,
+                    named_accounts={1: BENCH_USERNAME}, hot_residents={1: 0.01}, log=log)
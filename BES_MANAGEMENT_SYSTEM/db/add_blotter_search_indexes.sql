@@ -0,0 +1,6 @@
+-- Blotter records table: keyset paging, date-range filters and full-text search
+USE barangay_db;
+
+CREATE INDEX idx_blotters_created ON blotters (created_at, blotter_id);
+CREATE INDEX idx_blotters_incident ON blotters (incident_date);
+CREATE FULLTEXT INDEX ft_blotters_text ON blotters (reason, complainant_name, respondent_name);
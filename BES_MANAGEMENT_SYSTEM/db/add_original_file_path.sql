@@ -0,0 +1,4 @@
+-- Audit copy of the untouched upload for valid IDs/documents (the normalized copy is in file_path / uploaded_file_path)
+-- Run once (MySQL has no ADD COLUMN IF NOT EXISTS; a second run fails with "Duplicate column name")
+ALTER TABLE document_uploads ADD COLUMN original_file_path VARCHAR(500);
+ALTER TABLE certificate_requests ADD COLUMN original_file_path VARCHAR(500);
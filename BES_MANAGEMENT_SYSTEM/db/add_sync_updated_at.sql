@@ -0,0 +1,7 @@
+-- Change timestamps the offline replica pulls by (app/sync.py SYNC_TABLES); run once
+USE barangay_db;
+
+ALTER TABLE document_uploads
+    ADD COLUMN updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
+ALTER TABLE payments
+    ADD COLUMN updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;
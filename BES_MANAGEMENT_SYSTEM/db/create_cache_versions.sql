@@ -0,0 +1,14 @@
+-- Change counters for cached reference data (see app/reference_cache.py)
+-- Every write to a cached table increments its row; stations compare these
+-- few numbers instead of reloading the tables.
+USE barangay_db;
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO cache_versions (table_name, version) VALUES
+    ('services', 0),
+    ('barangay_officials', 0),
+    ('announcements', 0);
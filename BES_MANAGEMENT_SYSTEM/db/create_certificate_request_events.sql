@@ -0,0 +1,27 @@
+-- Status history of certificate requests (written on every status change, see app/request_events.py)
+USE barangay_db;
+
+CREATE TABLE IF NOT EXISTS certificate_request_events (
+    event_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    request_id BIGINT NOT NULL,
+    from_status VARCHAR(50),
+    to_status VARCHAR(50) NOT NULL,
+    actor VARCHAR(100),
+    note TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_request_events_request (request_id, event_id),
+    FOREIGN KEY (request_id) REFERENCES certificate_requests(request_id) ON DELETE CASCADE
+);
+
+-- Backfill: existing requests only know when they were submitted and when they last changed
+INSERT INTO certificate_request_events (request_id, from_status, to_status, actor, note, created_at)
+SELECT request_id, NULL, 'Pending', 'backfill', NULL, created_at
+FROM certificate_requests
+WHERE request_id NOT IN (SELECT request_id FROM certificate_request_events);
+
+INSERT INTO certificate_request_events (request_id, from_status, to_status, actor, note, created_at)
+SELECT r.request_id, 'Pending', r.status, 'backfill', NULL, COALESCE(r.updated_at, r.created_at)
+FROM certificate_requests r
+WHERE r.status IS NOT NULL AND r.status <> 'Pending'
+  AND NOT EXISTS (SELECT 1 FROM certificate_request_events e
+                  WHERE e.request_id = r.request_id AND e.to_status = r.status);
@@ -0,0 +1,15 @@
+-- Cross-station change feed (see app/change_feed.py)
+-- Every write to certificate requests, payments, residents and notifications
+-- appends the changed keys here; the other stations poll for new rows and
+-- refresh only those rows of their open tables. Rows older than a day are purged.
+USE barangay_db;
+
+CREATE TABLE IF NOT EXISTS change_log (
+    change_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    table_name VARCHAR(64) NOT NULL,
+    row_id BIGINT NULL COMMENT 'Key the views refresh by; NULL = reload the whole table',
+    operation VARCHAR(10) NOT NULL COMMENT 'insert, update or delete',
+    station VARCHAR(100) NULL COMMENT 'Station that made the change',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_change_log_created (created_at)
+);
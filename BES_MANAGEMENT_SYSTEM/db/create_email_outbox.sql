@@ -0,0 +1,16 @@
+-- Create email_outbox table
+-- Emails are queued here by Emailer.queue_email() and delivered by the background sender (app/email_outbox.py)
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    outbox_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    to_address VARCHAR(255) NOT NULL COMMENT 'Recipient email address',
+    subject VARCHAR(255) NULL,
+    body TEXT NULL,
+    status ENUM('Pending', 'Sending', 'Sent', 'Failed') DEFAULT 'Pending' COMMENT 'Delivery status',
+    attempts INT DEFAULT 0 COMMENT 'Number of delivery attempts so far',
+    last_error TEXT NULL COMMENT 'Error from the last failed attempt',
+    next_attempt_at DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT 'When the row is next due (retry backoff / send lease)',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME NULL,
+    INDEX idx_outbox_due (status, next_attempt_at)
+);
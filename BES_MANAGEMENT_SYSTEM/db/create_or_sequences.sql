@@ -0,0 +1,24 @@
+-- Official receipt numbers reserved in blocks per station (app/or_numbers.py)
+USE barangay_db;
+
+CREATE TABLE IF NOT EXISTS or_sequences (
+    series VARCHAR(20) PRIMARY KEY COMMENT 'Year of the series, e.g. 2025',
+    next_number BIGINT NOT NULL DEFAULT 1 COMMENT 'First number not yet reserved by any station'
+);
+
+CREATE TABLE IF NOT EXISTS or_number_blocks (
+    block_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    station VARCHAR(100) NOT NULL COMMENT 'Station (PC) that reserved the block',
+    series VARCHAR(20) NOT NULL,
+    first_number BIGINT NOT NULL,
+    last_number BIGINT NOT NULL,
+    reserved_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    unused_from BIGINT NULL COMMENT 'First number never issued; set when the station shuts down',
+    released_at DATETIME NULL,
+    INDEX idx_or_blocks_series (series, first_number)
+);
+
+-- One payment per OR number. Hand-typed duplicates must be fixed first:
+--   SELECT or_number, COUNT(*) FROM certificate_payments WHERE or_number IS NOT NULL
+--   GROUP BY or_number HAVING COUNT(*) > 1;
+CREATE UNIQUE INDEX uq_payments_or_number ON certificate_payments (or_number);
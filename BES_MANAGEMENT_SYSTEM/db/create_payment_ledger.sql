@@ -0,0 +1,25 @@
+-- Payments ledger: indexed totals and end-of-day closing (app/payment_ledger.py)
+USE barangay_db;
+
+-- Daily / monthly / per-cashier SUM and COUNT of received payments
+CREATE INDEX idx_payments_paid_received ON certificate_payments (is_paid, received_at);
+-- Date window of the Payment Management table
+CREATE INDEX idx_payments_created ON certificate_payments (created_at);
+
+CREATE TABLE IF NOT EXISTS payment_ledger_days (
+    ledger_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    ledger_date DATE NOT NULL COMMENT 'Closed day',
+    received_by_admin_id BIGINT NULL COMMENT 'Cashier account; NULL for payments recorded without one',
+    payment_count INT DEFAULT 0,
+    total_amount DECIMAL(12, 2) DEFAULT 0.00,
+    closed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_ledger_date (ledger_date, received_by_admin_id)
+);
+
+-- Single row stations lock while closing days, so each day is closed once
+CREATE TABLE IF NOT EXISTS payment_ledger_lock (
+    lock_id INT PRIMARY KEY COMMENT 'Always 1',
+    close_count BIGINT NOT NULL DEFAULT 0,
+    locked_at DATETIME NULL
+);
+INSERT IGNORE INTO payment_ledger_lock (lock_id, close_count) VALUES (1, 0);
@@ -0,0 +1,157 @@
+# gui/action_profiler.py
+"""
+On-demand Python profiler for GUI actions (developer tool).
+
+With ACTION_PROFILE_ENABLED (BES_ACTION_PROFILE=1) every show_*_page
+navigation of the sidebar windows and every controller call is captured:
+
+* mode "cprofile" (default): a cProfile run, written as a .pstats file
+  (python -m pstats, snakeviz, or scripts/profile_report.py --top)
+* mode "sample" (BES_ACTION_PROFILE_MODE=sample): the acting thread's stack
+  sampled every ACTION_PROFILE_SAMPLE_MS by a helper thread, written as
+  collapsed stacks ("frame;frame;frame count"), the input of flamegraph.pl
+  and speedscope. Lower overhead, and sleeps/waits show up as well.
+
+Only the outermost action is captured (a controller called by a page is part
+of the page's profile). Actions faster than ACTION_PROFILE_MIN_MS are only
+listed. Each app run gets a session folder under ACTION_PROFILE_DIR with one
+file per action and an actions.jsonl index; scripts/profile_report.py
+summarizes the slowest actions of a session.
+"""
+import os
+import re
+import sys
+import json
+import time
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from app.config import (ACTION_PROFILE_ENABLED, ACTION_PROFILE_MODE, ACTION_PROFILE_DIR, ACTION_PROFILE_SAMPLE_MS,
+                        ACTION_PROFILE_MIN_MS)
+
+ENABLED = ACTION_PROFILE_ENABLED
+INDEX_FILE = "actions.jsonl"
+
+_active = ContextVar("action_profiler_active", default=False)
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, thread_id, interval_ms=ACTION_PROFILE_SAMPLE_MS):
+        super().__init__(name="action-profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class ActionProfiler:
+    def __init__(self, directory=None, mode=ACTION_PROFILE_MODE, min_ms=ACTION_PROFILE_MIN_MS):
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"unknown profile mode {mode!r} (cprofile or sample)")
+        self.directory = Path(directory or Path(ACTION_PROFILE_DIR) / datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self.mode = mode
+        self.min_ms = min_ms
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def capture(self, action: str):
+        """Profile the block as `action` (nested captures are part of the outer one)"""
+        if _active.get():
+            yield
+            return
+        token = _active.set(True)
+        started = datetime.now()
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            if self.mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            _active.reset(token)
+            self.save(action, started, wall_ms, profiler)
+
+    def save(self, action, started, wall_ms, profiler):
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {"seq": seq, "action": action, "started": started.isoformat(timespec="milliseconds"),
+                 "thread": threading.current_thread().name, "wall_ms": round(wall_ms, 2), "file": None}
+        if wall_ms >= self.min_ms:
+            stem = f"{seq:04d}-{started.strftime('%H%M%S')}-{_UNSAFE.sub('_', action)}"
+            if self.mode == "cprofile":
+                entry["file"] = f"{stem}.pstats"
+                profiler.dump_stats(str(self.directory / entry["file"]))
+            else:
+                entry["file"] = f"{stem}.collapsed"
+                with open(self.directory / entry["file"], "w", encoding="utf-8") as f:
+                    for stack, count in profiler.stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+        with self._lock:
+            with open(self.directory / INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+_profiler = None
+
+
+def get_action_profiler():
+    """The session's profiler (created on first use)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ActionProfiler()
+    return _profiler
+
+
+def capture(action: str):
+    return get_action_profiler().capture(action)
+
+
+def instrument_controllers():
+    """Capture every controller call (run_app, when enabled)"""
+    from app.sql_profiler import wrap_controllers
+    count = wrap_controllers(capture)
+    print(f"🔬 Action profiler: {count} controller methods, profiles in {get_action_profiler().directory}")
+    return count
+
+
+def attach_action_profiler(window):
+    """Capture every page navigation of a sidebar window; call before its buttons are connected"""
+    if not ENABLED:
+        return
+    from gui.widgets.sql_profile_panel import page_methods, profiled_page
+    for name in page_methods(window):
+        setattr(window, name, profiled_page(window, name, scope=capture))
@@ -0,0 +1,135 @@
+# gui/certificate_batch.py
+"""
+Batch certificate printing.
+
+Pages are rendered in parallel by worker processes (each with its own offscreen
+QGuiApplication and CertificateRenderer) into QPicture recordings - vector paint
+commands, not bitmaps - that are streamed back in request order. The parent
+replays them into one multi-page PDF, then
+AdminController.mark_certificates_printed() updates every request in a single
+transaction. BatchPrintThread runs all of this off the GUI thread.
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5 import QtCore, QtGui
+from app.config import BATCH_PRINT_WORKERS, BATCH_PRINT_MIN_PARALLEL
+from gui.certificate_renderer import CertificateRenderer, PAGE_WIDTH, PAGE_HEIGHT, PDF_DPI
+
+_worker_app = None
+_worker_renderer = None
+
+
+def _init_worker():
+    """Runs once in every worker process"""
+    global _worker_app, _worker_renderer
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    _worker_app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+    _worker_renderer = CertificateRenderer()
+
+
+def record_page(renderer: CertificateRenderer, fields: dict) -> QtGui.QPicture:
+    picture = QtGui.QPicture()
+    painter = QtGui.QPainter(picture)
+    try:
+        renderer.paint(painter, QtCore.QRectF(0, 0, PAGE_WIDTH, PAGE_HEIGHT), fields)
+    finally:
+        painter.end()
+    return picture
+
+
+def picture_to_bytes(picture: QtGui.QPicture) -> bytes:
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    picture.save(buffer)
+    buffer.close()
+    return bytes(data)
+
+
+def picture_from_bytes(data: bytes) -> QtGui.QPicture:
+    picture = QtGui.QPicture()
+    buffer = QtCore.QBuffer()
+    buffer.setData(data)
+    buffer.open(QtCore.QIODevice.ReadOnly)
+    picture.load(buffer)
+    return picture
+
+
+def record_page_bytes(fields: dict) -> bytes:
+    """Worker task: record one certificate page"""
+    return picture_to_bytes(record_page(_worker_renderer, fields))
+
+
+def iter_page_pictures(pages, workers=BATCH_PRINT_WORKERS):
+    """Yield one QPicture per certificate, in order"""
+    workers = min(workers, os.cpu_count() or 1, len(pages))
+    if workers < 2 or len(pages) < BATCH_PRINT_MIN_PARALLEL:
+        # Not worth starting processes - render here (already off the GUI thread)
+        renderer = CertificateRenderer()
+        for fields in pages:
+            yield record_page(renderer, fields)
+        return
+
+    # "spawn" so workers never inherit the parent's Qt state (fork + Qt is unsafe)
+    context = multiprocessing.get_context("spawn")
+    chunksize = max(1, len(pages) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        for data in pool.map(record_page_bytes, pages, chunksize=chunksize):
+            yield picture_from_bytes(data)
+
+
+def render_batch_pdf(pages, path, workers=BATCH_PRINT_WORKERS, dpi=PDF_DPI, progress=None):
+    """
+    Render every certificate in pages (dicts from certificate_fields) into one PDF.
+    progress(done, total) is called after each page is written.
+    """
+    writer = QtGui.QPdfWriter(str(path))
+    writer.setResolution(dpi)
+    writer.setPageSize(QtGui.QPageSize(QtGui.QPageSize.A4))
+    writer.setPageMargins(QtCore.QMarginsF(0, 0, 0, 0))
+    writer.setTitle("Barangay Certificates")
+    writer.setCreator("Barangay E-Services")
+
+    painter = QtGui.QPainter()
+    if not painter.begin(writer):
+        raise RuntimeError(f"Could not write {path}")
+    try:
+        total = len(pages)
+        scale = writer.width() / PAGE_WIDTH
+        for index, picture in enumerate(iter_page_pictures(pages, workers)):
+            if index:
+                writer.newPage()
+            painter.save()
+            painter.scale(scale, scale)
+            painter.drawPicture(0, 0, picture)
+            painter.restore()
+            if progress:
+                progress(index + 1, total)
+    finally:
+        painter.end()
+    return str(path)
+
+
+class BatchPrintThread(QtCore.QThread):
+    """Renders the merged PDF and updates the requests without blocking the admin window"""
+    progress = QtCore.pyqtSignal(int, int)
+    done = QtCore.pyqtSignal(dict)
+
+    def __init__(self, pages, path, admin_account_id=None, parent=None):
+        super().__init__(parent)
+        self.pages = pages
+        self.path = path
+        self.admin_account_id = admin_account_id
+
+    def run(self):
+        from app.controllers.admin_controller import AdminController
+        try:
+            render_batch_pdf(self.pages, self.path, progress=self.progress.emit)
+            result = AdminController.mark_certificates_printed(
+                [fields["request_id"] for fields in self.pages], self.admin_account_id
+            )
+            result["path"] = str(self.path)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        self.done.emit(result)
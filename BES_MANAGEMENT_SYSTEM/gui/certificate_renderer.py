@@ -0,0 +1,290 @@
+# gui/certificate_renderer.py
+"""
+Offscreen certificate renderer.
+
+Every certificate type is an HTML template compiled once at import: the static
+wording (title, colour, certification clause) is filled in up front and only the
+per-request fields are substituted later. Pages are laid out with QTextDocument
+in 96-dpi page units and painted with QPainter onto a QImage (preview) or a
+QPdfWriter / QPrinter (PDF and printing), so the preview is exactly what prints.
+"""
+import html
+import os
+import re
+from datetime import datetime
+from string import Template
+from PyQt5 import QtCore, QtGui
+
+LAYOUT_DPI = 96
+PAGE_WIDTH = 794    # A4 (210 x 297 mm) at LAYOUT_DPI
+PAGE_HEIGHT = 1123
+PAGE_MARGIN = 60
+HEADER_GAP = 24
+PDF_DPI = 300
+LOGO_PATH = os.path.join(os.path.dirname(__file__), 'ui', 'logo.jpg')
+
+HEADER_HTML = """
+<table width="100%" cellspacing="0" cellpadding="0">
+  <tr>
+    <td width="80" valign="middle"><img src="logo" width="70" height="70"></td>
+    <td align="center" valign="middle">
+      <p style="margin: 0; font-size: 10pt;">Republic of the Philippines</p>
+      <p style="margin: 0; font-size: 10pt; font-weight: bold;">PROVINCE OF BATANGAS</p>
+      <p style="margin: 0; font-size: 10pt; font-style: italic;">Municipality of Calatagan</p>
+      <p style="margin: 0; font-size: 10pt; font-weight: bold;">Barangay Balibago</p>
+    </td>
+    <td width="80"></td>
+  </tr>
+</table>
+"""
+
+BODY_HTML = """
+<p style="text-align: center; font-size: 12pt; font-weight: bold; margin-top: 24px; margin-bottom: 6px; text-decoration: underline;">
+    OFFICE OF THE BARANGAY CAPTAIN
+</p>
+<p style="text-align: center; font-size: 15pt; font-weight: bold; color: ${color}; margin-top: 14px; margin-bottom: 14px;">
+    ${title}
+</p>
+<p style="font-size: 11pt; font-weight: bold; margin-top: 14px; margin-bottom: 10px;">
+    TO WHOM IT MAY CONCERN:
+</p>
+<p style="text-indent: 40px; line-height: 150%; text-align: justify; font-size: 11pt; margin-top: 8px; margin-bottom: 8px;">
+    THIS IS TO CERTIFY that <b><u>$$name</u></b> of legal age, a Filipino Citizen${certify}
+</p>
+<p style="text-indent: 40px; line-height: 150%; text-align: justify; font-size: 11pt; margin-top: 8px; margin-bottom: 8px;">
+    <b>Purpose:</b> $$purpose
+</p>
+<p style="text-indent: 40px; line-height: 150%; text-align: justify; font-size: 11pt; margin-top: 8px; margin-bottom: 8px;">
+    ${closing}
+</p>
+<p style="text-indent: 40px; line-height: 150%; font-size: 11pt; margin-top: 14px; margin-bottom: 14px;">
+    Issued this <u>$$day</u> day of <u>$$month_year</u> at Barangay Balibago, Calatagan, Batangas.
+</p>
+<p style="text-align: center; font-size: 11pt; font-weight: bold; margin-top: 70px; margin-bottom: 0;">
+    _________________________________
+</p>
+<p style="text-align: center; font-size: 10pt; font-style: italic; margin-top: 3px;">
+    Punong Barangay
+</p>
+<p style="text-align: center; font-size: 9pt; font-weight: bold; margin-top: 40px;">
+    NOT VALID WITHOUT SEAL
+</p>
+"""
+
+# Static wording per certificate type
+CERTIFICATE_KINDS = {
+    'business': {
+        'title': 'BARANGAY BUSINESS PERMIT',
+        'color': '#006400',
+        'certify': ' and a bonafide resident of Barangay Balibago, Calatagan, Batangas, is hereby granted '
+                   'this <b>BARANGAY BUSINESS PERMIT</b> to operate a business establishment within the '
+                   'territorial jurisdiction of this barangay.',
+        'closing': 'This permit is issued subject to existing barangay ordinances, rules and regulations, '
+                   'and is valid for one (1) year from the date of issuance unless sooner revoked for cause.',
+        'default_purpose': 'BUSINESS OPERATION',
+    },
+    'indigency': {
+        'title': 'CERTIFICATE OF INDIGENCY',
+        'color': '#8B4513',
+        'certify': ' and a bonafide resident of Barangay Balibago, Calatagan, Batangas, belongs to the '
+                   '<b>INDIGENT FAMILIES</b> in this barangay.',
+        'closing': 'This certification is issued upon the request of the above-mentioned person for whatever '
+                   'legal purpose it may serve, particularly for availing government assistance and other '
+                   'benefits intended for indigent families.',
+        'default_purpose': 'GENERAL PURPOSE',
+    },
+    'id': {
+        'title': 'BARANGAY IDENTIFICATION CERTIFICATE',
+        'color': '#1E90FF',
+        'certify': ', is a bonafide resident of Barangay Balibago, Calatagan, Batangas.',
+        'closing': 'This certification is issued for identification purposes and to certify the residency '
+                   'status of the above-mentioned person.',
+        'default_purpose': 'IDENTIFICATION',
+    },
+    'clearance': {
+        'title': 'BARANGAY CLEARANCE',
+        'color': '#8B0000',
+        'certify': ' and a bonafide resident of Barangay Balibago, Calatagan, Batangas, has no derogatory '
+                   'record filed in this barangay as of this date.',
+        'closing': 'This certification is issued upon the request of the above-mentioned person for whatever '
+                   'legal purpose it may serve.',
+        'default_purpose': 'GENERAL PURPOSE',
+    },
+}
+
+# Compiled once: static parts substituted, $name/$purpose/$day/$month_year left for each request
+BODY_TEMPLATES = {
+    kind: Template(Template(BODY_HTML).substitute(spec))
+    for kind, spec in CERTIFICATE_KINDS.items()
+}
+
+
+def certificate_kind(certificate_type: str) -> str:
+    """Map a certificate_type such as 'Barangay Clearance' to a template key"""
+    cert_type = (certificate_type or '').lower()
+    if 'business' in cert_type:
+        return 'business'
+    if 'indigency' in cert_type:
+        return 'indigency'
+    if 'id' in cert_type:
+        return 'id'
+    return 'clearance'
+
+
+def clean_name_part(name_part: str) -> str:
+    """Remove numeric-only parts and phone numbers from name"""
+    if not name_part:
+        return ""
+    cleaned = re.sub(r'^\d+$', '', name_part)  # Remove pure numbers
+    cleaned = re.sub(r'^\d{10,}', '', cleaned)  # Remove phone numbers at start
+    cleaned = re.sub(r'\d{10,}$', '', cleaned)  # Remove phone numbers at end
+    return cleaned.strip()
+
+
+def certificate_fields(request, resident=None, issued_on=None) -> dict:
+    """
+    Plain data needed to render one certificate.
+    Uses the name from the REQUEST FORM (requests can be made for family members)
+    and falls back to the resident record when the form has no name.
+    """
+    first_name = clean_name_part((request.first_name or "").strip().title())
+    middle_name = clean_name_part((request.middle_name or "").strip().title())
+    last_name = clean_name_part((request.last_name or "").strip().title())
+    suffix = (request.suffix or "").strip().upper()
+
+    resident_name = ' '.join(part for part in (first_name, middle_name, last_name, suffix) if part)
+    if not first_name and not last_name and resident:
+        resident_name = f"{resident.first_name} {resident.last_name}".title()
+
+    return {
+        "request_id": request.request_id,
+        "certificate_type": request.certificate_type,
+        "resident_name": resident_name,
+        "purpose": request.purpose or "",
+        "issued_on": issued_on or datetime.now(),
+    }
+
+
+def day_with_suffix(day: int) -> str:
+    if 10 <= day % 100 <= 20:
+        return f"{day}th"
+    suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
+    return f"{day}{suffix}"
+
+
+def render_body_html(fields: dict) -> str:
+    kind = certificate_kind(fields.get("certificate_type"))
+    purpose = fields.get("purpose") or CERTIFICATE_KINDS[kind]['default_purpose']
+    issued_on = fields.get("issued_on") or datetime.now()
+    return BODY_TEMPLATES[kind].substitute(
+        name=html.escape(fields.get("resident_name", "").upper()),
+        purpose=html.escape(purpose.upper()),
+        day=day_with_suffix(issued_on.day),
+        month_year=issued_on.strftime('%B, %Y'),
+    )
+
+
+class CertificateRenderer:
+    """
+    Paints certificates onto any QPaintDevice. The header (logo and address
+    block) is laid out once and reused; the body document object is reused
+    and only its HTML changes per certificate.
+    Requires a QGuiApplication (QT_QPA_PLATFORM=offscreen works headless).
+    """
+
+    _logo = None
+
+    def __init__(self):
+        # Lay out in fixed 96-dpi units so preview, PDF and printer agree
+        self._layout_device = QtGui.QImage(1, 1, QtGui.QImage.Format_RGB32)
+        dots_per_meter = round(LAYOUT_DPI / 0.0254)
+        self._layout_device.setDotsPerMeterX(dots_per_meter)
+        self._layout_device.setDotsPerMeterY(dots_per_meter)
+
+        self._header = self._new_document()
+        self._header.addResource(QtGui.QTextDocument.ImageResource, QtCore.QUrl("logo"), self.logo())
+        self._header.setHtml(HEADER_HTML)
+        self._body = self._new_document()
+
+    @classmethod
+    def logo(cls) -> QtGui.QImage:
+        """Barangay logo, read from disk once per process"""
+        if cls._logo is None:
+            image = QtGui.QImage(LOGO_PATH) if os.path.exists(LOGO_PATH) else QtGui.QImage()
+            if not image.isNull():
+                image = image.scaled(140, 140, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            cls._logo = image
+        return cls._logo
+
+    def _new_document(self) -> QtGui.QTextDocument:
+        doc = QtGui.QTextDocument()
+        doc.documentLayout().setPaintDevice(self._layout_device)
+        doc.setDocumentMargin(0)
+        doc.setTextWidth(PAGE_WIDTH - 2 * PAGE_MARGIN)
+        return doc
+
+    def paint(self, painter: QtGui.QPainter, target: QtCore.QRectF, fields: dict):
+        """Paint one page scaled to fit the width of target"""
+        scale = target.width() / PAGE_WIDTH
+        painter.save()
+        painter.translate(target.topLeft())
+        painter.scale(scale, scale)
+        painter.fillRect(QtCore.QRectF(0, 0, PAGE_WIDTH, PAGE_HEIGHT), QtCore.Qt.white)
+        painter.translate(PAGE_MARGIN, PAGE_MARGIN)
+        self._header.drawContents(painter)
+        painter.translate(0, self._header.size().height() + HEADER_GAP)
+        self._body.setHtml(render_body_html(fields))
+        self._body.drawContents(painter)
+        painter.restore()
+
+    def render_image(self, fields: dict, dpi: float = LAYOUT_DPI) -> QtGui.QImage:
+        """Render one page to an image (used for the on-screen preview)"""
+        scale = dpi / LAYOUT_DPI
+        image = QtGui.QImage(round(PAGE_WIDTH * scale), round(PAGE_HEIGHT * scale), QtGui.QImage.Format_RGB32)
+        dots_per_meter = round(dpi / 0.0254)
+        image.setDotsPerMeterX(dots_per_meter)
+        image.setDotsPerMeterY(dots_per_meter)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing |
+                               QtGui.QPainter.SmoothPixmapTransform)
+        try:
+            self.paint(painter, QtCore.QRectF(0, 0, image.width(), image.height()), fields)
+        finally:
+            painter.end()
+        return image
+
+    def paint_pages(self, device: QtGui.QPagedPaintDevice, pages):
+        """Paint one certificate per page onto a QPdfWriter or QPrinter"""
+        painter = QtGui.QPainter()
+        if not painter.begin(device):
+            raise RuntimeError("Could not start painting on the output device")
+        try:
+            target = QtCore.QRectF(0, 0, device.width(), device.width() * PAGE_HEIGHT / PAGE_WIDTH)
+            for index, fields in enumerate(pages):
+                if index:
+                    device.newPage()
+                self.paint(painter, target, fields)
+        finally:
+            painter.end()
+
+    def render_pdf(self, pages, path: str, dpi: int = PDF_DPI) -> str:
+        """Write the certificates to a PDF file, one per page"""
+        writer = QtGui.QPdfWriter(path)
+        writer.setResolution(dpi)
+        writer.setPageSize(QtGui.QPageSize(QtGui.QPageSize.A4))
+        writer.setPageMargins(QtCore.QMarginsF(0, 0, 0, 0))
+        writer.setTitle("Barangay Certificate")
+        writer.setCreator("Barangay E-Services")
+        self.paint_pages(writer, pages)
+        return path
+
+
+_shared_renderer = None
+
+
+def shared_renderer() -> CertificateRenderer:
+    """Renderer reused by the GUI so the header and logo are prepared only once"""
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = CertificateRenderer()
+    return _shared_renderer
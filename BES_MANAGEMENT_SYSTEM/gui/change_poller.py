@@ -0,0 +1,75 @@
+# gui/change_poller.py
+"""
+Polls the cross-station change feed (app/change_feed.py) on a background
+thread and hands the changed keys to the GUI thread as Qt signals:
+
+    changed(table_name, keys)   # keys: set of ids; RELOAD (None) among them = reload the table
+
+The sidebar windows connect it to their apply_remote_changes() with
+attach_change_feed(), and the open page re-reads just those rows. The thread
+also purges change_log rows older than CHANGE_FEED_RETENTION_HOURS once an hour.
+"""
+import threading
+import time
+from PyQt5 import QtCore
+from app.change_feed import ChangeReader, purge
+from app.config import CHANGE_FEED_POLL_MS
+
+PURGE_EVERY_SECONDS = 3600
+
+
+class ChangePoller(QtCore.QThread):
+    changed = QtCore.pyqtSignal(str, object)
+
+    def __init__(self, reader=None, interval_ms: int = CHANGE_FEED_POLL_MS, parent=None):
+        super().__init__(parent)
+        self.reader = reader or ChangeReader()
+        self.interval = interval_ms / 1000
+        self._stop = threading.Event()
+        self._purged_at = 0.0
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                for table, keys in self.reader.poll().items():
+                    self.changed.emit(table, keys)
+                if time.monotonic() - self._purged_at > PURGE_EVERY_SECONDS:
+                    self._purged_at = time.monotonic()
+                    purge(self.reader.bind)
+            except Exception as e:
+                # Database unreachable: keep the position and try again on the next poll
+                print(f"⚠️ Change feed poll failed: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self.wait(int(timeout * 1000))
+
+
+_poller = None
+
+
+def start_change_poller(**kwargs):
+    """Start the shared poller (call on the GUI thread once the QApplication exists)"""
+    global _poller
+    if _poller is None:
+        _poller = ChangePoller(**kwargs)
+        _poller.start()
+    return _poller
+
+
+def stop_change_poller(timeout=5):
+    global _poller
+    if _poller is not None:
+        _poller.stop(timeout)
+        _poller = None
+
+
+def get_change_poller():
+    return _poller
+
+
+def attach_change_feed(window):
+    """Deliver other stations' changes to window.apply_remote_changes (if the poller runs)"""
+    if _poller is not None:
+        _poller.changed.connect(window.apply_remote_changes)
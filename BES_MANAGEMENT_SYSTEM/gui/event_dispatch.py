@@ -0,0 +1,31 @@
+# gui/event_dispatch.py
+"""
+Delivers the domain events of app/events.py on the Qt thread.
+
+The first event published after a delivery emits a queued signal; its slot
+runs bus.flush() on the GUI thread on the next pass of the event loop. Every
+event published before that - by the same click handler or by a worker
+thread - is coalesced into the same delivery.
+"""
+from PyQt5 import QtCore
+from app.events import bus
+
+
+class EventDispatcher(QtCore.QObject):
+    wake = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.wake.connect(bus.flush, QtCore.Qt.QueuedConnection)
+
+
+_dispatcher = None
+
+
+def install_event_dispatch(app):
+    """Route event delivery through the Qt event loop (call on the GUI thread)"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = EventDispatcher(app)
+        bus.set_scheduler(_dispatcher.wake.emit)
+    return _dispatcher
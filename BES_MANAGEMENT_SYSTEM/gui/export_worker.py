@@ -0,0 +1,128 @@
+# gui/export_worker.py
+"""
+Runs app.exports.export_table() on a background thread so exporting a large
+table never freezes the admin window, and the export dialog that picks the
+table, columns, filters and file.
+"""
+from datetime import datetime
+from PyQt5 import QtCore, QtWidgets
+from app.exports import EXPORTS, REQUEST_STATUSES, PAYMENT_STATUSES, column_names, column_label, export_table
+from app.config import EXPORT_FOLDER
+
+
+class ExportThread(QtCore.QThread):
+    progress = QtCore.pyqtSignal(int, int)
+    done = QtCore.pyqtSignal(dict)
+
+    def __init__(self, kind, path, columns=None, filters=None, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+        self.path = path
+        self.columns = columns
+        self.filters = filters
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        result = export_table(self.kind, self.path, self.columns, self.filters,
+                              progress=self.progress.emit, cancelled=lambda: self._cancelled)
+        self.done.emit(result)
+
+
+class ExportDialog(QtWidgets.QDialog):
+    """Table, columns and filters of an export"""
+
+    def __init__(self, kind="residents", sitios=(), parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export")
+        self.resize(520, 620)
+        layout = QtWidgets.QVBoxLayout(self)
+        form = QtWidgets.QFormLayout()
+
+        self.kind_combo = QtWidgets.QComboBox()
+        for key, spec in EXPORTS.items():
+            self.kind_combo.addItem(spec.title, key)
+        self.kind_combo.setCurrentIndex(max(0, self.kind_combo.findData(kind)))
+        self.kind_combo.currentIndexChanged.connect(self.load_kind)
+        form.addRow("Table:", self.kind_combo)
+
+        self.sitio_combo = QtWidgets.QComboBox()
+        self.sitio_combo.addItem("All sitios", None)
+        for sitio in sitios:
+            self.sitio_combo.addItem(sitio, sitio)
+        form.addRow("Sitio:", self.sitio_combo)
+
+        self.status_combo = QtWidgets.QComboBox()
+        form.addRow("Status:", self.status_combo)
+
+        date_row = QtWidgets.QHBoxLayout()
+        self.date_check = QtWidgets.QCheckBox("Only")
+        self.date_field_combo = QtWidgets.QComboBox()
+        self.date_from = QtWidgets.QDateEdit(QtCore.QDate.currentDate().addMonths(-1))
+        self.date_to = QtWidgets.QDateEdit(QtCore.QDate.currentDate())
+        for widget in (self.date_from, self.date_to):
+            widget.setCalendarPopup(True)
+            widget.setDisplayFormat("MMM d, yyyy")
+        date_row.addWidget(self.date_check)
+        date_row.addWidget(self.date_field_combo)
+        date_row.addWidget(self.date_from)
+        date_row.addWidget(QtWidgets.QLabel("to"))
+        date_row.addWidget(self.date_to)
+        form.addRow("Dates:", date_row)
+        layout.addLayout(form)
+
+        layout.addWidget(QtWidgets.QLabel("Columns:"))
+        self.column_list = QtWidgets.QListWidget()
+        layout.addWidget(self.column_list, 1)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        btn_layout.addStretch()
+        export_btn = QtWidgets.QPushButton("📤 Export...")
+        export_btn.setStyleSheet("background-color: #27ae60; color: white; border-radius: 5px; padding: 8px 16px; font-weight: bold;")
+        export_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(export_btn)
+        cancel_btn = QtWidgets.QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        self.load_kind()
+
+    def kind(self):
+        return self.kind_combo.currentData()
+
+    def load_kind(self):
+        kind = self.kind()
+        spec = EXPORTS[kind]
+        self.column_list.clear()
+        for name in column_names(kind):
+            item = QtWidgets.QListWidgetItem(column_label(name))
+            item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.Checked if name in spec.default_columns else QtCore.Qt.Unchecked)
+            item.setData(QtCore.Qt.UserRole, name)
+            self.column_list.addItem(item)
+        self.status_combo.clear()
+        self.status_combo.addItem("All", None)
+        for status in {"requests": REQUEST_STATUSES, "payments": PAYMENT_STATUSES}.get(kind, []):
+            self.status_combo.addItem(status, status)
+        self.status_combo.setEnabled(kind != "residents")
+        self.date_field_combo.clear()
+        for field in spec.date_fields:
+            self.date_field_combo.addItem(column_label(field), field)
+
+    def columns(self):
+        # Keep the table's column order
+        return [self.column_list.item(i).data(QtCore.Qt.UserRole) for i in range(self.column_list.count())
+                if self.column_list.item(i).checkState() == QtCore.Qt.Checked]
+
+    def filters(self):
+        filters = {"sitio": self.sitio_combo.currentData(), "status": self.status_combo.currentData()}
+        if self.date_check.isChecked():
+            filters.update(date_field=self.date_field_combo.currentData(),
+                           date_from=self.date_from.date().toPyDate(), date_to=self.date_to.date().toPyDate())
+        return filters
+
+    def default_path(self):
+        EXPORT_FOLDER.mkdir(parents=True, exist_ok=True)
+        return EXPORT_FOLDER / f"{self.kind()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -0,0 +1,72 @@
+# gui/prefetch.py
+"""
+Loads the dashboard's first screen while the login window shows its
+"Login successful" message.
+
+LoginWindow calls start_prefetch() with the UserSession of the verified OTP
+(app/user_session.py); its role picks the dashboard. That dashboard's
+first-screen queries - its module's prefetch_jobs() - run concurrently on
+PREFETCH_WORKERS threads, each with its own session. done is emitted on the
+GUI thread with
+
+    {<job name>: result, ...}
+
+and the window is built from that dict: its first paint makes no query of
+its own. A job that failed is left out of the dict, so the window simply
+runs that query itself.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5 import QtCore
+from app.config import PREFETCH_WORKERS
+
+
+def dashboard_jobs(user_session):
+    """The first-screen queries of the user's dashboard: {name: callable}"""
+    if user_session.is_admin():
+        from gui.views.sidebar_home_view import prefetch_jobs
+    else:
+        from gui.views.sidebar_home_user_view import prefetch_jobs
+    return prefetch_jobs(user_session)
+
+
+def prefetch_dashboard(user_session, workers=PREFETCH_WORKERS):
+    """Run the dashboard's jobs concurrently (any thread)"""
+    result = {}
+    jobs = dashboard_jobs(user_session)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(job) for name, job in jobs.items()}
+        for name, future in futures.items():
+            try:
+                result[name] = future.result()
+            except Exception as e:
+                print(f"⚠️ Prefetch of {name} failed: {e}")
+    return result
+
+
+class PrefetchThread(QtCore.QThread):
+    done = QtCore.pyqtSignal(dict)
+
+    def __init__(self, user_session, workers=PREFETCH_WORKERS, parent=None):
+        super().__init__(parent)
+        self.user_session = user_session
+        self.workers = workers
+
+    def run(self):
+        try:
+            result = prefetch_dashboard(self.user_session, self.workers)
+        except Exception as e:
+            # Database unreachable: the dashboard runs its own queries (and reports the error)
+            print(f"⚠️ Dashboard prefetch failed: {e}")
+            result = {}
+        self.done.emit(result)
+
+
+def start_prefetch(parent, user_session, on_done):
+    """Start prefetching the user's dashboard; on_done(result) is called on the GUI thread"""
+    thread = PrefetchThread(user_session, parent=parent)
+    # Keep a reference until the thread finishes
+    parent._prefetch_thread = thread
+    thread.done.connect(on_done)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread
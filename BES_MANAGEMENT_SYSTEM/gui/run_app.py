@@ -19,6 +19,12 @@ sys.path.append(str(root_dir))
 from PyQt5 import QtWidgets, QtCore, uic
 from gui.views.login_view import LoginWindow
 from gui.window_state import save_window_state, apply_window_state
+from app.config import (EMAIL_OUTBOX_ENABLED, SYNC_ENABLED, SQL_PROFILE_ENABLED, STALL_WATCHDOG_ENABLED,
+                        ACTION_PROFILE_ENABLED, CHANGE_FEED_ENABLED)
+from app.db import engine
+from app.schema import create_schema
+from app.email_outbox import start_outbox_sender, stop_outbox_sender
+import app.reference_cache  # registers the cache version listeners for every session
 
 UI_DIR = Path(__file__).resolve().parent / "ui"
 WELCOME_UI = UI_DIR / "loginUi3_revised_2.ui"
@@ -27,6 +33,51 @@ WELCOME_UI = UI_DIR / "loginUi3_revised_2.ui"
 def main():
     app = QtWidgets.QApplication(sys.argv)
 
+    # Domain events (app/events.py) reach the open pages on the Qt thread, coalesced per event-loop pass
+    from gui.event_dispatch import install_event_dispatch
+    install_event_dispatch(app)
+
+    # Record where the event loop freezes (hidden report in the sidebar windows)
+    if STALL_WATCHDOG_ENABLED:
+        from gui.stall_watchdog import start_stall_watchdog, stop_stall_watchdog
+        start_stall_watchdog()
+        app.aboutToQuit.connect(stop_stall_watchdog)
+
+    # The embedded database has no setup scripts: create missing tables on every start
+    if engine.dialect.name == "sqlite":
+        create_schema(engine)
+
+    # Local replica: screens use the SQLite copy, changes reach the central MySQL in the background
+    if SYNC_ENABLED:
+        from app.sync import ensure_replica, start_sync_worker, stop_sync_worker
+        ensure_replica(engine)
+        start_sync_worker()
+        app.aboutToQuit.connect(stop_sync_worker)
+
+    # Developer SQL profiler: statements per controller action (pages are wrapped by the windows)
+    if SQL_PROFILE_ENABLED:
+        from app.sql_profiler import instrument_controllers
+        instrument_controllers()
+    # Developer action profiler: a cProfile/stack-sample file per controller call and page
+    if ACTION_PROFILE_ENABLED:
+        from gui import action_profiler
+        action_profiler.instrument_controllers()
+
+    # Numbers left in this station's OR block are recorded as unused on exit
+    from app.or_numbers import release_or_numbers
+    app.aboutToQuit.connect(release_or_numbers)
+
+    # Other stations' changes refresh the open admin tables row by row
+    if CHANGE_FEED_ENABLED:
+        from gui.change_poller import start_change_poller, stop_change_poller
+        start_change_poller()
+        app.aboutToQuit.connect(stop_change_poller)
+
+    # Deliver queued emails in the background so admin actions never wait on SMTP
+    if EMAIL_OUTBOX_ENABLED:
+        start_outbox_sender()
+        app.aboutToQuit.connect(stop_outbox_sender)
+
     # Load welcome/landing UI first
     welcome = QtWidgets.QDialog()
     uic.loadUi(str(WELCOME_UI), welcome)
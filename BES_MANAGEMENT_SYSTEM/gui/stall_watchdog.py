@@ -0,0 +1,151 @@
+# gui/stall_watchdog.py
+"""
+Event-loop stall watchdog: finds what freezes the GUI.
+
+A heartbeat QTimer on the GUI thread stamps the time every
+STALL_HEARTBEAT_MS. A monitor thread checks the stamp; when the heartbeat is
+more than STALL_THRESHOLD_MS late the GUI thread is stuck in some handler,
+and the monitor samples its Python stack (sys._current_frames) until the
+heartbeat comes back. The stall is then recorded with its duration and call
+site - the innermost frame in this project's code, so a freeze inside
+SQLAlchemy or Qt is charged to the page method that called it.
+
+The last STALL_HISTORY stalls are kept; top_offenders() aggregates them by
+call site. Cost while nothing stalls: one timer callback per heartbeat and
+one thread wake-up per check, so it stays on in production
+(STALL_WATCHDOG_ENABLED). The report is opened from the sidebar windows with
+a hidden shortcut (gui/widgets/stall_report_panel.py).
+"""
+import sys
+import time
+import threading
+import traceback
+from collections import deque, namedtuple, Counter
+from datetime import datetime
+from pathlib import Path
+from PyQt5 import QtCore
+from app.config import STALL_THRESHOLD_MS, STALL_HEARTBEAT_MS, STALL_HISTORY
+
+PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+Stall = namedtuple("Stall", "at duration_ms site stack")
+
+
+def call_site(frames):
+    """'file:line in function' of the innermost frame in project code (else the innermost frame)"""
+    for frame in reversed(frames):
+        if frame.filename.startswith(PROJECT_DIR) and "site-packages" not in frame.filename \
+                and not frame.filename.endswith("stall_watchdog.py"):
+            break
+    else:
+        frame = frames[-1]
+    filename = frame.filename[len(PROJECT_DIR) + 1:] if frame.filename.startswith(PROJECT_DIR) else frame.filename
+    return f"{filename}:{frame.lineno} in {frame.name}"
+
+
+class StallMonitor(threading.Thread):
+    """Daemon thread that watches the heartbeat and samples the GUI thread's stack while it is late"""
+
+    def __init__(self, watchdog):
+        super().__init__(name="gui-stall-monitor", daemon=True)
+        self.watchdog = watchdog
+        self.gui_thread_id = threading.main_thread().ident
+        # Check a few times per threshold so short stalls are still sampled
+        self.check_seconds = max(watchdog.threshold_ms / 4, 5) / 1000
+        self._stop_event = threading.Event()
+
+    def run(self):
+        stalled_beat, sites, stacks = None, Counter(), {}
+        while not self._stop_event.wait(self.check_seconds):
+            beat = self.watchdog.last_beat
+            late_ms = (time.perf_counter() - beat) * 1000 - self.watchdog.heartbeat_ms
+            if late_ms >= self.watchdog.threshold_ms:
+                if stalled_beat != beat:
+                    stalled_beat, sites, stacks = beat, Counter(), {}
+                frame = sys._current_frames().get(self.gui_thread_id)
+                if frame is not None:
+                    frames = traceback.extract_stack(frame)
+                    site = call_site(frames)
+                    sites[site] += 1
+                    stacks.setdefault(site, "".join(traceback.format_list(frames)))
+                    del frame
+            elif stalled_beat is not None and beat != stalled_beat:
+                # The heartbeat is back: the stall lasted from the last beat before it to this one
+                if sites:
+                    site = sites.most_common(1)[0][0]
+                    duration_ms = (beat - stalled_beat) * 1000 - self.watchdog.heartbeat_ms
+                    self.watchdog.record(Stall(datetime.now(), duration_ms, site, stacks[site]))
+                stalled_beat = None
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+
+class StallWatchdog(QtCore.QObject):
+    def __init__(self, threshold_ms=STALL_THRESHOLD_MS, heartbeat_ms=STALL_HEARTBEAT_MS, history=STALL_HISTORY,
+                 parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.stalls = deque(maxlen=history)
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self.last_beat = time.perf_counter()
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+        self.monitor = StallMonitor(self)
+
+    def beat(self):
+        self.last_beat = time.perf_counter()
+
+    def start(self):
+        self.last_beat = time.perf_counter()
+        self.timer.start(self.heartbeat_ms)
+        self.monitor.start()
+
+    def stop(self, timeout=None):
+        self.timer.stop()
+        self.monitor.stop(timeout)
+
+    def record(self, stall):
+        with self._lock:
+            self.stalls.append(stall)
+
+    def top_offenders(self, limit=20):
+        """[{"site", "count", "total_ms", "max_ms", "last_at", "stack"}] by total stall time"""
+        with self._lock:
+            stalls = list(self.stalls)
+        by_site = {}
+        for stall in stalls:
+            entry = by_site.setdefault(stall.site, {"site": stall.site, "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += stall.duration_ms
+            if stall.duration_ms >= entry["max_ms"]:
+                entry["max_ms"], entry["stack"] = stall.duration_ms, stall.stack
+            entry["last_at"] = stall.at
+        return sorted(by_site.values(), key=lambda entry: -entry["total_ms"])[:limit]
+
+
+_watchdog = None
+
+
+def start_stall_watchdog(**kwargs):
+    """Start the shared watchdog (call on the GUI thread once the QApplication exists)"""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = StallWatchdog(**kwargs)
+        _watchdog.start()
+    return _watchdog
+
+
+def stop_stall_watchdog(timeout=2):
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop(timeout)
+        _watchdog = None
+
+
+def get_stall_watchdog():
+    return _watchdog
@@ -0,0 +1,56 @@
+# gui/upload_worker.py
+"""
+Runs app.uploads.store_upload() on a background thread so copying and hashing
+large files never freezes the window. Validation (size/extension) happens
+on the GUI thread first, so bad files are rejected instantly.
+"""
+from PyQt5 import QtCore
+from app.uploads import store_upload, validate_upload
+from app.config import ALLOWED_EXTENSIONS, MAX_UPLOAD_SIZE
+
+
+class UploadThread(QtCore.QThread):
+    progress = QtCore.pyqtSignal(int, int)
+    done = QtCore.pyqtSignal(dict)
+
+    def __init__(self, src, allowed_extensions=ALLOWED_EXTENSIONS, max_size=MAX_UPLOAD_SIZE, kind=None, parent=None):
+        super().__init__(parent)
+        self.src = src
+        self.kind = kind
+        self.allowed_extensions = allowed_extensions
+        self.max_size = max_size
+
+    def run(self):
+        try:
+            result = store_upload(self.src, self.allowed_extensions, self.max_size,
+                                  progress=self.progress.emit, kind=self.kind)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        self.done.emit(result)
+
+
+def start_upload(parent, src, on_done, allowed_extensions=ALLOWED_EXTENSIONS, max_size=MAX_UPLOAD_SIZE, kind=None):
+    """
+    Validate src and start uploading it in the background.
+    kind ('photo', 'id', 'official', 'announcement') turns on image normalization.
+    on_done(result) is called on the GUI thread with the store_upload() result.
+    Returns the error message (and starts nothing) if the file is rejected.
+    """
+    error = validate_upload(src, allowed_extensions, max_size)
+    if error:
+        return error
+    thread = UploadThread(src, allowed_extensions, max_size, kind, parent=parent)
+    # Keep a reference until the thread finishes
+    threads = getattr(parent, "_upload_threads", None)
+    if threads is None:
+        threads = parent._upload_threads = set()
+    threads.add(thread)
+
+    def finished(result):
+        threads.discard(thread)
+        on_done(result)
+
+    thread.done.connect(finished)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return None
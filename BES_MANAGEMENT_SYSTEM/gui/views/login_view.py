@@ -4,6 +4,8 @@ from pathlib import Path
 from app.controllers.auth_controllers import AuthController
 from gui.widgets.notification_bar import NotificationBar
 from gui.window_state import save_window_state, apply_window_state
+from gui.prefetch import start_prefetch
+from app.config import LOGIN_TRANSITION_MS
 
 # Import compiled resources for background images
 try:
@@ -77,6 +79,11 @@ class LoginWindow(QtWidgets.QDialog):
         
         # Initialize current_username
         self.current_username = None
+        # The logged-in user (app/user_session.py), set once the OTP is verified
+        self.user_session = None
+        # Dashboard data loaded during the post-login transition (gui/prefetch.py)
+        self.prefetched = None
+        self.transition_over = False
         
         # Connect buttons
         try:
@@ -245,23 +252,32 @@ class LoginWindow(QtWidgets.QDialog):
             return
         
         # Success!
+        self.user_session = verify["session"]
         self.notification.show_success("Login successful! Welcome back!")
         
-        # Wait a moment for user to see the success message, then check role
-        QtCore.QTimer.singleShot(1500, self.open_dashboard_by_role)
+        # Load the dashboard's first screen on worker threads while the user sees the success
+        # message; the dashboard opens once both the message time and the prefetch are over
+        self.prefetched = None
+        self.transition_over = False
+        start_prefetch(self, self.user_session, self.on_prefetched)
+        QtCore.QTimer.singleShot(LOGIN_TRANSITION_MS, self.on_transition_over)
+    
+    def on_prefetched(self, result):
+        self.prefetched = result
+        if self.transition_over:
+            self.open_dashboard_by_role()
+    
+    def on_transition_over(self):
+        self.transition_over = True
+        if self.prefetched is not None:
+            self.open_dashboard_by_role()
     
     def open_dashboard_by_role(self):
         """Open appropriate dashboard based on user role"""
         try:
-            from app.db import SessionLocal
-            from app.models import Account
-            
-            # Get user's role
-            db = SessionLocal()
-            account = db.query(Account).filter(Account.username == self.current_username).first()
-            db.close()
+            user_session = self.user_session
             
-            if not account:
+            if not user_session:
                 self.notification.show_error("Account not found!")
                 return
             
@@ -269,16 +285,17 @@ class LoginWindow(QtWidgets.QDialog):
             save_window_state(self)
             
             # Check role and open appropriate dashboard
-            if account.user_role in ['Admin', 'Staff']:
+            if user_session.is_admin():
                 # ADMIN DASHBOARD
                 from gui.views.sidebar_home_view import SidebarHomeWindow
-                self.dashboard = SidebarHomeWindow()
+                self.dashboard = SidebarHomeWindow(admin_account_id=user_session.account_id, prefetched=self.prefetched,
+                                                   user_session=user_session)
                 apply_window_state(self.dashboard)
 
             else:
                 # USER DASHBOARD (Resident)
                 from gui.views.sidebar_home_user_view import SidebarHomeUserWindow
-                self.dashboard = SidebarHomeUserWindow(username=self.current_username)
+                self.dashboard = SidebarHomeUserWindow(user_session=user_session, prefetched=self.prefetched)
                 apply_window_state(self.dashboard)
 
             self.close()
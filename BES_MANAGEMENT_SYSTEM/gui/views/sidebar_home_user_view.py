@@ -2,10 +2,17 @@
 from PyQt5 import uic, QtWidgets, QtCore, QtGui
 from pathlib import Path
 from gui.widgets.notification_bar import NotificationBar
+from gui.widgets.sql_profile_panel import attach_sql_profiler
+from gui.widgets.stall_report_panel import attach_stall_report
+from gui.action_profiler import attach_action_profiler
+from gui.change_poller import attach_change_feed
 from gui.window_state import save_window_state, apply_window_state
 from app.db import SessionLocal
-from app.models import Resident, Account
+from app.models import Resident
 from app.config import get_philippine_time
+from app.user_session import load_session, refresh_session
+from app.events import bus, ResidentUpdated
+from app.change_feed import RELOAD
 import math
 
 UI_PATH = Path(__file__).resolve().parent.parent / "ui" / "sidebarhomee_USER.ui"
@@ -515,18 +522,216 @@ class AnimatedCircleProgress(QtWidgets.QWidget):
         painter.drawText(title_rect, QtCore.Qt.AlignCenter, self.title)
 
 
+# ============ DASHBOARD DATA ============
+# Module-level so the post-login prefetch (gui/prefetch.py) can run them on worker threads
+# before the window exists; each opens its own session.
+
+# Filter the dashboard opens with: monthly bars for this year, counts over all requests
+DEFAULT_DASHBOARD_FILTER = {'type': 'year', 'start_date': None, 'end_date': None}
+
+
+def resident_dashboard_stats(resident_id, dashboard_filter):
+    """Certificate type and status counts of one resident's requests"""
+    from app.models import CertificateRequest
+    from datetime import datetime
+    
+    stats = {
+        'barangay_id': 0,
+        'business_permit': 0,
+        'indigency': 0,
+        'clearance': 0,
+        'completed': 0,
+        'rejected': 0,
+        'pending': 0,
+        'cancelled': 0,
+    }
+    
+    db = SessionLocal()
+    try:
+        # Query ONLY this resident's certificate requests
+        query = db.query(CertificateRequest.certificate_type, CertificateRequest.status).filter(
+            CertificateRequest.resident_id == resident_id
+        )
+        
+        # Apply date filter if set
+        if dashboard_filter.get('type') != 'all':
+            start_date = dashboard_filter.get('start_date')
+            end_date = dashboard_filter.get('end_date')
+            
+            if start_date and end_date:
+                # Filter by date range
+                query = query.filter(
+                    CertificateRequest.created_at >= datetime.combine(start_date, datetime.min.time()),
+                    CertificateRequest.created_at <= datetime.combine(end_date, datetime.max.time())
+                )
+                print(f"📅 Filter: {start_date} to {end_date}")
+        
+        requests = query.all()
+    finally:
+        db.close()
+    
+    print(f"📊 Loaded {len(requests)} requests for resident {resident_id}")
+    
+    for certificate_type, status in requests:
+        cert_type = (certificate_type or '').lower()
+        status = (status or '').lower().strip()
+        
+        # Count certificate types
+        if 'id' in cert_type:
+            stats['barangay_id'] += 1
+        elif 'permit' in cert_type or 'business' in cert_type:
+            stats['business_permit'] += 1
+        elif 'indigency' in cert_type:
+            stats['indigency'] += 1
+        elif 'clearance' in cert_type:
+            stats['clearance'] += 1
+        
+        # Count statuses (map to dashboard categories)
+        if 'completed' in status or 'complete' in status:
+            stats['completed'] += 1
+        elif 'declined' in status or 'rejected' in status or 'reject' in status:
+            stats['rejected'] += 1
+        elif 'cancelled' in status or 'cancel' in status:
+            stats['cancelled'] += 1
+        elif 'pending' in status or 'processing' in status or 'under review' in status or 'ready' in status:
+            stats['pending'] += 1
+    
+    return stats
+
+
+def resident_request_summary(resident_id, dashboard_filter):
+    """Bar chart labels and values: one resident's requests per period of the filter"""
+    from app.models import CertificateRequest
+    from datetime import datetime, timedelta
+    from collections import defaultdict
+    
+    print(f"📊 Getting request data for resident_id={resident_id}")
+    
+    # Determine date range based on filter
+    filter_type = dashboard_filter.get('type', 'year')
+    start_date = dashboard_filter.get('start_date')
+    end_date = dashboard_filter.get('end_date') or datetime.now().date()
+    
+    # Set default start date based on filter type
+    if not start_date:
+        if filter_type == 'today':
+            start_date = end_date
+        elif filter_type == 'week':
+            start_date = end_date - timedelta(days=6)
+        elif filter_type == 'month':
+            start_date = end_date.replace(day=1)
+        elif filter_type == 'year':
+            start_date = end_date.replace(month=1, day=1)
+        else:  # all
+            start_date = datetime(2020, 1, 1).date()
+    
+    print(f"📅 Date range: {start_date} to {end_date}, filter: {filter_type}")
+    
+    db = SessionLocal()
+    try:
+        # Query requests from CertificateRequest table for this resident
+        requests_query = db.query(CertificateRequest.created_at).filter(
+            CertificateRequest.resident_id == resident_id
+        )
+        
+        # Apply date filter based on when request was created
+        if start_date and end_date:
+            requests_query = requests_query.filter(
+                CertificateRequest.created_at >= datetime.combine(start_date, datetime.min.time()),
+                CertificateRequest.created_at <= datetime.combine(end_date, datetime.max.time())
+            )
+        
+        created = [created_at for (created_at,) in requests_query]
+    finally:
+        db.close()
+    
+    print(f"📄 Loaded {len(created)} requests for resident {resident_id}")
+    
+    # Group requests by appropriate time period
+    request_data = defaultdict(int)
+    
+    for req_date in created:
+        # Use created_at date for grouping
+        if req_date:
+            if filter_type == 'today':
+                # Round to nearest 3-hour block
+                hour_block = (req_date.hour // 3) * 3
+                key = datetime(2000, 1, 1, hour_block).strftime('%I %p').lstrip('0')
+            elif filter_type == 'week':
+                day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+                key = day_names[req_date.weekday()]
+            elif filter_type == 'month':
+                week_num = (req_date.day - 1) // 7 + 1
+                key = f"Week {week_num}"
+            elif filter_type == 'year':
+                month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
+                              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+                key = month_names[req_date.month - 1]
+            else:  # all
+                key = str(req_date.year)
+            
+            request_data[key] += 1
+    
+    # Generate labels and values based on filter type
+    if filter_type == 'today':
+        labels = []
+        for h in range(0, 24, 3):
+            label = datetime(2000, 1, 1, h).strftime('%I %p').lstrip('0')
+            labels.append(label)
+        values = [request_data.get(l, 0) for l in labels]
+        
+    elif filter_type == 'week':
+        labels = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        values = [request_data.get(d, 0) for d in labels]
+        
+    elif filter_type == 'month':
+        labels = ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5']
+        values = [request_data.get(w, 0) for w in labels]
+        
+    elif filter_type == 'year':
+        labels = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
+                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+        values = [request_data.get(m, 0) for m in labels]
+        
+    else:  # all time
+        if request_data:
+            labels = sorted(request_data.keys())
+            values = [request_data[y] for y in labels]
+        else:
+            labels = [str(datetime.now().year)]
+            values = [0]
+    
+    total = sum(values)
+    print(f"📊 Request summary (Total: {total}): {dict(zip(labels, values))}")
+    
+    return {'labels': labels, 'values': values}
+
+
+def prefetch_jobs(user_session):
+    """First-screen queries of a resident's dashboard, by the key the window looks them up with"""
+    if not user_session.resident_id:
+        return {}
+    resident_id = user_session.resident_id
+    return {
+        'dashboard_stats': lambda: resident_dashboard_stats(resident_id, DEFAULT_DASHBOARD_FILTER),
+        'request_summary': lambda: resident_request_summary(resident_id, DEFAULT_DASHBOARD_FILTER),
+    }
+
+
 # ============ MAIN WINDOW CLASS ============
 
 class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     """User Dashboard Interface - For Residents"""
     
-    def __init__(self, username=None):
+    def __init__(self, username=None, prefetched=None, user_session=None):
         super().__init__()
         uic.loadUi(str(UI_PATH), self)
         
-        self.username = username
-        self.account = None
-        self.resident = None
+        # The logged-in user (app/user_session.py), handed to every page widget
+        self.user_session = user_session
+        self.username = user_session.username if user_session else username
+        # First-screen data loaded during the login transition (gui/prefetch.py); used once
+        self.prefetched = dict(prefetched or {})
         
         # Load user data
         self.load_user_data()
@@ -544,29 +749,41 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
         # Find the main content area
         self.find_content_area()
         
+        # Developer tools: the SQL (BES_SQL_PROFILE=1) and action (BES_ACTION_PROFILE=1) profilers wrap
+        # page navigations before they are connected; Ctrl+Shift+F12 opens the GUI stall report
+        attach_sql_profiler(self)
+        attach_action_profiler(self)
+        attach_stall_report(self)
+        # New notifications from the admin stations appear without reopening the page (BES_CHANGE_FEED)
+        attach_change_feed(self)
+        # Profile edits (here or at the barangay hall) refresh the session's display fields
+        bus.subscribe(ResidentUpdated, self.on_residents_updated)
+        
         # Connect buttons
         self.connect_buttons()
         
+        # Coming from the login: open on the dashboard, built from the prefetched data
+        if prefetched is not None:
+            self.show_dashboard_page()
+        
         # Show welcome message
-        if self.resident:
-            self.notification.show_success(f"✅ Welcome, {self.resident.first_name}!")
+        if self.user_session and self.user_session.first_name:
+            self.notification.show_success(f"✅ Welcome, {self.user_session.first_name}!")
     
     def load_user_data(self):
-        """Load user account and resident data"""
-        if not self.username:
+        """Look up the logged-in user, unless the login passed the session in"""
+        if self.user_session is not None or not self.username:
             return
             
-        db = SessionLocal()
         try:
-            self.account = db.query(Account).filter(Account.username == self.username).first()
-            if self.account and self.account.resident_id:
-                self.resident = db.query(Resident).filter(
-                    Resident.resident_id == self.account.resident_id
-                ).first()
+            self.user_session = load_session(self.username)
         except Exception as e:
             pass
-        finally:
-            db.close()
+    
+    def on_residents_updated(self, event):
+        # (RELOAD from the change feed: it lost track of which residents changed)
+        if self.user_session and {self.user_session.resident_id, RELOAD} & set(event.resident_ids):
+            self.user_session = refresh_session(self.user_session)
     
     def find_content_area(self):
         """Find the main white content area where we'll load pages"""
@@ -646,11 +863,7 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
         try:
             # Initialize filter state
             if not hasattr(self, 'dashboard_filter'):
-                self.dashboard_filter = {
-                    'type': 'year',  # Default to year for monthly breakdown
-                    'start_date': None,
-                    'end_date': None,
-                }
+                self.dashboard_filter = dict(DEFAULT_DASHBOARD_FILTER)  # year: monthly breakdown
 
             # Create a fully responsive dashboard using code instead of fixed UI
             dashboard_widget = self.create_responsive_dashboard()
@@ -1073,82 +1286,18 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     
     def get_dashboard_stats(self):
         """Get statistics for the dashboard from database - ONLY for logged-in user"""
-        stats = {
-            'barangay_id': 0,
-            'business_permit': 0,
-            'indigency': 0,
-            'clearance': 0,
-            'completed': 0,
-            'rejected': 0,
-            'pending': 0,
-            'cancelled': 0,
-        }
-        
+        if 'dashboard_stats' in self.prefetched:
+            return self.prefetched.pop('dashboard_stats')
         try:
-            from app.db import SessionLocal
-            from app.models import CertificateRequest
-            from datetime import datetime
-            
             # Ensure user is logged in and has a resident record
-            if not self.account or not self.resident:
+            if not self.user_session or not self.user_session.resident_id:
                 print("❌ No user logged in - using sample data")
                 return self._get_sample_stats()
-            
-            db = SessionLocal()
-            resident_id = self.resident.resident_id
-            
-            # Query ONLY this resident's certificate requests
-            query = db.query(CertificateRequest).filter(
-                CertificateRequest.resident_id == resident_id
-            )
-            
-            # Apply date filter if set
-            if hasattr(self, 'dashboard_filter') and self.dashboard_filter.get('type') != 'all':
-                start_date = self.dashboard_filter.get('start_date')
-                end_date = self.dashboard_filter.get('end_date')
-                
-                if start_date and end_date:
-                    # Filter by date range
-                    query = query.filter(
-                        CertificateRequest.created_at >= datetime.combine(start_date, datetime.min.time()),
-                        CertificateRequest.created_at <= datetime.combine(end_date, datetime.max.time())
-                    )
-                    print(f"📅 Filter: {start_date} to {end_date}")
-            
-            requests = query.all()
-            
-            print(f"📊 Loaded {len(requests)} requests for resident {resident_id} ({self.username})")
-            
-            for req in requests:
-                cert_type = (req.certificate_type or '').lower()
-                status = (req.status or '').lower().strip()
-                
-                # Count certificate types
-                if 'id' in cert_type:
-                    stats['barangay_id'] += 1
-                elif 'permit' in cert_type or 'business' in cert_type:
-                    stats['business_permit'] += 1
-                elif 'indigency' in cert_type:
-                    stats['indigency'] += 1
-                elif 'clearance' in cert_type:
-                    stats['clearance'] += 1
-                
-                # Count statuses (map to dashboard categories)
-                if 'completed' in status or 'complete' in status:
-                    stats['completed'] += 1
-                elif 'declined' in status or 'rejected' in status or 'reject' in status:
-                    stats['rejected'] += 1
-                elif 'cancelled' in status or 'cancel' in status:
-                    stats['cancelled'] += 1
-                elif 'pending' in status or 'processing' in status or 'under review' in status or 'ready' in status:
-                    stats['pending'] += 1
-            
-            db.close()
+            return resident_dashboard_stats(self.user_session.resident_id,
+                                            getattr(self, 'dashboard_filter', DEFAULT_DASHBOARD_FILTER))
         except Exception as e:
             print(f"❌ Error loading dashboard stats: {e}")
             return self._get_sample_stats()
-        
-        return stats
     
     def _get_sample_stats(self):
         """Return sample data for demo purposes"""
@@ -1165,126 +1314,15 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     
     def get_request_summary_data(self):
         """Get request summary data for bar chart based on certificate requests"""
-        from datetime import datetime, timedelta
-        from collections import defaultdict
-        
+        if 'request_summary' in self.prefetched:
+            return self.prefetched.pop('request_summary')
         try:
-            from app.db import SessionLocal
-            from app.models import CertificateRequest
-            
             # Ensure user is logged in
-            if not self.account or not self.resident:
-                print(f"❌ No user logged in - account:{self.account} resident:{self.resident}")
+            if not self.user_session or not self.user_session.resident_id:
+                print(f"❌ No user logged in - session:{self.user_session}")
                 return {'labels': [], 'values': []}
-            
-            db = SessionLocal()
-            resident_id = self.resident.resident_id
-            print(f"📊 Getting request data for resident_id={resident_id}")
-            
-            # Determine date range based on filter
-            filter_type = 'year'  # Default to year for better visibility
-            start_date = None
-            end_date = datetime.now().date()
-            
-            if hasattr(self, 'dashboard_filter'):
-                filter_type = self.dashboard_filter.get('type', 'year')
-                start_date = self.dashboard_filter.get('start_date')
-                end_date = self.dashboard_filter.get('end_date') or datetime.now().date()
-            
-            # Set default start date based on filter type
-            if not start_date:
-                if filter_type == 'today':
-                    start_date = end_date
-                elif filter_type == 'week':
-                    start_date = end_date - timedelta(days=6)
-                elif filter_type == 'month':
-                    start_date = end_date.replace(day=1)
-                elif filter_type == 'year':
-                    start_date = end_date.replace(month=1, day=1)
-                else:  # all
-                    start_date = datetime(2020, 1, 1).date()
-            
-            print(f"📅 Date range: {start_date} to {end_date}, filter: {filter_type}")
-            
-            # Query requests from CertificateRequest table for this resident
-            requests_query = db.query(CertificateRequest).filter(
-                CertificateRequest.resident_id == resident_id
-            )
-            
-            # Apply date filter based on when request was created
-            if start_date and end_date:
-                requests_query = requests_query.filter(
-                    CertificateRequest.created_at >= datetime.combine(start_date, datetime.min.time()),
-                    CertificateRequest.created_at <= datetime.combine(end_date, datetime.max.time())
-                )
-            
-            requests = requests_query.all()
-            
-            print(f"📄 Loaded {len(requests)} requests for resident {resident_id}")
-            
-            # Group requests by appropriate time period
-            request_data = defaultdict(int)
-            
-            for req in requests:
-                # Use created_at date for grouping
-                req_date = req.created_at
-                
-                if req_date:
-                    if filter_type == 'today':
-                        # Round to nearest 3-hour block
-                        hour_block = (req_date.hour // 3) * 3
-                        key = datetime(2000, 1, 1, hour_block).strftime('%I %p').lstrip('0')
-                    elif filter_type == 'week':
-                        day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-                        key = day_names[req_date.weekday()]
-                    elif filter_type == 'month':
-                        week_num = (req_date.day - 1) // 7 + 1
-                        key = f"Week {week_num}"
-                    elif filter_type == 'year':
-                        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                        key = month_names[req_date.month - 1]
-                    else:  # all
-                        key = str(req_date.year)
-                    
-                    request_data[key] += 1
-            
-            # Generate labels and values based on filter type
-            if filter_type == 'today':
-                labels = []
-                for h in range(0, 24, 3):
-                    label = datetime(2000, 1, 1, h).strftime('%I %p').lstrip('0')
-                    labels.append(label)
-                values = [request_data.get(l, 0) for l in labels]
-                
-            elif filter_type == 'week':
-                labels = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-                values = [request_data.get(d, 0) for d in labels]
-                
-            elif filter_type == 'month':
-                labels = ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5']
-                values = [request_data.get(w, 0) for w in labels]
-                
-            elif filter_type == 'year':
-                labels = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                         'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                values = [request_data.get(m, 0) for m in labels]
-                
-            else:  # all time
-                if request_data:
-                    labels = sorted(request_data.keys())
-                    values = [request_data[y] for y in labels]
-                else:
-                    labels = [str(datetime.now().year)]
-                    values = [0]
-            
-            db.close()
-            
-            total = sum(values)
-            print(f"📊 Request summary (Total: {total}): {dict(zip(labels, values))}")
-            
-            return {'labels': labels, 'values': values}
-            
+            return resident_request_summary(self.user_session.resident_id,
+                                            getattr(self, 'dashboard_filter', DEFAULT_DASHBOARD_FILTER))
         except Exception as e:
             print(f"❌ Error loading request summary: {e}")
             import traceback
@@ -1857,13 +1895,14 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     def upload_photo(self, form_widget):
         """Handle photo/valid ID upload"""
         try:
+            from app.uploads import IMAGE_EXTENSIONS
             # Open file dialog
             file_dialog = QtWidgets.QFileDialog()
             file_path, _ = file_dialog.getOpenFileName(
                 self,
                 "Select Photo or Valid ID",
                 "",
-                "Image Files (*.png *.jpg *.jpeg);;All Files (*)"
+                "Image Files (*.png *.jpg *.jpeg)"
             )
             
             if file_path:
@@ -1877,6 +1916,9 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
                     # Load and display image
                     pixmap = QtGui.QPixmap(file_path)
                     if not pixmap.isNull():
+                        # Copy into the upload store in the background (size/type checked first)
+                        if not self.start_form_upload(form_widget, file_path, 'uploaded_photo_path', IMAGE_EXTENSIONS, 'photo'):
+                            return
                         # Scale to fit the label
                         label_size = img_label.size()
                         scaled_pixmap = pixmap.scaled(
@@ -1886,12 +1928,6 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
                         )
                         img_label.setPixmap(scaled_pixmap)
                         img_label.setText("")
-                        
-                        # Store file path
-                        form_widget.uploaded_photo_path = file_path
-                        
-                        self.notification.show_success("✅ Photo uploaded!")
-
                     else:
                         self.notification.show_error("❌ Failed to load photo")
                 else:
@@ -1902,13 +1938,14 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     def upload_valid_id(self, form_widget):
         """Handle Valid ID upload (bottom upload button)"""
         try:
+            from app.config import ALLOWED_EXTENSIONS
             # Open file dialog
             file_dialog = QtWidgets.QFileDialog()
             file_path, _ = file_dialog.getOpenFileName(
                 self,
                 "Select Valid ID",
                 "",
-                "Image Files (*.png *.jpg *.jpeg *.pdf);;All Files (*)"
+                "Image Files (*.png *.jpg *.jpeg *.pdf)"
             )
             
             if file_path:
@@ -1918,6 +1955,8 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
                     # Load and display image
                     pixmap = QtGui.QPixmap(file_path)
                     if not pixmap.isNull():
+                        if not self.start_form_upload(form_widget, file_path, 'uploaded_valid_id_path', ALLOWED_EXTENSIONS, 'id'):
+                            return
                         scaled_pixmap = pixmap.scaled(
                             200, 120,
                             QtCore.Qt.KeepAspectRatio,
@@ -1925,12 +1964,6 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
                         )
                         img_label.setPixmap(scaled_pixmap)
                         img_label.setText("")
-                        
-                        # Store file path
-                        form_widget.uploaded_valid_id_path = file_path
-                        
-                        self.notification.show_success("✅ Valid ID uploaded!")
-
                     else:
                         self.notification.show_error("❌ Failed to load Valid ID")
                 else:
@@ -1938,10 +1971,40 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
         except Exception as e:
             self.notification.show_error(f"❌ Upload error: {e}")
 
+    def start_form_upload(self, form_widget, file_path, attribute, allowed_extensions, kind):
+        """
+        Start a background upload for a request form. When it finishes the stored
+        path is saved on form_widget.<attribute> and as uploaded_file_path
+        (the Valid ID wins over the photo); the Valid ID's audit copy goes to
+        original_file_path. Returns False if the file was rejected.
+        """
+        from gui.upload_worker import start_upload
+
+        def on_done(result):
+            form_widget.uploads_in_progress = getattr(form_widget, 'uploads_in_progress', 1) - 1
+            if not result["success"]:
+                self.notification.show_error(f"❌ Upload error: {result['error']}")
+                return
+            setattr(form_widget, attribute, result["path"])
+            if attribute == 'uploaded_valid_id_path' or not getattr(form_widget, 'uploaded_valid_id_path', None):
+                form_widget.uploaded_file_path = result["path"]
+                form_widget.original_file_path = result["original_path"]
+            self.notification.show_success("✅ Valid ID uploaded!" if attribute == 'uploaded_valid_id_path' else "✅ Photo uploaded!")
+
+        error = start_upload(self, file_path, on_done, allowed_extensions=allowed_extensions, kind=kind)
+        if error:
+            self.notification.show_error(f"❌ {error}")
+            return False
+        form_widget.uploads_in_progress = getattr(form_widget, 'uploads_in_progress', 0) + 1
+        return True
+
     def submit_certificate_request(self, certificate_type, form_widget, dialog=None):
         """Handle certificate request submission"""
 
         try:
+            if getattr(form_widget, 'uploads_in_progress', 0) > 0:
+                self.notification.show_warning("⏳ Please wait for your upload to finish")
+                return
             # Import the model
             from app.models import CertificateRequest
             from datetime import datetime
@@ -2029,20 +2092,17 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
             
             try:
                 # Get the current user's resident_id
-                if not self.username:
+                if not self.user_session:
                     self.notification.show_error("❌ User not logged in")
                     return
                 
-                # Get resident_id from account
-                from app.models import Account
-                account = db.query(Account).filter(Account.username == self.username).first()
-                if not account or not account.resident_id:
+                if not self.user_session.resident_id:
                     self.notification.show_error("❌ User account not found")
                     return
                 
                 # Create new certificate request
                 new_request = CertificateRequest(
-                    resident_id=account.resident_id,
+                    resident_id=self.user_session.resident_id,
                     certificate_type=certificate_type,
                     last_name=last_name,
                     first_name=first_name,
@@ -2052,13 +2112,17 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
                     purpose=purpose,
                     quantity=quantity,
                     uploaded_file_path=getattr(form_widget, 'uploaded_file_path', None),  # From upload
-                    status='Pending',
+                    original_file_path=getattr(form_widget, 'original_file_path', None),
                     created_at=get_philippine_time()
                 )
+                from app.request_events import set_request_status
+                set_request_status(new_request, 'Pending', actor=self.username)
                 
                 # Save to database
                 db.add(new_request)
                 db.commit()
+                from app.events import publish, RequestStatusChanged
+                publish(RequestStatusChanged({new_request.request_id}))
 
                 self.notification.show_success(f"✅ {certificate_type} request submitted successfully!")
                 
@@ -2085,11 +2149,9 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     def load_services_content(self, widget):
         """Load available services from database"""
         try:
-            from app.models import Service
+            from app.reference_cache import all_services
             
-            db = SessionLocal()
-            services = db.query(Service).all()
-            db.close()
+            services = all_services()
             
             
             # TODO: Populate service cards/buttons in the UI
@@ -2139,6 +2201,20 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
         except Exception as e:
             pass
 
+    def apply_remote_changes(self, table_name, keys):
+        """Change feed: update the notifications page if it is open (and the session on a profile edit)"""
+        if table_name == "residents":
+            self.on_residents_updated(ResidentUpdated(keys))
+            return
+        widget = getattr(self, 'notifications_widget', None)
+        if table_name != "notifications" or widget is None:
+            return
+        try:
+            widget.apply_changes(keys)
+        except RuntimeError:
+            # The notifications page was closed in the meantime
+            self.notifications_widget = None
+
     def show_notifications_page(self):
         """Show user notifications from database"""
         try:
@@ -2146,7 +2222,8 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
             from gui.widgets.notification_viewer import NotificationViewerWidget
             
             # Create the notification viewer widget
-            notifications_widget = NotificationViewerWidget(username=self.username, parent=self)
+            notifications_widget = NotificationViewerWidget(user_session=self.user_session, parent=self)
+            self.notifications_widget = notifications_widget
             
             # Set size policy to expand
             notifications_widget.setSizePolicy(
@@ -2215,7 +2292,7 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
                 from gui.widgets.request_status_tracker import RequestStatusWidget
                 
                 # Create the status tracker (this will go INSIDE the scroll area)
-                tracker_widget = RequestStatusWidget(username=self.username, parent=status_widget)
+                tracker_widget = RequestStatusWidget(user_session=self.user_session, parent=status_widget)
                 
                 # Set the tracker as the widget for the scroll area
                 scroll_area.setWidget(tracker_widget)
@@ -2224,7 +2301,7 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
 
                 # Fallback: use tracker directly if scroll area not found
                 from gui.widgets.request_status_tracker import RequestStatusWidget
-                status_widget = RequestStatusWidget(username=self.username, parent=self)
+                status_widget = RequestStatusWidget(user_session=self.user_session, parent=self)
             
             # Set size policy to expand
             status_widget.setSizePolicy(
@@ -2305,8 +2382,7 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
     def show_officials_page(self):
         """Show officials page - view only (same data as admin)"""
         try:
-            from app.models import BarangayOfficial
-            from app.db import SessionLocal
+            from app.reference_cache import active_officials
             
             # Create main container with scroll area for responsiveness
             main_widget = QtWidgets.QWidget()
@@ -2354,120 +2430,113 @@ class SidebarHomeUserWindow(QtWidgets.QMainWindow):
             content_layout.setSpacing(15)
             content_layout.setAlignment(QtCore.Qt.AlignTop | QtCore.Qt.AlignHCenter)
             
-            # Fetch officials from database
-            db = SessionLocal()
-            try:
-                officials = db.query(BarangayOfficial).filter(
-                    BarangayOfficial.is_active == True
-                ).order_by(BarangayOfficial.display_order).all()
-                
-                # Separate by category
-                captain = None
-                sanggunian = []
-                others = []
+            # Active officials (cached until an official is added, edited or removed)
+            officials = active_officials()
+            
+            # Separate by category
+            captain = None
+            sanggunian = []
+            others = []
+            
+            for official in officials:
+                if 'kapitan' in official.position.lower() or 'captain' in official.position.lower() or 'punong' in official.position.lower():
+                    captain = official
+                elif official.category == 'Other':
+                    others.append(official)
+                else:
+                    sanggunian.append(official)
+            
+            # If no officials in database, show default/placeholder
+            if not officials:
+                no_data_label = QtWidgets.QLabel("No officials data yet.\nPlease contact the admin to add barangay officials.")
+                no_data_label.setStyleSheet("""
+                    font-size: 14pt;
+                    color: #666;
+                    padding: 50px;
+                    background: white;
+                    border-radius: 10px;
+                """)
+                no_data_label.setAlignment(QtCore.Qt.AlignCenter)
+                content_layout.addWidget(no_data_label)
+            else:
+                # === BARANGAY CAPTAIN (centered at top) ===
+                if captain:
+                    captain_card = self.create_official_card(captain.position, captain.full_name, captain.photo_path, is_captain=True)
+                    content_layout.addWidget(captain_card, alignment=QtCore.Qt.AlignHCenter)
                 
-                for official in officials:
-                    if 'kapitan' in official.position.lower() or 'captain' in official.position.lower() or 'punong' in official.position.lower():
-                        captain = official
-                    elif official.category == 'Other':
-                        others.append(official)
-                    else:
-                        sanggunian.append(official)
+                # === TWO COLUMNS: Sanggunian (left) and Other Officials (right) ===
+                two_columns = QtWidgets.QHBoxLayout()
+                two_columns.setSpacing(20)
+                two_columns.setAlignment(QtCore.Qt.AlignCenter)
                 
-                # If no officials in database, show default/placeholder
-                if not officials:
-                    no_data_label = QtWidgets.QLabel("No officials data yet.\nPlease contact the admin to add barangay officials.")
-                    no_data_label.setStyleSheet("""
-                        font-size: 14pt;
-                        color: #666;
-                        padding: 50px;
-                        background: white;
-                        border-radius: 10px;
-                    """)
-                    no_data_label.setAlignment(QtCore.Qt.AlignCenter)
-                    content_layout.addWidget(no_data_label)
-                else:
-                    # === BARANGAY CAPTAIN (centered at top) ===
-                    if captain:
-                        captain_card = self.create_official_card(captain.position, captain.full_name, captain.photo_path, is_captain=True)
-                        content_layout.addWidget(captain_card, alignment=QtCore.Qt.AlignHCenter)
+                # LEFT COLUMN - Sangguniang Barangay
+                if sanggunian:
+                    left_container = QtWidgets.QFrame()
+                    left_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
+                    left_layout = QtWidgets.QVBoxLayout(left_container)
+                    left_layout.setContentsMargins(15, 10, 15, 15)
+                    left_layout.setSpacing(10)
                     
-                    # === TWO COLUMNS: Sanggunian (left) and Other Officials (right) ===
-                    two_columns = QtWidgets.QHBoxLayout()
-                    two_columns.setSpacing(20)
-                    two_columns.setAlignment(QtCore.Qt.AlignCenter)
+                    sanggunian_title = QtWidgets.QLabel("SANGGUNIANG BARANGAY")
+                    sanggunian_title.setStyleSheet("""
+                        font-size: 12pt; font-weight: bold; color: white;
+                        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
+                        padding: 8px 15px; border-radius: 5px;
+                    """)
+                    sanggunian_title.setAlignment(QtCore.Qt.AlignCenter)
+                    left_layout.addWidget(sanggunian_title)
                     
-                    # LEFT COLUMN - Sangguniang Barangay
-                    if sanggunian:
-                        left_container = QtWidgets.QFrame()
-                        left_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
-                        left_layout = QtWidgets.QVBoxLayout(left_container)
-                        left_layout.setContentsMargins(15, 10, 15, 15)
-                        left_layout.setSpacing(10)
-                        
-                        sanggunian_title = QtWidgets.QLabel("SANGGUNIANG BARANGAY")
-                        sanggunian_title.setStyleSheet("""
-                            font-size: 12pt; font-weight: bold; color: white;
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
-                            padding: 8px 15px; border-radius: 5px;
-                        """)
-                        sanggunian_title.setAlignment(QtCore.Qt.AlignCenter)
-                        left_layout.addWidget(sanggunian_title)
-                        
-                        # Grid layout for sanggunian (3 columns)
-                        grid_widget = QtWidgets.QWidget()
-                        grid_layout = QtWidgets.QGridLayout(grid_widget)
-                        grid_layout.setSpacing(10)
-                        grid_layout.setAlignment(QtCore.Qt.AlignCenter)
-                        
-                        for i, official in enumerate(sanggunian):
-                            row = i // 3
-                            col = i % 3
-                            card = self.create_official_card(official.position, official.full_name, official.photo_path)
-                            grid_layout.addWidget(card, row, col)
-                        
-                        left_layout.addWidget(grid_widget)
-                        two_columns.addWidget(left_container)
+                    # Grid layout for sanggunian (3 columns)
+                    grid_widget = QtWidgets.QWidget()
+                    grid_layout = QtWidgets.QGridLayout(grid_widget)
+                    grid_layout.setSpacing(10)
+                    grid_layout.setAlignment(QtCore.Qt.AlignCenter)
                     
-                    # RIGHT COLUMN - Other Officials
-                    if others:
-                        right_container = QtWidgets.QFrame()
-                        right_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
-                        right_layout = QtWidgets.QVBoxLayout(right_container)
-                        right_layout.setContentsMargins(15, 10, 15, 15)
-                        right_layout.setSpacing(10)
-                        
-                        other_title = QtWidgets.QLabel("OTHER OFFICIALS")
-                        other_title.setStyleSheet("""
-                            font-size: 12pt; font-weight: bold; color: white;
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
-                            padding: 8px 15px; border-radius: 5px;
-                        """)
-                        other_title.setAlignment(QtCore.Qt.AlignCenter)
-                        right_layout.addWidget(other_title)
-                        
-                        # Grid layout for others (3 columns)
-                        others_grid = QtWidgets.QWidget()
-                        others_layout = QtWidgets.QGridLayout(others_grid)
-                        others_layout.setSpacing(10)
-                        others_layout.setAlignment(QtCore.Qt.AlignCenter)
-                        
-                        for i, official in enumerate(others):
-                            row = i // 3
-                            col = i % 3
-                            card = self.create_official_card(official.position, official.full_name, official.photo_path)
-                            others_layout.addWidget(card, row, col)
-                        
-                        right_layout.addWidget(others_grid)
-                        right_layout.addStretch()
-                        two_columns.addWidget(right_container)
+                    for i, official in enumerate(sanggunian):
+                        row = i // 3
+                        col = i % 3
+                        card = self.create_official_card(official.position, official.full_name, official.photo_path)
+                        grid_layout.addWidget(card, row, col)
                     
-                    content_layout.addLayout(two_columns)
+                    left_layout.addWidget(grid_widget)
+                    two_columns.addWidget(left_container)
                 
-                content_layout.addStretch()
+                # RIGHT COLUMN - Other Officials
+                if others:
+                    right_container = QtWidgets.QFrame()
+                    right_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
+                    right_layout = QtWidgets.QVBoxLayout(right_container)
+                    right_layout.setContentsMargins(15, 10, 15, 15)
+                    right_layout.setSpacing(10)
+                    
+                    other_title = QtWidgets.QLabel("OTHER OFFICIALS")
+                    other_title.setStyleSheet("""
+                        font-size: 12pt; font-weight: bold; color: white;
+                        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
+                        padding: 8px 15px; border-radius: 5px;
+                    """)
+                    other_title.setAlignment(QtCore.Qt.AlignCenter)
+                    right_layout.addWidget(other_title)
+                    
+                    # Grid layout for others (3 columns)
+                    others_grid = QtWidgets.QWidget()
+                    others_layout = QtWidgets.QGridLayout(others_grid)
+                    others_layout.setSpacing(10)
+                    others_layout.setAlignment(QtCore.Qt.AlignCenter)
+                    
+                    for i, official in enumerate(others):
+                        row = i // 3
+                        col = i % 3
+                        card = self.create_official_card(official.position, official.full_name, official.photo_path)
+                        others_layout.addWidget(card, row, col)
+                    
+                    right_layout.addWidget(others_grid)
+                    right_layout.addStretch()
+                    two_columns.addWidget(right_container)
                 
-            finally:
-                db.close()
+                content_layout.addLayout(two_columns)
+            
+            content_layout.addStretch()
             
             scroll_area.setWidget(content_widget)
             main_layout.addWidget(scroll_area)
@@ -2,10 +2,16 @@
 from PyQt5 import uic, QtWidgets, QtCore, QtGui
 from pathlib import Path
 from gui.widgets.notification_bar import NotificationBar
+from gui.widgets.sql_profile_panel import attach_sql_profiler
+from gui.widgets.stall_report_panel import attach_stall_report
+from gui.action_profiler import attach_action_profiler
+from gui.change_poller import attach_change_feed
 from gui.window_state import save_window_state, apply_window_state
 from app.db import SessionLocal
 from app.models import Resident
-from app.config import get_philippine_time
+from app.change_feed import RELOAD
+from app.events import (bus, publish, publish_on_commit, RequestStatusChanged, PaymentRecorded, ResidentUpdated,
+                        BlotterUpdated)
 UI_PATH = Path(__file__).resolve().parent.parent / "ui" / "sidebarhomee.ui"
 ADMIN_RESIDENTS_UI_PATH = Path(__file__).resolve().parent.parent / "ui" / "admin_residents.ui"
 ADMIN_BLOTTER_UI_PATH = Path(__file__).resolve().parent.parent / "ui" / "Blotter.ui"
@@ -72,14 +78,14 @@ class AdminAnimatedCircleProgress(QtWidgets.QWidget):
         painter.drawText(QtCore.QRectF(-radius, -radius, radius * 2, radius * 2),
                         QtCore.Qt.AlignCenter, str(self.value))
 class AdminAnimatedBarChart(QtWidgets.QWidget):
-    """Animated bar chart for transactions"""
-    def __init__(self, parent=None):
+    """Animated bar chart for transactions (the last 8 months' requests unless labels/values are given)"""
+    def __init__(self, months=None, values=None, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(250)
         # Sample data - months and values
-        self.months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug']
-        self.values = [45, 78, 52, 89, 63, 95, 72, 58]
-        self.max_value = max(self.values) if self.values else 100
+        self.months = months or ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug']
+        self.values = values or [45, 78, 52, 89, 63, 95, 72, 58]
+        self.max_value = max(self.values) if self.values and max(self.values) > 0 else 100
         self.animation_progress = 0.0
         self.colors = [
             QtGui.QColor("#667eea"),
@@ -92,7 +98,8 @@ class AdminAnimatedBarChart(QtWidgets.QWidget):
             QtGui.QColor("#38f9d7"),
         ]
         # Try to get real data
-        self.load_real_data()
+        if months is None:
+            self.load_real_data()
         # Animation timer
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.animate)
@@ -428,10 +435,114 @@ class AdminSitioBarChart(QtWidgets.QWidget):
                 painter.drawText(QtCore.QRectF(left_margin + bar_width + 5, y, 50, bar_height),
                                QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, str(display_val))
 # ============== END OF ANIMATED CHART CLASSES ==============
+# ============== DASHBOARD STATISTICS ==============
+# Module-level so the post-login prefetch (gui/prefetch.py) can run the parts concurrently
+# on worker threads before the window exists; each opens its own session.
+def resident_dashboard_stats():
+    """Resident counts and the residents per sitio"""
+    from sqlalchemy import func
+    session = SessionLocal()
+    try:
+        # === RESIDENT STATISTICS ===
+        stats = {
+            'total_residents': session.query(Resident).count(),
+            'male': session.query(Resident).filter(Resident.gender == 'Male').count(),
+            'female': session.query(Resident).filter(Resident.gender == 'Female').count(),
+            'voters': session.query(Resident).filter(Resident.registered_voter == True).count(),
+            'fourps': session.query(Resident).filter(Resident.fourps_member == True).count(),
+            'solo_parent': session.query(Resident).filter(Resident.solo_parent == True).count(),
+            'indigent': session.query(Resident).filter(Resident.indigent == True).count(),
+        }
+        # === RESIDENTS PER SITIO ===
+        sitio_counts = session.query(
+            Resident.sitio, func.count(Resident.resident_id)
+        ).group_by(Resident.sitio).order_by(func.count(Resident.resident_id).desc()).limit(8).all()
+        stats['sitio_data'] = [(sitio or 'Unknown', count) for sitio, count in sitio_counts]
+        if not stats['sitio_data']:
+            stats['sitio_data'] = [('No Data', 0)]
+        return stats
+    finally:
+        session.close()
+def request_dashboard_stats():
+    """Certificate type and status counts and the monthly trend (sample trend if unavailable)"""
+    from datetime import datetime, timedelta
+    stats = {'months': [], 'monthly_requests': []}
+    session = SessionLocal()
+    try:
+        from app.models import CertificateRequest
+        stats['barangay_id'] = session.query(CertificateRequest).filter(
+            CertificateRequest.certificate_type.ilike('%id%')
+        ).count()
+        stats['business_permit'] = session.query(CertificateRequest).filter(
+            CertificateRequest.certificate_type.ilike('%business%')
+        ).count()
+        stats['indigency'] = session.query(CertificateRequest).filter(
+            CertificateRequest.certificate_type.ilike('%indigency%')
+        ).count()
+        stats['clearance'] = session.query(CertificateRequest).filter(
+            CertificateRequest.certificate_type.ilike('%clearance%')
+        ).count()
+        stats['completed'] = session.query(CertificateRequest).filter(
+            CertificateRequest.status.ilike('%completed%')
+        ).count()
+        stats['pending'] = session.query(CertificateRequest).filter(
+            CertificateRequest.status.ilike('%pending%')
+        ).count()
+        stats['rejected'] = session.query(CertificateRequest).filter(
+            CertificateRequest.status.ilike('%rejected%')
+        ).count()
+        stats['total_requests'] = session.query(CertificateRequest).count()
+        stats['transactions'] = stats['completed']  # Completed = paid transactions
+        # === MONTHLY TREND (last 6 months) ===
+        for i in range(5, -1, -1):
+            date = datetime.now() - timedelta(days=i*30)
+            month_name = date.strftime('%b')
+            stats['months'].append(month_name)
+            start_date = date.replace(day=1)
+            if date.month == 12:
+                end_date = date.replace(year=date.year+1, month=1, day=1)
+            else:
+                end_date = date.replace(month=date.month+1, day=1)
+            count = session.query(CertificateRequest).filter(
+                CertificateRequest.created_at >= start_date,
+                CertificateRequest.created_at < end_date
+            ).count()
+            stats['monthly_requests'].append(count if count > 0 else (6-i) * 3)
+    except Exception as e:
+        stats['months'] = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+        stats['monthly_requests'] = [5, 12, 8, 15, 10, 18]
+    finally:
+        session.close()
+    return stats
+def blotter_dashboard_stats():
+    """Number of blotter records"""
+    session = SessionLocal()
+    try:
+        from app.models import Blotter
+        return {'blotters': session.query(Blotter).count()}
+    except:
+        return {'blotters': 0}
+    finally:
+        session.close()
+# Parts of the admin dashboard's statistics, in the order they used to be read
+DASHBOARD_STAT_PARTS = {
+    'resident_stats': resident_dashboard_stats,
+    'request_stats': request_dashboard_stats,
+    'blotter_stats': blotter_dashboard_stats,
+}
+def prefetch_jobs(user_session):
+    """First-screen queries of the admin dashboard, by the key the window looks them up with"""
+    return dict(DASHBOARD_STAT_PARTS)
 class SidebarHomeWindow(QtWidgets.QMainWindow):
-    def __init__(self):
+    def __init__(self, admin_account_id=None, prefetched=None, user_session=None):
         super().__init__()
         uic.loadUi(str(UI_PATH), self)
+        # The logged-in admin/staff user (app/user_session.py)
+        self.user_session = user_session
+        # Logged-in admin/staff account; recorded as the cashier of the payments they receive
+        self.admin_account_id = admin_account_id or (user_session.account_id if user_session else None)
+        # First-screen data loaded during the login transition (gui/prefetch.py); used once
+        self.prefetched = dict(prefetched or {})
         # Set window properties - FULLSCREEN CAPABLE
         self.setWindowTitle("Barangay E-Services - Admin Dashboard")
         self.setWindowFlags(QtCore.Qt.Window | 
@@ -442,8 +553,34 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
         self.notification = NotificationBar(self)
         # Find the main content area
         self.find_content_area()
+        # Developer tools: the SQL (BES_SQL_PROFILE=1) and action (BES_ACTION_PROFILE=1) profilers wrap
+        # page navigations before they are connected; Ctrl+Shift+F12 opens the GUI stall report
+        attach_sql_profiler(self)
+        attach_action_profiler(self)
+        attach_stall_report(self)
+        # Other stations' changes refresh just their rows on the open page (BES_CHANGE_FEED)
+        attach_change_feed(self)
+        # ...and so do this station's own saves (app/events.py)
+        self.connect_events()
         # Connect buttons
         self.connect_buttons()
+        # Coming from the login: open on the dashboard, built from the prefetched statistics
+        if prefetched is not None:
+            self.show_dashboard_page()
+    def connect_events(self):
+        """Domain events published after a commit update the affected rows of the open page"""
+        bus.subscribe(RequestStatusChanged, self.on_requests_changed)
+        bus.subscribe(PaymentRecorded, self.on_payments_recorded)
+        bus.subscribe(ResidentUpdated, self.on_residents_updated)
+        bus.subscribe(BlotterUpdated, self.on_blotters_updated)
+    def on_requests_changed(self, event):
+        self.refresh_open_pages("certificate_requests", event.request_ids)
+    def on_payments_recorded(self, event):
+        self.refresh_open_pages("certificate_payments", event.request_ids)
+    def on_residents_updated(self, event):
+        self.refresh_open_pages("residents", event.resident_ids)
+    def on_blotters_updated(self, event):
+        self.refresh_open_pages("blotters", event.blotter_ids)
     def find_content_area(self):
         """Find the main white content area where we'll load pages"""
         # Look for QStackedWidget first
@@ -608,6 +745,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             residents_widget.resize(self.content_area.size())
             # Find and connect the Add Resident button
             self.connect_add_resident_button(residents_widget)
+            self.add_export_button(residents_widget)
             # Connect search functionality
             self.connect_search_button(residents_widget)
             # LOAD DATA INTO TABLE
@@ -657,20 +795,11 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             table = widget.findChild(QtWidgets.QTableWidget, "tableWidget")
             if not table:
                 return
+            self.residents_table = table
+            self.residents_search = search_text
             # Fetch data
             db = SessionLocal()
-            query = db.query(Resident)
-            # Apply search filter if provided
-            if search_text:
-                search_filter = f"%{search_text}%"
-                query = query.filter(
-                    (Resident.last_name.like(search_filter)) |
-                    (Resident.first_name.like(search_filter)) |
-                    (Resident.middle_name.like(search_filter)) |
-                    (Resident.sitio.like(search_filter)) |
-                    (Resident.contact_number.like(search_filter))
-                )
-            residents = query.all()
+            residents = self.filter_residents(db.query(Resident), search_text).all()
             db.close()
             # Clear table
             table.setRowCount(0)
@@ -681,55 +810,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             # Populate rows
             for row_idx, r in enumerate(residents):
                 table.insertRow(row_idx)
-                # Map data to columns (Order MUST match the UI columns we added)
-                data = [
-                    r.last_name, r.first_name, r.middle_name, r.suffix,
-                    r.gender, str(r.birth_date) if r.birth_date else "", r.birth_place, str(r.age) if r.age else "", r.civil_status,
-                    r.spouse_name, str(r.no_of_children), str(r.no_of_siblings),
-                    r.mother_full_name, r.father_full_name,
-                    r.nationality, r.religion, r.occupation, r.highest_educational_attainment,
-                    r.contact_number, r.emergency_contact_name, r.emergency_contact_number,
-                    r.sitio, r.barangay, r.municipality,
-                    "Yes" if r.registered_voter else "No",
-                    "Yes" if r.indigent else "No",
-                    "Yes" if r.solo_parent else "No",
-                    r.solo_parent_id_no,
-                    "Yes" if r.fourps_member else "No"
-                ]
-                for col_idx, value in enumerate(data):
-                    item = QtWidgets.QTableWidgetItem(str(value) if value is not None else "")
-                    item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row_idx, col_idx, item)
-                # Create container widget for centering
-                button_container = QtWidgets.QWidget()
-                button_layout = QtWidgets.QHBoxLayout(button_container)
-                button_layout.setContentsMargins(0, 0, 0, 0)
-                button_layout.setAlignment(QtCore.Qt.AlignCenter)
-                edit_btn = QtWidgets.QPushButton()
-                edit_btn.setIcon(self.create_edit_icon())
-                edit_btn.setIconSize(QtCore.QSize(18, 18))
-                edit_btn.setFixedSize(35, 30)
-                edit_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #3498db;
-                        border: none;
-                        border-radius: 4px;
-                    }
-                    QPushButton:hover {
-                        background-color: #2980b9;
-                    }
-                    QPushButton:pressed {
-                        background-color: #1f5f8b;
-                    }
-                """)
-                edit_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                edit_btn.setToolTip(f"Edit {r.first_name} {r.last_name}")
-                # Connect button to edit function with resident_id
-                edit_btn.clicked.connect(lambda checked, resident_id=r.resident_id: self.open_edit_resident_dialog(resident_id))
-                # Add button to container
-                button_layout.addWidget(edit_btn)
-                # Add container to table
-                table.setCellWidget(row_idx, 29, button_container)
+                self.set_resident_row(table, row_idx, r)
             # Maximize column space
             header = table.horizontalHeader()
             header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
@@ -739,6 +820,102 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
         except Exception as e:
             import traceback
             traceback.print_exc()
+    def filter_residents(self, query, search_text=""):
+        """Apply the residents page search box to a Resident query"""
+        if search_text:
+            search_filter = f"%{search_text}%"
+            query = query.filter(
+                (Resident.last_name.like(search_filter)) |
+                (Resident.first_name.like(search_filter)) |
+                (Resident.middle_name.like(search_filter)) |
+                (Resident.sitio.like(search_filter)) |
+                (Resident.contact_number.like(search_filter))
+            )
+        return query
+    def set_resident_row(self, table, row_idx, r):
+        """All columns of one residents table row (the first cell carries the resident id)"""
+        # Map data to columns (Order MUST match the UI columns we added)
+        data = [
+            r.last_name, r.first_name, r.middle_name, r.suffix,
+            r.gender, str(r.birth_date) if r.birth_date else "", r.birth_place, str(r.age) if r.age else "", r.civil_status,
+            r.spouse_name, str(r.no_of_children), str(r.no_of_siblings),
+            r.mother_full_name, r.father_full_name,
+            r.nationality, r.religion, r.occupation, r.highest_educational_attainment,
+            r.contact_number, r.emergency_contact_name, r.emergency_contact_number,
+            r.sitio, r.barangay, r.municipality,
+            "Yes" if r.registered_voter else "No",
+            "Yes" if r.indigent else "No",
+            "Yes" if r.solo_parent else "No",
+            r.solo_parent_id_no,
+            "Yes" if r.fourps_member else "No"
+        ]
+        for col_idx, value in enumerate(data):
+            item = QtWidgets.QTableWidgetItem(str(value) if value is not None else "")
+            item.setTextAlignment(QtCore.Qt.AlignCenter)
+            table.setItem(row_idx, col_idx, item)
+        table.item(row_idx, 0).setData(QtCore.Qt.UserRole, r.resident_id)
+        # Create container widget for centering
+        button_container = QtWidgets.QWidget()
+        button_layout = QtWidgets.QHBoxLayout(button_container)
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        button_layout.setAlignment(QtCore.Qt.AlignCenter)
+        edit_btn = QtWidgets.QPushButton()
+        edit_btn.setIcon(self.create_edit_icon())
+        edit_btn.setIconSize(QtCore.QSize(18, 18))
+        edit_btn.setFixedSize(35, 30)
+        edit_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                border: none;
+                border-radius: 4px;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+            QPushButton:pressed {
+                background-color: #1f5f8b;
+            }
+        """)
+        edit_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        edit_btn.setToolTip(f"Edit {r.first_name} {r.last_name}")
+        # Connect button to edit function with resident_id
+        edit_btn.clicked.connect(lambda checked, resident_id=r.resident_id: self.open_edit_resident_dialog(resident_id))
+        # Add button to container
+        button_layout.addWidget(edit_btn)
+        # Add container to table
+        table.setCellWidget(row_idx, 29, button_container)
+    def refresh_resident_rows(self, resident_ids):
+        """Re-read only the given residents: update their rows, add new matches at the end, drop deleted ones"""
+        table = getattr(self, 'residents_table', None)
+        if table is None or not resident_ids:
+            return
+        try:
+            db = SessionLocal()
+            try:
+                residents = {r.resident_id: r for r in self.filter_residents(
+                    db.query(Resident).filter(Resident.resident_id.in_(resident_ids)),
+                    getattr(self, 'residents_search', ""))}
+            finally:
+                db.close()
+            wanted = set(resident_ids)
+            for row in reversed(range(table.rowCount())):
+                item = table.item(row, 0)
+                resident_id = item.data(QtCore.Qt.UserRole) if item is not None else None
+                if resident_id not in wanted:
+                    continue
+                resident = residents.pop(resident_id, None)
+                if resident is None:
+                    table.removeRow(row)          # deleted, or no longer matches the search
+                else:
+                    self.set_resident_row(table, row, resident)
+            # Unordered query: new residents come last, as they would in a full reload
+            for resident_id in sorted(residents):
+                row = table.rowCount()
+                table.insertRow(row)
+                self.set_resident_row(table, row, residents[resident_id])
+        except RuntimeError:
+            # The residents page was closed in the meantime
+            self.residents_table = None
     def create_edit_icon(self):
         """Create edit icon - pencil in square frame"""
         pixmap = QtGui.QPixmap(24, 24)
@@ -1002,13 +1179,12 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 for key, value in data.items():
                     if hasattr(resident, key):
                         setattr(resident, key, value)
+                publish_on_commit(db, ResidentUpdated({resident.resident_id}))
                 db.commit()
                 db.refresh(resident)
-                # Close dialog
+                # Close dialog (the ResidentUpdated event refreshes the row)
                 dialog.close()
-                # Refresh the table
                 if hasattr(self, 'current_residents_widget'):
-                    self.load_residents_table(self.current_residents_widget)
                     self.notification.show_success(f"✅ Updated: {resident.first_name} {resident.last_name}")
             except Exception as e:
                 db.rollback()
@@ -1085,6 +1261,83 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 # Connect to open data collection
                 btn.clicked.connect(self.open_data_collection_dialog)
                 break
+    def add_export_button(self, widget):
+        """Put an Export button next to the Add Resident button"""
+        for btn in widget.findChildren(QtWidgets.QPushButton):
+            if 'add' not in btn.objectName().lower() and 'add' not in btn.text().lower():
+                continue
+            for layout in widget.findChildren(QtWidgets.QLayout):
+                index = layout.indexOf(btn)
+                if index < 0:
+                    continue
+                export_btn = QtWidgets.QPushButton("📤 Export")
+                export_btn.setCursor(QtCore.Qt.PointingHandCursor)
+                export_btn.setStyleSheet("""
+                    QPushButton {
+                        background-color: #607d8b;
+                        color: white;
+                        font-size: 12pt;
+                        font-weight: bold;
+                        padding: 10px 20px;
+                        border-radius: 8px;
+                        border: none;
+                    }
+                    QPushButton:hover {
+                        background-color: #546e7a;
+                    }
+                """)
+                export_btn.clicked.connect(lambda: self.open_export_dialog("residents"))
+                layout.insertWidget(index + 1, export_btn)
+                return
+            return
+    def open_export_dialog(self, kind):
+        """Pick columns and filters, then export on a worker thread with progress"""
+        try:
+            from gui.export_worker import ExportDialog
+            db = SessionLocal()
+            try:
+                sitios = [sitio for (sitio,) in db.query(Resident.sitio).filter(Resident.sitio.isnot(None))
+                          .distinct().order_by(Resident.sitio)]
+            finally:
+                db.close()
+            dialog = ExportDialog(kind, sitios, parent=self)
+            if dialog.exec_() != QtWidgets.QDialog.Accepted:
+                return
+            columns = dialog.columns()
+            if not columns:
+                self.notification.show_warning("⚠️ Select at least one column")
+                return
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export", str(dialog.default_path()),
+                                                            "CSV Files (*.csv);;Excel Workbook (*.xlsx)")
+            if path:
+                self.start_export(dialog.kind(), path, columns, dialog.filters())
+        except Exception as e:
+            self.notification.show_error(f"❌ Error preparing export: {e}")
+            import traceback
+            traceback.print_exc()
+    def start_export(self, kind, path, columns, filters):
+        from gui.export_worker import ExportThread
+        progress_dialog = QtWidgets.QProgressDialog("Exporting...", "Cancel", 0, 0, self)
+        progress_dialog.setWindowTitle("Export")
+        progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        self.export_thread = ExportThread(kind, path, columns, filters, parent=self)
+
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total or 0)
+            progress_dialog.setValue(done)
+            progress_dialog.setLabelText(f"Exporting... {done:,} of {total:,} rows")
+        self.export_thread.progress.connect(on_progress)
+        progress_dialog.canceled.connect(self.export_thread.cancel)
+        self.export_thread.done.connect(lambda result: self.on_export_done(result, progress_dialog))
+        self.export_thread.start()
+    def on_export_done(self, result, progress_dialog):
+        progress_dialog.close()
+        self.export_thread = None
+        if result.get("success"):
+            self.notification.show_success(f"📤 Exported {result['rows']:,} row(s) to {result['path']}")
+        else:
+            self.notification.show_error(f"❌ Export failed: {result.get('error')}")
     def create_add_icon(self):
         """Create a + icon for the Add button"""
         pixmap = QtGui.QPixmap(32, 32)
@@ -1229,11 +1482,10 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 db.add(new_resident)
                 db.commit()
                 db.refresh(new_resident)
-                # Close dialog
+                publish(ResidentUpdated({new_resident.resident_id}))
+                # Close dialog (the ResidentUpdated event adds the row)
                 dialog.close()
-                # Refresh the table
                 if hasattr(self, 'current_residents_widget'):
-                    self.load_residents_table(self.current_residents_widget)
                     self.notification.show_success(f"✅ Added: {new_resident.first_name} {new_resident.last_name}")
                 else:
                     self.notification.show_success(f"✅ Resident added successfully!")
@@ -1326,13 +1578,13 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             """)
             bar_title.setAlignment(QtCore.Qt.AlignCenter)
             bar_layout.addWidget(bar_title)
-            bar_chart = AdminAnimatedBarChart()
-            bar_chart.months = ['ID', 'Clearance', 'Indigency', 'Business', 'Completed', 'Pending']
-            bar_chart.values = [
-                stats['barangay_id'], stats['clearance'], stats['indigency'],
-                stats['business_permit'], stats['completed'], stats['pending']
-            ]
-            bar_chart.max_value = max(bar_chart.values) if bar_chart.values else 1
+            bar_chart = AdminAnimatedBarChart(
+                months=['ID', 'Clearance', 'Indigency', 'Business', 'Completed', 'Pending'],
+                values=[
+                    stats['barangay_id'], stats['clearance'], stats['indigency'],
+                    stats['business_permit'], stats['completed'], stats['pending']
+                ]
+            )
             bar_chart.setMinimumHeight(180)
             bar_layout.addWidget(bar_chart)
             charts_layout.addWidget(bar_widget, stretch=1)
@@ -1402,8 +1654,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             import traceback
             traceback.print_exc()
     def get_comprehensive_dashboard_stats(self):
-        """Get all dashboard statistics from database"""
-        from datetime import datetime, timedelta
+        """Get all dashboard statistics from database (or the parts prefetched after login)"""
         stats = {
             'total_residents': 0, 'male': 0, 'female': 0,
             'voters': 0, 'fourps': 0, 'solo_parent': 0, 'indigent': 0,
@@ -1414,74 +1665,8 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             'sitio_data': []
         }
         try:
-            session = SessionLocal()
-            # === RESIDENT STATISTICS ===
-            stats['total_residents'] = session.query(Resident).count()
-            stats['male'] = session.query(Resident).filter(Resident.gender == 'Male').count()
-            stats['female'] = session.query(Resident).filter(Resident.gender == 'Female').count()
-            stats['voters'] = session.query(Resident).filter(Resident.registered_voter == True).count()
-            stats['fourps'] = session.query(Resident).filter(Resident.fourps_member == True).count()
-            stats['solo_parent'] = session.query(Resident).filter(Resident.solo_parent == True).count()
-            stats['indigent'] = session.query(Resident).filter(Resident.indigent == True).count()
-            # === RESIDENTS PER SITIO ===
-            from sqlalchemy import func
-            sitio_counts = session.query(
-                Resident.sitio, func.count(Resident.resident_id)
-            ).group_by(Resident.sitio).order_by(func.count(Resident.resident_id).desc()).limit(8).all()
-            stats['sitio_data'] = [(sitio or 'Unknown', count) for sitio, count in sitio_counts]
-            if not stats['sitio_data']:
-                stats['sitio_data'] = [('No Data', 0)]
-            # === REQUEST STATISTICS ===
-            try:
-                from app.models import CertificateRequest
-                stats['barangay_id'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.certificate_type.ilike('%id%')
-                ).count()
-                stats['business_permit'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.certificate_type.ilike('%business%')
-                ).count()
-                stats['indigency'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.certificate_type.ilike('%indigency%')
-                ).count()
-                stats['clearance'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.certificate_type.ilike('%clearance%')
-                ).count()
-                stats['completed'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.status.ilike('%completed%')
-                ).count()
-                stats['pending'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.status.ilike('%pending%')
-                ).count()
-                stats['rejected'] = session.query(CertificateRequest).filter(
-                    CertificateRequest.status.ilike('%rejected%')
-                ).count()
-                stats['total_requests'] = session.query(CertificateRequest).count()
-                stats['transactions'] = stats['completed']  # Completed = paid transactions
-                # === MONTHLY TREND (last 6 months) ===
-                for i in range(5, -1, -1):
-                    date = datetime.now() - timedelta(days=i*30)
-                    month_name = date.strftime('%b')
-                    stats['months'].append(month_name)
-                    start_date = date.replace(day=1)
-                    if date.month == 12:
-                        end_date = date.replace(year=date.year+1, month=1, day=1)
-                    else:
-                        end_date = date.replace(month=date.month+1, day=1)
-                    count = session.query(CertificateRequest).filter(
-                        CertificateRequest.created_at >= start_date,
-                        CertificateRequest.created_at < end_date
-                    ).count()
-                    stats['monthly_requests'].append(count if count > 0 else (6-i) * 3)
-            except Exception as e:
-                stats['months'] = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-                stats['monthly_requests'] = [5, 12, 8, 15, 10, 18]
-            # === BLOTTER COUNT ===
-            try:
-                from app.models import Blotter
-                stats['blotters'] = session.query(Blotter).count()
-            except:
-                stats['blotters'] = 0
-            session.close()
+            for name, load in DASHBOARD_STAT_PARTS.items():
+                stats.update(self.prefetched.pop(name) if name in self.prefetched else load())
         except Exception as e:
             # Fallback sample data
             stats['months'] = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
@@ -1824,6 +2009,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 )
                 db.add(blotter)
                 db.commit()
+                publish(BlotterUpdated({blotter.blotter_id}))
                 self.notification.show_success("✅ Blotter report submitted successfully!")
                 # Clear the form
                 self.complainant_input.clear()
@@ -1894,7 +2080,36 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             """)
             back_btn.clicked.connect(self.show_blotter_page)
             back_row.addWidget(back_btn)
-            back_row.addStretch()
+            back_row.addSpacing(20)
+            # Search and date-range filters (kept across refreshes)
+            filters = getattr(self, 'blotter_filters', None) or {}
+            input_style = "background-color: white; border: 1px solid #ccc; border-radius: 5px; padding: 4px; font-size: 10pt;"
+            search_input = QtWidgets.QLineEdit(filters.get('query', ''))
+            search_input.setPlaceholderText("🔍 Search complainant, respondent or reason...")
+            search_input.setClearButtonEnabled(True)
+            search_input.setMinimumWidth(280)
+            search_input.setStyleSheet(input_style)
+            back_row.addWidget(search_input, 1)
+            date_check = QtWidgets.QCheckBox("Date range:")
+            date_check.setChecked(filters.get('date_from') is not None)
+            back_row.addWidget(date_check)
+            date_field_combo = QtWidgets.QComboBox()
+            date_field_combo.addItem("Incident date", 'incident_date')
+            date_field_combo.addItem("Date filed", 'created_at')
+            date_field_combo.setCurrentIndex(max(0, date_field_combo.findData(filters.get('date_field', 'incident_date'))))
+            date_field_combo.setStyleSheet(input_style)
+            back_row.addWidget(date_field_combo)
+            date_from_edit = QtWidgets.QDateEdit()
+            date_to_edit = QtWidgets.QDateEdit()
+            for edit, value, default in ((date_from_edit, filters.get('date_from'), QtCore.QDate.currentDate().addMonths(-1)),
+                                         (date_to_edit, filters.get('date_to'), QtCore.QDate.currentDate())):
+                edit.setCalendarPopup(True)
+                edit.setDisplayFormat("yyyy-MM-dd")
+                edit.setDate(QtCore.QDate(value.year, value.month, value.day) if value else default)
+                edit.setStyleSheet(input_style)
+            back_row.addWidget(date_from_edit)
+            back_row.addWidget(QtWidgets.QLabel("to"))
+            back_row.addWidget(date_to_edit)
             main_layout.addLayout(back_row)
             # Table widget
             table = QtWidgets.QTableWidget()
@@ -1923,9 +2138,47 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 }
             """)
             table.setAlternatingRowColors(True)
+            table.verticalHeader().setDefaultSectionSize(50)  # fits the action buttons
+            self.blotter_table = table
             main_layout.addWidget(table, 1)
-            # Load data from database
-            self.load_blotter_data(table)
+            status_row = QtWidgets.QHBoxLayout()
+            status_label = QtWidgets.QLabel()
+            status_label.setStyleSheet("color: #555; font-size: 9pt;")
+            status_row.addWidget(status_label)
+            status_row.addStretch()
+            # For when the loaded rows fit without a scrollbar (large screen, narrow filter)
+            more_btn = QtWidgets.QPushButton("Load more ▼")
+            more_btn.hide()
+            status_row.addWidget(more_btn)
+            main_layout.addLayout(status_row)
+            def apply_filters():
+                self.blotter_filters = {
+                    'query': search_input.text().strip(),
+                    'date_field': date_field_combo.currentData(),
+                    'date_from': date_from_edit.date().toPyDate() if date_check.isChecked() else None,
+                    'date_to': date_to_edit.date().toPyDate() if date_check.isChecked() else None,
+                }
+                self.load_blotter_data(table, status_label, more_btn)
+            # Wait for typing to pause instead of querying on every key press
+            from app.config import BLOTTER_SEARCH_DELAY_MS
+            search_timer = QtCore.QTimer(table)
+            search_timer.setSingleShot(True)
+            search_timer.setInterval(BLOTTER_SEARCH_DELAY_MS)
+            search_timer.timeout.connect(apply_filters)
+            search_input.textChanged.connect(lambda _: search_timer.start())
+            search_input.returnPressed.connect(apply_filters)
+            date_check.toggled.connect(lambda _: apply_filters())
+            date_field_combo.currentIndexChanged.connect(lambda _: apply_filters())
+            date_from_edit.dateChanged.connect(lambda _: date_check.isChecked() and apply_filters())
+            date_to_edit.dateChanged.connect(lambda _: date_check.isChecked() and apply_filters())
+            # Fetch the next page when the user scrolls near the bottom
+            scroll_bar = table.verticalScrollBar()
+            scroll_bar.valueChanged.connect(
+                lambda value: value >= scroll_bar.maximum() - 5
+                and self.load_more_blotters(table, status_label, more_btn))
+            more_btn.clicked.connect(lambda: self.load_more_blotters(table, status_label, more_btn))
+            # Load the first page from the database
+            apply_filters()
             # Add to outer layout
             outer_layout.addWidget(table_widget)
             # Replace content
@@ -1935,100 +2188,155 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             self.notification.show_error(f"❌ Error loading blotter table: {e}")
             import traceback
             traceback.print_exc()
-    def load_blotter_data(self, table):
-        """Load blotter records from database into the table"""
+    def load_blotter_data(self, table, status_label=None, more_button=None):
+        """Reload the blotter table from its first page using the current filters"""
+        self.blotter_cursor = None
+        self.blotter_has_more = True
+        table.setRowCount(0)
+        table.scrollToTop()
+        self.load_more_blotters(table, status_label, more_button)
+    def load_more_blotters(self, table, status_label=None, more_button=None):
+        """Append the next page of blotter records (keyset paging, see BlotterController.search)"""
+        if not getattr(self, 'blotter_has_more', False) or getattr(self, 'blotter_loading', False):
+            return
+        self.blotter_loading = True
+        try:
+            from app.controllers.blotter_controller import BlotterController
+            filters = getattr(self, 'blotter_filters', None) or {}
+            result = BlotterController.search(
+                query=filters.get('query'),
+                date_field=filters.get('date_field', 'incident_date'),
+                date_from=filters.get('date_from'),
+                date_to=filters.get('date_to'),
+                after=self.blotter_cursor
+            )
+            if not result["success"]:
+                self.blotter_has_more = False
+                self.notification.show_error(f"❌ Error loading blotters: {result['error']}")
+                return
+            self.blotter_cursor = result["next_cursor"]
+            self.blotter_has_more = result["next_cursor"] is not None
+            first_row = table.rowCount()
+            table.setRowCount(first_row + len(result["rows"]))
+            for row, blotter in enumerate(result["rows"], start=first_row):
+                self.set_blotter_row(table, row, blotter)
+            if status_label is not None:
+                more = " - scroll down for more" if self.blotter_has_more else ""
+                status_label.setText(f"Showing {table.rowCount()} record(s){more}")
+        except Exception as e:
+            self.blotter_has_more = False
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.blotter_loading = False
+            if more_button is not None:
+                more_button.setVisible(self.blotter_has_more)
+    def set_blotter_row(self, table, row, blotter):
+        """All cells of one blotter table row (a row dict from BlotterController.search)"""
+        # COMPLAINANT
+        complainant_item = QtWidgets.QTableWidgetItem(blotter['complainant_name'] or "")
+        complainant_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        complainant_item.setData(QtCore.Qt.UserRole, blotter['blotter_id'])
+        table.setItem(row, 0, complainant_item)
+        # RESPONDENT
+        respondent_item = QtWidgets.QTableWidgetItem(blotter['respondent_name'] or "")
+        respondent_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 1, respondent_item)
+        # REASON (truncated for display)
+        reason_text = blotter['reason'] or ""
+        if len(reason_text) > 50:
+            reason_text = reason_text[:50] + "..."
+        reason_item = QtWidgets.QTableWidgetItem(reason_text)
+        reason_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 2, reason_item)
+        # DATE
+        date_str = ""
+        if blotter['incident_date']:
+            date_str = blotter['incident_date'].strftime("%Y-%m-%d %I:%M %p")
+        date_item = QtWidgets.QTableWidgetItem(date_str)
+        date_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 3, date_item)
+        # LOCATION
+        location_item = QtWidgets.QTableWidgetItem(blotter['location'] or "")
+        location_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 4, location_item)
+        # HANDLED BY
+        handled_item = QtWidgets.QTableWidgetItem(blotter['handled_by'] or "")
+        handled_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 5, handled_item)
+        # ACTION - Edit and Delete buttons
+        action_widget = QtWidgets.QWidget()
+        action_layout = QtWidgets.QHBoxLayout(action_widget)
+        action_layout.setContentsMargins(5, 2, 5, 2)
+        action_layout.setSpacing(8)
+        action_layout.setAlignment(QtCore.Qt.AlignCenter)
+        # Edit button
+        edit_btn = QtWidgets.QPushButton("Edit")
+        edit_btn.setFixedSize(50, 28)
+        edit_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        edit_btn.setToolTip("Edit this record")
+        edit_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                font-size: 9pt;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+        """)
+        edit_btn.clicked.connect(lambda checked, bid=blotter['blotter_id']: self.edit_blotter(bid))
+        action_layout.addWidget(edit_btn)
+        # Delete button
+        delete_btn = QtWidgets.QPushButton("Delete")
+        delete_btn.setFixedSize(50, 28)
+        delete_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        delete_btn.setToolTip("Delete this record")
+        delete_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #e74c3c;
+                color: white;
+                border: none;
+                border-radius: 5px;
+                font-size: 9pt;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+        """)
+        delete_btn.clicked.connect(lambda checked, bid=blotter['blotter_id']: self.delete_blotter(bid))
+        action_layout.addWidget(delete_btn)
+        table.setCellWidget(row, 6, action_widget)
+    def apply_blotter_changes(self, blotter_ids):
+        """Redraw the given blotter rows if they are loaded; drop deleted ones"""
+        table = getattr(self, 'blotter_table', None)
+        if table is None:
+            return
         try:
             from app.models import Blotter
+            from app.controllers.blotter_controller import blotter_row
             db = SessionLocal()
             try:
-                # Query all blotter records, ordered by date descending
-                blotters = db.query(Blotter).order_by(Blotter.created_at.desc()).all()
-                table.setRowCount(len(blotters))
-                for row, blotter in enumerate(blotters):
-                    # Set row height to fit buttons properly
-                    table.setRowHeight(row, 50)
-                    # COMPLAINANT
-                    complainant_item = QtWidgets.QTableWidgetItem(blotter.complainant_name or "")
-                    complainant_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 0, complainant_item)
-                    # RESPONDENT
-                    respondent_item = QtWidgets.QTableWidgetItem(blotter.respondent_name or "")
-                    respondent_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 1, respondent_item)
-                    # REASON (truncated for display)
-                    reason_text = blotter.reason or ""
-                    if len(reason_text) > 50:
-                        reason_text = reason_text[:50] + "..."
-                    reason_item = QtWidgets.QTableWidgetItem(reason_text)
-                    reason_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 2, reason_item)
-                    # DATE
-                    date_str = ""
-                    if blotter.incident_date:
-                        date_str = blotter.incident_date.strftime("%Y-%m-%d %I:%M %p")
-                    date_item = QtWidgets.QTableWidgetItem(date_str)
-                    date_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 3, date_item)
-                    # LOCATION
-                    location_item = QtWidgets.QTableWidgetItem(blotter.location or "")
-                    location_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 4, location_item)
-                    # HANDLED BY
-                    handled_item = QtWidgets.QTableWidgetItem(blotter.handled_by or "")
-                    handled_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 5, handled_item)
-                    # ACTION - Edit and Delete buttons
-                    action_widget = QtWidgets.QWidget()
-                    action_layout = QtWidgets.QHBoxLayout(action_widget)
-                    action_layout.setContentsMargins(5, 2, 5, 2)
-                    action_layout.setSpacing(8)
-                    action_layout.setAlignment(QtCore.Qt.AlignCenter)
-                    # Edit button
-                    edit_btn = QtWidgets.QPushButton("Edit")
-                    edit_btn.setFixedSize(50, 28)
-                    edit_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                    edit_btn.setToolTip("Edit this record")
-                    edit_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #3498db;
-                            color: white;
-                            border: none;
-                            border-radius: 5px;
-                            font-size: 9pt;
-                            font-weight: bold;
-                        }
-                        QPushButton:hover {
-                            background-color: #2980b9;
-                        }
-                    """)
-                    edit_btn.clicked.connect(lambda checked, bid=blotter.blotter_id: self.edit_blotter(bid))
-                    action_layout.addWidget(edit_btn)
-                    # Delete button
-                    delete_btn = QtWidgets.QPushButton("Delete")
-                    delete_btn.setFixedSize(50, 28)
-                    delete_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                    delete_btn.setToolTip("Delete this record")
-                    delete_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #e74c3c;
-                            color: white;
-                            border: none;
-                            border-radius: 5px;
-                            font-size: 9pt;
-                            font-weight: bold;
-                        }
-                        QPushButton:hover {
-                            background-color: #c0392b;
-                        }
-                    """)
-                    delete_btn.clicked.connect(lambda checked, bid=blotter.blotter_id: self.delete_blotter(bid))
-                    action_layout.addWidget(delete_btn)
-                    table.setCellWidget(row, 6, action_widget)
+                blotters = {b.blotter_id: blotter_row(b) for b in
+                            db.query(Blotter).filter(Blotter.blotter_id.in_(blotter_ids))}
             finally:
                 db.close()
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
+            for row in reversed(range(table.rowCount())):
+                item = table.item(row, 0)
+                blotter_id = item.data(QtCore.Qt.UserRole) if item is not None else None
+                if blotter_id not in blotter_ids:
+                    continue
+                if blotter_id in blotters:
+                    self.set_blotter_row(table, row, blotters[blotter_id])
+                else:
+                    table.removeRow(row)
+            # New records show up on the next search (they may not match the filters)
+        except RuntimeError:
+            self.blotter_table = None
     def delete_blotter(self, blotter_id):
         """Delete a blotter record"""
         try:
@@ -2047,10 +2355,10 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                     blotter = db.query(Blotter).filter(Blotter.blotter_id == blotter_id).first()
                     if blotter:
                         db.delete(blotter)
+                        publish_on_commit(db, BlotterUpdated({blotter_id}))
                         db.commit()
+                        # The BlotterUpdated event removes the row
                         self.notification.show_success("✅ Blotter record deleted!")
-                        # Refresh the table
-                        self.show_blotter_table()
                     else:
                         self.notification.show_error("❌ Blotter record not found!")
                 except Exception as e:
@@ -2191,11 +2499,11 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                             time.hour(), time.minute(), time.second()
                         )
                         blotter_to_update.incident_date = new_datetime
+                        publish_on_commit(save_db, BlotterUpdated({blotter_id}))
                         save_db.commit()
                         self.notification.show_success("✅ Blotter updated successfully!")
+                        # The BlotterUpdated event redraws the row
                         dialog.accept()
-                        # Refresh table
-                        self.show_blotter_table()
                     except Exception as e:
                         save_db.rollback()
                         self.notification.show_error(f"❌ Error saving: {e}")
@@ -2365,8 +2673,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
     def show_officials_page(self):
         """Show officials page - admin version with edit/delete/upload capabilities"""
         try:
-            from app.models import BarangayOfficial
-            from app.db import SessionLocal
+            from app.reference_cache import active_officials
             
             # Create main container with scroll area for responsiveness
             main_widget = QtWidgets.QWidget()
@@ -2435,120 +2742,113 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             content_layout.setSpacing(15)
             content_layout.setAlignment(QtCore.Qt.AlignTop | QtCore.Qt.AlignHCenter)
             
-            # Fetch officials from database
-            db = SessionLocal()
-            try:
-                officials = db.query(BarangayOfficial).filter(
-                    BarangayOfficial.is_active == True
-                ).order_by(BarangayOfficial.display_order).all()
-                
-                # Separate by category
-                captain = None
-                sanggunian = []
-                others = []
+            # Active officials (cached until an official is added, edited or removed)
+            officials = active_officials()
+            
+            # Separate by category
+            captain = None
+            sanggunian = []
+            others = []
+            
+            for official in officials:
+                if 'kapitan' in official.position.lower() or 'captain' in official.position.lower() or 'punong' in official.position.lower():
+                    captain = official
+                elif official.category == 'Other':
+                    others.append(official)
+                else:
+                    sanggunian.append(official)
+            
+            # If no officials in database, show default/placeholder
+            if not officials:
+                no_data_label = QtWidgets.QLabel("No officials yet. Click 'Add New Official' to get started!")
+                no_data_label.setStyleSheet("""
+                    font-size: 14pt;
+                    color: #666;
+                    padding: 50px;
+                    background: white;
+                    border-radius: 10px;
+                """)
+                no_data_label.setAlignment(QtCore.Qt.AlignCenter)
+                content_layout.addWidget(no_data_label)
+            else:
+                # === BARANGAY CAPTAIN (centered at top) ===
+                if captain:
+                    captain_card = self.create_official_card_admin(captain, is_captain=True)
+                    content_layout.addWidget(captain_card, alignment=QtCore.Qt.AlignHCenter)
                 
-                for official in officials:
-                    if 'kapitan' in official.position.lower() or 'captain' in official.position.lower() or 'punong' in official.position.lower():
-                        captain = official
-                    elif official.category == 'Other':
-                        others.append(official)
-                    else:
-                        sanggunian.append(official)
+                # === TWO COLUMNS: Sanggunian (left) and Other Officials (right) ===
+                two_columns = QtWidgets.QHBoxLayout()
+                two_columns.setSpacing(20)
+                two_columns.setAlignment(QtCore.Qt.AlignCenter)
                 
-                # If no officials in database, show default/placeholder
-                if not officials:
-                    no_data_label = QtWidgets.QLabel("No officials yet. Click 'Add New Official' to get started!")
-                    no_data_label.setStyleSheet("""
-                        font-size: 14pt;
-                        color: #666;
-                        padding: 50px;
-                        background: white;
-                        border-radius: 10px;
-                    """)
-                    no_data_label.setAlignment(QtCore.Qt.AlignCenter)
-                    content_layout.addWidget(no_data_label)
-                else:
-                    # === BARANGAY CAPTAIN (centered at top) ===
-                    if captain:
-                        captain_card = self.create_official_card_admin(captain, is_captain=True)
-                        content_layout.addWidget(captain_card, alignment=QtCore.Qt.AlignHCenter)
+                # LEFT COLUMN - Sangguniang Barangay
+                if sanggunian:
+                    left_container = QtWidgets.QFrame()
+                    left_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
+                    left_layout = QtWidgets.QVBoxLayout(left_container)
+                    left_layout.setContentsMargins(15, 10, 15, 15)
+                    left_layout.setSpacing(10)
                     
-                    # === TWO COLUMNS: Sanggunian (left) and Other Officials (right) ===
-                    two_columns = QtWidgets.QHBoxLayout()
-                    two_columns.setSpacing(20)
-                    two_columns.setAlignment(QtCore.Qt.AlignCenter)
+                    sanggunian_title = QtWidgets.QLabel("SANGGUNIANG BARANGAY")
+                    sanggunian_title.setStyleSheet("""
+                        font-size: 12pt; font-weight: bold; color: white;
+                        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
+                        padding: 8px 15px; border-radius: 5px;
+                    """)
+                    sanggunian_title.setAlignment(QtCore.Qt.AlignCenter)
+                    left_layout.addWidget(sanggunian_title)
                     
-                    # LEFT COLUMN - Sangguniang Barangay
-                    if sanggunian:
-                        left_container = QtWidgets.QFrame()
-                        left_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
-                        left_layout = QtWidgets.QVBoxLayout(left_container)
-                        left_layout.setContentsMargins(15, 10, 15, 15)
-                        left_layout.setSpacing(10)
-                        
-                        sanggunian_title = QtWidgets.QLabel("SANGGUNIANG BARANGAY")
-                        sanggunian_title.setStyleSheet("""
-                            font-size: 12pt; font-weight: bold; color: white;
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
-                            padding: 8px 15px; border-radius: 5px;
-                        """)
-                        sanggunian_title.setAlignment(QtCore.Qt.AlignCenter)
-                        left_layout.addWidget(sanggunian_title)
-                        
-                        # Grid layout for sanggunian (3 columns)
-                        grid_widget = QtWidgets.QWidget()
-                        grid_layout = QtWidgets.QGridLayout(grid_widget)
-                        grid_layout.setSpacing(10)
-                        grid_layout.setAlignment(QtCore.Qt.AlignCenter)
-                        
-                        for i, official in enumerate(sanggunian):
-                            row = i // 3
-                            col = i % 3
-                            card = self.create_official_card_admin(official)
-                            grid_layout.addWidget(card, row, col)
-                        
-                        left_layout.addWidget(grid_widget)
-                        two_columns.addWidget(left_container)
+                    # Grid layout for sanggunian (3 columns)
+                    grid_widget = QtWidgets.QWidget()
+                    grid_layout = QtWidgets.QGridLayout(grid_widget)
+                    grid_layout.setSpacing(10)
+                    grid_layout.setAlignment(QtCore.Qt.AlignCenter)
                     
-                    # RIGHT COLUMN - Other Officials
-                    if others:
-                        right_container = QtWidgets.QFrame()
-                        right_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
-                        right_layout = QtWidgets.QVBoxLayout(right_container)
-                        right_layout.setContentsMargins(15, 10, 15, 15)
-                        right_layout.setSpacing(10)
-                        
-                        other_title = QtWidgets.QLabel("OTHER OFFICIALS")
-                        other_title.setStyleSheet("""
-                            font-size: 12pt; font-weight: bold; color: white;
-                            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
-                            padding: 8px 15px; border-radius: 5px;
-                        """)
-                        other_title.setAlignment(QtCore.Qt.AlignCenter)
-                        right_layout.addWidget(other_title)
-                        
-                        # Grid layout for others (3 columns)
-                        others_grid = QtWidgets.QWidget()
-                        others_layout = QtWidgets.QGridLayout(others_grid)
-                        others_layout.setSpacing(10)
-                        others_layout.setAlignment(QtCore.Qt.AlignCenter)
-                        
-                        for i, official in enumerate(others):
-                            row = i // 3
-                            col = i % 3
-                            card = self.create_official_card_admin(official)
-                            others_layout.addWidget(card, row, col)
-                        
-                        right_layout.addWidget(others_grid)
-                        right_layout.addStretch()
-                        two_columns.addWidget(right_container)
+                    for i, official in enumerate(sanggunian):
+                        row = i // 3
+                        col = i % 3
+                        card = self.create_official_card_admin(official)
+                        grid_layout.addWidget(card, row, col)
                     
-                    content_layout.addLayout(two_columns)
+                    left_layout.addWidget(grid_widget)
+                    two_columns.addWidget(left_container)
                 
-                content_layout.addStretch()
+                # RIGHT COLUMN - Other Officials
+                if others:
+                    right_container = QtWidgets.QFrame()
+                    right_container.setStyleSheet("QFrame { background-color: white; border-radius: 10px; }")
+                    right_layout = QtWidgets.QVBoxLayout(right_container)
+                    right_layout.setContentsMargins(15, 10, 15, 15)
+                    right_layout.setSpacing(10)
+                    
+                    other_title = QtWidgets.QLabel("OTHER OFFICIALS")
+                    other_title.setStyleSheet("""
+                        font-size: 12pt; font-weight: bold; color: white;
+                        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3c72, stop:1 #2a5298);
+                        padding: 8px 15px; border-radius: 5px;
+                    """)
+                    other_title.setAlignment(QtCore.Qt.AlignCenter)
+                    right_layout.addWidget(other_title)
+                    
+                    # Grid layout for others (3 columns)
+                    others_grid = QtWidgets.QWidget()
+                    others_layout = QtWidgets.QGridLayout(others_grid)
+                    others_layout.setSpacing(10)
+                    others_layout.setAlignment(QtCore.Qt.AlignCenter)
+                    
+                    for i, official in enumerate(others):
+                        row = i // 3
+                        col = i % 3
+                        card = self.create_official_card_admin(official)
+                        others_layout.addWidget(card, row, col)
+                    
+                    right_layout.addWidget(others_grid)
+                    right_layout.addStretch()
+                    two_columns.addWidget(right_container)
                 
-            finally:
-                db.close()
+                content_layout.addLayout(two_columns)
+            
+            content_layout.addStretch()
             
             scroll_area.setWidget(content_widget)
             main_layout.addWidget(scroll_area)
@@ -2977,46 +3277,49 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             self.notification.show_error(f"❌ Error: {e}")
     
     def upload_official_photo(self, official_id):
-        """Upload a photo for an official"""
+        """Upload a photo for an official (copied in the background)"""
         try:
-            from app.models import BarangayOfficial
-            from app.db import SessionLocal
-            import os
-            import shutil
+            from app.uploads import IMAGE_EXTENSIONS
+            from gui.upload_worker import start_upload
             
             file_path, _ = QtWidgets.QFileDialog.getOpenFileName(
                 self, "Select Photo",
-                "", "Image Files (*.png *.jpg *.jpeg *.bmp *.gif)"
+                "", "Image Files (*.png *.jpg *.jpeg)"
             )
             
             if file_path:
-                # Create uploads/officials directory if not exists
-                uploads_dir = Path(__file__).resolve().parent.parent.parent / "uploads" / "officials"
-                uploads_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file to uploads folder with unique name
-                file_ext = os.path.splitext(file_path)[1]
-                new_filename = f"official_{official_id}{file_ext}"
-                new_path = uploads_dir / new_filename
-                
-                shutil.copy(file_path, new_path)
-                
-                # Update database
-                db = SessionLocal()
-                try:
-                    official = db.query(BarangayOfficial).filter(BarangayOfficial.official_id == official_id).first()
-                    if official:
-                        official.photo_path = str(new_path)
-                        db.commit()
-                        self.notification.show_success(f"✅ Photo uploaded successfully!")
-                        self.show_officials_page()  # Refresh
-                    else:
-                        self.notification.show_error("❌ Official not found!")
-                finally:
-                    db.close()
+                # Size/type are checked before anything is copied
+                error = start_upload(self, file_path,
+                                     lambda result: self.save_official_photo(official_id, result),
+                                     allowed_extensions=IMAGE_EXTENSIONS, kind='official')
+                if error:
+                    self.notification.show_error(f"❌ {error}")
+                else:
+                    self.notification.show_info("⏳ Uploading photo...")
                     
         except Exception as e:
             self.notification.show_error(f"❌ Error uploading photo: {e}")
+    def save_official_photo(self, official_id, result):
+        """Store the uploaded photo's path once the background copy has finished"""
+        if not result["success"]:
+            self.notification.show_error(f"❌ Error uploading photo: {result['error']}")
+            return
+        try:
+            from app.models import BarangayOfficial
+            db = SessionLocal()
+            try:
+                official = db.query(BarangayOfficial).filter(BarangayOfficial.official_id == official_id).first()
+                if official:
+                    official.photo_path = result["path"]
+                    db.commit()
+                    self.notification.show_success(f"✅ Photo uploaded successfully!")
+                    self.show_officials_page()  # Refresh
+                else:
+                    self.notification.show_error("❌ Official not found!")
+            finally:
+                db.close()
+        except Exception as e:
+            self.notification.show_error(f"❌ Error uploading photo: {e}")
     def show_announcement_page(self):
         """Show admin announcements page with database-driven announcements"""
         try:
@@ -3070,6 +3373,69 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             """)
             header.setMinimumHeight(70)
             main_layout.addWidget(header)
+            # Toolbar - bulk actions on the selected rows, batch print
+            toolbar_layout = QtWidgets.QHBoxLayout()
+            selection_hint = QtWidgets.QLabel("Ctrl/Shift+click rows to select several requests")
+            selection_hint.setStyleSheet("color: #666; font-size: 9pt;")
+            toolbar_layout.addWidget(selection_hint)
+            toolbar_layout.addStretch()
+            for text, status, color, hover in [
+                ("✅ Accept Selected", "Processing", "#0078D4", "#005a9e"),
+                ("❌ Decline Selected", "Declined", "#e74c3c", "#c0392b"),
+                ("✔ Complete Selected", "Completed", "#9b59b6", "#8e44ad"),
+            ]:
+                bulk_btn = QtWidgets.QPushButton(text)
+                bulk_btn.setFixedHeight(35)
+                bulk_btn.setCursor(QtCore.Qt.PointingHandCursor)
+                bulk_btn.setStyleSheet(f"""
+                    QPushButton {{
+                        background-color: {color};
+                        color: white;
+                        border: none;
+                        border-radius: 5px;
+                        font-weight: bold;
+                        font-size: 10pt;
+                        padding: 0 16px;
+                    }}
+                    QPushButton:hover {{ background-color: {hover}; }}
+                """)
+                bulk_btn.clicked.connect(lambda checked, st=status: self.bulk_update_selected_requests(st))
+                toolbar_layout.addWidget(bulk_btn)
+            batch_print_btn = QtWidgets.QPushButton("🖨 Batch Print")
+            batch_print_btn.setFixedHeight(35)
+            batch_print_btn.setCursor(QtCore.Qt.PointingHandCursor)
+            batch_print_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #27ae60;
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 10pt;
+                    padding: 0 16px;
+                }
+                QPushButton:hover { background-color: #219a52; }
+            """)
+            batch_print_btn.clicked.connect(self.show_batch_print_dialog)
+            toolbar_layout.addWidget(batch_print_btn)
+            export_btn = QtWidgets.QPushButton("📤 Export")
+            export_btn.setFixedHeight(35)
+            export_btn.setCursor(QtCore.Qt.PointingHandCursor)
+            export_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #607d8b;
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 10pt;
+                    padding: 0 16px;
+                }
+                QPushButton:hover { background-color: #546e7a; }
+            """)
+            export_btn.clicked.connect(lambda: self.open_export_dialog("requests"))
+            toolbar_layout.addWidget(export_btn)
+            main_layout.addLayout(toolbar_layout)
             # Table widget - expandable
             table = QtWidgets.QTableWidget()
             table.setColumnCount(7)
@@ -3097,8 +3463,12 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 }
             """)
             table.setAlternatingRowColors(True)
+            table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+            table.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+            table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
             table.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
             table.verticalHeader().setDefaultSectionSize(50)
+            self.services_table = table
             # Add table to layout with stretch factor
             main_layout.addWidget(table, 1)
             # Add main container to outer layout
@@ -3115,152 +3485,329 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
     def load_services_table_data(self, table):
         """Load certificate requests from database and populate the table"""
         try:
-            from app.models import CertificateRequest, Resident
+            from app.models import CertificateRequest
             db = SessionLocal()
             try:
                 # Query certificate requests
                 requests = db.query(CertificateRequest).order_by(CertificateRequest.created_at.desc()).all()
                 table.setRowCount(len(requests))
                 for row, req in enumerate(requests):
-                    table.setRowHeight(row, 70)
-                    # Get name from REQUEST FORM (not account/resident)
-                    # This allows requesting for others (e.g., family members)
-                    # Auto-capitalize: john kester benitez → John Kester Benitez
-                    first_name = (req.first_name or "").strip().title()
-                    last_name = (req.last_name or "").strip().title()
-                    resident_name = f"{first_name} {last_name}"
-                    
-                    # Fallback to resident table only if request has no name
-                    if not first_name and not last_name and req.resident_id:
-                        resident = db.query(Resident).filter(Resident.resident_id == req.resident_id).first()
-                        if resident:
-                            resident_name = f"{resident.first_name} {resident.last_name}".title()
-                    # NAME
-                    name_item = QtWidgets.QTableWidgetItem(resident_name)
-                    name_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 0, name_item)
-                    # TYPE
-                    type_item = QtWidgets.QTableWidgetItem(req.certificate_type or "")
-                    type_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 1, type_item)
-                    # PURPOSE
-                    purpose_item = QtWidgets.QTableWidgetItem(req.purpose or "")
-                    purpose_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 2, purpose_item)
-                    # QUANTITY
-                    qty_item = QtWidgets.QTableWidgetItem(str(req.quantity or 1))
-                    qty_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 3, qty_item)
-                    # DATE
-                    date_str = ""
-                    if req.created_at:
-                        date_str = req.created_at.strftime("%Y-%m-%d %H:%M")
-                    date_item = QtWidgets.QTableWidgetItem(date_str)
-                    date_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 4, date_item)
-                    # STATUS
-                    status_text = req.status or "Pending"
-                    status_item = QtWidgets.QTableWidgetItem(status_text)
-                    status_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    # Color based on status
-                    if status_text == "Declined":
-                        status_item.setForeground(QtGui.QColor("#e74c3c"))  # Red
-                    elif status_text == "Cancelled":
-                        status_item.setForeground(QtGui.QColor("#9e9e9e"))  # Gray
-                    elif status_text == "Pending":
-                        status_item.setForeground(QtGui.QColor("#f39c12"))  # Orange
-                    elif status_text in ["Under Review", "Processing", "Ready for Pickup", "Completed"]:
-                        status_item.setForeground(QtGui.QColor("#27ae60"))  # Green
-                    else:
-                        status_item.setForeground(QtGui.QColor("#333333"))  # Default
-                    table.setItem(row, 5, status_item)
-                    # ACTION - View and Print buttons (circle icons)
-                    action_widget = QtWidgets.QWidget()
-                    action_layout = QtWidgets.QHBoxLayout(action_widget)
-                    action_layout.setContentsMargins(5, 5, 5, 5)
-                    action_layout.setSpacing(8)
-                    action_layout.setAlignment(QtCore.Qt.AlignCenter)
-                    # View button (eye icon - circle)
-                    view_btn = QtWidgets.QPushButton("👁")
-                    view_btn.setFixedSize(40, 40)
-                    view_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                    view_btn.setToolTip("View Details")
-                    view_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #0078D4;
-                            color: white;
-                            border: none;
-                            border-radius: 20px;
-                            font-size: 16pt;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #005a9e;
-                        }
-                    """)
-                    view_btn.clicked.connect(lambda checked, r=req: self.view_certificate_request(r))
-                    action_layout.addWidget(view_btn)
-                    # Print button (printer icon - circle)
-                    print_btn = QtWidgets.QPushButton("🖨")
-                    print_btn.setFixedSize(40, 40)
-                    print_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                    print_btn.setToolTip("Print Certificate")
-                    print_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #27ae60;
-                            color: white;
-                            border: none;
-                            border-radius: 20px;
-                            font-size: 16pt;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #219a52;
-                        }
-                    """)
-                    print_btn.clicked.connect(lambda checked, r=req: self.print_certificate(r))
-                    action_layout.addWidget(print_btn)
-                    # Complete button (check icon - circle) - mark as completed
-                    complete_btn = QtWidgets.QPushButton("✔")
-                    complete_btn.setFixedSize(40, 40)
-                    complete_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                    complete_btn.setToolTip("Mark as Completed")
-                    complete_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: #9b59b6;
-                            color: white;
-                            border: none;
-                            border-radius: 20px;
-                            font-size: 18pt;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #8e44ad;
-                        }
-                    """)
-                    complete_btn.clicked.connect(lambda checked, r=req, tbl=table, rw=row: self.mark_as_completed(r, tbl, rw))
-                    action_layout.addWidget(complete_btn)
-                    table.setCellWidget(row, 6, action_widget)
+                    self.set_service_row(table, row, req, db)
             finally:
                 db.close()
         except Exception as e:
             import traceback
             traceback.print_exc()
-    def view_certificate_request(self, request):
-        """View details of a certificate request with photo and Accept/Decline buttons"""
+    def set_service_row(self, table, row, req, db):
+        """All cells of one services table row (db: open session for the resident name fallback)"""
+        from app.models import Resident
+        table.setRowHeight(row, 70)
+        # Get name from REQUEST FORM (not account/resident)
+        # This allows requesting for others (e.g., family members)
+        # Auto-capitalize: john kester benitez → John Kester Benitez
+        first_name = (req.first_name or "").strip().title()
+        last_name = (req.last_name or "").strip().title()
+        resident_name = f"{first_name} {last_name}"
+        
+        # Fallback to resident table only if request has no name
+        if not first_name and not last_name and req.resident_id:
+            resident = db.query(Resident).filter(Resident.resident_id == req.resident_id).first()
+            if resident:
+                resident_name = f"{resident.first_name} {resident.last_name}".title()
+        # NAME (also carries the request id for bulk actions)
+        name_item = QtWidgets.QTableWidgetItem(resident_name)
+        name_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        name_item.setData(QtCore.Qt.UserRole, req.request_id)
+        table.setItem(row, 0, name_item)
+        # TYPE
+        type_item = QtWidgets.QTableWidgetItem(req.certificate_type or "")
+        type_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 1, type_item)
+        # PURPOSE
+        purpose_item = QtWidgets.QTableWidgetItem(req.purpose or "")
+        purpose_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 2, purpose_item)
+        # QUANTITY
+        qty_item = QtWidgets.QTableWidgetItem(str(req.quantity or 1))
+        qty_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 3, qty_item)
+        # DATE
+        date_str = ""
+        if req.created_at:
+            date_str = req.created_at.strftime("%Y-%m-%d %H:%M")
+        date_item = QtWidgets.QTableWidgetItem(date_str)
+        date_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 4, date_item)
+        # STATUS
+        self.set_service_status_cell(table, row, req.status or "Pending")
+        # ACTION - View and Print buttons (circle icons)
+        action_widget = QtWidgets.QWidget()
+        action_layout = QtWidgets.QHBoxLayout(action_widget)
+        action_layout.setContentsMargins(5, 5, 5, 5)
+        action_layout.setSpacing(8)
+        action_layout.setAlignment(QtCore.Qt.AlignCenter)
+        # View button (eye icon - circle)
+        view_btn = QtWidgets.QPushButton("👁")
+        view_btn.setFixedSize(40, 40)
+        view_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        view_btn.setToolTip("View Details")
+        view_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #0078D4;
+                color: white;
+                border: none;
+                border-radius: 20px;
+                font-size: 16pt;
+                padding: 0px;
+            }
+            QPushButton:hover {
+                background-color: #005a9e;
+            }
+        """)
+        view_btn.clicked.connect(lambda checked, r=req: self.view_certificate_request(r))
+        action_layout.addWidget(view_btn)
+        # Print button (printer icon - circle)
+        print_btn = QtWidgets.QPushButton("🖨")
+        print_btn.setFixedSize(40, 40)
+        print_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        print_btn.setToolTip("Print Certificate")
+        print_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                border: none;
+                border-radius: 20px;
+                font-size: 16pt;
+                padding: 0px;
+            }
+            QPushButton:hover {
+                background-color: #219a52;
+            }
+        """)
+        print_btn.clicked.connect(lambda checked, r=req: self.print_certificate(r))
+        action_layout.addWidget(print_btn)
+        # Complete button (check icon - circle) - mark as completed
+        complete_btn = QtWidgets.QPushButton("✔")
+        complete_btn.setFixedSize(40, 40)
+        complete_btn.setCursor(QtCore.Qt.PointingHandCursor)
+        complete_btn.setToolTip("Mark as Completed")
+        complete_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #9b59b6;
+                color: white;
+                border: none;
+                border-radius: 20px;
+                font-size: 18pt;
+                padding: 0px;
+            }
+            QPushButton:hover {
+                background-color: #8e44ad;
+            }
+        """)
+        complete_btn.clicked.connect(lambda checked, r=req: self.mark_as_completed(r))
+        action_layout.addWidget(complete_btn)
+        table.setCellWidget(row, 6, action_widget)
+    def set_service_status_cell(self, table, row, status_text):
+        """STATUS column of the services table, colored by status"""
+        status_item = QtWidgets.QTableWidgetItem(status_text)
+        status_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        # Color based on status
+        if status_text == "Declined":
+            status_item.setForeground(QtGui.QColor("#e74c3c"))  # Red
+        elif status_text == "Cancelled":
+            status_item.setForeground(QtGui.QColor("#9e9e9e"))  # Gray
+        elif status_text == "Pending":
+            status_item.setForeground(QtGui.QColor("#f39c12"))  # Orange
+        elif status_text in ["Under Review", "Processing", "Ready for Pickup", "Completed"]:
+            status_item.setForeground(QtGui.QColor("#27ae60"))  # Green
+        else:
+            status_item.setForeground(QtGui.QColor("#333333"))  # Default
+        table.setItem(row, 5, status_item)
+    def selected_request_ids(self, table, column=0):
+        """Request ids of the selected rows (stored in the given column's UserRole data)"""
+        rows = sorted({index.row() for index in table.selectionModel().selectedRows()})
+        ids = []
+        for row in rows:
+            item = table.item(row, column)
+            if item is not None and item.data(QtCore.Qt.UserRole) is not None:
+                ids.append(int(item.data(QtCore.Qt.UserRole)))
+        return ids
+    def apply_service_changes(self, request_ids):
+        """Another station changed these requests: rebuild their rows, add new ones on top, drop deleted ones"""
+        table = getattr(self, 'services_table', None)
+        if table is None:
+            return
+        if RELOAD in request_ids:
+            return self.load_services_table_data(table)
         try:
-            from app.models import Resident, CertificateRequest
-            from datetime import datetime
-            import os
-            # Store request_id for use in callbacks
-            request_id = request.request_id
+            from app.models import CertificateRequest
+            db = SessionLocal()
+            try:
+                requests = {req.request_id: req for req in db.query(CertificateRequest).filter(
+                    CertificateRequest.request_id.in_(request_ids))}
+                for row in reversed(range(table.rowCount())):
+                    item = table.item(row, 0)
+                    request_id = item.data(QtCore.Qt.UserRole) if item is not None else None
+                    if request_id not in request_ids:
+                        continue
+                    req = requests.pop(request_id, None)
+                    if req is None:
+                        table.removeRow(row)
+                    else:
+                        self.set_service_row(table, row, req, db)
+                # Newest first, like the full load
+                for req in sorted(requests.values(), key=lambda r: (r.created_at is not None, r.created_at)):
+                    table.insertRow(0)
+                    self.set_service_row(table, 0, req, db)
+            finally:
+                db.close()
+        except RuntimeError:
+            self.services_table = None
+    def apply_resident_changes(self, resident_ids):
+        """Another station changed these residents: refresh their rows under the current search"""
+        if RELOAD in resident_ids:
+            widget = getattr(self, 'current_residents_widget', None)
+            if widget is not None:
+                self.load_residents_table(widget, getattr(self, 'residents_search', ""))
+            return
+        self.refresh_resident_rows(list(resident_ids))
+    def bulk_update_selected_requests(self, new_status):
+        """Apply one status change to every selected request in a single transaction"""
+        try:
+            from app.controllers.admin_controller import AdminController
+            table = getattr(self, 'services_table', None)
+            request_ids = self.selected_request_ids(table) if table is not None else []
+            if not request_ids:
+                self.notification.show_warning("⚠️ Select one or more requests first")
+                return
+            reply = QtWidgets.QMessageBox.question(
+                self,
+                "Confirm Bulk Update",
+                f"Set {len(request_ids)} selected request(s) to '{new_status}'?",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No
+            )
+            if reply != QtWidgets.QMessageBox.Yes:
+                return
+            result = AdminController.bulk_transition(request_ids, new_status, self.admin_account_id)
+            if not result["success"]:
+                self.notification.show_error(f"❌ Bulk update failed: {result['error']}")
+                return
+            # The controller's RequestStatusChanged event refreshes the rows
+            message = f"✅ {len(result['updated'])} request(s) set to {new_status}"
+            if result["skipped"]:
+                message += f" ({len(result['skipped'])} skipped - status does not allow it)"
+            self.notification.show_success(message)
+        except Exception as e:
+            self.notification.show_error(f"❌ Error: {e}")
+            import traceback
+            traceback.print_exc()
+    def show_batch_print_dialog(self):
+        """Pick several accepted requests and print them as one merged PDF"""
+        try:
+            from app.models import CertificateRequest, Resident
+            from gui.certificate_renderer import certificate_fields
+            db = SessionLocal()
+            try:
+                requests = db.query(CertificateRequest).filter(
+                    CertificateRequest.status.in_(['Processing', 'Ready for Pickup'])
+                ).order_by(CertificateRequest.created_at).all()
+                # Only load residents for requests without a name on the form
+                fallback_ids = {r.resident_id for r in requests if not (r.first_name or r.last_name) and r.resident_id}
+                residents = {}
+                if fallback_ids:
+                    residents = {res.resident_id: res for res in db.query(Resident).filter(Resident.resident_id.in_(fallback_ids))}
+                pages = [(req.status, certificate_fields(req, residents.get(req.resident_id))) for req in requests]
+            finally:
+                db.close()
+            if not pages:
+                self.notification.show_info("ℹ️ No accepted requests waiting to be printed")
+                return
+            dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle("Batch Print Certificates")
+            dialog.resize(520, 560)
+            layout = QtWidgets.QVBoxLayout(dialog)
+            info_label = QtWidgets.QLabel("Select the certificates to print. Processing requests are selected by default;\n"
+                                          "Ready for Pickup requests can be ticked to reprint.")
+            layout.addWidget(info_label)
+            list_widget = QtWidgets.QListWidget()
+            for status, fields in pages:
+                item = QtWidgets.QListWidgetItem(f"{fields['resident_name']} - {fields['certificate_type']} ({status})")
+                item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+                item.setCheckState(QtCore.Qt.Checked if status == 'Processing' else QtCore.Qt.Unchecked)
+                item.setData(QtCore.Qt.UserRole, fields)
+                list_widget.addItem(item)
+            layout.addWidget(list_widget, 1)
+            btn_layout = QtWidgets.QHBoxLayout()
+            select_all_btn = QtWidgets.QPushButton("Select All")
+            select_all_btn.clicked.connect(lambda: [list_widget.item(i).setCheckState(QtCore.Qt.Checked) for i in range(list_widget.count())])
+            btn_layout.addWidget(select_all_btn)
+            btn_layout.addStretch()
+            print_btn = QtWidgets.QPushButton("🖨 Print Selected")
+            print_btn.setStyleSheet("background-color: #27ae60; color: white; border-radius: 5px; padding: 8px 16px; font-weight: bold;")
+            print_btn.clicked.connect(dialog.accept)
+            btn_layout.addWidget(print_btn)
+            cancel_btn = QtWidgets.QPushButton("Cancel")
+            cancel_btn.clicked.connect(dialog.reject)
+            btn_layout.addWidget(cancel_btn)
+            layout.addLayout(btn_layout)
+            if dialog.exec_() != QtWidgets.QDialog.Accepted:
+                return
+            selected = [list_widget.item(i).data(QtCore.Qt.UserRole) for i in range(list_widget.count())
+                        if list_widget.item(i).checkState() == QtCore.Qt.Checked]
+            if not selected:
+                self.notification.show_warning("⚠️ No certificates selected")
+                return
+            self.start_batch_print(selected)
+        except Exception as e:
+            self.notification.show_error(f"❌ Error preparing batch print: {e}")
+            import traceback
+            traceback.print_exc()
+    def start_batch_print(self, pages):
+        """Render the merged PDF in the background and show progress"""
+        from datetime import datetime
+        from app.config import BATCH_PRINT_FOLDER
+        from gui.certificate_batch import BatchPrintThread
+        BATCH_PRINT_FOLDER.mkdir(parents=True, exist_ok=True)
+        default_path = BATCH_PRINT_FOLDER / f"certificates_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Batch PDF", str(default_path), "PDF Files (*.pdf)")
+        if not path:
+            return
+        progress_dialog = QtWidgets.QProgressDialog("Rendering certificates...", None, 0, len(pages), self)
+        progress_dialog.setWindowTitle("Batch Print")
+        progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.setValue(0)
+        self.batch_print_thread = BatchPrintThread(pages, path, self.admin_account_id, parent=self)
+        self.batch_print_thread.progress.connect(lambda done, total: progress_dialog.setValue(done))
+        self.batch_print_thread.done.connect(lambda result: self.on_batch_print_done(result, progress_dialog))
+        self.batch_print_thread.start()
+    def on_batch_print_done(self, result, progress_dialog):
+        progress_dialog.close()
+        self.batch_print_thread = None
+        if result.get("success"):
+            self.notification.show_success(f"🖨 {result['updated']} certificate(s) saved to {result['path']} and set to Ready for Pickup")
+            QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(result["path"]))
+        else:
+            self.notification.show_error(f"❌ Batch print failed: {result.get('error')}")
+    def view_certificate_request(self, request):
+        """View details of a certificate request with photo and Accept/Decline buttons"""
+        try:
+            from app.models import Resident, CertificateRequest
+            from datetime import datetime
+            import os
+            # Store request_id for use in callbacks
+            request_id = request.request_id
             db = SessionLocal()
             try:
                 # Update status to "Under Review" when admin views the request (if still Pending)
                 req = db.query(CertificateRequest).filter(CertificateRequest.request_id == request_id).first()
                 if req and req.status == 'Pending':
-                    req.status = 'Under Review'
-                    req.updated_at = datetime.now()
+                    from app.request_events import set_request_status
+                    from app.controllers.admin_controller import admin_actor
+                    set_request_status(req, 'Under Review', actor=admin_actor(self.admin_account_id),
+                                       note="Opened for review")
+                    publish_on_commit(db, RequestStatusChanged({request_id}))
                     db.commit()
                     request.status = 'Under Review'  # Update local object too
                 resident = db.query(Resident).filter(Resident.resident_id == request.resident_id).first()
@@ -3402,8 +3949,16 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
     def show_payment_page(self):
         """Show admin payment management page - for all accepted requests"""
         try:
-            from app.models import CertificateRequest, CertificatePayment, Resident
-            from datetime import datetime
+            from app import payment_ledger
+            from app.config import PAYMENT_WINDOW_DAYS
+            # Accepted requests without a payment record get one; days that ended since the
+            # last visit are closed into the end-of-day ledger
+            db = SessionLocal()
+            try:
+                payment_ledger.ensure_payment_records(db)
+            finally:
+                db.close()
+            payment_ledger.close_days()
             # Create outer wrapper
             outer_widget = QtWidgets.QWidget()
             outer_widget.setStyleSheet("background-color: #f0f0f0;")
@@ -3440,36 +3995,13 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             stats_layout.setSpacing(8)
             stats_layout.setContentsMargins(0, 0, 0, 0)
             # Get payment stats from database
-            db = SessionLocal()
-            try:
-                # Count pending payments (all unpaid payment records)
-                pending_count = db.query(CertificatePayment).filter(
-                    CertificatePayment.is_paid == False
-                ).count()
-                # Count paid today
-                from datetime import datetime, timedelta
-                today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                paid_today = db.query(CertificatePayment).filter(
-                    CertificatePayment.is_paid == True,
-                    CertificatePayment.received_at >= today_start
-                ).count()
-                # Total collected today
-                total_today = db.query(CertificatePayment).filter(
-                    CertificatePayment.is_paid == True,
-                    CertificatePayment.received_at >= today_start
-                ).all()
-                total_amount_today = sum(float(p.total_amount or 0) for p in total_today)
-            except Exception as e:
-                pending_count = 0
-                paid_today = 0
-                total_amount_today = 0
-            finally:
-                db.close()
+            stats = self.load_payment_stats()
+            self.payment_stat_labels = []
             # Stat cards
             for title, value, color in [
-                ("Pending Payments", str(pending_count), "#ff9800"),
-                ("Paid Today", str(paid_today), "#4caf50"),
-                ("Total Collected Today", f"₱{total_amount_today:.2f}", "#2196f3")
+                ("Pending Payments", stats[0], "#ff9800"),
+                ("Paid Today", stats[1], "#4caf50"),
+                ("Total Collected Today", stats[2], "#2196f3")
             ]:
                 stat_card = QtWidgets.QFrame()
                 stat_card.setStyleSheet(f"""
@@ -3489,6 +4021,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 stat_value = QtWidgets.QLabel(value)
                 stat_value.setStyleSheet(f"font-size: 14pt; font-weight: bold; color: {color};")
                 stat_card_layout.addWidget(stat_value)
+                self.payment_stat_labels.append(stat_value)
                 stats_layout.addWidget(stat_card)
             main_layout.addWidget(stats_widget)
             # Table header with refresh button
@@ -3499,6 +4032,53 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             table_title.setStyleSheet("font-size: 12pt; font-weight: bold; color: #333;")
             table_header.addWidget(table_title)
             table_header.addStretch()
+            bulk_paid_btn = QtWidgets.QPushButton("💵 Mark Selected Paid")
+            bulk_paid_btn.setToolTip("Ctrl/Shift+click rows to select several payments")
+            bulk_paid_btn.clicked.connect(self.bulk_mark_selected_paid)
+            bulk_paid_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #4caf50;
+                    color: white;
+                    border: none;
+                    padding: 6px 12px;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 9pt;
+                }
+                QPushButton:hover { background-color: #388e3c; }
+            """)
+            table_header.addWidget(bulk_paid_btn)
+            ledger_btn = QtWidgets.QPushButton("📒 Ledger")
+            ledger_btn.setToolTip("This month's collections per day and per cashier")
+            ledger_btn.clicked.connect(self.show_payment_ledger)
+            ledger_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #8d6e63;
+                    color: white;
+                    border: none;
+                    padding: 6px 12px;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 9pt;
+                }
+                QPushButton:hover { background-color: #795548; }
+            """)
+            table_header.addWidget(ledger_btn)
+            export_btn = QtWidgets.QPushButton("📤 Export")
+            export_btn.clicked.connect(lambda: self.open_export_dialog("payments"))
+            export_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #607d8b;
+                    color: white;
+                    border: none;
+                    padding: 6px 12px;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 9pt;
+                }
+                QPushButton:hover { background-color: #546e7a; }
+            """)
+            table_header.addWidget(export_btn)
             refresh_btn = QtWidgets.QPushButton("🔄 Refresh")
             refresh_btn.clicked.connect(self.show_payment_page)
             refresh_btn.setStyleSheet("""
@@ -3541,7 +4121,10 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             """)
             table.setAlternatingRowColors(True)
             table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+            table.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+            table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
             table.verticalHeader().setVisible(False)
+            self.payments_table = table
             # Set row height for better visibility (taller for icons/buttons)
             table.verticalHeader().setDefaultSectionSize(55)
             # Set custom column widths - use Stretch mode for most columns to fill available space
@@ -3559,177 +4142,42 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             table.setColumnWidth(7, 70)    # STATUS
             table.setColumnWidth(8, 100)   # ACTION
             table.horizontalHeader().setStretchLastSection(True)  # Stretch last column to fill remaining space
-            # Define certificate prices
-            CERTIFICATE_PRICES = {
-                'Barangay Indigency': 0.00,  # Free
-                'Barangay Clearance': 50.00,
-                'Barangay ID': 100.00,
-                'Business Permit': 500.00
-            }
-            # Load data - ALL accepted requests (Processing, Ready for Pickup, and Completed)
-            db = SessionLocal()
-            try:
-                # First, ensure all accepted requests have payment records
-                # Query requests that are Processing, Ready for Pickup, or Completed
-                accepted_requests = db.query(CertificateRequest).filter(
-                    CertificateRequest.status.in_(['Processing', 'Ready for Pickup', 'Completed'])
-                ).all()
-                
-                # Create payment records for any that don't have one
-                for req in accepted_requests:
-                    existing_payment = db.query(CertificatePayment).filter(
-                        CertificatePayment.request_id == req.request_id
-                    ).first()
-                    
-                    if not existing_payment:
-                        # Create payment record for this request
-                        cert_type = req.certificate_type or ''
-                        unit_price = CERTIFICATE_PRICES.get(cert_type, 50.00)
-                        quantity = req.quantity or 1
-                        total_amount = unit_price * quantity
-                        requestor_name = f"{req.first_name or ''} {req.last_name or ''}".strip()
-                        
-                        # For Completed requests, mark as paid
-                        is_paid = (req.status == 'Completed')
-                        
-                        payment = CertificatePayment(
-                            request_id=req.request_id,
-                            resident_id=req.resident_id,
-                            certificate_type=cert_type,
-                            requestor_name=requestor_name,
-                            quantity=quantity,
-                            unit_price=unit_price,
-                            total_amount=total_amount,
-                            is_paid=is_paid,
-                            payment_method='Cash',
-                            created_at=req.created_at or datetime.now(),
-                            received_at=req.updated_at if is_paid else None
-                        )
-                        db.add(payment)
-                        print(f"💰 Created missing payment record for request #{req.request_id} ({cert_type})")
-                
-                db.commit()  # Save any new payment records
-                
-                # Now query all payment records
-                payments = db.query(CertificatePayment).order_by(
-                    CertificatePayment.is_paid.asc(),  # Unpaid first
-                    CertificatePayment.created_at.desc()
-                ).all()
-                
-                table.setRowCount(len(payments))
-                for row, payment in enumerate(payments):
-                    # Get the associated request
-                    req = db.query(CertificateRequest).filter(
-                        CertificateRequest.request_id == payment.request_id
-                    ).first()
-                    
-                    if not req:
-                        continue
-                    # ID
-                    id_item = QtWidgets.QTableWidgetItem(str(req.request_id))
-                    id_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 0, id_item)
-                    # NAME - use name from request form, auto-capitalize
-                    first_name = (req.first_name or "").strip().title()
-                    last_name = (req.last_name or "").strip().title()
-                    name = f"{first_name} {last_name}"
-                    name_item = QtWidgets.QTableWidgetItem(name)
-                    name_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 1, name_item)
-                    # CERTIFICATE TYPE
-                    type_item = QtWidgets.QTableWidgetItem(req.certificate_type)
-                    type_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 2, type_item)
-                    # QUANTITY
-                    qty_item = QtWidgets.QTableWidgetItem(str(req.quantity or 1))
-                    qty_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 3, qty_item)
-                    # UNIT PRICE
-                    unit_price = CERTIFICATE_PRICES.get(req.certificate_type, 0.00)
-                    price_item = QtWidgets.QTableWidgetItem(f"₱{unit_price:.2f}")
-                    price_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    table.setItem(row, 4, price_item)
-                    # TOTAL
-                    total = unit_price * (req.quantity or 1)
-                    total_item = QtWidgets.QTableWidgetItem(f"₱{total:.2f}")
-                    total_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    total_item.setForeground(QtGui.QColor("#1565c0"))
-                    table.setItem(row, 5, total_item)
-                    # RECEIPT # (OR Number or Reference Number with payment method)
-                    receipt_text = ""
-                    if payment and payment.is_paid:
-                        method = payment.payment_method or "Cash"
-                        if payment.or_number and payment.reference_number:
-                            receipt_text = f"OR: {payment.or_number}\nRef: {payment.reference_number}"
-                        elif payment.or_number:
-                            receipt_text = f"OR: {payment.or_number}"
-                        elif payment.reference_number:
-                            receipt_text = f"{method}: {payment.reference_number}"
-                        else:
-                            receipt_text = f"({method})"
-                    receipt_item = QtWidgets.QTableWidgetItem(receipt_text)
-                    receipt_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    if receipt_text:
-                        receipt_item.setForeground(QtGui.QColor("#1565c0"))
-                    table.setItem(row, 6, receipt_item)
-                    # STATUS (column 7)
-                    if payment and payment.is_paid:
-                        status_text = "PAID ✓"
-                        status_color = "#4caf50"
-                    else:
-                        status_text = "UNPAID"
-                        status_color = "#ff9800"
-                    status_item = QtWidgets.QTableWidgetItem(status_text)
-                    status_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                    status_item.setForeground(QtGui.QColor(status_color))
-                    table.setItem(row, 7, status_item)
-                    # ACTION - Mark as Paid button (column 8 - at the very end)
-                    action_widget = QtWidgets.QWidget()
-                    action_layout = QtWidgets.QHBoxLayout(action_widget)
-                    action_layout.setContentsMargins(5, 5, 5, 5)
-                    action_layout.setAlignment(QtCore.Qt.AlignCenter)
-                    if payment and payment.is_paid:
-                        # Already paid - show checkmark
-                        paid_label = QtWidgets.QLabel("✓ Paid")
-                        paid_label.setStyleSheet("color: #4caf50; font-weight: bold; font-size: 10pt;")
-                        paid_label.setAlignment(QtCore.Qt.AlignCenter)
-                        action_layout.addWidget(paid_label)
-                    else:
-                        # Mark as Paid button
-                        pay_btn = QtWidgets.QPushButton("💵 Mark Paid")
-                        pay_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                        pay_btn.setStyleSheet("""
-                            QPushButton {
-                                background-color: #4caf50;
-                                color: white;
-                                border: none;
-                                padding: 6px 8px;
-                                border-radius: 5px;
-                                font-weight: bold;
-                                font-size: 9pt;
-                            }
-                            QPushButton:hover { background-color: #388e3c; }
-                        """)
-                        # Store request data for the button
-                        request_id = req.request_id
-                        resident_id = req.resident_id
-                        cert_type = req.certificate_type
-                        # Use name from request form, auto-capitalize
-                        first_name = (req.first_name or "").strip().title()
-                        last_name = (req.last_name or "").strip().title()
-                        requestor = f"{first_name} {last_name}"
-                        qty = req.quantity or 1
-                        unit_price = CERTIFICATE_PRICES.get(req.certificate_type, 0.00)
-                        total = unit_price * qty
-                        pay_btn.clicked.connect(
-                            lambda checked, rid=request_id, resid=resident_id, ct=cert_type, 
-                                   rn=requestor, q=qty, up=unit_price, t=total:
-                            self.mark_as_paid(rid, resid, ct, rn, q, up, t)
-                        )
-                        action_layout.addWidget(pay_btn)
-                    table.setCellWidget(row, 8, action_widget)
-            finally:
-                db.close()
+            # Payments created in the date window, one page at a time (app/payment_ledger.py)
+            window_row = QtWidgets.QHBoxLayout()
+            window_row.setContentsMargins(0, 0, 0, 0)
+            window_row.setSpacing(5)
+            window_row.addWidget(QtWidgets.QLabel("Created:"))
+            today = QtCore.QDate.currentDate()
+            window = getattr(self, 'payment_window', None)
+            date_from_edit = QtWidgets.QDateEdit(
+                QtCore.QDate(window[0]) if window else today.addDays(-PAYMENT_WINDOW_DAYS))
+            date_to_edit = QtWidgets.QDateEdit(QtCore.QDate(window[1]) if window else today)
+            for edit in (date_from_edit, date_to_edit):
+                edit.setCalendarPopup(True)
+                edit.setDisplayFormat("yyyy-MM-dd")
+                edit.setStyleSheet("background-color: white; padding: 4px;")
+            window_row.addWidget(date_from_edit)
+            window_row.addWidget(QtWidgets.QLabel("to"))
+            window_row.addWidget(date_to_edit)
+            window_row.addStretch()
+            prev_btn = QtWidgets.QPushButton("◀ Prev")
+            page_label = QtWidgets.QLabel()
+            page_label.setStyleSheet("font-size: 9pt; color: #555;")
+            next_btn = QtWidgets.QPushButton("Next ▶")
+            for widget in (prev_btn, page_label, next_btn):
+                window_row.addWidget(widget)
+            main_layout.addLayout(window_row)
+            self.payment_page_controls = (page_label, prev_btn, next_btn)
+
+            def apply_window():
+                self.payment_window = (date_from_edit.date().toPyDate(), date_to_edit.date().toPyDate())
+                self.load_payment_table(0)
+            date_from_edit.dateChanged.connect(apply_window)
+            date_to_edit.dateChanged.connect(apply_window)
+            prev_btn.clicked.connect(lambda: self.load_payment_table(self.payment_page_index - 1))
+            next_btn.clicked.connect(lambda: self.load_payment_table(self.payment_page_index + 1))
+            self.payment_window = (date_from_edit.date().toPyDate(), date_to_edit.date().toPyDate())
+            self.load_payment_table(0)
             main_layout.addWidget(table, 1)  # Give table stretch priority
             outer_layout.addWidget(main_container)
             # Replace content
@@ -3739,10 +4187,309 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             self.notification.show_error(f"❌ Error loading Payment page: {e}")
             import traceback
             traceback.print_exc()
+    def load_payment_stats(self):
+        """(pending payments, paid today, collected today) as display strings"""
+        try:
+            from app import payment_ledger
+            stats = payment_ledger.summary()
+            return str(stats["pending"]), str(stats["paid_today"]), f"₱{float(stats['collected_today']):.2f}"
+        except Exception as e:
+            return "0", "0", "₱0.00"
+    def load_payment_table(self, page=0):
+        """Fill the payments table with one page of the current date window"""
+        table = getattr(self, 'payments_table', None)
+        if table is None:
+            return
+        try:
+            from app import payment_ledger
+            from app.config import PAYMENT_PAGE_SIZE
+            date_from, date_to = self.payment_window
+            db = SessionLocal()
+            try:
+                rows, total = payment_ledger.payment_page(db, date_from, date_to, max(0, page))
+            finally:
+                db.close()
+            pages = max(1, -(-total // PAYMENT_PAGE_SIZE))
+            self.payment_page_index = max(0, min(page, pages - 1))
+            if page != self.payment_page_index:
+                # e.g. a narrower window has fewer pages
+                return self.load_payment_table(self.payment_page_index)
+            table.setRowCount(len(rows))
+            for row, (req, payment) in enumerate(rows):
+                self.set_payment_row(table, row, req, payment)
+            self.payment_total = total
+            self.update_payment_page_label()
+        except RuntimeError:
+            # The payments page was closed in the meantime
+            self.payments_table = None
+        except Exception as e:
+            self.notification.show_error(f"❌ Error loading payments: {e}")
+    def update_payment_page_label(self):
+        """'1-100 of 250' and the Prev/Next buttons of the payments table"""
+        from app.config import PAYMENT_PAGE_SIZE
+        page_label, prev_btn, next_btn = self.payment_page_controls
+        total = self.payment_total
+        pages = max(1, -(-total // PAYMENT_PAGE_SIZE))
+        first = self.payment_page_index * PAYMENT_PAGE_SIZE
+        page_label.setText(f"{first + 1 if total else 0}-{first + self.payments_table.rowCount()} of {total}")
+        prev_btn.setEnabled(self.payment_page_index > 0)
+        next_btn.setEnabled(self.payment_page_index < pages - 1)
+    def set_payment_row(self, table, row, req, payment):
+        """All columns of one payments table row"""
+        from app.config import certificate_price
+        # ID (also carries the request id for bulk actions)
+        id_item = QtWidgets.QTableWidgetItem(str(req.request_id))
+        id_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        id_item.setData(QtCore.Qt.UserRole, req.request_id)
+        table.setItem(row, 0, id_item)
+        # NAME - use name from request form, auto-capitalize
+        first_name = (req.first_name or "").strip().title()
+        last_name = (req.last_name or "").strip().title()
+        name = f"{first_name} {last_name}"
+        name_item = QtWidgets.QTableWidgetItem(name)
+        name_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 1, name_item)
+        # CERTIFICATE TYPE
+        type_item = QtWidgets.QTableWidgetItem(req.certificate_type)
+        type_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 2, type_item)
+        # QUANTITY
+        qty_item = QtWidgets.QTableWidgetItem(str(req.quantity or 1))
+        qty_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 3, qty_item)
+        # UNIT PRICE
+        unit_price = certificate_price(req.certificate_type)
+        price_item = QtWidgets.QTableWidgetItem(f"₱{unit_price:.2f}")
+        price_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        table.setItem(row, 4, price_item)
+        # TOTAL
+        total_amount = unit_price * (req.quantity or 1)
+        total_item = QtWidgets.QTableWidgetItem(f"₱{total_amount:.2f}")
+        total_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        total_item.setForeground(QtGui.QColor("#1565c0"))
+        table.setItem(row, 5, total_item)
+        # RECEIPT #, STATUS and ACTION
+        self.set_payment_row_state(table, row, req, payment)
+    def show_payment_ledger(self):
+        """This month's collections per day and per cashier (closed days come from the end-of-day ledger)"""
+        try:
+            from app import payment_ledger
+            from datetime import date
+            today = date.today()
+            month_start = today.replace(day=1)
+            days = payment_ledger.daily_totals(month_start, today)
+            cashiers = payment_ledger.cashier_totals(month_start, today)
+            dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle(f"Payments Ledger - {today:%B %Y}")
+            dialog.resize(560, 520)
+            layout = QtWidgets.QVBoxLayout(dialog)
+            count = sum(t.count for t in days.values())
+            collected = sum(t.total for t in days.values())
+            summary = QtWidgets.QLabel(f"<b>{count}</b> payment(s), <b>₱{float(collected):,.2f}</b> collected this month")
+            summary.setStyleSheet("font-size: 11pt;")
+            layout.addWidget(summary)
+            for headers, rows in (
+                (["CASHIER", "PAYMENTS", "TOTAL"],
+                 [(c["username"] or ("(not recorded)" if c["admin_id"] is None else f"#{c['admin_id']}"),
+                   c["count"], c["total"]) for c in cashiers]),
+                (["DAY", "PAYMENTS", "TOTAL"],
+                 [(f"{day:%a %b %d}", t.count, t.total) for day, t in sorted(days.items(), reverse=True)]),
+            ):
+                ledger_table = QtWidgets.QTableWidget(len(rows), 3)
+                ledger_table.setHorizontalHeaderLabels(headers)
+                ledger_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+                ledger_table.verticalHeader().setVisible(False)
+                ledger_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+                for row, (label, row_count, row_total) in enumerate(rows):
+                    for column, text in enumerate((label, str(row_count), f"₱{float(row_total):,.2f}")):
+                        ledger_table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+                layout.addWidget(ledger_table)
+            close_btn = QtWidgets.QPushButton("Close")
+            close_btn.clicked.connect(dialog.accept)
+            layout.addWidget(close_btn, 0, QtCore.Qt.AlignRight)
+            dialog.exec_()
+        except Exception as e:
+            self.notification.show_error(f"❌ Error loading payments ledger: {e}")
+    def set_payment_row_state(self, table, row, req, payment):
+        """RECEIPT #, STATUS and ACTION columns of one payments table row"""
+        from app.config import certificate_price
+        # RECEIPT # (OR Number or Reference Number with payment method)
+        receipt_text = ""
+        if payment and payment.is_paid:
+            method = payment.payment_method or "Cash"
+            if payment.or_number and payment.reference_number:
+                receipt_text = f"OR: {payment.or_number}\nRef: {payment.reference_number}"
+            elif payment.or_number:
+                receipt_text = f"OR: {payment.or_number}"
+            elif payment.reference_number:
+                receipt_text = f"{method}: {payment.reference_number}"
+            else:
+                receipt_text = f"({method})"
+        receipt_item = QtWidgets.QTableWidgetItem(receipt_text)
+        receipt_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        if receipt_text:
+            receipt_item.setForeground(QtGui.QColor("#1565c0"))
+        table.setItem(row, 6, receipt_item)
+        # STATUS (column 7)
+        if payment and payment.is_paid:
+            status_text = "PAID ✓"
+            status_color = "#4caf50"
+        else:
+            status_text = "UNPAID"
+            status_color = "#ff9800"
+        status_item = QtWidgets.QTableWidgetItem(status_text)
+        status_item.setTextAlignment(QtCore.Qt.AlignCenter)
+        status_item.setForeground(QtGui.QColor(status_color))
+        table.setItem(row, 7, status_item)
+        # ACTION - Mark as Paid button (column 8 - at the very end)
+        action_widget = QtWidgets.QWidget()
+        action_layout = QtWidgets.QHBoxLayout(action_widget)
+        action_layout.setContentsMargins(5, 5, 5, 5)
+        action_layout.setAlignment(QtCore.Qt.AlignCenter)
+        if payment and payment.is_paid:
+            # Already paid - show checkmark
+            paid_label = QtWidgets.QLabel("✓ Paid")
+            paid_label.setStyleSheet("color: #4caf50; font-weight: bold; font-size: 10pt;")
+            paid_label.setAlignment(QtCore.Qt.AlignCenter)
+            action_layout.addWidget(paid_label)
+        else:
+            # Mark as Paid button
+            pay_btn = QtWidgets.QPushButton("💵 Mark Paid")
+            pay_btn.setCursor(QtCore.Qt.PointingHandCursor)
+            pay_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #4caf50;
+                    color: white;
+                    border: none;
+                    padding: 6px 8px;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 9pt;
+                }
+                QPushButton:hover { background-color: #388e3c; }
+            """)
+            # Store request data for the button
+            request_id = req.request_id
+            resident_id = req.resident_id
+            cert_type = req.certificate_type
+            # Use name from request form, auto-capitalize
+            first_name = (req.first_name or "").strip().title()
+            last_name = (req.last_name or "").strip().title()
+            requestor = f"{first_name} {last_name}"
+            qty = req.quantity or 1
+            unit_price = certificate_price(req.certificate_type)
+            total = unit_price * qty
+            pay_btn.clicked.connect(
+                lambda checked, rid=request_id, resid=resident_id, ct=cert_type, 
+                       rn=requestor, q=qty, up=unit_price, t=total:
+                self.mark_as_paid(rid, resid, ct, rn, q, up, t)
+            )
+            action_layout.addWidget(pay_btn)
+        table.setCellWidget(row, 8, action_widget)
+    def refresh_payment_rows(self, request_ids):
+        """Re-read only the given requests' payments and update their rows and the stat cards"""
+        table = getattr(self, 'payments_table', None)
+        if table is None or not request_ids:
+            return
+        try:
+            from app.models import CertificateRequest, CertificatePayment
+            db = SessionLocal()
+            try:
+                rows = db.query(CertificateRequest, CertificatePayment).join(
+                    CertificatePayment, CertificatePayment.request_id == CertificateRequest.request_id
+                ).filter(CertificateRequest.request_id.in_(request_ids)).all()
+            finally:
+                db.close()
+            by_id = {req.request_id: (req, payment) for req, payment in rows}
+            for row in range(table.rowCount()):
+                item = table.item(row, 0)
+                request_id = item.data(QtCore.Qt.UserRole) if item is not None else None
+                if request_id in by_id:
+                    self.set_payment_row_state(table, row, *by_id[request_id])
+            for label, value in zip(getattr(self, 'payment_stat_labels', []), self.load_payment_stats()):
+                label.setText(value)
+        except RuntimeError:
+            # The payments page was closed in the meantime
+            self.payments_table = None
+    def apply_payment_changes(self, request_ids):
+        """Another station changed these payments: update their rows and add new ones that fall in the window"""
+        table = getattr(self, 'payments_table', None)
+        if table is None:
+            return
+        if RELOAD in request_ids:
+            return self.load_payment_table(self.payment_page_index)
+        try:
+            shown = {table.item(row, 0).data(QtCore.Qt.UserRole) for row in range(table.rowCount())
+                     if table.item(row, 0) is not None}
+            self.refresh_payment_rows([rid for rid in request_ids if rid in shown])
+            new_ids = [rid for rid in request_ids if rid not in shown]
+            if not new_ids or self.payments_table is None:
+                return
+            from datetime import timedelta
+            from app import payment_ledger
+            from app.models import CertificateRequest, CertificatePayment
+            date_from, date_to = self.payment_window
+            db = SessionLocal()
+            try:
+                rows = db.query(CertificateRequest, CertificatePayment).join(
+                    CertificatePayment, CertificatePayment.request_id == CertificateRequest.request_id
+                ).filter(
+                    CertificateRequest.request_id.in_(new_ids),
+                    CertificatePayment.created_at >= payment_ledger.day_start(date_from),
+                    CertificatePayment.created_at < payment_ledger.day_start(date_to + timedelta(days=1))
+                ).order_by(CertificatePayment.created_at, CertificatePayment.payment_id).all()
+            finally:
+                db.close()
+            if not rows:
+                return
+            self.payment_total += len(rows)
+            if self.payment_page_index == 0:
+                # New payments are unpaid and the newest: the top of the first page
+                for req, payment in rows:
+                    table.insertRow(0)
+                    self.set_payment_row(table, 0, req, payment)
+            self.update_payment_page_label()
+            for label, value in zip(getattr(self, 'payment_stat_labels', []), self.load_payment_stats()):
+                label.setText(value)
+        except RuntimeError:
+            self.payments_table = None
+    def bulk_mark_selected_paid(self):
+        """Mark every selected unpaid payment as paid in a single transaction"""
+        try:
+            from app.controllers.admin_controller import AdminController
+            table = getattr(self, 'payments_table', None)
+            request_ids = self.selected_request_ids(table) if table is not None else []
+            if not request_ids:
+                self.notification.show_warning("⚠️ Select one or more payments first")
+                return
+            method, ok = QtWidgets.QInputDialog.getItem(
+                self, "Mark Selected Paid",
+                f"Payment method for the {len(request_ids)} selected payment(s):",
+                ["Cash", "GCash", "Bank Transfer", "Other"], 0, False
+            )
+            if not ok:
+                return
+            result = AdminController.bulk_mark_paid(request_ids, method, self.admin_account_id)
+            if not result["success"]:
+                self.notification.show_error(f"❌ Bulk payment failed: {result['error']}")
+                return
+            # The controller's PaymentRecorded event refreshes the rows and stat cards
+            if result["updated"]:
+                receipts = sorted(result['receipts'].values())
+                issued = f", OR {receipts[0]} - {receipts[-1]}" if receipts else ""
+                self.notification.show_success(f"✅ {len(result['updated'])} payment(s) marked paid (₱{result['total']:.2f}, {method}{issued})")
+            else:
+                self.notification.show_info("ℹ️ The selected payments were already paid")
+        except Exception as e:
+            self.notification.show_error(f"❌ Error: {e}")
+            import traceback
+            traceback.print_exc()
     def mark_as_paid(self, request_id, resident_id, cert_type, requestor_name, quantity, unit_price, total):
         """Mark a certificate request as paid"""
         try:
             from app.models import CertificatePayment, CertificateRequest
+            from app.or_numbers import get_or_allocator
+            from sqlalchemy.exc import IntegrityError
             from datetime import datetime
             # Show confirmation dialog with payment method and receipt inputs
             dialog = QtWidgets.QDialog(self)
@@ -3790,7 +4537,12 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             or_label.setStyleSheet("font-weight: bold;")
             or_layout.addWidget(or_label)
             or_input = QtWidgets.QLineEdit()
-            or_input.setPlaceholderText("Official Receipt Number")
+            # Cash payments left blank get this station's next OR number (app/or_numbers.py)
+            try:
+                or_input.setPlaceholderText(f"Automatic for Cash (next: {get_or_allocator().peek()})")
+            except Exception as e:
+                print(f"⚠️ OR numbers unavailable: {e}")
+                or_input.setPlaceholderText("Official Receipt Number")
             or_input.setStyleSheet("""
                 QLineEdit {
                     padding: 8px;
@@ -3850,6 +4602,8 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                 ref_number = ref_input.text().strip()
                 db = SessionLocal()
                 try:
+                    if not or_number and payment_method == 'Cash':
+                        or_number = get_or_allocator().allocate()
                     # Check if payment record exists
                     payment = db.query(CertificatePayment).filter(
                         CertificatePayment.request_id == request_id
@@ -3867,6 +4621,7 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                             is_paid=True,
                             payment_method=payment_method,
                             received_at=datetime.now(),
+                            received_by_admin_id=self.admin_account_id,
                             or_number=or_number if or_number else None,
                             reference_number=ref_number if ref_number else None
                         )
@@ -3876,13 +4631,17 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
                         payment.is_paid = True
                         payment.payment_method = payment_method
                         payment.received_at = datetime.now()
+                        payment.received_by_admin_id = self.admin_account_id
                         payment.or_number = or_number if or_number else None
                         payment.reference_number = ref_number if ref_number else None
+                    publish_on_commit(db, PaymentRecorded({request_id}))
                     db.commit()
                     self.notification.show_success(f"✅ Payment of ₱{total:.2f} ({payment_method}) confirmed for Request #{request_id}")
+                    # The PaymentRecorded event refreshes the paid row and the stat cards
                     dialog.accept()
-                    # Refresh the payment page
-                    self.show_payment_page()
+                except IntegrityError:
+                    db.rollback()
+                    self.notification.show_error(f"❌ OR number {or_number} is already on another payment")
                 except Exception as e:
                     self.notification.show_error(f"❌ Error: {e}")
                 finally:
@@ -3946,331 +4705,117 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
         except Exception as e:
             pass
     def print_certificate(self, request):
-        """Show certificate preview"""
+        """Show certificate preview (rendered by the same engine that prints it)"""
         try:
             from app.models import Resident
-            import os
-            import re
+            from gui.certificate_renderer import certificate_fields, shared_renderer
             db = SessionLocal()
             try:
                 resident = db.query(Resident).filter(Resident.resident_id == request.resident_id).first()
-                
-                # Use name from the REQUEST FORM (not the account name)
-                # This allows users to request certificates for others (e.g., family members)
-                # Auto-capitalize: john kester benitez → John Kester Benitez
-                first_name = (request.first_name or "").strip().title()
-                middle_name = (request.middle_name or "").strip().title()
-                last_name = (request.last_name or "").strip().title()
-                suffix = (request.suffix or "").strip().upper() if request.suffix else ""
-                
-                # Clean any numeric-only values from name fields (data migration issue)
-                # Remove phone numbers, IDs, or any purely numeric strings
-                def clean_name_part(name_part):
-                    """Remove numeric-only parts and phone numbers from name"""
-                    if not name_part:
-                        return ""
-                    # Remove if it's purely numeric or looks like a phone number
-                    cleaned = re.sub(r'^\d+$', '', name_part)  # Remove pure numbers
-                    cleaned = re.sub(r'^\d{10,}', '', cleaned)  # Remove phone numbers at start
-                    cleaned = re.sub(r'\d{10,}$', '', cleaned)  # Remove phone numbers at end
-                    return cleaned.strip()
-                
-                first_name = clean_name_part(first_name)
-                middle_name = clean_name_part(middle_name)
-                last_name = clean_name_part(last_name)
-                
-                # Build full name from request form
-                if middle_name:
-                    resident_name = f"{first_name} {middle_name} {last_name}"
-                else:
-                    resident_name = f"{first_name} {last_name}"
-                
-                if suffix:
-                    resident_name += f" {suffix}"
-                
-                # Clean up any extra spaces
-                resident_name = ' '.join(resident_name.split())
-                
-                # Fallback to resident table if request has no name
-                if not first_name and not last_name and resident:
-                    resident_name = f"{resident.first_name} {resident.last_name}".title()
-                
-                # Create certificate preview dialog
-                dialog = QtWidgets.QDialog(self)
-                dialog.setWindowTitle("Certificate Preview")
-                dialog.setFixedSize(650, 850)
-                dialog.setStyleSheet("background-color: #f0f0f0;")
-                layout = QtWidgets.QVBoxLayout(dialog)
-                layout.setSpacing(10)
-                layout.setContentsMargins(20, 20, 20, 20)
-                # Title
-                title_label = QtWidgets.QLabel("📄 Certificate Preview")
-                title_label.setStyleSheet("font-size: 14pt; font-weight: bold; color: #333;")
-                title_label.setAlignment(QtCore.Qt.AlignCenter)
-                layout.addWidget(title_label)
-                # Certificate frame (like paper)
-                cert_frame = QtWidgets.QFrame()
-                cert_frame.setStyleSheet("""
-                    QFrame {
-                        background-color: white;
-                        border: 1px solid #ccc;
-                        border-radius: 5px;
-                    }
-                """)
-                cert_layout = QtWidgets.QVBoxLayout(cert_frame)
-                cert_layout.setContentsMargins(25, 25, 25, 25)
-                cert_layout.setSpacing(5)
-                # Header section with logo and text
-                header_widget = QtWidgets.QWidget()
-                header_layout = QtWidgets.QHBoxLayout(header_widget)
-                header_layout.setContentsMargins(0, 0, 0, 0)
-                # Logo on left
-                logo_label = QtWidgets.QLabel()
-                logo_path = os.path.join(os.path.dirname(__file__), '..', 'ui', 'logo.jpg')
-                if os.path.exists(logo_path):
-                    pixmap = QtGui.QPixmap(logo_path)
-                    scaled_pixmap = pixmap.scaled(65, 65, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                    logo_label.setPixmap(scaled_pixmap)
-                logo_label.setFixedSize(70, 70)
-                header_layout.addWidget(logo_label)
-                # Header text (center)
-                header_text = QtWidgets.QLabel()
-                header_text.setAlignment(QtCore.Qt.AlignCenter)
-                header_text.setText("""
-                    <p style="margin: 0; font-size: 9pt;">Republic of the Philippines</p>
-                    <p style="margin: 0; font-size: 9pt; font-weight: bold;">PROVINCE OF BATANGAS</p>
-                    <p style="margin: 0; font-size: 9pt; font-style: italic;">Municipality of Calatagan</p>
-                    <p style="margin: 0; font-size: 9pt; font-weight: bold;">Barangay Balibago</p>
-                """)
-                header_layout.addWidget(header_text, 1)
-                cert_layout.addWidget(header_widget)
-                # Date calculations
-                from datetime import datetime
-                current_date = datetime.now()
-                day = current_date.day
-                if 10 <= day % 100 <= 20:
-                    suffix = 'th'
-                else:
-                    suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
-                day_with_suffix = f"{day}{suffix}"
-                month_year = current_date.strftime('%B, %Y')
-                
-                # Get certificate type
-                cert_type = request.certificate_type.lower() if request.certificate_type else ''
-                
-                # Different certificate templates based on type
-                if 'business' in cert_type:
-                    # BUSINESS PERMIT CERTIFICATE
-                    body_html = f"""
-                    <p style="text-align: center; font-size: 11pt; font-weight: bold; margin: 10px 0 5px 0; text-decoration: underline;">
-                        OFFICE OF THE BARANGAY CAPTAIN
-                    </p>
-                    <p style="text-align: center; font-size: 13pt; font-weight: bold; color: #006400; margin: 12px 0;">
-                        BARANGAY BUSINESS PERMIT
-                    </p>
-                    <p style="text-align: left; font-size: 10pt; font-weight: bold; margin: 12px 0 8px 0;">
-                        TO WHOM IT MAY CONCERN:
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        THIS IS TO CERTIFY that <strong><u>{resident_name.upper()}</u></strong> of legal age, a 
-                        Filipino Citizen and a bonafide resident of Barangay Balibago, Calatagan, 
-                        Batangas, is hereby granted this <strong>BARANGAY BUSINESS PERMIT</strong> to operate 
-                        a business establishment within the territorial jurisdiction of this barangay.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        <strong>Purpose:</strong> {request.purpose.upper() if request.purpose else 'BUSINESS OPERATION'}
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        This permit is issued subject to existing barangay ordinances, rules and regulations, 
-                        and is valid for one (1) year from the date of issuance unless sooner revoked for cause.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; font-size: 10pt; margin: 12px 0;">
-                        Issued this <u>{day_with_suffix}</u> day of <u>{month_year}</u> at Barangay Balibago, Calatagan, Batangas.
-                    </p>
-                    <div style="margin-top: 35px; text-align: center;">
-                        <p style="margin: 0; font-size: 10pt; font-weight: bold;">
-                            _________________________________
-                        </p>
-                        <p style="margin: 3px 0 0 0; font-size: 9pt; font-style: italic;">
-                            Punong Barangay
-                        </p>
-                    </div>
-                    <p style="text-align: center; font-size: 8pt; font-weight: bold; margin-top: 25px;">
-                        NOT VALID WITHOUT SEAL
-                    </p>
-                    """
-                elif 'indigency' in cert_type:
-                    # CERTIFICATE OF INDIGENCY
-                    body_html = f"""
-                    <p style="text-align: center; font-size: 11pt; font-weight: bold; margin: 10px 0 5px 0; text-decoration: underline;">
-                        OFFICE OF THE BARANGAY CAPTAIN
-                    </p>
-                    <p style="text-align: center; font-size: 13pt; font-weight: bold; color: #8B4513; margin: 12px 0;">
-                        CERTIFICATE OF INDIGENCY
-                    </p>
-                    <p style="text-align: left; font-size: 10pt; font-weight: bold; margin: 12px 0 8px 0;">
-                        TO WHOM IT MAY CONCERN:
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        THIS IS TO CERTIFY that <strong><u>{resident_name.upper()}</u></strong> of legal age, a 
-                        Filipino Citizen and a bonafide resident of Barangay Balibago, Calatagan, 
-                        Batangas, belongs to the <strong>INDIGENT FAMILIES</strong> in this barangay.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        <strong>Purpose:</strong> {request.purpose.upper() if request.purpose else 'GENERAL PURPOSE'}
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        This certification is issued upon the request of the above-mentioned person for 
-                        whatever legal purpose it may serve, particularly for availing government assistance 
-                        and other benefits intended for indigent families.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; font-size: 10pt; margin: 12px 0;">
-                        Issued this <u>{day_with_suffix}</u> day of <u>{month_year}</u> at Barangay Balibago, Calatagan, Batangas.
-                    </p>
-                    <div style="margin-top: 35px; text-align: center;">
-                        <p style="margin: 0; font-size: 10pt; font-weight: bold;">
-                            _________________________________
-                        </p>
-                        <p style="margin: 3px 0 0 0; font-size: 9pt; font-style: italic;">
-                            Punong Barangay
-                        </p>
-                    </div>
-                    <p style="text-align: center; font-size: 8pt; font-weight: bold; margin-top: 25px;">
-                        NOT VALID WITHOUT SEAL
-                    </p>
-                    """
-                elif 'id' in cert_type:
-                    # BARANGAY ID CERTIFICATE
-                    body_html = f"""
-                    <p style="text-align: center; font-size: 11pt; font-weight: bold; margin: 10px 0 5px 0; text-decoration: underline;">
-                        OFFICE OF THE BARANGAY CAPTAIN
-                    </p>
-                    <p style="text-align: center; font-size: 13pt; font-weight: bold; color: #1E90FF; margin: 12px 0;">
-                        BARANGAY IDENTIFICATION CERTIFICATE
-                    </p>
-                    <p style="text-align: left; font-size: 10pt; font-weight: bold; margin: 12px 0 8px 0;">
-                        TO WHOM IT MAY CONCERN:
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        THIS IS TO CERTIFY that <strong><u>{resident_name.upper()}</u></strong> of legal age, a 
-                        Filipino Citizen, is a bonafide resident of Barangay Balibago, Calatagan, 
-                        Batangas.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        <strong>Purpose:</strong> {request.purpose.upper() if request.purpose else 'IDENTIFICATION'}
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        This certification is issued for identification purposes and to certify the 
-                        residency status of the above-mentioned person.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; font-size: 10pt; margin: 12px 0;">
-                        Issued this <u>{day_with_suffix}</u> day of <u>{month_year}</u> at Barangay Balibago, Calatagan, Batangas.
-                    </p>
-                    <div style="margin-top: 35px; text-align: center;">
-                        <p style="margin: 0; font-size: 10pt; font-weight: bold;">
-                            _________________________________
-                        </p>
-                        <p style="margin: 3px 0 0 0; font-size: 9pt; font-style: italic;">
-                            Punong Barangay
-                        </p>
-                    </div>
-                    <p style="text-align: center; font-size: 8pt; font-weight: bold; margin-top: 25px;">
-                        NOT VALID WITHOUT SEAL
-                    </p>
-                    """
-                else:
-                    # BARANGAY CLEARANCE CERTIFICATE (default)
-                    body_html = f"""
-                    <p style="text-align: center; font-size: 11pt; font-weight: bold; margin: 10px 0 5px 0; text-decoration: underline;">
-                        OFFICE OF THE BARANGAY CAPTAIN
-                    </p>
-                    <p style="text-align: center; font-size: 13pt; font-weight: bold; color: #8B0000; margin: 12px 0;">
-                        BARANGAY CLEARANCE
-                    </p>
-                    <p style="text-align: left; font-size: 10pt; font-weight: bold; margin: 12px 0 8px 0;">
-                        TO WHOM IT MAY CONCERN:
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        THIS IS TO CERTIFY that <strong><u>{resident_name.upper()}</u></strong> of legal age, a 
-                        Filipino Citizen and a bonafide resident of Barangay Balibago, Calatagan, 
-                        Batangas, has no derogatory record filed in this barangay as of this date.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        <strong>Purpose:</strong> {request.purpose.upper() if request.purpose else 'GENERAL PURPOSE'}
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; text-align: justify; font-size: 10pt; margin: 6px 0;">
-                        This certification is issued upon the request of the above-mentioned person for 
-                        whatever legal purpose it may serve.
-                    </p>
-                    <p style="text-indent: 35px; line-height: 1.5; font-size: 10pt; margin: 12px 0;">
-                        Issued this <u>{day_with_suffix}</u> day of <u>{month_year}</u> at Barangay Balibago, Calatagan, Batangas.
-                    </p>
-                    <div style="margin-top: 35px; text-align: center;">
-                        <p style="margin: 0; font-size: 10pt; font-weight: bold;">
-                            _________________________________
-                        </p>
-                        <p style="margin: 3px 0 0 0; font-size: 9pt; font-style: italic;">
-                            Punong Barangay
-                        </p>
-                    </div>
-                    <p style="text-align: center; font-size: 8pt; font-weight: bold; margin-top: 25px;">
-                        NOT VALID WITHOUT SEAL
-                    </p>
-                    """
-                body_label = QtWidgets.QLabel()
-                body_label.setText(body_html)
-                body_label.setWordWrap(True)
-                body_label.setAlignment(QtCore.Qt.AlignTop)
-                cert_layout.addWidget(body_label)
-                cert_layout.addStretch()
-                layout.addWidget(cert_frame)
-                # Buttons
-                btn_layout = QtWidgets.QHBoxLayout()
-                btn_layout.addStretch()
-                # Print button - sets status to Ready for Pickup
-                print_btn = QtWidgets.QPushButton("🖨 Print")
-                print_btn.setFixedSize(100, 35)
-                print_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                print_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #27ae60;
-                        color: white;
-                        border: none;
-                        border-radius: 5px;
-                        font-weight: bold;
-                        font-size: 10pt;
-                    }
-                    QPushButton:hover { background-color: #219a52; }
-                """)
-                print_btn.clicked.connect(lambda: self.do_print(request.request_id, dialog))
-                btn_layout.addWidget(print_btn)
-                # Close button
-                close_btn = QtWidgets.QPushButton("Close")
-                close_btn.setFixedSize(100, 35)
-                close_btn.setCursor(QtCore.Qt.PointingHandCursor)
-                close_btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #95a5a6;
-                        color: white;
-                        border: none;
-                        border-radius: 5px;
-                        font-weight: bold;
-                        font-size: 10pt;
-                    }
-                    QPushButton:hover { background-color: #7f8c8d; }
-                """)
-                close_btn.clicked.connect(dialog.accept)
-                btn_layout.addWidget(close_btn)
-                btn_layout.addStretch()
-                layout.addLayout(btn_layout)
-                dialog.exec_()
+                fields = certificate_fields(request, resident)
             finally:
                 db.close()
+            # Render the page offscreen at screen resolution
+            renderer = shared_renderer()
+            ratio = self.devicePixelRatioF()
+            image = renderer.render_image(fields, dpi=72 * ratio)
+            image.setDevicePixelRatio(ratio)
+            # Create certificate preview dialog
+            dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle("Certificate Preview")
+            dialog.setFixedSize(680, 900)
+            dialog.setStyleSheet("background-color: #f0f0f0;")
+            layout = QtWidgets.QVBoxLayout(dialog)
+            layout.setSpacing(10)
+            layout.setContentsMargins(20, 20, 20, 20)
+            # Title
+            title_label = QtWidgets.QLabel("📄 Certificate Preview")
+            title_label.setStyleSheet("font-size: 14pt; font-weight: bold; color: #333;")
+            title_label.setAlignment(QtCore.Qt.AlignCenter)
+            layout.addWidget(title_label)
+            # Rendered page (like paper)
+            page_label = QtWidgets.QLabel()
+            page_label.setPixmap(QtGui.QPixmap.fromImage(image))
+            page_label.setAlignment(QtCore.Qt.AlignCenter)
+            page_label.setStyleSheet("background-color: white; border: 1px solid #ccc;")
+            scroll = QtWidgets.QScrollArea()
+            scroll.setWidget(page_label)
+            scroll.setWidgetResizable(True)
+            scroll.setAlignment(QtCore.Qt.AlignCenter)
+            layout.addWidget(scroll, 1)
+            # Buttons
+            btn_layout = QtWidgets.QHBoxLayout()
+            btn_layout.addStretch()
+            button_style = """
+                QPushButton {
+                    background-color: %s;
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                    font-weight: bold;
+                    font-size: 10pt;
+                }
+                QPushButton:hover { background-color: %s; }
+            """
+            # Print button - prints the page, then sets status to Ready for Pickup
+            print_btn = QtWidgets.QPushButton("🖨 Print")
+            print_btn.setFixedSize(100, 35)
+            print_btn.setCursor(QtCore.Qt.PointingHandCursor)
+            print_btn.setStyleSheet(button_style % ("#27ae60", "#219a52"))
+            print_btn.clicked.connect(lambda: self.send_certificate_to_printer(fields, dialog))
+            btn_layout.addWidget(print_btn)
+            # Save as PDF button
+            pdf_btn = QtWidgets.QPushButton("💾 Save PDF")
+            pdf_btn.setFixedSize(110, 35)
+            pdf_btn.setCursor(QtCore.Qt.PointingHandCursor)
+            pdf_btn.setStyleSheet(button_style % ("#2980b9", "#2471a3"))
+            pdf_btn.clicked.connect(lambda: self.save_certificate_pdf(fields, dialog))
+            btn_layout.addWidget(pdf_btn)
+            # Close button
+            close_btn = QtWidgets.QPushButton("Close")
+            close_btn.setFixedSize(100, 35)
+            close_btn.setCursor(QtCore.Qt.PointingHandCursor)
+            close_btn.setStyleSheet(button_style % ("#95a5a6", "#7f8c8d"))
+            close_btn.clicked.connect(dialog.accept)
+            btn_layout.addWidget(close_btn)
+            btn_layout.addStretch()
+            layout.addLayout(btn_layout)
+            dialog.exec_()
         except Exception as e:
             self.notification.show_error(f"❌ Error showing certificate: {e}")
             import traceback
             traceback.print_exc()
-    def mark_as_completed(self, request, table, row):
+    def send_certificate_to_printer(self, fields, dialog):
+        """Print the previewed certificate, then mark the request Ready for Pickup"""
+        try:
+            from PyQt5 import QtPrintSupport
+            from gui.certificate_renderer import shared_renderer
+            printer = QtPrintSupport.QPrinter(QtPrintSupport.QPrinter.HighResolution)
+            printer.setPageSize(QtGui.QPageSize(QtGui.QPageSize.A4))
+            printer.setDocName(f"Certificate #{fields['request_id']}")
+            print_dialog = QtPrintSupport.QPrintDialog(printer, dialog)
+            if print_dialog.exec_() != QtWidgets.QDialog.Accepted:
+                return
+            shared_renderer().paint_pages(printer, [fields])
+            self.do_print(fields['request_id'], dialog)
+        except Exception as e:
+            self.notification.show_error(f"❌ Error printing certificate: {e}")
+            import traceback
+            traceback.print_exc()
+    def save_certificate_pdf(self, fields, dialog):
+        """Save the previewed certificate as a PDF file"""
+        try:
+            from gui.certificate_renderer import shared_renderer
+            safe_name = "_".join(fields['resident_name'].split()) or "certificate"
+            default_name = f"{fields['certificate_type'] or 'Certificate'}_{safe_name}.pdf".replace(" ", "_")
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(dialog, "Save Certificate", default_name, "PDF Files (*.pdf)")
+            if not path:
+                return
+            shared_renderer().render_pdf([fields], path)
+            self.notification.show_success(f"✅ Certificate saved to {path}")
+        except Exception as e:
+            self.notification.show_error(f"❌ Error saving PDF: {e}")
+    def mark_as_completed(self, request):
         """Mark a request as completed with confirmation"""
         # Ask for confirmation first
         reply = QtWidgets.QMessageBox.question(
@@ -4282,195 +4827,51 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
         )
         if reply == QtWidgets.QMessageBox.Yes:
             try:
-                from app.models import CertificateRequest, Notification
-                from datetime import datetime
-                db = SessionLocal()
-                try:
-                    req = db.query(CertificateRequest).filter(CertificateRequest.request_id == request.request_id).first()
-                    if req:
-                        req.status = "Completed"
-                        req.updated_at = datetime.now()
-                        
-                        # Create notification for user - "Request Completed"
-                        notification = Notification(
-                            resident_id=req.resident_id,
-                            title="🎉 Request Completed",
-                            message=f"Your {req.certificate_type} request has been completed! Thank you for using Barangay E-Services.",
-                            is_read=False,
-                            created_at=datetime.now()
-                        )
-                        db.add(notification)
-                        
-                        db.commit()
-                        # Update the table cell
-                        status_item = QtWidgets.QTableWidgetItem("Completed")
-                        status_item.setTextAlignment(QtCore.Qt.AlignCenter)
-                        status_item.setForeground(QtGui.QColor("#3498db"))  # Blue
-                        table.setItem(row, 5, status_item)
-                        self.notification.show_success("✅ Request marked as Completed")
-                    else:
-                        self.notification.show_error("❌ Request not found")
-                finally:
-                    db.close()
+                from app.controllers.admin_controller import AdminController
+                # Same transition (status event + notification) the bulk action uses
+                result = AdminController.bulk_transition([request.request_id], "Completed", self.admin_account_id)
+                if not result["success"]:
+                    self.notification.show_error(f"❌ Error updating status: {result['error']}")
+                elif result["updated"]:
+                    self.notification.show_success("✅ Request marked as Completed")
+                else:
+                    self.notification.show_error("❌ Only accepted or ready requests can be completed")
             except Exception as e:
                 self.notification.show_error(f"❌ Error updating status: {e}")
     def do_print(self, request_id, dialog):
         """Set status to Ready for Pickup and notify user"""
         try:
-            # Show printing notification immediately
-            self.notification.show_info("🖨️ Printing certificate... Please wait.")
-            
-            from app.models import CertificateRequest, Notification, Account, CertificatePayment
-            from datetime import datetime
-            # Certificate prices
-            CERTIFICATE_PRICES = {
-                'Barangay Indigency': 0.00,
-                'Barangay Clearance': 50.00,
-                'Barangay ID': 100.00,
-                'Business Permit': 500.00
-            }
-            db = SessionLocal()
-            try:
-                request = db.query(CertificateRequest).filter(CertificateRequest.request_id == request_id).first()
-                if request:
-                    request.status = 'Ready for Pickup'
-                    request.updated_at = datetime.now()
-                    # Create payment record if not exists
-                    existing_payment = db.query(CertificatePayment).filter(
-                        CertificatePayment.request_id == request_id
-                    ).first()
-                    if not existing_payment:
-                        unit_price = CERTIFICATE_PRICES.get(request.certificate_type, 0.00)
-                        quantity = request.quantity or 1
-                        total = unit_price * quantity
-                        payment = CertificatePayment(
-                            request_id=request_id,
-                            resident_id=request.resident_id,
-                            certificate_type=request.certificate_type,
-                            requestor_name=f"{request.first_name} {request.last_name}",
-                            quantity=quantity,
-                            unit_price=unit_price,
-                            total_amount=total,
-                            is_paid=False,
-                            payment_method='Cash'
-                        )
-                        db.add(payment)
-                    # Create notification for user - "Ready for Payment"
-                    notification = Notification(
-                        resident_id=request.resident_id,
-                        title="💳 Ready for Payment",
-                        message=f"Your {request.certificate_type} request is ready! Please proceed to the Barangay Hall for payment and pickup.",
-                        is_read=False,
-                        created_at=datetime.now()
-                    )
-                    db.add(notification)
-                    db.commit()
-                    self.notification.show_success("🖨 Certificate printed! Status set to Ready for Pickup. User notified for payment.")
-                    dialog.accept()
-                    self.show_services_page()  # Refresh table
-                else:
-                    self.notification.show_error("❌ Request not found")
-            finally:
-                db.close()
+            from app.controllers.admin_controller import AdminController
+            # Same single-transaction update the batch print uses
+            result = AdminController.mark_certificates_printed([request_id], self.admin_account_id,
+                                                                audit_action="Print Certificate")
+            if result["success"]:
+                self.notification.show_success("🖨 Certificate printed! Status set to Ready for Pickup. User notified for payment.")
+                dialog.accept()
+            else:
+                self.notification.show_error(f"❌ {result['error']}")
         except Exception as e:
             self.notification.show_error(f"❌ Error: {e}")
     def update_request_status(self, request_id, new_status, dialog):
         """Update the status of a certificate request and create payment record if accepted"""
         try:
-            from app.models import CertificateRequest, CertificatePayment, Resident, Notification
-            from datetime import datetime
-            
-            # Official certificate fees (in PHP) - based on Barangay price list
-            CERTIFICATE_FEES = {
-                'Barangay Indigency': 0.00,      # FREE
-                'Barangay Clearance': 50.00,     # ₱50
-                'Barangay ID': 100.00,           # ₱100
-                'Business Permit': 500.00,       # ₱500
-            }
-            
-            db = SessionLocal()
-            try:
-                request = db.query(CertificateRequest).filter(CertificateRequest.request_id == request_id).first()
-                if request:
-                    request.status = new_status
-                    request.reviewed_at = datetime.now()
-                    request.updated_at = datetime.now()
-                    
-                    # If accepted (Processing), create a payment record for admin to manage
-                    if new_status == 'Processing':
-                        # Check if payment record already exists
-                        existing_payment = db.query(CertificatePayment).filter(
-                            CertificatePayment.request_id == request_id
-                        ).first()
-                        
-                        if not existing_payment:
-                            # Get resident info
-                            resident = db.query(Resident).filter(
-                                Resident.resident_id == request.resident_id
-                            ).first()
-                            
-                            # Get fee based on certificate type
-                            cert_type = request.certificate_type or ''
-                            unit_price = CERTIFICATE_FEES.get(cert_type, 50.00)
-                            quantity = request.quantity or 1
-                            total_amount = unit_price * quantity
-                            
-                            # Create requestor name
-                            requestor_name = f"{request.first_name or ''} {request.last_name or ''}".strip()
-                            if not requestor_name and resident:
-                                requestor_name = resident.full_name()
-                            
-                            # Create payment record
-                            payment = CertificatePayment(
-                                request_id=request_id,
-                                resident_id=request.resident_id,
-                                certificate_type=cert_type,
-                                requestor_name=requestor_name,
-                                quantity=quantity,
-                                unit_price=unit_price,
-                                total_amount=total_amount,
-                                is_paid=False,  # Not paid yet - admin will mark as paid
-                                payment_method='Cash',  # Default
-                                created_at=datetime.now()
-                            )
-                            db.add(payment)
-                            print(f"💰 Created payment record: {cert_type} - ₱{total_amount} for {requestor_name}")
-                        
-                        # Create notification for user - "Request Accepted"
-                        notification = Notification(
-                            resident_id=request.resident_id,
-                            title="✅ Request Accepted",
-                            message=f"Your {request.certificate_type} request has been accepted and is now being processed. Please wait for further updates.",
-                            is_read=False,
-                            created_at=datetime.now()
-                        )
-                        db.add(notification)
-                        
-                        self.notification.show_success("✅ Request accepted! Payment record created for admin.")
-                    elif new_status == 'Declined':
-                        # Create notification for user - "Request Declined"
-                        notification = Notification(
-                            resident_id=request.resident_id,
-                            title="❌ Request Declined",
-                            message=f"Your {request.certificate_type} request has been declined. Please visit the Barangay Hall for more information.",
-                            is_read=False,
-                            created_at=datetime.now()
-                        )
-                        db.add(notification)
-                        
-                        self.notification.show_warning("❌ Request declined.")
-                    else:
-                        self.notification.show_success(f"✅ Status updated to {new_status}")
-                    
-                    db.commit()
-                    
-                    # Close dialog and refresh table
-                    dialog.accept()
-                    self.show_services_page()
-                else:
-                    self.notification.show_error("❌ Request not found!")
-            finally:
-                db.close()
+            from app.controllers.admin_controller import AdminController
+            # Same single-transaction update the bulk actions use (payment row, notification, history)
+            result = AdminController.bulk_transition([request_id], new_status, self.admin_account_id)
+            if not result["success"]:
+                self.notification.show_error(f"❌ Error updating status: {result['error']}")
+                return
+            if not result["updated"]:
+                self.notification.show_error("❌ Request not found or its status has already changed!")
+                return
+            if new_status == 'Processing':
+                self.notification.show_success("✅ Request accepted! Payment record created for admin.")
+            elif new_status == 'Declined':
+                self.notification.show_warning("❌ Request declined.")
+            else:
+                self.notification.show_success(f"✅ Status updated to {new_status}")
+            # Close dialog (the RequestStatusChanged event refreshes the row)
+            dialog.accept()
         except Exception as e:
             self.notification.show_error(f"❌ Error updating status: {e}")
             import traceback
@@ -4821,36 +5222,34 @@ class SidebarHomeWindow(QtWidgets.QMainWindow):
             import traceback
             traceback.print_exc()
     def approve_request(self, request, dialog):
-        """Approve the certificate request"""
-        try:
-            from app.database import SessionLocal
-            db = SessionLocal()
-            request.status = 'Approved'
-            request.reviewed_at = get_philippine_time()
-            # request.reviewed_by_admin_id = self.current_admin_id  # Add if you have admin ID
-            db.commit()
-            db.close()
-            self.notification.show_success(f"✅ Request #{request.request_id} APPROVED!")
-            dialog.accept()  # Close dialog
-            self.show_services_page()  # Refresh table
-        except Exception as e:
-            self.notification.show_error(f"❌ Error approving request: {e}")
+        """Approve the certificate request (accepting moves it to Processing)"""
+        self.update_request_status(request.request_id, 'Processing', dialog)
     def reject_request(self, request, dialog):
         """Reject the certificate request"""
-        try:
-            from app.database import SessionLocal
-            db = SessionLocal()
-            request.status = 'Rejected'
-            request.reviewed_at = get_philippine_time()
-            # request.reviewed_by_admin_id = self.current_admin_id  # Add if you have admin ID
-            db.commit()
-            db.close()
-            self.notification.show_success(f"❌ Request #{request.request_id} REJECTED")
-            dialog.accept()  # Close dialog
-            self.show_services_page()  # Refresh table
-        except Exception as e:
-            self.notification.show_error(f"❌ Error rejecting request: {e}")
+        self.update_request_status(request.request_id, 'Declined', dialog)
     # populate_request_details method removed - will be recreated when new UI is connected
+    def apply_remote_changes(self, table_name, keys):
+        """Change feed: ids another station changed"""
+        self.refresh_open_pages(table_name, keys)
+    def refresh_open_pages(self, table_name, keys):
+        """Pass the changed ids of a table to the open page that shows it"""
+        pages = {
+            "certificate_requests": [('services_table', self.apply_service_changes),
+                                     ('payments_table', self.apply_payment_changes)],
+            "certificate_payments": [('payments_table', self.apply_payment_changes)],
+            "residents": [('residents_table', self.apply_resident_changes)],
+            "blotters": [('blotter_table', self.apply_blotter_changes)],
+        }
+        for attr, apply in pages.get(table_name, []):
+            table = getattr(self, attr, None)
+            try:
+                # Pages replaced by another one are hidden, not deleted
+                if table is None or not table.isVisibleTo(self):
+                    continue
+            except RuntimeError:
+                setattr(self, attr, None)
+                continue
+            apply(keys)
     def replace_content(self, new_widget):
         """Helper to replace content in the content area"""
         if isinstance(self.content_area, QtWidgets.QStackedWidget):
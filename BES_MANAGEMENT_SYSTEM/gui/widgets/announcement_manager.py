@@ -5,7 +5,11 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 from app.db import SessionLocal
 from app.models import Announcement
+from app.reference_cache import visible_announcements
+from app.events import bus, publish, publish_on_commit, AnnouncementPublished
 from app.config import get_philippine_time
+from app.uploads import IMAGE_EXTENSIONS
+from gui.upload_worker import start_upload
 from datetime import datetime
 
 
@@ -93,6 +97,8 @@ class AnnouncementManagerWidget(QtWidgets.QWidget):
         self.admin_id = admin_id
         self.init_ui()
         self.load_announcements()
+        # Posting, editing or removing an announcement redraws just that card
+        bus.subscribe(AnnouncementPublished, self.apply_changes)
     
     def init_ui(self):
         """Initialize the UI"""
@@ -192,12 +198,9 @@ class AnnouncementManagerWidget(QtWidgets.QWidget):
             if item.widget():
                 item.widget().deleteLater()
         
-        # Fetch from database
-        db = SessionLocal()
+        # Cached until an announcement is posted, edited or removed
         try:
-            announcements = db.query(Announcement).filter(
-                Announcement.visible == True
-            ).order_by(Announcement.posted_at.desc()).all()
+            announcements = visible_announcements()
             
             # Add cards with flow layout (no grid, each card has its own size)
             for announcement in announcements:
@@ -207,12 +210,31 @@ class AnnouncementManagerWidget(QtWidgets.QWidget):
         except Exception as e:
             import traceback
             traceback.print_exc()
-        finally:
-            db.close()
+    
+    def apply_changes(self, event):
+        """Rebuild only the cards of the changed announcements, keeping the list order"""
+        changed = event.announcement_ids
+        kept = {}
+        while self.announcements_layout.count():
+            widget = self.announcements_layout.takeAt(0).widget()
+            if widget is None:
+                continue
+            announcement_id = widget.property("announcement_id")
+            if announcement_id is None or announcement_id in changed:
+                widget.deleteLater()
+            else:
+                kept[announcement_id] = widget
+        
+        for announcement in visible_announcements():
+            card = kept.pop(announcement.announcement_id, None) or self.create_announcement_card(announcement)
+            self.announcements_layout.addWidget(card)
+        for widget in kept.values():
+            widget.deleteLater()
     
     def create_announcement_card(self, announcement):
         """Create a card widget for an announcement"""
         card = QtWidgets.QFrame()
+        card.setProperty("announcement_id", announcement.announcement_id)
         card.setFixedWidth(280)  # Fixed width, flexible height
         card.setStyleSheet("""
             QFrame {
@@ -449,7 +471,7 @@ class AnnouncementManagerWidget(QtWidgets.QWidget):
                 db.add(new_announcement)
                 db.commit()
                 
-                self.load_announcements()  # Refresh display
+                publish(AnnouncementPublished({new_announcement.announcement_id}))
                 
             except Exception as e:
                 db.rollback()
@@ -482,10 +504,9 @@ class AnnouncementManagerWidget(QtWidgets.QWidget):
                 announcement.title = title
                 announcement.content = content
                 announcement.image_path = image_path
+                publish_on_commit(db, AnnouncementPublished({announcement_id}))
                 db.commit()
                 
-                self.load_announcements()  # Refresh display
-                
         except Exception as e:
             db.rollback()
             QtWidgets.QMessageBox.critical(self, "Error", f"Failed to edit announcement: {e}")
@@ -510,10 +531,9 @@ class AnnouncementManagerWidget(QtWidgets.QWidget):
                 
                 if announcement:
                     announcement.visible = False  # Soft delete
+                    publish_on_commit(db, AnnouncementPublished({announcement_id}))
                     db.commit()
                     
-                    self.load_announcements()  # Refresh display
-                    
             except Exception as e:
                 db.rollback()
                 QtWidgets.QMessageBox.critical(self, "Error", f"Failed to delete announcement: {e}")
@@ -819,7 +839,7 @@ class AnnouncementDialog(QtWidgets.QDialog):
         """)
         button_layout.addWidget(cancel_btn)
         
-        save_btn = QtWidgets.QPushButton("Save")
+        self.save_btn = save_btn = QtWidgets.QPushButton("Save")
         save_btn.clicked.connect(self.accept)
         save_btn.setStyleSheet("""
             QPushButton {
@@ -845,13 +865,33 @@ class AnnouncementDialog(QtWidgets.QDialog):
             self,
             "Select Photo",
             "",
-            "Image Files (*.png *.jpg *.jpeg *.gif *.bmp);;All Files (*)"
+            "Image Files (*.png *.jpg *.jpeg)"
         )
         
         if file_path:
-            self.image_path = file_path
+            # Copy into the upload store in the background; Save waits for it
+            error = start_upload(self, file_path, self.on_photo_uploaded,
+                                 allowed_extensions=IMAGE_EXTENSIONS, kind='announcement')
+            if error:
+                QtWidgets.QMessageBox.warning(self, "Invalid Photo", error)
+                return
+            self.save_btn.setEnabled(False)
+            self.save_btn.setText("Uploading...")
             self.display_photo(file_path)
     
+    def on_photo_uploaded(self, result):
+        """Background copy finished - keep the stored path (not the user's local file)"""
+        self.save_btn.setEnabled(True)
+        self.save_btn.setText("Save")
+        if result["success"]:
+            self.image_path = result["path"]
+        else:
+            QtWidgets.QMessageBox.warning(self, "Upload Failed", result["error"])
+            if self.image_path:
+                self.display_photo(self.image_path)  # back to the previous photo
+            else:
+                self.photo_preview_label.setText("No photo selected")
+    
     def display_photo(self, file_path):
         """Display photo preview"""
         try:
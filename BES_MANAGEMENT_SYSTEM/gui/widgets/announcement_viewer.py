@@ -3,8 +3,7 @@ Announcement Viewer Widget - Displays announcements for users (read-only)
 """
 from PyQt5 import QtWidgets, QtCore, QtGui
 from pathlib import Path
-from app.db import SessionLocal
-from app.models import Announcement
+from app.reference_cache import visible_announcements
 
 
 class FlowLayout(QtWidgets.QLayout):
@@ -166,12 +165,9 @@ class AnnouncementViewerWidget(QtWidgets.QWidget):
             if item.widget():
                 item.widget().deleteLater()
         
-        # Fetch from database
-        db = SessionLocal()
+        # Cached until an announcement is posted, edited or removed
         try:
-            announcements = db.query(Announcement).filter(
-                Announcement.visible == True
-            ).order_by(Announcement.posted_at.desc()).all()
+            announcements = visible_announcements()
             
             if not announcements:
                 # Show "no announcements" message
@@ -196,8 +192,6 @@ class AnnouncementViewerWidget(QtWidgets.QWidget):
 
             import traceback
             traceback.print_exc()
-        finally:
-            db.close()
     
     def create_announcement_card(self, announcement):
         """Create a card widget for an announcement"""
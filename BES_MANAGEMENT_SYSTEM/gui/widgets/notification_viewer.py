@@ -5,17 +5,21 @@ Displays user notifications from the database with visual styling
 from PyQt5 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 from app.db import SessionLocal
-from app.models import Notification, Account
+from app.models import Notification
+from app.change_feed import RELOAD, record_changes
 from datetime import datetime
 
 
 class NotificationViewerWidget(QtWidgets.QWidget):
     """Custom widget for displaying user notifications"""
     
-    def __init__(self, username=None, parent=None):
+    def __init__(self, user_session=None, parent=None):
         super().__init__(parent)
-        self.username = username
+        # The logged-in user (app/user_session.py)
+        self.user_session = user_session
+        self.resident_id = user_session.resident_id if user_session else None
         self.notifications = []
+        self.cards = {}                 # notification_id -> (card, is_read)
         
         self.init_ui()
         self.load_notifications()
@@ -117,22 +121,20 @@ class NotificationViewerWidget(QtWidgets.QWidget):
             item = self.notifications_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
+        self.cards = {}
         
-        if not self.username:
+        if not self.user_session:
             self.add_empty_message("Please log in to view notifications.")
             return
+        if not self.resident_id:
+            self.add_empty_message("Account not found.")
+            return
         
         db = SessionLocal()
         try:
-            # Get user account
-            account = db.query(Account).filter(Account.username == self.username).first()
-            if not account or not account.resident_id:
-                self.add_empty_message("Account not found.")
-                return
-            
             # Get all notifications for this user
             notifications = db.query(Notification).filter(
-                Notification.resident_id == account.resident_id
+                Notification.resident_id == self.resident_id
             ).order_by(Notification.created_at.desc()).all()
             
             if not notifications:
@@ -144,6 +146,7 @@ class NotificationViewerWidget(QtWidgets.QWidget):
                 card = self.create_notification_card(notif)
                 # Insert before the stretch
                 self.notifications_layout.insertWidget(self.notifications_layout.count() - 1, card)
+                self.cards[notif.notification_id] = (card, notif.is_read)
             
         except Exception as e:
             import traceback
@@ -255,20 +258,17 @@ class NotificationViewerWidget(QtWidgets.QWidget):
     
     def mark_all_as_read(self):
         """Mark all notifications as read"""
-        if not self.username:
+        if not self.resident_id:
             return
         
         db = SessionLocal()
         try:
-            account = db.query(Account).filter(Account.username == self.username).first()
-            if not account or not account.resident_id:
-                return
-            
             # Update all unread notifications
             db.query(Notification).filter(
-                Notification.resident_id == account.resident_id,
+                Notification.resident_id == self.resident_id,
                 Notification.is_read == False
             ).update({Notification.is_read: True})
+            record_changes(db, "notifications", [self.resident_id])
             
             db.commit()
 
@@ -279,3 +279,40 @@ class NotificationViewerWidget(QtWidgets.QWidget):
             pass
         finally:
             db.close()
+    
+    def apply_changes(self, resident_ids):
+        """Another station changed notifications: add new cards, restyle the ones whose read state changed"""
+        if self.resident_id is None or (RELOAD not in resident_ids and self.resident_id not in resident_ids):
+            return
+        if not self.cards:
+            # Empty-state message on screen
+            self.load_notifications()
+            return
+        
+        db = SessionLocal()
+        try:
+            notifications = db.query(Notification).filter(
+                Notification.resident_id == self.resident_id
+            ).order_by(Notification.created_at.desc()).all()
+        finally:
+            db.close()
+        if not notifications:
+            self.load_notifications()
+            return
+        
+        wanted = {notif.notification_id for notif in notifications}
+        for notification_id in [nid for nid in self.cards if nid not in wanted]:
+            card, _ = self.cards.pop(notification_id)
+            self.notifications_layout.removeWidget(card)
+            card.deleteLater()
+        # Walk the cards in display order, reusing the ones that did not change
+        for position, notif in enumerate(notifications):
+            card, is_read = self.cards.get(notif.notification_id, (None, None))
+            if card is not None and is_read == notif.is_read:
+                continue
+            if card is not None:
+                self.notifications_layout.removeWidget(card)
+                card.deleteLater()
+            card = self.create_notification_card(notif)
+            self.notifications_layout.insertWidget(position, card)
+            self.cards[notif.notification_id] = (card, notif.is_read)
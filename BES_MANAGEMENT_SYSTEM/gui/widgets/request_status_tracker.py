@@ -4,24 +4,103 @@ Displays request status with visual progress indicators and detailed history
 """
 from PyQt5 import QtWidgets, QtCore, QtGui
 from pathlib import Path
+from sqlalchemy import tuple_
 from app.db import SessionLocal
-from app.models import CertificateRequest, Account
+from app.models import CertificateRequest, CertificateRequestEvent
+from app.request_events import set_request_status
+from app.events import bus, publish_on_commit, RequestStatusChanged
+from app.config import TRACKER_PAGE_SIZE
+from app.dto import TrackedRequest, StatusEvent, query_columns, rows
 from datetime import datetime
 
+TIME_FORMAT = "%m/%d/%Y %H:%M"
+
+# Progress tracker stage reached by each status
+STAGE_INDEX = {
+    "Pending": 0,
+    "Under Review": 1,
+    "Processing": 2,
+    "Ready": 3,
+    "Ready for Pickup": 3,
+    "Completed": 4,
+}
+
+# Timeline title and default description for each status
+EVENT_TEXT = {
+    "Under Review": ("Under Review", "Admin is reviewing your request"),
+    "Processing": ("Processing", "Certificate is being prepared"),
+    "Ready for Pickup": ("Ready for Pickup", "Certificate is ready at Barangay Hall"),
+    "Completed": ("Completed", "Certificate claimed successfully"),
+    "Rejected": ("Request Declined", "Your request was declined. Please contact the Barangay Hall for details."),
+    "Declined": ("Request Declined", "Your request was declined. Please contact the Barangay Hall for details."),
+    "Cancelled": ("Request Cancelled", "You cancelled this request."),
+}
+
+
+def format_time(value):
+    return value.strftime(TIME_FORMAT) if value else ""
+
+
+def build_history(req, events):
+    """Timeline entries (oldest first) from the request's recorded status events"""
+    if not events:
+        # Not backfilled yet: only the submission and the current status are known
+        events = [StatusEvent(req.request_id, None, "Pending", None, req.created_at)]
+        if (req.status or "Pending") != "Pending":
+            events.append(StatusEvent(req.request_id, "Pending", req.status, None, req.updated_at))
+    history = []
+    for event in events:
+        if event.from_status is None and event.to_status == "Pending":
+            title = f"Request submitted for {req.certificate_type}"
+            description = f"By: {req.first_name} {req.last_name}"
+        else:
+            title, description = EVENT_TEXT.get(event.to_status, (event.to_status, ""))
+        history.append({
+            "timestamp": format_time(event.created_at),
+            "event": title,
+            "description": event.note or description,
+            "status": event.to_status,
+        })
+    return history
+
+
+def stage_times(history):
+    """Time each progress stage was reached (the latest event for that stage wins)"""
+    times = {}
+    for entry in history:
+        stage = STAGE_INDEX.get(entry["status"])
+        if stage is not None:
+            times[stage] = entry["timestamp"]
+    return times
+
+
+def sort_key(req):
+    return (req.created_at or datetime.min, req.request_id)
+
 
 class RequestStatusWidget(QtWidgets.QWidget):
     """Custom widget for displaying request status tracking"""
     
-    def __init__(self, username=None, parent=None):
+    def __init__(self, user_session=None, parent=None):
         super().__init__(parent)
-        self.username = username
-        self.requests = []
+        # The logged-in user (app/user_session.py)
+        self.user_session = user_session
+        self.username = user_session.username if user_session else None
+        self.resident_id = user_session.resident_id if user_session else None
+        self.requests = []              # TrackedRequest rows, newest first
+        self.events = {}                # request_id -> its StatusEvent rows, oldest first
         self.current_request_index = 0
+        self.has_more = False
         
         self.init_ui()
         self.load_requests()
         # Always call display_request to update UI (handles both empty and non-empty cases)
         self.display_request(0)
+        # Cancelling or submitting a request re-reads just the requests that changed
+        bus.subscribe(RequestStatusChanged, self.on_requests_changed)
+    
+    def on_requests_changed(self, event):
+        self.refresh_requests()
     
     def init_ui(self):
         """Initialize the UI components"""
@@ -452,7 +531,7 @@ class RequestStatusWidget(QtWidgets.QWidget):
         
         return tracker_widget
     
-    def update_progress_tracker(self, current_stage, request_data):
+    def update_progress_tracker(self, status, times):
         """Update the progress tracker based on current status"""
         # Reset all stages to inactive
         for i, widget_set in enumerate(self.stage_widgets):
@@ -499,7 +578,6 @@ class RequestStatusWidget(QtWidgets.QWidget):
             "Cancelled": -2  # Cancelled by user
         }
         
-        status = request_data.get("status", "Pending")
         stage_index = status_map.get(status, 0)
         
         # Handle cancelled status (show gray/red on first stage)
@@ -571,10 +649,8 @@ class RequestStatusWidget(QtWidgets.QWidget):
                 }
             """)
             
-            # Add timestamp if available
-            if i < len(request_data.get("history", [])):
-                timestamp = request_data["history"][i].get("timestamp", "")
-                self.stage_widgets[i]["time"].setText(timestamp)
+            # Time the request reached this stage (from its status events)
+            self.stage_widgets[i]["time"].setText(times.get(i, ""))
             
             # Green connecting line (only if line exists)
             if "line" in self.stage_widgets[i] and self.stage_widgets[i]["line"] is not None:
@@ -585,87 +661,81 @@ class RequestStatusWidget(QtWidgets.QWidget):
                     }
                 """)
     
-    def load_requests(self):
-        """Load user's certificate requests from database"""
-        if not self.username:
+    def requests_query(self, db, resident_id):
+        """The tracker's columns of the resident's requests, newest first"""
+        return query_columns(db, TrackedRequest, CertificateRequest).filter(
+            CertificateRequest.resident_id == resident_id
+        ).order_by(CertificateRequest.created_at.desc(), CertificateRequest.request_id.desc())
+    
+    def load_events(self, db, requests):
+        """Status events of the given requests (one SELECT for all of them) into self.events"""
+        ids = [req.request_id for req in requests]
+        if not ids:
+            return
+        for request_id in ids:
+            self.events[request_id] = []
+        query = query_columns(db, StatusEvent, CertificateRequestEvent).filter(
+            CertificateRequestEvent.request_id.in_(ids)
+        ).order_by(CertificateRequestEvent.event_id)
+        for event in rows(StatusEvent, query):
+            self.events[event.request_id].append(event)
+    
+    def load_requests(self, older=False):
+        """Load one page of the user's certificate requests (older=True appends the next page)"""
+        resident_id = self.resident_id
+        if resident_id is None:
             return
         
         db = SessionLocal()
         try:
-            # Get user account
-            account = db.query(Account).filter(Account.username == self.username).first()
-            if not account or not account.resident_id:
-                return
-            
-            # Get all requests for this user
-            requests = db.query(CertificateRequest).filter(
-                CertificateRequest.resident_id == account.resident_id
-            ).order_by(CertificateRequest.created_at.desc()).all()
+            query = self.requests_query(db, resident_id)
+            if older and self.requests:
+                created_at, request_id = sort_key(self.requests[-1])
+                query = query.filter(
+                    tuple_(CertificateRequest.created_at, CertificateRequest.request_id) < tuple_(created_at, request_id)
+                )
+            page = rows(TrackedRequest, query.limit(TRACKER_PAGE_SIZE + 1))
+            self.has_more = len(page) > TRACKER_PAGE_SIZE
+            page = page[:TRACKER_PAGE_SIZE]
+            if not older:
+                self.events = {}
+            self.load_events(db, page)
+            self.requests = self.requests + page if older else page
             
-            self.requests = []
-            for req in requests:
-                # Build history timeline
-                history = [
-                    {
-                        "timestamp": req.created_at.strftime("%m/%d/%Y %H:%M") if req.created_at else "",
-                        "event": f"Request submitted for {req.certificate_type}",
-                        "description": f"By: {req.first_name} {req.last_name}"
-                    }
-                ]
-                
-                # Add status-specific history entries based on current status
-                status = req.status or "Pending"
-                updated_time = req.updated_at.strftime("%m/%d/%Y %H:%M") if req.updated_at else ""
-                
-                if status == "Under Review":
-                    history.append({
-                        "timestamp": updated_time,
-                        "event": "Under Review",
-                        "description": "Admin is reviewing your request"
-                    })
-                elif status == "Processing":
-                    history.extend([
-                        {"timestamp": "", "event": "Under Review", "description": "Document verification completed"},
-                        {"timestamp": updated_time, "event": "Processing", "description": "Certificate is being prepared"}
-                    ])
-                elif status == "Ready for Pickup":
-                    history.extend([
-                        {"timestamp": "", "event": "Under Review", "description": "Document verification completed"},
-                        {"timestamp": "", "event": "Processing", "description": "Certificate preparation completed"},
-                        {"timestamp": updated_time, "event": "Ready for Pickup", "description": "Certificate is ready at Barangay Hall"}
-                    ])
-                elif status == "Completed":
-                    history.extend([
-                        {"timestamp": "", "event": "Under Review", "description": "Document verification completed"},
-                        {"timestamp": "", "event": "Processing", "description": "Certificate preparation completed"},
-                        {"timestamp": "", "event": "Ready for Pickup", "description": "Certificate was ready at Barangay Hall"},
-                        {"timestamp": updated_time, "event": "Completed", "description": "Certificate claimed successfully"}
-                    ])
-                elif status in ["Rejected", "Declined"]:
-                    history.append({
-                        "timestamp": updated_time,
-                        "event": "Request Declined",
-                        "description": "Your request was declined. Please contact the Barangay Hall for details."
-                    })
-                elif status == "Cancelled":
-                    history.append({
-                        "timestamp": updated_time,
-                        "event": "Request Cancelled",
-                        "description": "You cancelled this request."
-                    })
-                
-                self.requests.append({
-                    "id": req.request_id,
-                    "certificate_type": req.certificate_type,
-                    "status": req.status,
-                    "created_at": req.created_at.strftime("%m/%d/%Y %H:%M") if req.created_at else "",
-                    "first_name": req.first_name,
-                    "last_name": req.last_name,
-                    "purpose": req.purpose,
-                    "quantity": req.quantity,
-                    "history": history
-                })
+        except Exception as e:
 
+            import traceback
+            traceback.print_exc()
+        finally:
+            db.close()
+    
+    def reload_changed_requests(self):
+        """Re-read only requests whose updated_at moved (plus new ones) since the last load"""
+        if not self.requests:
+            self.load_requests()
+            return
+        
+        db = SessionLocal()
+        try:
+            resident_id = self.resident_id
+            oldest = sort_key(self.requests[-1])
+            current = dict(db.query(CertificateRequest.request_id, CertificateRequest.updated_at).filter(
+                CertificateRequest.resident_id == resident_id,
+                tuple_(CertificateRequest.created_at, CertificateRequest.request_id) >= tuple_(*oldest)
+            ).all())
+            loaded = {request.request_id: request for request in self.requests}
+            changed = [request_id for request_id, updated_at in current.items()
+                       if request_id not in loaded or loaded[request_id].updated_at != updated_at]
+            if changed:
+                reloaded = rows(TrackedRequest, self.requests_query(db, resident_id).filter(
+                    CertificateRequest.request_id.in_(changed)))
+                self.load_events(db, reloaded)
+                loaded.update((req.request_id, req) for req in reloaded)
+            # Requests that no longer exist drop out
+            self.requests = sorted((loaded[request_id] for request_id in loaded if request_id in current),
+                                   key=sort_key, reverse=True)
+            for request_id in set(self.events) - set(current):
+                del self.events[request_id]
             
         except Exception as e:
 
@@ -699,23 +769,24 @@ class RequestStatusWidget(QtWidgets.QWidget):
             "Rejected": "#f44336",
             "Declined": "#f44336",
             "Cancelled": "#9e9e9e"
-        }.get(request["status"], "#666")
+        }.get(request.status, "#666")
         
         # Show status only (no ID for users)
         self.request_header_label.setText(
-            f'<span style="color: {status_color};">STATUS: {request["status"].upper()}</span>'
+            f'<span style="color: {status_color};">STATUS: {request.status.upper()}</span>'
         )
         self.request_header_label.setTextFormat(QtCore.Qt.RichText)
         
-        # Update counter
-        self.request_counter_label.setText(f"Request {index + 1} of {len(self.requests)}")
+        # Update counter ("+" while older requests have not been loaded yet)
+        more = "+" if self.has_more else ""
+        self.request_counter_label.setText(f"Request {index + 1} of {len(self.requests)}{more}")
         
         # Enable/disable navigation buttons
         self.prev_btn.setEnabled(index > 0)
-        self.next_btn.setEnabled(index < len(self.requests) - 1)
+        self.next_btn.setEnabled(index < len(self.requests) - 1 or self.has_more)
         
         # Enable/disable cancel button (only for Pending and Under Review)
-        if request["status"] in ["Pending", "Under Review"]:
+        if request.status in ["Pending", "Under Review"]:
             self.cancel_btn.setEnabled(True)
             self.cancel_btn.setToolTip("Cancel this request")
         else:
@@ -723,35 +794,31 @@ class RequestStatusWidget(QtWidgets.QWidget):
             self.cancel_btn.setToolTip("Cannot cancel - request is already being processed")
         
         # Update details - capitalize names properly (john kester a. benitez → John Kester A. Benitez)
-        first_name = (request["first_name"] or "").strip().title()
-        last_name = (request["last_name"] or "").strip().title()
+        first_name = (request.first_name or "").strip().title()
+        last_name = (request.last_name or "").strip().title()
         
         details_html = f"""
-        <b>Certificate Type:</b> {request["certificate_type"]}<br>
+        <b>Certificate Type:</b> {request.certificate_type}<br>
         <b>Name:</b> {first_name} {last_name}<br>
-        <b>Purpose:</b> {request["purpose"]}<br>
-        <b>Quantity:</b> {request["quantity"]}<br>
-        <b>Date Submitted:</b> {request["created_at"]}<br>
+        <b>Purpose:</b> {request.purpose}<br>
+        <b>Quantity:</b> {request.quantity}<br>
+        <b>Date Submitted:</b> {format_time(request.created_at)}<br>
         """
         self.details_text.setText(details_html)
         self.details_text.setTextFormat(QtCore.Qt.RichText)
         
         # Update progress tracker
-        self.update_progress_tracker(request["status"], request)
+        history = build_history(request, self.events.get(request.request_id))
+        self.update_progress_tracker(request.status, stage_times(history))
         
         # Show/hide payment banner based on status
-        if request["status"] == "Ready for Pickup":
+        if request.status == "Ready for Pickup":
             # Calculate price based on certificate type
-            CERTIFICATE_PRICES = {
-                'Barangay Indigency': 0.00,
-                'Barangay Clearance': 50.00,
-                'Barangay ID': 100.00,
-                'Business Permit': 500.00
-            }
+            from app.config import certificate_price
             
             cert_type = request.get("certificate_type", "")
             quantity = request.get("quantity", 1)
-            unit_price = CERTIFICATE_PRICES.get(cert_type, 0.00)
+            unit_price = certificate_price(cert_type)
             total_price = unit_price * quantity
             
             # Update banner message with price
@@ -769,7 +836,7 @@ class RequestStatusWidget(QtWidgets.QWidget):
             self.payment_banner.setVisible(False)
         
         # Update history timeline
-        self.update_history_timeline(request["history"])
+        self.update_history_timeline(history)
     
     def update_history_timeline(self, history):
         """Update the history timeline with events"""
@@ -871,21 +938,22 @@ class RequestStatusWidget(QtWidgets.QWidget):
             self.display_request(self.current_request_index - 1)
     
     def show_next_request(self):
-        """Show the next request"""
+        """Show the next request, loading the next page of older requests when needed"""
+        if self.current_request_index >= len(self.requests) - 1 and self.has_more:
+            self.load_requests(older=True)
         if self.current_request_index < len(self.requests) - 1:
             self.display_request(self.current_request_index + 1)
     
     def refresh_requests(self):
-        """Refresh requests from database"""
-
-        current_index = self.current_request_index
-        self.load_requests()
+        """Refresh requests that changed in the database"""
+        current_id = None
+        if 0 <= self.current_request_index < len(self.requests):
+            current_id = self.requests[self.current_request_index].request_id
+        self.reload_changed_requests()
         if self.requests:
             # Try to go back to the same request, or show the first one
-            if current_index < len(self.requests):
-                self.display_request(current_index)
-            else:
-                self.display_request(0)
+            ids = [request.request_id for request in self.requests]
+            self.display_request(ids.index(current_id) if current_id in ids else 0)
 
     def cancel_request(self):
         """Cancel the current request (only allowed for Pending/Under Review)"""
@@ -895,7 +963,7 @@ class RequestStatusWidget(QtWidgets.QWidget):
         request = self.requests[self.current_request_index]
         
         # Double-check status
-        if request["status"] not in ["Pending", "Under Review"]:
+        if request.status not in ["Pending", "Under Review"]:
             QtWidgets.QMessageBox.warning(
                 self,
                 "Cannot Cancel",
@@ -909,8 +977,8 @@ class RequestStatusWidget(QtWidgets.QWidget):
             self,
             "Cancel Request",
             f"Are you sure you want to cancel this request?\n\n"
-            f"Request ID: {request['id']}\n"
-            f"Certificate Type: {request['certificate_type']}\n\n"
+            f"Request ID: {request.request_id}\n"
+            f"Certificate Type: {request.certificate_type}\n\n"
             f"This action cannot be undone.",
             QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
             QtWidgets.QMessageBox.No
@@ -923,7 +991,7 @@ class RequestStatusWidget(QtWidgets.QWidget):
         db = SessionLocal()
         try:
             cert_request = db.query(CertificateRequest).filter(
-                CertificateRequest.request_id == request["id"]
+                CertificateRequest.request_id == request.request_id
             ).first()
             
             if cert_request:
@@ -938,9 +1006,9 @@ class RequestStatusWidget(QtWidgets.QWidget):
                     self.refresh_requests()
                     return
                 
-                # Set status to Cancelled
-                cert_request.status = "Cancelled"
-                cert_request.updated_at = datetime.now()
+                # Set status to Cancelled (recorded in the request's status history)
+                set_request_status(cert_request, "Cancelled", actor=self.username)
+                publish_on_commit(db, RequestStatusChanged({cert_request.request_id}))
                 db.commit()
 
                 QtWidgets.QMessageBox.information(
@@ -949,9 +1017,7 @@ class RequestStatusWidget(QtWidgets.QWidget):
                     "Your request has been cancelled successfully.",
                     QtWidgets.QMessageBox.Ok
                 )
-                
-                # Refresh to show updated status
-                self.refresh_requests()
+                # The RequestStatusChanged event shows the updated status
             else:
                 QtWidgets.QMessageBox.warning(
                     self,
@@ -0,0 +1,76 @@
+"""
+SQL Profile Panel
+Developer panel with the statement reports of the recent page navigations
+(only attached when the SQL profiler is enabled, see app/sql_profiler.py)
+"""
+import inspect
+import functools
+from PyQt5 import QtWidgets, QtCore, QtGui
+from app import sql_profiler
+
+SHORTCUT = "Ctrl+Shift+Q"
+
+
+def page_methods(window):
+    """Names of the window's show_*_page navigation methods"""
+    return [name for name in dir(type(window)) if name.startswith("show_") and name.endswith("_page")]
+
+
+def profiled_page(window, name, scope=sql_profiler.profile):
+    """The window's show_*_page method wrapped in a profiler scope (scope(label) is a context manager)"""
+    method = getattr(window, name)
+    accepted = len(inspect.signature(method).parameters)
+
+    @functools.wraps(method)
+    def slot(*args):
+        # clicked(bool) passes `checked`; the page methods take no arguments
+        with scope(f"{type(window).__name__}.{name}"):
+            return method(*args[:accepted])
+    return slot
+
+
+def attach_sql_profiler(window):
+    """Profile every page navigation of a sidebar window; call before its buttons are connected"""
+    if not sql_profiler.ENABLED:
+        return
+    for name in page_methods(window):
+        setattr(window, name, profiled_page(window, name))
+    shortcut = QtWidgets.QShortcut(QtGui.QKeySequence(SHORTCUT), window)
+    shortcut.activated.connect(lambda: SqlProfilePanel(window).show())
+
+
+class SqlProfilePanel(QtWidgets.QDialog):
+    """Recent page/action reports, newest first"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("SQL Profile")
+        self.resize(900, 600)
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.text = QtWidgets.QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        layout.addWidget(self.text)
+
+        buttons = QtWidgets.QHBoxLayout()
+        refresh_btn = QtWidgets.QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        clear_btn = QtWidgets.QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear)
+        buttons.addStretch()
+        buttons.addWidget(refresh_btn)
+        buttons.addWidget(clear_btn)
+        layout.addLayout(buttons)
+        self.refresh()
+
+    def refresh(self):
+        reports = [report.summary() for report in reversed(sql_profiler.recent)]
+        reports.append(sql_profiler.unscoped.summary())
+        self.text.setPlainText("\n\n".join(reports))
+
+    def clear(self):
+        sql_profiler.recent.clear()
+        self.refresh()
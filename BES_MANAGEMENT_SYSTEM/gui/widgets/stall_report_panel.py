@@ -0,0 +1,70 @@
+"""
+Stall Report Panel
+Hidden debug view of the GUI stall watchdog: the call sites that froze the
+window the longest, with the stack of their worst stall
+"""
+from PyQt5 import QtWidgets, QtCore, QtGui
+from gui.stall_watchdog import get_stall_watchdog
+
+SHORTCUT = "Ctrl+Shift+F12"
+
+
+def attach_stall_report(window):
+    """Open the stall report from the window with the hidden shortcut (if the watchdog runs)"""
+    shortcut = QtWidgets.QShortcut(QtGui.QKeySequence(SHORTCUT), window)
+    shortcut.activated.connect(lambda: get_stall_watchdog() and StallReportPanel(window).show())
+
+
+class StallReportPanel(QtWidgets.QDialog):
+    """Top offenders by total stall time"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("GUI Stalls")
+        self.resize(1000, 650)
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.summary_label = QtWidgets.QLabel()
+        layout.addWidget(self.summary_label)
+
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Vertical)
+        self.table = QtWidgets.QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Call site", "Stalls", "Total (ms)", "Worst (ms)", "Last"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.currentCellChanged.connect(self.show_stack)
+        splitter.addWidget(self.table)
+        self.stack_view = QtWidgets.QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.stack_view.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        splitter.addWidget(self.stack_view)
+        layout.addWidget(splitter)
+
+        refresh_btn = QtWidgets.QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        layout.addWidget(refresh_btn, alignment=QtCore.Qt.AlignRight)
+        self.offenders = []
+        self.refresh()
+
+    def refresh(self):
+        watchdog = get_stall_watchdog()
+        self.offenders = watchdog.top_offenders() if watchdog else []
+        if watchdog:
+            self.summary_label.setText(
+                f"{len(watchdog.stalls)} stalls over {watchdog.threshold_ms} ms since "
+                f"{watchdog.started_at.strftime('%b %d, %Y %I:%M %p')} (last {watchdog.stalls.maxlen} kept)")
+        self.table.setRowCount(len(self.offenders))
+        for row, entry in enumerate(self.offenders):
+            values = [entry["site"], str(entry["count"]), f"{entry['total_ms']:.0f}", f"{entry['max_ms']:.0f}",
+                      entry["last_at"].strftime("%I:%M:%S %p")]
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
+        if self.offenders:
+            self.table.selectRow(0)
+        self.show_stack(self.table.currentRow())
+
+    def show_stack(self, row, *args):
+        self.stack_view.setPlainText(self.offenders[row]["stack"] if 0 <= row < len(self.offenders) else "")
@@ -0,0 +1,128 @@
+# scripts/bench_certificate_render.py
+"""
+Certificates-per-second benchmark for the offscreen certificate renderer.
+
+Compares the old preview path (QLabel/QFrame widget tree with the logo reloaded
+from disk and grabbed to a pixmap) with CertificateRenderer painting to a
+QImage and to a multi-page PDF. --workers also times the batch print path
+(pages rendered in worker processes and merged into one PDF). Runs headless.
+
+    python scripts/bench_certificate_render.py --count 200
+    python scripts/bench_certificate_render.py --count 200 --workers 4
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from types import SimpleNamespace
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets, QtGui, QtCore
+from gui.certificate_renderer import (
+    CertificateRenderer, certificate_fields, render_body_html, HEADER_HTML, LOGO_PATH
+)
+
+CERTIFICATE_TYPES = ['Barangay Clearance', 'Barangay Indigency', 'Barangay ID', 'Business Permit']
+
+
+def sample_fields(count):
+    fields = []
+    for i in range(count):
+        request = SimpleNamespace(
+            request_id=i + 1,
+            first_name=f"juan{i}", middle_name="santos", last_name="dela cruz", suffix="",
+            certificate_type=CERTIFICATE_TYPES[i % len(CERTIFICATE_TYPES)],
+            purpose="employment",
+        )
+        fields.append(certificate_fields(request))
+    return fields
+
+
+def bench_widget_tree(pages):
+    """Roughly what print_certificate used to build for every preview"""
+    start = time.perf_counter()
+    for fields in pages:
+        frame = QtWidgets.QFrame()
+        frame.setStyleSheet("QFrame { background-color: white; border: 1px solid #ccc; border-radius: 5px; }")
+        frame.setFixedSize(610, 760)
+        layout = QtWidgets.QVBoxLayout(frame)
+        header = QtWidgets.QHBoxLayout()
+        logo_label = QtWidgets.QLabel()
+        pixmap = QtGui.QPixmap(LOGO_PATH)
+        logo_label.setPixmap(pixmap.scaled(65, 65, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
+        header.addWidget(logo_label)
+        header.addWidget(QtWidgets.QLabel(HEADER_HTML), 1)
+        layout.addLayout(header)
+        body = QtWidgets.QLabel(render_body_html(fields))
+        body.setWordWrap(True)
+        layout.addWidget(body)
+        frame.grab()
+        frame.deleteLater()
+    QtWidgets.QApplication.processEvents()
+    return time.perf_counter() - start
+
+
+def bench_image(renderer, pages, dpi):
+    start = time.perf_counter()
+    for fields in pages:
+        renderer.render_image(fields, dpi=dpi)
+    return time.perf_counter() - start
+
+
+def bench_pdf(renderer, pages):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.pdf")
+        start = time.perf_counter()
+        renderer.render_pdf(pages, path)
+        elapsed = time.perf_counter() - start
+        size_kb = os.path.getsize(path) / 1024
+    return elapsed, size_kb
+
+
+def bench_batch(pages, workers):
+    from gui.certificate_batch import render_batch_pdf
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        render_batch_pdf(pages, os.path.join(tmp, "batch.pdf"), workers=workers)
+        return time.perf_counter() - start
+
+
+def report(label, count, elapsed):
+    print(f"{label:<34} {count:>6} certs  {elapsed:8.3f}s  {count / elapsed:10.1f} certs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Certificate rendering benchmark")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=0, help="also time batch printing with this many processes")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    pages = sample_fields(args.count)
+
+    report("widget tree + grab (old)", args.count, bench_widget_tree(pages))
+
+    start = time.perf_counter()
+    renderer = CertificateRenderer()
+    print(f"{'renderer setup (once)':<34} {'':>12}  {time.perf_counter() - start:8.3f}s")
+
+    report("renderer -> QImage @96dpi", args.count, bench_image(renderer, pages, 96))
+    report("renderer -> QImage @150dpi", args.count, bench_image(renderer, pages, 150))
+    elapsed, size_kb = bench_pdf(renderer, pages)
+    report("renderer -> PDF @300dpi", args.count, elapsed)
+    print(f"\nPDF size: {size_kb:.0f} KB for {args.count} pages\n")
+
+    if args.workers:
+        report("batch print, 1 process", args.count, bench_batch(pages, 1))
+        report(f"batch print, {args.workers} processes", args.count, bench_batch(pages, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# scripts/bench_db_backend.py
+"""
+Throughput benchmark for the database backends (MySQL vs embedded SQLite).
+
+Runs the same workloads the app generates against a SCRATCH database: one
+commit per request (residents filing requests), a batch insert, primary-key
+reads, the admin services list query and a bulk status change. The schema is
+created with app.schema.create_schema and the rows are left in place.
+
+    python scripts/bench_db_backend.py                      # temporary SQLite file
+    python scripts/bench_db_backend.py --uri sqlite:///bench.db
+    python scripts/bench_db_backend.py --uri mysql+pymysql://root:@127.0.0.1:3306/barangay_bench
+
+Never point --uri at the live barangay_db.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+
+def report(label, count, elapsed, unit="ops"):
+    print(f"{label:<34} {count:>6} {unit}  {elapsed:8.3f}s  {count / elapsed:10.1f} {unit}/s")
+
+
+def new_request(resident_id, i):
+    from app.models import CertificateRequest
+    return CertificateRequest(resident_id=resident_id, certificate_type="Barangay Clearance",
+                              first_name="bench", last_name=f"resident {i}", purpose="Employment",
+                              quantity=1, status="Pending", created_at=datetime.now())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database backend throughput benchmark")
+    parser.add_argument("--uri", help="scratch database URI (default: a temporary SQLite file)")
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+
+    tmp = None
+    if not args.uri:
+        tmp = tempfile.TemporaryDirectory()
+        args.uri = f"sqlite:///{Path(tmp.name) / 'bench.db'}"
+    # app.db reads the URI at import time
+    os.environ["BES_DATABASE_URI"] = args.uri
+
+    from app.db import engine, SessionLocal
+    from app.schema import create_schema
+    from app.models import Resident, CertificateRequest
+    from app.controllers.admin_controller import AdminController
+
+    print(f"Backend: {engine.dialect.name} ({engine.url.render_as_string(hide_password=True)})")
+    create_schema(engine)
+    db = SessionLocal()
+    resident = Resident(first_name="Bench", last_name="Resident", gender="Other", birth_date=date(1990, 1, 1),
+                        civil_status="Single", barangay="Balibago", municipality="Calatagan")
+    db.add(resident)
+    db.commit()
+    resident_id = resident.resident_id
+    db.close()
+
+    # 1. One transaction per request, as the resident form does
+    start = time.perf_counter()
+    for i in range(args.count):
+        db = SessionLocal()
+        db.add(new_request(resident_id, i))
+        db.commit()
+        db.close()
+    report("insert, commit per row", args.count, time.perf_counter() - start, "rows")
+
+    # 2. The same rows in one transaction
+    start = time.perf_counter()
+    db = SessionLocal()
+    db.add_all(new_request(resident_id, i) for i in range(args.count))
+    db.commit()
+    db.close()
+    report("insert, one transaction", args.count, time.perf_counter() - start, "rows")
+
+    db = SessionLocal()
+    ids = [request_id for (request_id,) in db.query(CertificateRequest.request_id)
+           .filter(CertificateRequest.resident_id == resident_id)]
+    db.close()
+
+    # 3. Primary key lookups (new session each time, like the dialogs)
+    sample = random.sample(ids, min(args.count, len(ids)))
+    start = time.perf_counter()
+    for request_id in sample:
+        db = SessionLocal()
+        db.get(CertificateRequest, request_id)
+        db.close()
+    report("read by primary key", len(sample), time.perf_counter() - start, "reads")
+
+    # 4. Admin services table: pending requests, newest first
+    rounds = max(args.count // 20, 1)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        db = SessionLocal()
+        db.query(CertificateRequest).filter(CertificateRequest.status == "Pending") \
+            .order_by(CertificateRequest.created_at.desc()).limit(100).all()
+        db.close()
+    report("admin list (100 rows)", rounds, time.perf_counter() - start, "queries")
+
+    # 5. Bulk status change with events, payments and notifications
+    batch = ids[:100]
+    start = time.perf_counter()
+    result = AdminController.bulk_transition(batch, "Processing")
+    if not result["success"]:
+        print(f"❌ bulk_transition failed: {result['error']}")
+    report("bulk transition (100 requests)", len(batch), time.perf_counter() - start, "rows")
+
+    engine.dispose()
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# scripts/bench_dto_memory.py
+"""
+Memory benchmark for large result sets: ORM instances vs dicts vs the
+read-only rows of app/dto.py.
+
+Seeds a SCRATCH database with --rows certificate requests (one bulk insert)
+and loads them three ways, measuring with tracemalloc how much the loaded
+list keeps alive once the session is closed, the peak while loading, and the
+time taken:
+
+* full CertificateRequest instances, as the views used to keep them;
+* the tracker's columns turned into one dict per row;
+* the same columns as TrackedRequest namedtuples (app.dto.rows).
+
+    python scripts/bench_dto_memory.py                      # 100k rows, temporary SQLite file
+    python scripts/bench_dto_memory.py --rows 20000 --uri sqlite:///bench.db
+
+Never point --uri at the live barangay_db.
+"""
+import gc
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+
+def measure(label, rows, load):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    loaded = load()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(loaded) == rows, f"{label}: loaded {len(loaded)} of {rows} rows"
+    print(f"{label:<24} {retained / 2**20:9.1f} MiB kept  {peak / 2**20:9.1f} MiB peak  "
+          f"{retained / rows:7.0f} B/row  {elapsed:7.2f}s")
+    del loaded
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Result-set memory benchmark (ORM vs dict vs DTO)")
+    parser.add_argument("--uri", help="scratch database URI (default: a temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tmp = None
+    if not args.uri:
+        tmp = tempfile.TemporaryDirectory()
+        args.uri = f"sqlite:///{Path(tmp.name) / 'bench.db'}"
+    # app.db reads the URI at import time
+    os.environ["BES_DATABASE_URI"] = args.uri
+
+    from app.db import engine, SessionLocal
+    from app.schema import create_schema
+    from app.models import Resident, CertificateRequest
+    from app.dto import TrackedRequest, query_columns, rows
+
+    print(f"Backend: {engine.dialect.name} ({engine.url.render_as_string(hide_password=True)})")
+    create_schema(engine)
+    db = SessionLocal()
+    resident = Resident(first_name="Bench", last_name="Resident", gender="Other", birth_date=date(1990, 1, 1),
+                        civil_status="Single", barangay="Balibago", municipality="Calatagan")
+    db.add(resident)
+    db.flush()
+    base = datetime(2025, 1, 1)
+    db.execute(CertificateRequest.__table__.insert(), [
+        {"resident_id": resident.resident_id, "certificate_type": "Barangay Clearance", "first_name": "bench",
+         "last_name": f"resident {i}", "purpose": "Employment", "quantity": 1, "status": "Pending",
+         "created_at": base + timedelta(seconds=i), "updated_at": base + timedelta(seconds=i)}
+        for i in range(args.rows)
+    ])
+    db.commit()
+    resident_id = resident.resident_id
+    db.close()
+    print(f"Seeded {args.rows} requests\n")
+
+    def load_orm():
+        db = SessionLocal()
+        try:
+            return db.query(CertificateRequest).filter(CertificateRequest.resident_id == resident_id).all()
+        finally:
+            db.close()
+
+    def load_dicts():
+        db = SessionLocal()
+        try:
+            query = query_columns(db, TrackedRequest, CertificateRequest).filter(
+                CertificateRequest.resident_id == resident_id)
+            return [dict(row._mapping) for row in query]
+        finally:
+            db.close()
+
+    def load_dto():
+        db = SessionLocal()
+        try:
+            return rows(TrackedRequest, query_columns(db, TrackedRequest, CertificateRequest).filter(
+                CertificateRequest.resident_id == resident_id))
+        finally:
+            db.close()
+
+    orm = measure("ORM instances", args.rows, load_orm)
+    measure("dict per row", args.rows, load_dicts)
+    dto = measure("TrackedRequest rows", args.rows, load_dto)
+    print(f"\nTrackedRequest rows keep {orm / dto:.1f}x less memory than ORM instances")
+
+    engine.dispose()
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# scripts/bench_email_outbox.py
+"""
+Throughput benchmark for email delivery against a local SMTP stand-in (aiosmtpd).
+
+Compares the old path (new connection per message, like Emailer.send_email)
+with the outbox sender's kept-alive SMTPConnection. With --db the full
+queue -> OutboxSender path is measured against the configured database.
+
+    pip install aiosmtpd
+    python scripts/bench_email_outbox.py --messages 500
+    python scripts/bench_email_outbox.py --messages 500 --db
+"""
+import sys
+import time
+import argparse
+import smtplib
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from aiosmtpd.controller import Controller
+from app.email_outbox import SMTPConnection, OutboxSender, build_message
+
+
+class CountingHandler:
+    """aiosmtpd handler that only counts messages and connections"""
+
+    def __init__(self):
+        self.messages = 0
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 OK"
+
+
+def bench_connection_per_message(host, port, count):
+    start = time.perf_counter()
+    for i in range(count):
+        with smtplib.SMTP(host, port) as server:
+            server.send_message(build_message("resident@example.com", f"Bench {i}", "Hello"))
+    return time.perf_counter() - start
+
+
+def bench_reused_connection(host, port, count):
+    conn = SMTPConnection(host=host, port=port, username=None, password=None, use_tls=False)
+    start = time.perf_counter()
+    for i in range(count):
+        conn.send(build_message("resident@example.com", f"Bench {i}", "Hello"))
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def bench_outbox(host, port, count):
+    from app.db import SessionLocal, engine
+    from app.models import EmailOutbox
+    from app.emailer import Emailer
+
+    EmailOutbox.__table__.create(engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        for i in range(count):
+            Emailer.queue_email("resident@example.com", f"Bench {i}", "Hello", db=db)
+        db.commit()
+    finally:
+        db.close()
+
+    conn = SMTPConnection(host=host, port=port, username=None, password=None, use_tls=False)
+    sender = OutboxSender(connection=conn)
+    start = time.perf_counter()
+    handled = 0
+    while handled < count:
+        sent = sender.process_batch()
+        if not sent:
+            break
+        handled += sent
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed, handled
+
+
+def report(label, count, elapsed):
+    print(f"{label:<34} {count:>6} msgs  {elapsed:8.3f}s  {count / elapsed:10.1f} msg/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Email delivery throughput benchmark")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--db", action="store_true", help="also benchmark the full outbox path (needs the DB)")
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=8025)
+    controller.start()
+    try:
+        host, port = controller.hostname, controller.port
+
+        elapsed = bench_connection_per_message(host, port, args.messages)
+        report("connection per message", args.messages, elapsed)
+
+        elapsed = bench_reused_connection(host, port, args.messages)
+        report("kept-alive SMTPConnection", args.messages, elapsed)
+
+        if args.db:
+            elapsed, handled = bench_outbox(host, port, args.messages)
+            report("outbox sender (DB + SMTP)", handled, elapsed)
+
+        print(f"\nServer saw {handler.messages} messages over {handler.connections} connections")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
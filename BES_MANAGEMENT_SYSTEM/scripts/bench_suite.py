@@ -0,0 +1,122 @@
+# scripts/bench_suite.py
+"""
+Benchmark suite: controllers and page loaders against a seeded database.
+
+The database is seeded once per scale/seed (benchmarks/data/) and every run
+works on a fresh copy, so results from different commits are comparable.
+Results are written to benchmarks/results/<commit>-<scale>-<backend>.json and
+compared with benchmarks/baseline-<scale>.json; the exit code is 1 when a
+case regressed. GUI cases run offscreen.
+
+    python scripts/bench_suite.py --scale 1k
+    python scripts/bench_suite.py --scale 10k --cases page.,tracker
+    python scripts/bench_suite.py --scale 1k --save-baseline
+    python scripts/bench_suite.py --scale 1k --uri mysql+pymysql://root:@127.0.0.1:3306/barangay_bench --reseed
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+DATA_DIR = root_dir / "benchmarks" / "data"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controller and page loader benchmarks")
+    parser.add_argument("--scale", default="1k", help="tiny, 1k, 10k or 100k (100k residents / 1M requests)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--uri", help="benchmark a scratch database instead of a SQLite copy (never the live one)")
+    parser.add_argument("--reseed", action="store_true", help="seed --uri (it must be empty) or rebuild the SQLite template")
+    parser.add_argument("--cases", help="comma separated name filters, e.g. page.,auth.")
+    parser.add_argument("--repeat", type=int, help="timed runs per case (default: per case)")
+    parser.add_argument("--baseline", help="baseline JSON (default: benchmarks/baseline-<scale>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown of the median (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    work_dir = None
+    template = DATA_DIR / f"bench-{args.scale}-{args.seed}.db"
+    if args.uri:
+        uri = args.uri
+    else:
+        work_dir = tempfile.TemporaryDirectory()
+        uri = f"sqlite:///{Path(work_dir.name) / 'bench.db'}"
+    # app.db reads the URI at import time
+    os.environ["BES_DATABASE_URI"] = uri
+
+    from PyQt5 import QtWidgets
+    from app.db import engine, create_app_engine
+    from app.schema import create_schema
+    from benchmarks.seed import seed, SCALES
+    from benchmarks.runner import SuiteContext, run_suite, build_report, save_report, compare
+    if args.scale not in SCALES:
+        parser.error(f"unknown scale {args.scale} (choose from {', '.join(SCALES)})")
+
+    if args.uri:
+        if args.reseed:
+            create_schema(engine)
+            print(f"🌱 Seeding {args.scale}...")
+            seed(engine, args.scale, args.seed)
+    else:
+        if args.reseed or not template.exists():
+            DATA_DIR.mkdir(parents=True, exist_ok=True)
+            template.unlink(missing_ok=True)
+            print(f"🌱 Seeding {template.name}...")
+            template_engine = create_app_engine(f"sqlite:///{template}")
+            try:
+                create_schema(template_engine)
+                seed(template_engine, args.scale, args.seed)
+                with template_engine.connect() as conn:
+                    conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            except BaseException:
+                template_engine.dispose()
+                template.unlink(missing_ok=True)
+                raise
+            template_engine.dispose()
+        shutil.copyfile(template, Path(work_dir.name) / "bench.db")
+        create_schema(engine)
+
+    ctx = SuiteContext(engine)
+    ctx.qt_app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    names = [name.strip() for name in args.cases.split(",")] if args.cases else None
+    print(f"⏱️  {args.scale} on {engine.dialect.name}")
+    results = run_suite(ctx, names, args.repeat)
+
+    report = build_report(results, args.scale, engine.dialect.name)
+    path = save_report(report)
+    print(f"\n📝 Results written to {path}")
+
+    baseline_path = Path(args.baseline) if args.baseline else root_dir / "benchmarks" / f"baseline-{args.scale}.json"
+    exit_code = 0
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"📌 Baseline saved to {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions against {baseline['commit']}:")
+            for line in regressions:
+                print(f"  {line}")
+            exit_code = 1
+        else:
+            print(f"\n✅ No regressions against {baseline['commit']}")
+    else:
+        print(f"ℹ️ No baseline at {baseline_path} (create one with --save-baseline)")
+
+    engine.dispose()
+    if work_dir:
+        work_dir.cleanup()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# scripts/email_outbox_worker.py
+"""
+Run the email outbox sender outside the GUI (e.g. on the server PC).
+
+    python scripts/email_outbox_worker.py           # run until Ctrl+C
+    python scripts/email_outbox_worker.py --once    # send one batch and exit
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from app.db import engine
+from app.models import EmailOutbox
+from app.email_outbox import OutboxSender
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued emails from the email_outbox table")
+    parser.add_argument("--once", action="store_true", help="send one batch and exit")
+    args = parser.parse_args()
+
+    # Create the outbox table if it doesn't exist yet
+    EmailOutbox.__table__.create(engine, checkfirst=True)
+
+    sender = OutboxSender()
+    if args.once:
+        handled = sender.process_batch()
+        sender.connection.close()
+        print(f"✅ Processed {handled} queued email(s)")
+        return
+
+    sender.start()
+    try:
+        while sender.is_alive():
+            sender.join(1)
+    except KeyboardInterrupt:
+        sender.stop(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# scripts/export_data.py
+"""
+Export residents, certificate requests or payments to CSV/XLSX (app/exports.py).
+
+    python scripts/export_data.py residents exports/residents.csv
+    python scripts/export_data.py residents dita.xlsx --sitio Dita --columns last_name,first_name,birth_date,sitio
+    python scripts/export_data.py requests q1.csv --from 2025-01-01 --to 2025-03-31 --status Completed
+    python scripts/export_data.py payments collections.csv --status Paid --date-field received_at --from 2025-06-01
+    python scripts/export_data.py residents --list-columns
+
+Rows are streamed, so memory use does not grow with the table.
+"""
+import sys
+import time
+import argparse
+from datetime import date
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from app.exports import EXPORTS, export_table, column_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a table to CSV or XLSX")
+    parser.add_argument("kind", choices=list(EXPORTS))
+    parser.add_argument("path", nargs="?", type=Path, help="output file (.csv or .xlsx)")
+    parser.add_argument("--columns", help="comma-separated column names (default: the usual report columns)")
+    parser.add_argument("--list-columns", action="store_true", help="print the available columns and exit")
+    parser.add_argument("--sitio")
+    parser.add_argument("--status", help="request status, or Paid/Unpaid for payments")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, metavar="YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, metavar="YYYY-MM-DD")
+    parser.add_argument("--date-field", help="column the --from/--to range applies to")
+    args = parser.parse_args()
+
+    if args.list_columns:
+        defaults = set(EXPORTS[args.kind].default_columns)
+        for name in column_names(args.kind):
+            print(f"{'*' if name in defaults else ' '} {name}")
+        return
+    if not args.path:
+        parser.error("the output path is required")
+
+    columns = [c.strip() for c in args.columns.split(",") if c.strip()] if args.columns else None
+    filters = {"sitio": args.sitio, "status": args.status, "date_from": args.date_from, "date_to": args.date_to,
+               "date_field": args.date_field}
+    start = time.perf_counter()
+
+    def progress(done, total):
+        print(f"\r  {done:,}/{total:,} rows", end="", flush=True)
+
+    result = export_table(args.kind, args.path, columns, filters, progress=progress)
+    print()
+    if not result["success"]:
+        print(f"❌ Export failed: {result['error']}")
+        sys.exit(1)
+    print(f"✅ {result['rows']:,} rows written to {result['path']} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
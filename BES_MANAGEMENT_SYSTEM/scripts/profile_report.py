@@ -0,0 +1,127 @@
+# scripts/profile_report.py
+"""
+Summarize an action profiler session (gui/action_profiler.py).
+
+    python scripts/profile_report.py                          # latest session, 10 slowest actions
+    python scripts/profile_report.py profiles/20250630-081500 -n 20 --by-action
+    python scripts/profile_report.py --functions 15           # hot functions of each slow action
+    python scripts/profile_report.py --merge session.pstats   # whole session in one file
+    python scripts/profile_report.py --merge session.collapsed   # (sample mode) for flamegraph.pl/speedscope
+"""
+import io
+import sys
+import json
+import pstats
+import argparse
+import statistics
+from collections import Counter
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from app.config import ACTION_PROFILE_DIR
+from gui.action_profiler import INDEX_FILE
+
+
+def load_session(session: Path):
+    with open(session / INDEX_FILE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latest_session(directory: Path = ACTION_PROFILE_DIR):
+    sessions = sorted(p for p in Path(directory).glob("*") if (p / INDEX_FILE).exists())
+    return sessions[-1] if sessions else None
+
+
+def read_collapsed(path: Path):
+    stacks = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            stacks[stack] += int(count)
+    return stacks
+
+
+def hot_functions(path: Path, limit: int) -> str:
+    if path.suffix == ".pstats":
+        out = io.StringIO()
+        pstats.Stats(str(path), stream=out).strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+    own, total = Counter(), Counter()
+    samples = 0
+    for stack, count in read_collapsed(path).items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+        samples += count
+    lines = [f"{samples} samples", f"{'self %':>7} {'total %':>8}  frame"]
+    for frame, count in own.most_common(limit):
+        lines.append(f"{100 * count / samples:7.1f} {100 * total[frame] / samples:8.1f}  {frame}")
+    return "\n".join(lines) + "\n"
+
+
+def merge(session: Path, entries, out: Path):
+    files = [session / e["file"] for e in entries if e["file"] and e["file"].endswith(out.suffix)]
+    if not files:
+        return 0
+    if out.suffix == ".pstats":
+        stats = pstats.Stats(str(files[0]))
+        for path in files[1:]:
+            stats.add(str(path))
+        stats.dump_stats(str(out))
+    else:
+        stacks = Counter()
+        for path in files:
+            stacks.update(read_collapsed(path))
+        with open(out, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    return len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slowest actions of a profiler session")
+    parser.add_argument("session", nargs="?", type=Path, help="session folder (default: the latest)")
+    parser.add_argument("-n", "--top", type=int, default=10, help="number of slowest actions to list")
+    parser.add_argument("--by-action", action="store_true", help="also aggregate by action name")
+    parser.add_argument("--functions", type=int, metavar="K", help="show the K hottest functions of each")
+    parser.add_argument("--merge", type=Path, metavar="FILE", help="merge the profiles into FILE (.pstats or .collapsed)")
+    args = parser.parse_args()
+
+    session = args.session or latest_session()
+    if session is None or not (session / INDEX_FILE).exists():
+        print(f"❌ No profiler session found (start the app with BES_ACTION_PROFILE=1; output goes to {ACTION_PROFILE_DIR})")
+        sys.exit(1)
+    entries = load_session(session)
+    print(f"Session {session} - {len(entries)} actions, {sum(e['wall_ms'] for e in entries) / 1000:.1f}s in total\n")
+
+    slowest = sorted(entries, key=lambda e: -e["wall_ms"])[:args.top]
+    print(f"{'ms':>9}  {'started':<23}  action")
+    for e in slowest:
+        print(f"{e['wall_ms']:9.1f}  {e['started']:<23}  {e['action']}  {e['file'] or ''}")
+
+    if args.by_action:
+        by_action = {}
+        for e in entries:
+            by_action.setdefault(e["action"], []).append(e["wall_ms"])
+        print(f"\n{'count':>6} {'total ms':>10} {'median':>9} {'max':>9}  action")
+        for action, times in sorted(by_action.items(), key=lambda item: -sum(item[1])):
+            print(f"{len(times):6} {sum(times):10.1f} {statistics.median(times):9.1f} {max(times):9.1f}  {action}")
+
+    if args.functions:
+        for e in slowest:
+            if e["file"]:
+                print(f"\n=== {e['action']} ({e['wall_ms']:.1f} ms) ===")
+                print(hot_functions(session / e["file"], args.functions))
+
+    if args.merge:
+        count = merge(session, entries, args.merge)
+        print(f"\n✅ Merged {count} profiles into {args.merge}" if count
+              else f"\n❌ No {args.merge.suffix} profiles in this session")
+
+
+if __name__ == "__main__":
+    main()
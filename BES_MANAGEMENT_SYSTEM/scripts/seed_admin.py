@@ -1,18 +1,20 @@
 # scripts/seed_admin.py
 import sys
+from datetime import date
 from pathlib import Path
 
 # Add project root to sys.path
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
-from app.db import engine, Base, SessionLocal
+from app.db import engine, SessionLocal
+from app.schema import create_schema
 from app.models import Resident, Account, Service
 from sqlalchemy.exc import IntegrityError
 
 def seed():
     # create tables if not exist
-    Base.metadata.create_all(bind=engine)
+    create_schema(engine)
 
     db = SessionLocal()
     try:
@@ -27,10 +29,12 @@ def seed():
             middle_name="",
             last_name="Captain",
             gender="Male",
-            birthdate="1970-01-01",
-            email="captain@balibago.local",
-            phone_number="09170000000",
-            purok_zone="Purok 1"
+            birth_date=date(1970, 1, 1),
+            civil_status="Married",
+            contact_number="09170000000",
+            sitio="Purok 1",
+            barangay="Balibago",
+            municipality="Calatagan"
         )
         db.add(r)
         db.flush()
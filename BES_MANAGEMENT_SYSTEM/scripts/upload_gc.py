@@ -0,0 +1,90 @@
+# scripts/upload_gc.py
+"""
+Upload store maintenance: find missing, corrupt and orphaned files in uploads/.
+
+Dry run by default (report only). With --quarantine, orphans (files no table
+refers to, older than UPLOAD_GC_GRACE_HOURS) are moved to
+uploads/quarantine/<timestamp>/ where they can be restored or deleted later.
+
+    python scripts/upload_gc.py
+    python scripts/upload_gc.py --quarantine
+    python scripts/upload_gc.py --report gc_report.csv --no-verify
+"""
+import csv
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from app.config import UPLOAD_FOLDER, UPLOAD_GC_GRACE_HOURS, UPLOAD_GC_HASH_WORKERS
+from app.upload_maintenance import iter_referenced_paths, build_reference_set, scan_uploads, quarantine_files
+
+PREVIEW_LINES = 20
+
+
+def write_report(path, result):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["problem", "path", "detail"])
+        for missing in result["missing"]:
+            writer.writerow(["missing", missing, "referenced in the database but not on disk"])
+        for corrupt, reason in result["corrupt"]:
+            writer.writerow(["corrupt", corrupt, reason])
+        for orphan in result["orphans"]:
+            writer.writerow(["orphan", orphan, "not referenced by any table"])
+
+
+def preview(title, rows):
+    if not rows:
+        return
+    print(f"\n{title} ({len(rows)}):")
+    for row in rows[:PREVIEW_LINES]:
+        print(f"  {row if isinstance(row, str) else ' - '.join(row)}")
+    if len(rows) > PREVIEW_LINES:
+        print(f"  ... {len(rows) - PREVIEW_LINES} more (use --report for the full list)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find missing/corrupt/orphaned uploads")
+    parser.add_argument("--root", default=str(UPLOAD_FOLDER))
+    parser.add_argument("--quarantine", action="store_true", help="move orphans into uploads/quarantine/")
+    parser.add_argument("--grace-hours", type=float, default=UPLOAD_GC_GRACE_HOURS)
+    parser.add_argument("--workers", type=int, default=UPLOAD_GC_HASH_WORKERS)
+    parser.add_argument("--no-verify", action="store_true", help="skip hashing the content-addressed store")
+    parser.add_argument("--report", help="write every problem to this CSV file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    references = build_reference_set(iter_referenced_paths())
+    print(f"📂 {len(references)} file references in the database")
+
+    result = scan_uploads(references, Path(args.root), workers=args.workers,
+                          grace_hours=args.grace_hours, verify=not args.no_verify)
+    elapsed = time.perf_counter() - start
+    print(f"🔎 Scanned {result['scanned']} files ({result['bytes'] / (1024 * 1024):.1f}MB) in {elapsed:.1f}s")
+    if result["external"]:
+        print(f"ℹ️ {result['external']} referenced file(s) live outside {args.root}")
+
+    preview("❌ Missing", result["missing"])
+    preview("❌ Corrupt", result["corrupt"])
+    preview("🗑️ Orphans", result["orphans"])
+    if args.report:
+        write_report(args.report, result)
+        print(f"\n📝 Report written to {args.report}")
+
+    if result["orphans"]:
+        if args.quarantine:
+            target = quarantine_files(result["orphans"], Path(args.root))
+            print(f"\n✅ Moved {len(result['orphans'])} orphan(s) to {target}")
+        else:
+            print("\nDry run - re-run with --quarantine to move the orphans")
+    if not (result["missing"] or result["corrupt"] or result["orphans"]):
+        print("\n✅ Upload store is clean")
+
+
+if __name__ == "__main__":
+    main()
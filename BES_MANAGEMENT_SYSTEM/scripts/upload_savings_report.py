@@ -0,0 +1,95 @@
+# scripts/upload_savings_report.py
+"""
+Report how many bytes image normalization saves across uploads/.
+
+Every image under uploads/ (except the originals/ audit copies and tmp/) is
+normalized in memory with the settings in app/config.py and the sizes are
+compared. "After" is what store_upload() would keep, which is the normalized
+file even when it is bigger (re-encoding an already small image can grow it);
+those files are counted in GREW. Nothing on disk is changed.
+
+    python scripts/upload_savings_report.py
+    python scripts/upload_savings_report.py --verbose
+"""
+import os
+import sys
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to sys.path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from app.config import UPLOAD_FOLDER
+from app.image_ingest import normalize_image
+from app.uploads import IMAGE_EXTENSIONS, file_extension
+
+SKIP_FOLDERS = {"originals", "tmp"}
+# Which size limit applies to each top-level folder; loose files are registration IDs
+FOLDER_KINDS = {"officials": "official", "announcements": "announcement"}
+DEFAULT_KIND = "id"
+
+
+def iter_images(root: Path):
+    """Yield (top-level folder, path) for every image below root"""
+    stack = [(root, None)]
+    while stack:
+        folder, top = stack.pop()
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if folder == root and entry.name in SKIP_FOLDERS:
+                        continue
+                    stack.append((Path(entry.path), top or entry.name))
+                elif entry.is_file() and file_extension(entry.name) in IMAGE_EXTENSIONS:
+                    yield top or ".", Path(entry.path)
+
+
+def human(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size:.0f}B"
+        size /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes saved by normalizing uploaded images")
+    parser.add_argument("--root", default=str(UPLOAD_FOLDER))
+    parser.add_argument("--verbose", action="store_true", help="list every file")
+    args = parser.parse_args()
+
+    totals = defaultdict(lambda: [0, 0, 0, 0])  # folder -> [files, bytes before, bytes after, files that grew]
+    unreadable = 0
+    for folder, path in iter_images(Path(args.root)):
+        before = path.stat().st_size
+        try:
+            data, _ = normalize_image(path, FOLDER_KINDS.get(folder, DEFAULT_KIND))
+        except ValueError:
+            unreadable += 1
+            continue
+        after = len(data)
+        row = totals[folder]
+        row[0] += 1
+        row[1] += before
+        row[2] += after
+        row[3] += after > before
+        if args.verbose:
+            print(f"{human(before):>9} -> {human(after):>9}{'  (grew)' if after > before else ''}  {path}")
+
+    print(f"\n{'FOLDER':<20} {'FILES':>6} {'GREW':>6} {'BEFORE':>10} {'AFTER':>10} {'SAVED':>10} {'%':>6}")
+    all_files = all_grew = all_before = all_after = 0
+    for folder in sorted(totals):
+        files, before, after, grew = totals[folder]
+        all_files, all_grew = all_files + files, all_grew + grew
+        all_before, all_after = all_before + before, all_after + after
+        print(f"{folder:<20} {files:>6} {grew:>6} {human(before):>10} {human(after):>10} {human(before - after):>10} "
+              f"{100 * (before - after) / before if before else 0:>5.1f}%")
+    print(f"{'TOTAL':<20} {all_files:>6} {all_grew:>6} {human(all_before):>10} {human(all_after):>10} "
+          f"{human(all_before - all_after):>10} {100 * (all_before - all_after) / all_before if all_before else 0:>5.1f}%")
+    if unreadable:
+        print(f"\n⚠️ {unreadable} file(s) could not be decoded as images")
+
+
+if __name__ == "__main__":
+    main()
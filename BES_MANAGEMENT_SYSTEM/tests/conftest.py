@@ -0,0 +1,61 @@
+# tests/conftest.py
+"""
+Fixtures shared by the database tests: a SQLite file database with the full
+schema (file, not :memory:, so threads and separate connections see the same
+data) and the sample resident most tests hang their requests on.
+"""
+from datetime import date
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.db import create_app_engine
+from app.schema import create_schema
+from app.models import Resident
+
+SAMPLE_RESIDENT = {"last_name": "Cruz", "first_name": "Juan", "gender": "Male", "civil_status": "Single",
+                   "birth_date": date(1990, 1, 1), "barangay": "Balibago", "municipality": "Calatagan"}
+
+
+def sample_resident(resident_id=None, **values) -> Resident:
+    """Juan Cruz of Balibago (resident_id None: assigned by the database)"""
+    return Resident(resident_id=resident_id, **{**SAMPLE_RESIDENT, **values})
+
+
+def insert_resident(conn, resident_id=1, **values):
+    """The sample resident, through a Core connection"""
+    conn.execute(Resident.__table__.insert(), {"resident_id": resident_id, **SAMPLE_RESIDENT, **values})
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """make_engine(name): another database file with the full schema, disposed after the test"""
+    engines = []
+
+    def make(name="barangay"):
+        engine = create_app_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        create_schema(engine)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
+
+
+@pytest.fixture
+def Session(engine):
+    Session = sessionmaker(bind=engine)
+    Session.engine = engine
+    return Session
+
+
+@pytest.fixture
+def resident(engine):
+    """Resident #1, the sample resident"""
+    with engine.begin() as conn:
+        insert_resident(conn)
+    return 1
@@ -0,0 +1,34 @@
+# tests/test_action_profiler.py
+import json
+import time
+import pstats
+from gui.action_profiler import ActionProfiler, INDEX_FILE
+
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def test_outermost_actions_are_written_per_mode(tmp_path):
+    profiler = ActionProfiler(tmp_path / "cprofile", mode="cprofile", min_ms=10)
+    with profiler.capture("SidebarHomeWindow.show_services_page"):
+        with profiler.capture("AdminController.bulk_transition"):      # nested: part of the page
+            busy(30)
+    with profiler.capture("AuthController.start_login"):               # too fast for a file
+        pass
+    entries = [json.loads(line) for line in (tmp_path / "cprofile" / INDEX_FILE).read_text().splitlines()]
+    assert [e["action"] for e in entries] == ["SidebarHomeWindow.show_services_page", "AuthController.start_login"]
+    assert entries[0]["wall_ms"] >= 30 and entries[1]["file"] is None
+    stats = pstats.Stats(str(tmp_path / "cprofile" / entries[0]["file"]))
+    assert any(func == "busy" for _, _, func in stats.stats)
+
+    sampler = ActionProfiler(tmp_path / "sample", mode="sample", min_ms=10)
+    with sampler.capture("show/payment page"):
+        busy(60)
+    [entry] = [json.loads(line) for line in (tmp_path / "sample" / INDEX_FILE).read_text().splitlines()]
+    assert entry["file"].endswith("-show_payment_page.collapsed")
+    lines = (tmp_path / "sample" / entry["file"]).read_text().splitlines()
+    assert lines and all(line.rpartition(" ")[2].isdigit() for line in lines)
+    assert any(line.rpartition(" ")[0].split(";")[-1].startswith("busy (") for line in lines)
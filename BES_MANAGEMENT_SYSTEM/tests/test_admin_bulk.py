@@ -0,0 +1,158 @@
+# tests/test_admin_bulk.py
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.models import (CertificateRequest, CertificateRequestEvent, CertificatePayment, Notification,
+                        StaffAuditLog, OrNumberSequence, OrNumberBlock)
+from app.or_numbers import OrNumberAllocator
+from app.controllers import admin_controller
+from app.controllers.admin_controller import AdminController
+
+
+@pytest.fixture
+def Session(monkeypatch):
+    engine = create_engine("sqlite://")
+    for model in (CertificateRequest, CertificateRequestEvent, CertificatePayment, Notification, StaffAuditLog,
+                  OrNumberSequence, OrNumberBlock):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(admin_controller, "SessionLocal", Session)
+    allocator = OrNumberAllocator("PC-1", engine, block_size=2, clock=lambda: datetime(2025, 6, 3))
+    monkeypatch.setattr(admin_controller, "get_or_allocator", lambda: allocator)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    Session.statements = statements
+    return Session
+
+
+def add_requests(Session, statuses):
+    db = Session()
+    for request_id, status in statuses.items():
+        db.add(CertificateRequest(request_id=request_id, resident_id=request_id, certificate_type="Barangay Clearance",
+                                  first_name="juan", last_name="cruz", purpose="work", quantity=2, status=status,
+                                  created_at=datetime(2025, 1, 1)))
+    db.commit()
+    db.close()
+
+
+def test_bulk_transition_updates_eligible_requests_in_one_statement(Session):
+    add_requests(Session, {1: "Pending", 2: "Under Review", 3: "Completed", 4: "Pending"})
+    Session.statements.clear()
+
+    result = AdminController.bulk_transition([1, 2, 3, 4], "Processing", admin_account_id=7)
+    assert result == {"success": True, "updated": [1, 2, 4], "skipped": [3]}
+    updates = [s for s in Session.statements if s.startswith("UPDATE certificate_requests")]
+    assert len(updates) == 1
+
+    db = Session()
+    assert {r.request_id: r.status for r in db.query(CertificateRequest)} == \
+        {1: "Processing", 2: "Processing", 3: "Completed", 4: "Processing"}
+    events = db.query(CertificateRequestEvent).filter_by(to_status="Processing").order_by(
+        CertificateRequestEvent.request_id).all()
+    assert [(e.request_id, e.from_status, e.actor) for e in events] == \
+        [(1, "Pending", "admin #7"), (2, "Under Review", "admin #7"), (4, "Pending", "admin #7")]
+    assert db.query(CertificatePayment).count() == 3
+    assert db.query(Notification).count() == 3
+    assert db.query(StaffAuditLog).count() == 1
+    db.close()
+
+    # A second pass skips everything and creates no duplicate payments
+    assert AdminController.bulk_transition([1, 2], "Processing")["updated"] == []
+    db = Session()
+    assert db.query(CertificatePayment).count() == 3
+    db.close()
+
+
+def test_bulk_mark_paid_only_touches_unpaid_payments(Session):
+    add_requests(Session, {1: "Pending", 2: "Pending", 3: "Pending"})
+    AdminController.bulk_transition([1, 2, 3], "Processing")
+    assert AdminController.bulk_mark_paid([2])["receipts"] == {2: "OR-2025-0000001"}
+
+    result = AdminController.bulk_mark_paid([1, 2, 3], "GCash", admin_account_id=7)
+    assert result["success"] and sorted(result["updated"]) == [1, 3] and result["receipts"] == {}
+    assert result["total"] == pytest.approx(2 * 2 * admin_controller.certificate_price("Barangay Clearance"))
+
+    db = Session()
+    payments = {p.request_id: p for p in db.query(CertificatePayment)}
+    assert all(p.is_paid and p.received_at for p in payments.values())
+    assert payments[1].payment_method == "GCash" and payments[2].payment_method == "Cash"
+    assert payments[1].or_number is None and payments[2].or_number == "OR-2025-0000001"
+    db.close()
+
+
+def test_bulk_cash_payments_each_get_an_or_number(Session):
+    add_requests(Session, {i: "Pending" for i in range(1, 6)})
+    AdminController.bulk_transition([1, 2, 3, 4, 5], "Processing")
+    assert AdminController.bulk_mark_paid([4])["updated"] == [4]
+
+    # Needs more numbers than the station's block holds
+    result = AdminController.bulk_mark_paid([1, 2, 3, 4, 5], "Cash")
+    assert result["updated"] == [1, 2, 3, 5]
+    assert result["receipts"] == {1: "OR-2025-0000002", 2: "OR-2025-0000003", 3: "OR-2025-0000004",
+                                  5: "OR-2025-0000005"}
+    db = Session()
+    assert {p.request_id: p.or_number for p in db.query(CertificatePayment)} == {
+        1: "OR-2025-0000002", 2: "OR-2025-0000003", 3: "OR-2025-0000004", 4: "OR-2025-0000001",
+        5: "OR-2025-0000005"}
+    db.close()
+
+
+def test_unpaid_payment_with_an_or_number_keeps_it_and_leftovers_are_reissued(Session, monkeypatch):
+    add_requests(Session, {1: "Pending", 2: "Pending"})
+    AdminController.bulk_transition([1, 2], "Processing")
+    db = Session()
+    db.query(CertificatePayment).filter_by(request_id=1).one().or_number = "OR-2024-0000042"
+    db.commit()
+    db.close()
+
+    result = AdminController.bulk_mark_paid([1, 2], "Cash")
+    assert result["updated"] == [1, 2] and result["receipts"] == {2: "OR-2025-0000001"}
+    db = Session()
+    assert {p.request_id: p.or_number for p in db.query(CertificatePayment)} == {
+        1: "OR-2024-0000042", 2: "OR-2025-0000001"}
+    db.close()
+
+    # A payment confirmed elsewhere after its number was drawn leaves the number for the next receipt
+    add_requests(Session, {3: "Pending"})
+    AdminController.bulk_transition([3], "Processing")
+    real_allocator = admin_controller.get_or_allocator()
+
+    class PaidMeanwhile:
+        give_back = real_allocator.give_back
+
+        def allocate(self):
+            number = real_allocator.allocate()
+            AdminController.bulk_mark_paid([3], "GCash")
+            return number
+
+    monkeypatch.setattr(admin_controller, "get_or_allocator", PaidMeanwhile)
+    assert AdminController.bulk_mark_paid([3], "Cash")["updated"] == []
+    assert real_allocator.allocate() == "OR-2025-0000002"
+
+
+def test_reprints_are_audited_without_notifying_again(Session):
+    add_requests(Session, {1: "Processing", 2: "Ready for Pickup"})
+    db = Session()
+    events_before = db.query(CertificateRequestEvent).count()
+    db.close()
+
+    result = AdminController.mark_certificates_printed([1, 2], admin_account_id=7)
+    assert result == {"success": True, "updated": 2}
+    assert AdminController.mark_certificates_printed([1], 7, audit_action="Print Certificate")["success"]
+
+    db = Session()
+    assert {r.request_id: r.status for r in db.query(CertificateRequest)} == {1: "Ready for Pickup",
+                                                                             2: "Ready for Pickup"}
+    events = db.query(CertificateRequestEvent).all()[events_before:]
+    assert [(e.request_id, e.to_status, e.actor) for e in events] == [(1, "Ready for Pickup", "admin #7")]
+    assert [n.resident_id for n in db.query(Notification)] == [1]
+    assert db.query(CertificatePayment).count() == 2
+    assert [(log.admin_id, log.action) for log in db.query(StaffAuditLog)] == [
+        (7, "Batch Print Certificates"), (7, "Print Certificate")]
+    db.close()
+
+
+def test_unknown_status_is_rejected(Session):
+    assert AdminController.bulk_transition([1], "Archived")["success"] is False
@@ -0,0 +1,54 @@
+# tests/test_bench_suite.py
+from sqlalchemy import create_engine, func, select
+from app.db import Base
+from app.models import Resident, CertificateRequest, Account
+from benchmarks.seed import seed, BENCH_USERNAME, BENCH_PASSWORD
+from benchmarks.runner import compare, time_case, StatementCounter, SuiteContext
+from benchmarks.cases import Case
+
+
+def report(**cases):
+    return {"commit": "abc", "cases": {name: {"median_ms": ms, "queries": q} for name, (ms, q) in cases.items()}}
+
+
+def test_compare_flags_slower_medians_and_extra_statements():
+    baseline = report(a=(10.0, 5), b=(100.0, 3), c=(0.5, 1), d=(10.0, 2))
+    now = report(a=(11.0, 5), b=(130.0, 3), c=(1.5, 1), d=(10.0, 3), new=(50.0, 9))
+    regressions = compare(now, baseline, threshold=0.2, min_delta_ms=2.0)
+    assert [line.split(":")[0] for line in regressions] == ["b", "d"]   # c tripled but by only 1ms
+
+
+def test_seed_is_deterministic():
+    counts = []
+    for _ in range(2):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        seed(engine, "tiny", seed=7)
+        with engine.connect() as conn:
+            counts.append((
+                conn.execute(select(func.count()).select_from(Resident)).scalar(),
+                conn.execute(select(func.count()).select_from(CertificateRequest)).scalar(),
+                conn.execute(select(CertificateRequest.status).order_by(CertificateRequest.request_id)).scalars().all(),
+            ))
+            account = conn.execute(select(Account).where(Account.username == BENCH_USERNAME)).first()
+    assert counts[0] == counts[1] and counts[0][:2] == (100, 500)
+    assert Account(password_hash=account.password_hash).verify_password(BENCH_PASSWORD)
+
+
+def test_time_case_counts_statements_per_run():
+    engine = create_engine("sqlite://")
+    calls = []
+
+    def factory(ctx):
+        def before():
+            calls.append("before")
+            return 2
+
+        def run(n):
+            with engine.connect() as conn:
+                for _ in range(n):
+                    conn.exec_driver_sql("SELECT 1")
+        return before, run
+
+    result = time_case(SuiteContext(engine), StatementCounter(engine), Case("x", factory, 3, False))
+    assert result["runs"] == 3 and result["queries"] == 2 and len(calls) == 4   # one warmup run
@@ -0,0 +1,61 @@
+# tests/test_blotter_controller.py
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Blotter
+from app.controllers import blotter_controller
+from app.controllers.blotter_controller import BlotterController, mysql_boolean_query, fts5_query, search_terms
+
+
+@pytest.fixture
+def blotters(monkeypatch):
+    engine = create_engine("sqlite://")
+    Blotter.__table__.create(engine)
+    BlotterController.ensure_search_index(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    base = datetime(2024, 1, 1, 8, 0)
+    for i in range(1, 121):
+        db.add(Blotter(
+            blotter_id=i,
+            complainant_name=f"Juan Cruz {i}",
+            respondent_name="Pedro Santos" if i % 10 == 0 else f"Neighbor {i}",
+            reason="Broken window after a dispute" if i % 3 == 0 else "Loud karaoke at night",
+            incident_date=base + timedelta(days=i),
+            created_at=base + timedelta(days=i // 2),  # pairs share created_at
+        ))
+    db.commit()
+    db.close()
+    monkeypatch.setattr(blotter_controller, "SessionLocal", Session)
+    return engine
+
+
+def collect(**filters):
+    ids, after = [], None
+    while True:
+        result = BlotterController.search(after=after, limit=7, **filters)
+        assert result["success"], result.get("error")
+        ids += [row["blotter_id"] for row in result["rows"]]
+        after = result["next_cursor"]
+        if after is None:
+            return ids
+
+
+def test_keyset_paging_visits_every_row_once_newest_first(blotters):
+    assert collect() == list(range(120, 0, -1))
+
+
+def test_full_text_search_and_date_range(blotters):
+    assert collect(query="santos") == list(range(120, 0, -10))
+    assert collect(query="brok wind") == list(range(120, 0, -3))
+    assert collect(query="window", date_from=date(2024, 1, 10), date_to=date(2024, 1, 20)) == [18, 15, 12, 9]
+    assert collect(query="window", date_field="created_at", date_from=date(2024, 1, 10), date_to=date(2024, 1, 11)) \
+        == [21, 18]
+
+
+def test_punctuation_cannot_break_match_syntax():
+    terms = search_terms('window" OR -"')
+    assert terms == ["window", "OR"]
+    assert mysql_boolean_query(terms) == "+window* +OR*"
+    assert fts5_query(terms) == '"window"* "OR"*'
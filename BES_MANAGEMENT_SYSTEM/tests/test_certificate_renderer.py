@@ -0,0 +1,74 @@
+# tests/test_certificate_renderer.py
+import os
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtGui = pytest.importorskip("PyQt5.QtGui")
+
+from gui.certificate_renderer import (
+    CertificateRenderer, certificate_fields, certificate_kind, render_body_html, PAGE_WIDTH, PAGE_HEIGHT
+)
+
+
+@pytest.fixture(scope="module")
+def qt_app():
+    app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+    yield app
+
+
+def make_request(**overrides):
+    values = dict(request_id=7, first_name="juan", middle_name="", last_name="dela cruz 09171234567",
+                  suffix="jr", certificate_type="Barangay Indigency", purpose="medical assistance")
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_fields_clean_request_name():
+    fields = certificate_fields(make_request(), issued_on=datetime(2025, 3, 22))
+    assert fields["resident_name"] == "Juan Dela Cruz JR"
+    assert fields["certificate_type"] == "Barangay Indigency"
+
+
+def test_certificate_kind_mapping():
+    assert certificate_kind("Business Permit") == "business"
+    assert certificate_kind("Barangay Indigency") == "indigency"
+    assert certificate_kind("Barangay ID") == "id"
+    assert certificate_kind("Barangay Clearance") == "clearance"
+    assert certificate_kind(None) == "clearance"
+
+
+def test_body_html_fills_request_fields():
+    fields = certificate_fields(make_request(purpose="<script>"), issued_on=datetime(2025, 3, 22))
+    body = render_body_html(fields)
+    assert "CERTIFICATE OF INDIGENCY" in body
+    assert "JUAN DELA CRUZ JR" in body
+    assert "22nd" in body and "March, 2025" in body
+    assert "&lt;SCRIPT&gt;" in body
+    assert "$" not in body
+
+
+def test_render_image_and_pdf(qt_app, tmp_path):
+    renderer = CertificateRenderer()
+    fields = certificate_fields(make_request())
+    image = renderer.render_image(fields)
+    assert (image.width(), image.height()) == (PAGE_WIDTH, PAGE_HEIGHT)
+    blank = QtGui.QImage(image.size(), image.format())
+    blank.fill(QtGui.QColor("white"))
+    assert image != blank
+
+    path = renderer.render_pdf([fields, fields], str(tmp_path / "certs.pdf"))
+    with open(path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+
+
+def test_batch_pdf_merges_pages(qt_app, tmp_path):
+    from gui.certificate_batch import render_batch_pdf
+    pages = [certificate_fields(make_request(request_id=i, certificate_type=t))
+             for i, t in enumerate(["Barangay ID", "Business Permit", "Barangay Clearance"])]
+    seen = []
+    path = render_batch_pdf(pages, tmp_path / "batch.pdf", workers=1, progress=lambda done, total: seen.append(done))
+    assert seen == [1, 2, 3]
+    with open(path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
@@ -0,0 +1,77 @@
+# tests/test_change_feed.py
+from datetime import datetime
+import pytest
+from sqlalchemy import insert, update
+from app.models import Resident, CertificateRequest, Notification, ChangeLog
+from app.change_feed import ChangeReader, RELOAD
+from app.or_numbers import OrNumberAllocator
+from app.controllers import admin_controller
+from app.controllers.admin_controller import AdminController
+from conftest import sample_resident
+
+
+@pytest.fixture
+def Session(Session, monkeypatch):
+    monkeypatch.setattr(admin_controller, "SessionLocal", Session)
+    allocator = OrNumberAllocator("PC-1", Session.engine)
+    monkeypatch.setattr(admin_controller, "get_or_allocator", lambda: allocator)
+    return Session
+
+
+def test_orm_and_bulk_writes_reach_other_stations(Session):
+    other = ChangeReader(Session.engine, station="PC-2")
+    own = ChangeReader(Session.engine)
+    other.start()
+    own.start()
+
+    db = Session()
+    db.add(sample_resident(1))
+    db.add(sample_resident(2))
+    db.add(CertificateRequest(request_id=10, resident_id=1, certificate_type="Barangay Clearance",
+                              purpose="work", status="Pending", created_at=datetime(2025, 1, 1)))
+    db.commit()
+    assert other.poll() == {"residents": {1, 2}, "certificate_requests": {10}}
+    assert own.poll() == {}
+
+    db.get(CertificateRequest, 10).purpose = "school"
+    db.get(Resident, 2).sitio = "Dita"
+    db.commit()
+    db.get(Resident, 1).sitio = None          # unchanged: nothing recorded
+    db.commit()
+    assert other.poll() == {"certificate_requests": {10}, "residents": {2}}
+
+    # Bulk statements: INSERT keys come from the rows, UPDATE keys from record_changes or a table reload
+    assert AdminController.bulk_transition([10], "Processing")["updated"] == [10]
+    assert other.poll() == {"certificate_requests": {10}, "certificate_payments": {10}, "notifications": {1}}
+    AdminController.bulk_mark_paid([10], "Cash")
+    assert other.poll() == {"certificate_payments": {10}}
+    db.execute(update(Notification).values(is_read=True).execution_options(synchronize_session=False))
+    db.commit()
+    assert other.poll() == {"notifications": {RELOAD}}
+
+    db.execute(insert(Notification), [{"resident_id": 2, "title": "Hello"}])
+    db.rollback()
+    db.get(Resident, 2).sitio = "Centro"
+    db.rollback()
+    assert other.poll() == {}
+    db.close()
+
+
+def test_reader_waits_for_changes_committed_out_of_order(Session):
+    reader = ChangeReader(Session.engine, station="PC-2", gap_polls=3)
+    reader.start()
+
+    def change(change_id, row_id):
+        with Session.engine.begin() as conn:
+            conn.execute(insert(ChangeLog).values(change_id=change_id, table_name="residents", row_id=row_id,
+                                                  operation="update", station="PC-3"))
+
+    # Ids 1 and 2 were taken by transactions that have not committed yet
+    change(3, 30)
+    assert reader.poll() == {"residents": {30}} and set(reader.gaps) == {1, 2}
+    change(1, 10)
+    assert reader.poll() == {"residents": {10}} and set(reader.gaps) == {2}
+    assert reader.poll() == {} and reader.gaps == {}          # 2 was rolled back: given up
+    change(2, 20)
+    change(4, 40)
+    assert reader.poll() == {"residents": {40}}
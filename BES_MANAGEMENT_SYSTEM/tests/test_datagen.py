@@ -0,0 +1,55 @@
+# tests/test_datagen.py
+from sqlalchemy import select, func
+from app.db import create_app_engine
+from app.schema import create_schema
+from app.models import Resident, CertificateRequest, CertificateRequestEvent, CertificatePayment
+from benchmarks.datagen import generate, SITIOS
+
+
+def dump(engine):
+    with engine.connect() as conn:
+        return [conn.execute(select(table).order_by(*table.__table__.primary_key.columns)).all()
+                for table in (Resident, CertificateRequest, CertificateRequestEvent, CertificatePayment)]
+
+
+def test_same_seed_same_rows_and_top_up_continues_ids(tmp_path):
+    engines = [create_app_engine(f"sqlite:///{tmp_path / f'{name}.db'}") for name in ("a", "b", "c")]
+    for engine in engines:
+        create_schema(engine)
+    for engine, seed in zip(engines, (3, 3, 4)):
+        generate(engine, 50, 200, seed=seed, batch_size=64, log=lambda message: None)
+    assert dump(engines[0]) == dump(engines[1]) != dump(engines[2])
+
+    counts = generate(engines[0], 10, 20, seed=5, log=lambda message: None)
+    with engines[0].connect() as conn:
+        assert conn.execute(select(func.max(CertificateRequest.request_id))).scalar() == 220
+        assert conn.execute(select(func.count()).select_from(Resident)).scalar() == 60
+    assert counts["requests"] == 20 and counts["residents"] == 10
+    for engine in engines:
+        engine.dispose()
+
+
+def test_rows_are_consistent(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'load.db'}")
+    create_schema(engine)
+    generate(engine, 300, 1500, seed=1, log=lambda message: None)
+    with engine.connect() as conn:
+        residents = conn.execute(select(Resident.age, Resident.civil_status, Resident.sitio)).all()
+        assert {sitio for _, _, sitio in residents} <= set(SITIOS)
+        assert all(status == "Single" for age, status, _ in residents if age < 18)
+
+        # The newest event of every request is its current status
+        events = {}
+        for request_id, to_status in conn.execute(select(CertificateRequestEvent.request_id, CertificateRequestEvent.to_status)
+                                                  .order_by(CertificateRequestEvent.event_id)):
+            events[request_id] = to_status
+        statuses = dict(conn.execute(select(CertificateRequest.request_id, CertificateRequest.status)).all())
+        assert events == statuses
+
+        payments = conn.execute(select(CertificatePayment.request_id, CertificatePayment.is_paid,
+                                       CertificatePayment.received_at, CertificatePayment.or_number,
+                                       CertificatePayment.reference_number)).all()
+        assert all(statuses[p.request_id] in ("Processing", "Ready for Pickup", "Completed") for p in payments)
+        assert all((p.received_at is not None) == p.is_paid for p in payments)
+        assert all(bool(p.or_number) != bool(p.reference_number) for p in payments if p.is_paid)
+    engine.dispose()
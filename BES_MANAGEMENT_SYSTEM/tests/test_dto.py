@@ -0,0 +1,48 @@
+# tests/test_dto.py
+import pytest
+from sqlalchemy import event
+from app.models import CertificateRequest, CertificateRequestEvent
+from app.dto import AccountInfo, TrackedRequest, StatusEvent, query_columns, rows
+from app.controllers import auth_controllers
+from app.controllers.auth_controllers import AuthController
+
+
+@pytest.fixture
+def Session(Session, resident, monkeypatch):
+    monkeypatch.setattr(auth_controllers, "SessionLocal", Session)
+    return Session
+
+
+def test_controllers_return_rows_without_rereading(Session):
+    statements = []
+    engine = Session.kw["bind"]
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement.split()[0]))
+    # (BEGIN is issued explicitly by the SQLite engine)
+
+    result = AuthController.create_account_after_verification(1, "juan", "secret123")
+    assert result["success"]
+    account = result["account"]
+    assert isinstance(account, AccountInfo)
+    assert account == AccountInfo(account.account_id, 1, "juan", "Resident", "Active")
+    # resident lookup + INSERT; no SELECT after the commit to refresh the account
+    assert [s for s in statements if s != "BEGIN"] == ["SELECT", "INSERT"]
+
+    statements.clear()
+    approved = AuthController.approve_account(account.account_id)["account"]
+    assert approved.account_status == "Active" and statements.count("SELECT") == 1
+
+
+def test_column_queries_build_rows(Session):
+    db = Session()
+    db.add(CertificateRequest(request_id=5, resident_id=1, certificate_type="Barangay ID", first_name="juan",
+                              last_name="cruz", purpose="ID", quantity=2, status="Pending"))
+    db.commit()      # the submission event is recorded by app/request_events.py
+
+    requests = rows(TrackedRequest, query_columns(db, TrackedRequest, CertificateRequest))
+    events = rows(StatusEvent, query_columns(db, StatusEvent, CertificateRequestEvent))
+    assert [(r.request_id, r.certificate_type, r.quantity) for r in requests] == [(5, "Barangay ID", 2)]
+    assert [(e.request_id, e.from_status, e.to_status) for e in events] == [(5, None, "Pending")]
+    # Nothing was loaded into the session
+    assert len(db.identity_map) == 0
+    db.close()
@@ -0,0 +1,196 @@
+# tests/test_email_outbox.py
+import smtplib
+import socket
+from datetime import timedelta
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app import emailer
+from app.config import OUTBOX_RETRY_BASE_SECONDS, OUTBOX_RETRY_MAX_SECONDS, OUTBOX_MAX_ATTEMPTS, get_philippine_time
+from app.db import create_app_engine
+from app.schema import create_schema
+from app.models import EmailOutbox
+from app.emailer import Emailer
+from app.email_outbox import SMTPConnection, OutboxSender, build_message, retry_delay, is_permanent_error
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.subjects = []
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        for line in envelope.content.decode("utf8", errors="replace").splitlines():
+            if line.startswith("Subject: "):
+                self.subjects.append(line[len("Subject: "):])
+        return "250 OK"
+
+
+def free_port():
+    # Bound to port 0 so the OS picks a free one (the Controller itself can't take 0:
+    # its start-up check connects to the port it was given)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_connection(controller):
+    return SMTPConnection(host=controller.hostname, port=controller.port,
+                          username=None, password=None, use_tls=False)
+
+
+def test_batch_uses_one_connection(smtp_server):
+    controller, handler = smtp_server
+    conn = make_connection(controller)
+    for i in range(20):
+        conn.send(build_message("resident@example.com", f"Message {i}", "body"))
+    conn.close()
+
+    assert handler.subjects == [f"Message {i}" for i in range(20)]
+    assert handler.connections == 1
+    assert conn.connect_count == 1
+
+
+def test_reconnects_when_session_dropped(smtp_server):
+    controller, handler = smtp_server
+    conn = make_connection(controller)
+    conn.send(build_message("resident@example.com", "first", "body"))
+    conn.server.quit()  # server side is gone but the wrapper still holds the session
+    conn.send(build_message("resident@example.com", "second", "body"))
+    conn.close()
+
+    assert handler.subjects == ["first", "second"]
+    assert conn.connect_count == 2
+
+
+def test_retry_delay_backs_off_exponentially():
+    assert retry_delay(1) == OUTBOX_RETRY_BASE_SECONDS
+    assert retry_delay(2) == OUTBOX_RETRY_BASE_SECONDS * 2
+    assert retry_delay(3) == OUTBOX_RETRY_BASE_SECONDS * 4
+    assert retry_delay(50) == OUTBOX_RETRY_MAX_SECONDS
+
+
+def test_permanent_errors_are_not_retried():
+    assert is_permanent_error(smtplib.SMTPRecipientsRefused({"x@example.com": (550, b"no such user")}))
+    assert is_permanent_error(smtplib.SMTPDataError(554, b"rejected"))
+    assert not is_permanent_error(smtplib.SMTPDataError(451, b"try again later"))
+    assert not is_permanent_error(smtplib.SMTPAuthenticationError(535, b"bad credentials"))
+    assert not is_permanent_error(smtplib.SMTPServerDisconnected("gone"))
+
+
+@pytest.fixture
+def Session(tmp_path, monkeypatch):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    create_schema(engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(emailer, "SessionLocal", Session)
+    monkeypatch.setattr(emailer, "wake_outbox_sender", lambda: None)
+    yield Session
+    engine.dispose()
+
+
+def make_sender(Session, batch_size=50):
+    # Never connects: these tests drive claim_batch / record_results directly
+    return OutboxSender(session_factory=Session, connection=SMTPConnection(host="127.0.0.1", port=1),
+                        batch_size=batch_size)
+
+
+def outbox(Session):
+    db = Session()
+    try:
+        return {row.outbox_id: row for row in db.query(EmailOutbox)}
+    finally:
+        db.close()
+
+
+def test_queue_email_commits_its_own_row_or_joins_the_callers_transaction(Session):
+    result = Emailer.queue_email("resident@example.com", "Ready", "Your clearance is ready")
+    assert result["success"] and result["queued"]
+    row = outbox(Session)[result["outbox_id"]]
+    assert (row.to_address, row.subject, row.status, row.attempts) == ("resident@example.com", "Ready", "Pending", 0)
+    assert row.next_attempt_at <= get_philippine_time()
+
+    assert Emailer.queue_email("", "Ready", "body")["success"] is False
+
+    # Queued with the caller's session: gone if the caller rolls back
+    db = Session()
+    assert Emailer.queue_email("resident@example.com", "Rolled back", "body", db=db)["success"]
+    db.rollback()
+    db.close()
+    assert [row.subject for row in outbox(Session).values()] == ["Ready"]
+
+
+def test_claim_batch_leases_due_rows_once(Session):
+    now = get_philippine_time()
+    db = Session()
+    db.add_all([EmailOutbox(to_address=f"r{i}@example.com", subject=f"Message {i}", body="body",
+                            status="Pending", next_attempt_at=now - timedelta(minutes=5 - i)) for i in range(3)])
+    db.add(EmailOutbox(to_address="later@example.com", subject="Retry later", body="body", status="Pending",
+                       next_attempt_at=now + timedelta(hours=1)))
+    db.commit()
+    db.close()
+
+    first, second = make_sender(Session, batch_size=2), make_sender(Session, batch_size=2)
+    claimed = first.claim_batch()
+    assert [item["subject"] for item in claimed] == ["Message 0", "Message 1"]
+    # Another station's sender gets only what is left, never the same rows
+    assert [item["subject"] for item in second.claim_batch()] == ["Message 2"]
+    assert first.claim_batch() == [] and second.claim_batch() == []
+
+    rows = outbox(Session)
+    assert {row.subject: row.status for row in rows.values()} == {
+        "Message 0": "Sending", "Message 1": "Sending", "Message 2": "Sending", "Retry later": "Pending"}
+    assert all(row.next_attempt_at > now for row in rows.values())
+
+    # A worker that died mid-batch: its rows are claimed again once the lease runs out
+    db = Session()
+    db.query(EmailOutbox).filter(EmailOutbox.outbox_id == claimed[0]["outbox_id"]).update(
+        {"next_attempt_at": now - timedelta(seconds=1)})
+    db.commit()
+    db.close()
+    assert [item["outbox_id"] for item in second.claim_batch()] == [claimed[0]["outbox_id"]]
+
+
+def test_record_results_marks_sent_retries_with_backoff_and_gives_up(Session):
+    for subject in ("sent", "retry", "last try", "rejected"):
+        Emailer.queue_email("resident@example.com", subject, "body")
+    db = Session()
+    db.query(EmailOutbox).filter(EmailOutbox.subject == "last try").update({"attempts": OUTBOX_MAX_ATTEMPTS - 1})
+    db.commit()
+    db.close()
+
+    sender = make_sender(Session)
+    batch = {item["subject"]: item for item in sender.claim_batch()}
+    busy = smtplib.SMTPDataError(451, b"try again later")
+    before = get_philippine_time()
+    sender.record_results([
+        (batch["sent"], None),
+        (batch["retry"], busy),
+        (batch["last try"], busy),
+        (batch["rejected"], smtplib.SMTPRecipientsRefused({"resident@example.com": (550, b"no such user")})),
+    ])
+
+    rows = {row.subject: row for row in outbox(Session).values()}
+    assert rows["sent"].status == "Sent" and rows["sent"].sent_at is not None and rows["sent"].attempts == 1
+    retry = rows["retry"]
+    assert (retry.status, retry.attempts) == ("Pending", 1) and "try again later" in retry.last_error
+    assert retry.next_attempt_at >= before + timedelta(seconds=retry_delay(1))
+    assert retry.next_attempt_at <= get_philippine_time() + timedelta(seconds=retry_delay(1))
+    assert (rows["last try"].status, rows["last try"].attempts) == ("Failed", OUTBOX_MAX_ATTEMPTS)
+    assert (rows["rejected"].status, rows["rejected"].attempts) == ("Failed", 1)
+    # Only the retry is due again, and not before its backoff
+    assert sender.claim_batch() == []
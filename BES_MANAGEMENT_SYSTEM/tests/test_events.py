@@ -0,0 +1,68 @@
+# tests/test_events.py
+import gc
+from datetime import datetime
+import pytest
+from app.models import CertificateRequest
+from app.events import EventBus, bus, publish_on_commit, RequestStatusChanged, PaymentRecorded, ResidentUpdated
+from app.controllers import admin_controller
+from app.controllers.admin_controller import AdminController
+from conftest import sample_resident
+
+
+class Page:
+    def __init__(self):
+        self.seen = []
+
+    def on_event(self, event):
+        self.seen.append(event)
+
+
+def test_events_are_coalesced_per_type_until_flushed():
+    events = EventBus()
+    scheduled = []
+    events.set_scheduler(lambda: scheduled.append(True))
+    page = Page()
+    events.subscribe(RequestStatusChanged, page.on_event)
+    events.subscribe(PaymentRecorded, page.on_event)
+
+    events.publish(RequestStatusChanged([1, 2]))
+    events.publish(PaymentRecorded({2}))
+    events.publish(RequestStatusChanged({2, 3}))
+    events.publish(ResidentUpdated({9}))          # nobody listens
+    assert scheduled == [True] and page.seen == []
+    events.flush()
+    assert page.seen == [RequestStatusChanged(frozenset({1, 2, 3})), PaymentRecorded(frozenset({2}))]
+
+    # A page that went away is dropped instead of being kept alive
+    del page
+    gc.collect()
+    events.publish(RequestStatusChanged({4}))
+    events.flush()
+    assert events._subscribers[RequestStatusChanged] == []
+
+
+@pytest.fixture
+def Session(Session, monkeypatch):
+    monkeypatch.setattr(admin_controller, "SessionLocal", Session)
+    return Session
+
+
+def test_events_are_published_after_commit_only(Session):
+    page = Page()
+    bus.subscribe(RequestStatusChanged, page.on_event)
+    db = Session()
+    db.add(sample_resident(1))
+    db.add(CertificateRequest(request_id=10, resident_id=1, certificate_type="Barangay Clearance",
+                              status="Pending", created_at=datetime(2025, 1, 1)))
+    publish_on_commit(db, RequestStatusChanged({10}))
+    db.rollback()
+    assert page.seen == []
+
+    db.add(sample_resident(1))
+    db.add(CertificateRequest(request_id=10, resident_id=1, certificate_type="Barangay Clearance",
+                              status="Pending", created_at=datetime(2025, 1, 1)))
+    db.commit()
+    db.close()
+    assert AdminController.bulk_transition([10, 11], "Processing")["updated"] == [10]
+    assert page.seen == [RequestStatusChanged(frozenset({10}))]
+    bus.unsubscribe(RequestStatusChanged, page.on_event)
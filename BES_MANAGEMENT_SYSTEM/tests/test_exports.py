@@ -0,0 +1,66 @@
+# tests/test_exports.py
+import csv
+from datetime import date
+import pytest
+from sqlalchemy import select, func
+from app.db import create_app_engine
+from app.schema import create_schema
+from app.models import Resident
+from app.exports import export_table
+from benchmarks.datagen import generate
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    engine = create_app_engine(f"sqlite:///{tmp_path_factory.mktemp('exports') / 'load.db'}")
+    create_schema(engine)
+    generate(engine, 200, 600, seed=2, log=lambda message: None)
+    yield engine
+    engine.dispose()
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_csv_export_applies_columns_and_filters(engine, tmp_path):
+    steps = []
+    result = export_table("residents", tmp_path / "dita.csv", ["resident_id", "last_name", "sitio", "indigent"],
+                          {"sitio": "Dita"}, progress=lambda done, total: steps.append((done, total)),
+                          bind=engine, batch_size=7)
+    rows = read_csv(tmp_path / "dita.csv")
+    with engine.connect() as conn:
+        expected = conn.execute(select(func.count()).select_from(Resident).where(Resident.sitio == "Dita")).scalar()
+    assert result == {"success": True, "rows": expected, "path": str(tmp_path / "dita.csv")}
+    assert rows[0] == ["Resident ID", "Last Name", "Sitio", "Indigent"]
+    assert len(rows) == expected + 1 and {row[2] for row in rows[1:]} == {"Dita"}
+    assert {row[3] for row in rows[1:]} <= {"Yes", "No"}
+    assert steps[-1] == (expected, expected) and len(steps) == -(-expected // 7)
+
+    result = export_table("requests", tmp_path / "done.csv", None,
+                          {"status": "Completed", "date_from": date(2025, 1, 1), "date_to": date(2025, 3, 31)},
+                          bind=engine)
+    rows = read_csv(tmp_path / "done.csv")
+    status, created = rows[0].index("Status"), rows[0].index("Created At")
+    assert result["rows"] == len(rows) - 1 > 0
+    assert all(row[status] == "Completed" and "2025-01-01" <= row[created] < "2025-04-01" for row in rows[1:])
+
+
+def test_failed_or_cancelled_exports_leave_no_file(engine, tmp_path):
+    result = export_table("payments", tmp_path / "p.csv", ["payment_id", "password_hash"], bind=engine)
+    assert not result["success"] and "password_hash" in result["error"]
+    result = export_table("requests", tmp_path / "r.csv", cancelled=lambda: True, bind=engine)
+    assert result == {"success": False, "error": "Export cancelled"}
+    assert export_table("residents", tmp_path / "r.pdf", bind=engine)["success"] is False
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_xlsx_export(engine, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    result = export_table("payments", tmp_path / "payments.xlsx", ["payment_id", "total_amount", "is_paid"],
+                          {"status": "Paid"}, bind=engine)
+    sheet = openpyxl.load_workbook(tmp_path / "payments.xlsx", read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0] == ("Payment ID", "Total Amount", "Is Paid") and len(rows) == result["rows"] + 1
+    assert all(row[2] is True for row in rows[1:])
@@ -0,0 +1,101 @@
+# tests/test_or_numbers.py
+import threading
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from app.models import CertificateRequest, CertificatePayment, OrNumberBlock
+from app.or_numbers import OrNumberAllocator
+from conftest import insert_resident
+
+CLOCK = lambda: datetime(2025, 6, 3, 9, 0)
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        insert_resident(conn)
+        conn.execute(CertificateRequest.__table__.insert(), {
+            "request_id": 1, "resident_id": 1, "certificate_type": "Barangay Clearance", "status": "Processing"})
+    return engine
+
+
+def add_payment(conn, or_number):
+    conn.execute(CertificatePayment.__table__.insert(), {"request_id": 1, "is_paid": True, "or_number": or_number})
+
+
+def test_concurrent_stations_never_issue_the_same_number(engine):
+    stations = [OrNumberAllocator(f"PC-{i}", engine, block_size=7, clock=CLOCK) for i in range(4)]
+    issued = []
+    issued_lock = threading.Lock()
+    errors = []
+    start = threading.Barrier(12)
+
+    def cashier(allocator):
+        try:
+            start.wait()
+            numbers = [allocator.allocate() for _ in range(30)]
+            with issued_lock:
+                issued.extend(numbers)
+        except Exception as e:
+            errors.append(e)
+
+    # Three cashier threads per station, all stations at once
+    threads = [threading.Thread(target=cashier, args=(stations[i % 4],)) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(issued) == len(set(issued)) == 360
+    assert all(number.startswith("OR-2025-") for number in issued)
+
+    for allocator in stations:
+        allocator.release()
+    with engine.connect() as conn:
+        blocks = conn.execute(select(OrNumberBlock).order_by(OrNumberBlock.first_number)).all()
+    # Blocks tile the sequence without overlaps; every number is either issued or recorded as unused
+    assert [b.first_number for b in blocks] == [1 + 7 * i for i in range(len(blocks))]
+    unused = {n for b in blocks if b.unused_from for n in range(b.unused_from, b.last_number + 1)}
+    assert {int(number[-7:]) for number in issued} | unused == set(range(1, 7 * len(blocks) + 1))
+    assert not {int(number[-7:]) for number in issued} & unused
+
+    with engine.begin() as conn:
+        for number in issued:
+            add_payment(conn, number)
+
+
+def test_series_continues_after_existing_receipts_and_rejects_duplicates(engine):
+    with engine.begin() as conn:
+        add_payment(conn, "OR-2025-0000120")
+        add_payment(conn, "OR-2024-0009999")
+    allocator = OrNumberAllocator("PC-1", engine, block_size=5, clock=CLOCK)
+    assert allocator.peek() == "OR-2025-0000121"
+    assert [allocator.allocate() for _ in range(2)] == ["OR-2025-0000121", "OR-2025-0000122"]
+    # A second station gets the next block, not the rest of the first one
+    assert OrNumberAllocator("PC-2", engine, block_size=5, clock=CLOCK).allocate() == "OR-2025-0000126"
+
+    allocator.release()
+    with engine.connect() as conn:
+        block = conn.execute(select(OrNumberBlock).where(OrNumberBlock.station == "PC-1")).one()
+    assert (block.first_number, block.last_number, block.unused_from) == (121, 125, 123)
+    assert block.released_at is not None
+
+    with pytest.raises(IntegrityError):
+        with engine.begin() as conn:
+            add_payment(conn, "OR-2025-0000120")
+
+
+def test_numbers_given_back_are_reissued_or_recorded_as_unused(engine):
+    allocator = OrNumberAllocator("PC-1", engine, block_size=10, clock=CLOCK)
+    drawn = [allocator.allocate() for _ in range(5)]
+    # The last ones drawn are handed out again
+    allocator.give_back(drawn[3:])
+    assert allocator.allocate() == drawn[3]
+    # Others can't be, so they are recorded as never issued
+    allocator.give_back([drawn[0], drawn[1], drawn[3]])
+    assert allocator.allocate() == "OR-2025-0000005"
+    with engine.connect() as conn:
+        unused = conn.execute(select(OrNumberBlock).where(OrNumberBlock.unused_from.is_not(None))
+                              .order_by(OrNumberBlock.first_number)).all()
+    assert [(b.first_number, b.last_number, b.unused_from) for b in unused] == [(1, 2, 1), (4, 4, 4)]
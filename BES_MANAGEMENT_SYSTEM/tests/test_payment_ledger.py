@@ -0,0 +1,150 @@
+# tests/test_payment_ledger.py
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import select, func, update
+from sqlalchemy.orm import sessionmaker
+from app.models import (Account, CertificateRequest, CertificatePayment, PaymentLedgerDay,
+                        PaymentLedgerLock, OrNumberSequence)
+from app import payment_ledger
+from app.payment_ledger import Totals
+from app.config import certificate_price
+from conftest import insert_resident
+
+NOW = datetime(2025, 6, 3, 15, 0)
+
+
+@pytest.fixture
+def engine(engine):
+    with engine.begin() as conn:
+        insert_resident(conn)
+        conn.execute(Account.__table__.insert(), [
+            {"account_id": 7, "username": "treasurer", "password_hash": "x", "user_role": "Staff"},
+            {"account_id": 8, "username": "secretary", "password_hash": "x", "user_role": "Staff"},
+        ])
+        conn.execute(CertificateRequest.__table__.insert(), [
+            {"request_id": i, "resident_id": 1, "certificate_type": "Barangay Clearance", "quantity": 1,
+             "status": "Processing", "first_name": "juan", "last_name": "cruz", "created_at": datetime(2025, 5, 30)}
+            for i in range(1, 9)
+        ])
+        # (request, received at, cashier, amount); None: still unpaid
+        payments = [
+            (1, datetime(2025, 5, 31, 9, 0), 7, "50.00"),
+            (2, datetime(2025, 6, 1, 8, 30), 7, "100.00"),
+            (3, datetime(2025, 6, 1, 16, 45), 8, "25.50"),
+            (4, datetime(2025, 6, 3, 10, 0), 8, "50.00"),
+            (5, datetime(2025, 6, 3, 11, 0), None, "75.00"),
+            (6, None, None, "50.00"),
+            (7, None, None, "50.00"),
+        ]
+        conn.execute(CertificatePayment.__table__.insert(), [
+            {"payment_id": request_id, "request_id": request_id, "total_amount": Decimal(amount),
+             "is_paid": received is not None, "received_at": received, "received_by_admin_id": cashier,
+             "created_at": datetime(2025, 5, 30, 8, 0).replace(day=30 - request_id % 3)}
+            for request_id, received, cashier, amount in payments
+        ])
+    return engine
+
+
+def test_daily_and_monthly_totals_survive_closing(engine):
+    live = payment_ledger.daily_totals(date(2025, 5, 31), date(2025, 6, 3), engine)
+    assert live == {date(2025, 5, 31): Totals(1, Decimal("50.00")), date(2025, 6, 1): Totals(2, Decimal("125.50")),
+                    date(2025, 6, 2): Totals(0, Decimal("0.00")), date(2025, 6, 3): Totals(2, Decimal("125.00"))}
+
+    assert payment_ledger.close_days(engine, now=NOW) == 3            # May 31 - June 2; June 3 is still open
+    assert payment_ledger.close_days(engine, now=NOW) == 0
+    with engine.connect() as conn:
+        assert conn.execute(select(func.max(PaymentLedgerDay.ledger_date))).scalar() == date(2025, 6, 2)
+    assert payment_ledger.daily_totals(date(2025, 5, 31), date(2025, 6, 3), engine) == live
+    assert payment_ledger.monthly_totals(2025, engine)[6] == Totals(4, Decimal("250.50"))
+
+    # Closed days are read from the ledger until they are closed again
+    with engine.begin() as conn:
+        conn.execute(update(CertificatePayment).where(CertificatePayment.payment_id == 6)
+                     .values(is_paid=True, received_at=datetime(2025, 6, 2, 9, 0), total_amount=Decimal("10.00")))
+    assert payment_ledger.daily_totals(date(2025, 6, 2), date(2025, 6, 2), engine)[date(2025, 6, 2)].count == 0
+    assert payment_ledger.close_day(date(2025, 6, 2), engine, now=NOW) == 1
+    assert payment_ledger.daily_totals(date(2025, 6, 2), date(2025, 6, 2), engine) == {
+        date(2025, 6, 2): Totals(1, Decimal("10.00"))}
+    with pytest.raises(ValueError):
+        payment_ledger.close_day(date(2025, 6, 3), engine, now=NOW)
+
+
+def test_concurrent_stations_close_each_day_once(engine):
+    live = payment_ledger.daily_totals(date(2025, 5, 31), date(2025, 6, 2), engine)
+    closed = []
+    errors = []
+    start = threading.Barrier(4)
+
+    def station():
+        try:
+            start.wait()
+            closed.append(payment_ledger.close_days(engine, now=NOW))
+        except Exception as e:
+            errors.append(e)
+
+    # Four cashier stations open the Payments page at once after midnight
+    threads = [threading.Thread(target=station) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(closed) == [0, 0, 0, 3]
+    with engine.connect() as conn:
+        days = conn.execute(select(PaymentLedgerDay.ledger_date, PaymentLedgerDay.received_by_admin_id)).all()
+        # Every close went through the ledger's own lock row, none through the receipt sequences
+        assert conn.execute(select(PaymentLedgerLock.close_count)).scalar() == 4
+        assert conn.execute(select(func.count()).select_from(OrNumberSequence)).scalar() == 0
+    assert len(days) == len(set(days))
+    assert payment_ledger.daily_totals(date(2025, 5, 31), date(2025, 6, 2), engine) == live
+
+
+def test_cashier_totals_combine_ledger_and_open_days(engine):
+    expected = [
+        {"admin_id": 7, "username": "treasurer", "count": 2, "total": Decimal("150.00")},
+        {"admin_id": 8, "username": "secretary", "count": 2, "total": Decimal("75.50")},
+        {"admin_id": None, "username": None, "count": 1, "total": Decimal("75.00")},
+    ]
+    assert payment_ledger.cashier_totals(date(2025, 5, 1), date(2025, 6, 30), engine) == expected
+    payment_ledger.close_days(engine, now=NOW)
+    assert payment_ledger.cashier_totals(date(2025, 5, 1), date(2025, 6, 30), engine) == expected
+    assert payment_ledger.cashier_totals(date(2025, 6, 3), date(2025, 6, 3), engine) == [
+        {"admin_id": None, "username": None, "count": 1, "total": Decimal("75.00")},
+        {"admin_id": 8, "username": "secretary", "count": 1, "total": Decimal("50.00")},
+    ]
+    assert payment_ledger.summary(engine, now=NOW) == {"pending": 2, "paid_today": 2,
+                                                       "collected_today": Decimal("125.00")}
+
+
+def test_payment_page_is_windowed_and_paged(engine):
+    db = sessionmaker(bind=engine)()
+    try:
+        # Request 8 was accepted without a payment record
+        assert payment_ledger.ensure_payment_records(db) == 1
+        assert payment_ledger.ensure_payment_records(db) == 0
+        rows, total = payment_ledger.payment_page(db, date(2025, 5, 1), date(2025, 6, 30), page=0, page_size=3)
+        assert total == 8 and len(rows) == 3
+        assert all(req.request_id == payment.request_id for req, payment in rows)
+        assert [payment.is_paid for _, payment in rows] == [False, False, False]      # unpaid first
+        last, _ = payment_ledger.payment_page(db, date(2025, 5, 1), date(2025, 6, 30), page=2, page_size=3)
+        assert len(last) == 2 and all(payment.is_paid for _, payment in last)
+        rows, total = payment_ledger.payment_page(db, date(2025, 5, 29), date(2025, 5, 29))
+        assert total == len(rows) == 3
+        assert {payment.created_at.date() for _, payment in rows} == {date(2025, 5, 29)}
+    finally:
+        db.close()
+
+
+def test_backfilled_payments_use_the_shared_price_list(engine):
+    db = sessionmaker(bind=engine)()
+    try:
+        assert payment_ledger.ensure_payment_records(db) == 1
+        payment = db.query(CertificatePayment).filter_by(request_id=8).one()
+        # Same price bulk_transition and printing record
+        assert payment.unit_price == Decimal(str(certificate_price("Barangay Clearance")))
+    finally:
+        db.close()
+    # Requests without a priced type are free everywhere (the backfill used to charge 50.00)
+    assert certificate_price(None) == certificate_price("Certificate of Residency") == 0.00
@@ -0,0 +1,63 @@
+# tests/test_prefetch.py
+import os
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.models import Account, CertificateRequest
+from app.user_session import UserSession
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def Session(Session, resident):
+    # The prefetch jobs run on their own threads and connections (the shared database is a file)
+    db = Session()
+    db.add(Account(account_id=1, resident_id=1, username="juan", password_hash="x", user_role="Resident"))
+    db.add(Account(account_id=2, resident_id=1, username="admin", password_hash="x", user_role="Admin"))
+    for request_id, certificate_type in ((1, "Barangay Clearance"), (2, "Barangay ID")):
+        db.add(CertificateRequest(request_id=request_id, resident_id=1, certificate_type=certificate_type,
+                                  first_name="juan", last_name="cruz", purpose="work", quantity=1,
+                                  status="Pending", created_at=datetime.now()))
+    db.commit()
+    db.close()
+    return Session
+
+
+def test_resident_dashboard_opens_without_queries(Session, monkeypatch):
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from gui import prefetch
+    from gui.views import sidebar_home_user_view as user_view
+    monkeypatch.setattr(user_view, "SessionLocal", Session)
+
+    user_session = UserSession(1, "juan", "Resident", 1, "Juan", "Cruz")
+    result = prefetch.prefetch_dashboard(user_session)
+    assert result["dashboard_stats"]["clearance"] == 1 and result["dashboard_stats"]["pending"] == 2
+    assert sum(result["request_summary"]["values"]) == 2
+
+    statements = []
+    event.listen(Session.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+    window = user_view.SidebarHomeUserWindow(user_session=user_session, prefetched=result)
+    assert statements == []
+    assert window.prefetched == {}
+    # The prefetched data is used once; the next visit re-reads
+    window.show_dashboard_page()
+    assert statements
+    window.deleteLater()
+
+
+def test_admin_jobs_and_failed_jobs(Session, monkeypatch):
+    pytest.importorskip("PyQt5.QtWidgets")
+    from gui import prefetch
+    from gui.views import sidebar_home_view as admin_view
+    monkeypatch.setattr(admin_view, "SessionLocal", Session)
+
+    def broken():
+        raise RuntimeError("database went away")
+    monkeypatch.setitem(admin_view.DASHBOARD_STAT_PARTS, "blotter_stats", broken)
+    result = prefetch.prefetch_dashboard(UserSession(2, "admin", "Admin", 1, "Juan", "Cruz"))
+    assert result["resident_stats"]["total_residents"] == 1
+    assert result["request_stats"]["total_requests"] == 2
+    # A failed job is left out, so the window runs that query itself
+    assert "blotter_stats" not in result
@@ -0,0 +1,88 @@
+# tests/test_reference_cache.py
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from app.models import Service, BarangayOfficial, Announcement, CacheVersion
+from app import reference_cache
+
+
+@pytest.fixture
+def station(monkeypatch):
+    engine = create_engine("sqlite://")
+    for model in (Service, BarangayOfficial, Announcement, CacheVersion):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add_all([CacheVersion(table_name=table, version=0) for table in reference_cache.CACHED_TABLES])
+    db.add_all([
+        BarangayOfficial(official_id=1, position="Punong Barangay", full_name="Maria Reyes", display_order=1),
+        BarangayOfficial(official_id=2, position="Kagawad", full_name="Jose Rizal", display_order=2),
+        BarangayOfficial(official_id=3, position="Kagawad", full_name="Retired", display_order=3, is_active=False),
+    ])
+    db.commit()
+    db.close()
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    monkeypatch.setattr(reference_cache, "SessionLocal", Session)
+    monkeypatch.setattr(reference_cache, "CACHE_VERSION_CHECK_SECONDS", 3600)
+    reference_cache.clear()
+    yield Session, engine, queries
+    reference_cache.clear()
+
+
+def officials_loads(queries):
+    """How many times the active-officials query reached the database"""
+    return sum("WHERE barangay_officials.is_active" in sql for sql in queries)
+
+
+def test_second_visit_is_served_from_cache(station):
+    Session, engine, queries = station
+    first = reference_cache.active_officials()
+    second = reference_cache.active_officials()
+    assert second is first
+    assert [o.full_name for o in first] == ["Maria Reyes", "Jose Rizal"]
+    assert officials_loads(queries) == 1
+    with pytest.raises(AttributeError):
+        first[0].full_name = "changed"
+
+
+def shared_version(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version FROM cache_versions WHERE table_name = :t"), {"t": table}).scalar()
+
+
+def test_committed_change_invalidates_but_rollback_does_not(station):
+    Session, engine, queries = station
+    reference_cache.active_officials()
+    version = shared_version(engine, "barangay_officials")
+
+    db = Session()
+    db.get(BarangayOfficial, 2).full_name = "Never saved"
+    db.flush()
+    db.rollback()
+    db.close()
+    reference_cache.active_officials()
+    assert officials_loads(queries) == 1
+
+    db = Session()
+    db.get(BarangayOfficial, 2).full_name = "Andres Bonifacio"
+    db.commit()
+    db.close()
+    assert [o.full_name for o in reference_cache.active_officials()] == ["Maria Reyes", "Andres Bonifacio"]
+    assert officials_loads(queries) == 2
+    assert shared_version(engine, "barangay_officials") == version + 1
+
+
+def test_other_station_change_is_seen_through_shared_version(station, monkeypatch):
+    Session, engine, queries = station
+    reference_cache.active_officials()
+    # Another station edits the table directly and bumps the shared counter
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE barangay_officials SET full_name = 'Emilio Aguinaldo' WHERE official_id = 1"))
+        conn.execute(text("UPDATE cache_versions SET version = version + 1 WHERE table_name = 'barangay_officials'"))
+
+    assert reference_cache.active_officials()[0].full_name == "Maria Reyes"   # within the check interval
+    monkeypatch.setattr(reference_cache, "CACHE_VERSION_CHECK_SECONDS", 0)
+    assert reference_cache.active_officials()[0].full_name == "Emilio Aguinaldo"
+    assert officials_loads(queries) == 2
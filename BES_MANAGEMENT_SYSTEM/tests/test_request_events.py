@@ -0,0 +1,100 @@
+# tests/test_request_events.py
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.models import Account, CertificateRequest, CertificateRequestEvent
+from app.request_events import set_request_status
+from app.user_session import UserSession
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def Session():
+    engine = create_engine("sqlite://")
+    for model in (Account, CertificateRequest, CertificateRequestEvent):
+        model.__table__.create(engine)
+    return sessionmaker(bind=engine)
+
+
+def add_request(db, request_id, created_at, resident_id=1):
+    req = CertificateRequest(request_id=request_id, resident_id=resident_id, certificate_type="Barangay Clearance",
+                             first_name="juan", last_name="cruz", purpose="work", quantity=1, created_at=created_at)
+    set_request_status(req, "Pending", actor="juan")
+    db.add(req)
+    return req
+
+
+def history(db, request_id):
+    return [(e.from_status, e.to_status, e.actor, e.note) for e in
+            db.query(CertificateRequestEvent).filter_by(request_id=request_id).order_by(CertificateRequestEvent.event_id)]
+
+
+def test_every_status_change_is_recorded(Session):
+    db = Session()
+    req = add_request(db, 1, datetime(2025, 1, 1))
+    db.commit()
+    set_request_status(req, "Under Review", actor="admin")
+    db.commit()
+    req.purpose = "abroad"           # not a status change
+    db.commit()
+    req.status = "Processing"        # changed without the helper
+    db.commit()
+    set_request_status(req, "Declined", actor="admin", note="Blurry ID")
+    db.rollback()                    # rolled back changes leave no history
+
+    assert history(db, 1) == [
+        (None, "Pending", "juan", None),
+        ("Pending", "Under Review", "admin", None),
+        ("Under Review", "Processing", "system", None),
+    ]
+    db.close()
+
+
+def test_tracker_pages_and_refreshes_only_changed_requests(Session, monkeypatch):
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from gui.widgets import request_status_tracker as tracker
+
+    db = Session()
+    db.add(Account(account_id=1, resident_id=1, username="juan", password_hash="x"))
+    start = datetime(2025, 1, 1)
+    for i in range(1, 26):
+        add_request(db, i, start + timedelta(days=i))
+    db.commit()
+    db.close()
+
+    monkeypatch.setattr(tracker, "SessionLocal", Session)
+    monkeypatch.setattr(tracker, "TRACKER_PAGE_SIZE", 10)
+    user_session = UserSession(account_id=1, username="juan", user_role="Resident", resident_id=1,
+                               first_name="Juan", last_name="Cruz")
+    widget = tracker.RequestStatusWidget(user_session=user_session)
+    assert [r.request_id for r in widget.requests] == list(range(25, 15, -1))
+    assert widget.has_more and widget.next_btn.isEnabled()
+
+    widget.display_request(9)
+    widget.show_next_request()       # loads the next page of older requests
+    assert len(widget.requests) == 20 and widget.current_request_index == 10
+
+    db = Session()
+    set_request_status(db.get(CertificateRequest, 20), "Under Review", actor="admin")
+    add_request(db, 26, start + timedelta(days=30))
+    db.commit()
+    db.close()
+
+    statements = []
+    engine = Session.kw["bind"]
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    widget.refresh_requests()
+    loads = [sql for sql in statements if "FROM certificate_requests" in sql and "certificate_type" in sql]
+    assert len(loads) == 1           # only requests 20 and 26 were re-read
+    assert [r.request_id for r in widget.requests][:2] == [26, 25]
+    reviewed = next(r for r in widget.requests if r.request_id == 20)
+    assert reviewed.status == "Under Review"
+    history = tracker.build_history(reviewed, widget.events[20])
+    assert [entry["event"] for entry in history] == ["Request submitted for Barangay Clearance", "Under Review"]
+    assert set(tracker.stage_times(history)) == {0, 1}
+    assert widget.requests[widget.current_request_index].request_id == 15   # still on the same request
+    widget.deleteLater()
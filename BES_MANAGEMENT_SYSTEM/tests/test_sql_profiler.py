@@ -0,0 +1,51 @@
+# tests/test_sql_profiler.py
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from app.db import Base
+from app.models import Resident, CertificateRequest
+from app import sql_profiler
+from app.sql_profiler import profile, profiled, statement_shape
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    sql_profiler.install(engine)
+    yield engine
+    sql_profiler.uninstall(engine)
+    engine.dispose()
+
+
+def test_statement_shape_collapses_literals_and_parameter_lists():
+    a = statement_shape("SELECT * FROM residents WHERE resident_id IN (?, ?, ?) AND sitio = 'Dita'  LIMIT 10")
+    b = statement_shape("SELECT * FROM residents\nWHERE resident_id IN (%s, %s) AND sitio = %s LIMIT 20")
+    assert a == b == "SELECT * FROM residents WHERE resident_id IN (?...) AND sitio = ? LIMIT ?"
+
+
+def test_scopes_count_statements_and_flag_n_plus_one(engine):
+    Session = sessionmaker(bind=engine)
+    logged = []
+
+    @profiled("controller.action")
+    def action(db):
+        return db.execute(select(Resident)).all()
+
+    with profile("page", log=logged.append) as page:
+        db = Session()
+        action(db)
+        for resident_id in range(12):                  # one query per row
+            db.get(CertificateRequest, resident_id + 1)
+        db.close()
+
+    assert page.count == 13 and len(page.shapes) == 2
+    [(shape, count, _)] = page.n_plus_one(threshold=10)
+    assert count == 12 and shape.startswith("SELECT certificate_requests.request_id")
+    assert sql_profiler.recent[-1] is page             # only the outermost scope is kept and logged
+    assert len(logged) == 1 and "N+1? 12x" in logged[0]
+
+    before = sql_profiler.unscoped.count
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+    assert sql_profiler.unscoped.count == before + 1
@@ -0,0 +1,59 @@
+# tests/test_sqlite_backend.py
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import text, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from app.models import CertificateRequest, CertificatePayment
+from app.schema import create_schema
+from conftest import sample_resident
+
+
+def test_connections_use_the_configured_pragmas(engine):
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1      # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -65536
+
+
+def test_schema_bootstrap_is_repeatable(engine):
+    create_schema(engine)
+    with engine.connect() as conn:
+        tables = {name for (name,) in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+        versions = conn.execute(text("SELECT count(*) FROM cache_versions")).scalar()
+    assert {"residents", "certificate_requests", "certificate_request_events", "blotters_fts"} <= tables
+    assert versions == 3
+
+    # A file created before a model gained a column gets it on the next start
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE payments DROP COLUMN updated_at"))
+    create_schema(engine)
+    with engine.connect() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(payments)"))}
+    assert "updated_at" in columns
+
+
+def test_bigint_keys_autoincrement_and_money_is_exact(engine):
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    resident = sample_resident()
+    db.add(resident)
+    db.flush()
+    req = CertificateRequest(resident_id=resident.resident_id, certificate_type="Barangay Clearance",
+                             first_name="juan", last_name="cruz", purpose="work", created_at=datetime(2025, 1, 1))
+    db.add(req)
+    db.flush()
+    for amount in ("0.10", "0.20", "0.10"):
+        db.add(CertificatePayment(request_id=req.request_id, resident_id=resident.resident_id, total_amount=amount))
+    db.commit()
+
+    assert resident.resident_id == 1 and req.request_id == 1 and req.events[0].event_id == 1
+    assert db.query(func.sum(CertificatePayment.total_amount)).scalar() == Decimal("0.40")
+    assert db.query(CertificatePayment).filter(CertificatePayment.total_amount > Decimal("0.15")).count() == 1
+
+    db.add(CertificateRequest(resident_id=999, certificate_type="Barangay ID", purpose="x"))
+    with pytest.raises(IntegrityError):
+        db.commit()                  # foreign keys are enforced
+    db.close()
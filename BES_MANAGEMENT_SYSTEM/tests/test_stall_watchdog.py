@@ -0,0 +1,34 @@
+# tests/test_stall_watchdog.py
+import time
+from PyQt5 import QtWidgets, QtCore
+from gui.stall_watchdog import StallWatchdog
+
+
+def slow_handler():
+    time.sleep(0.3)
+
+
+def run_loop(app, seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+        time.sleep(0.002)
+
+
+def test_stalls_are_recorded_by_call_site():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    watchdog = StallWatchdog(threshold_ms=80, heartbeat_ms=10)
+    watchdog.start()
+    try:
+        run_loop(app, 0.2)                                 # a responsive loop records nothing
+        assert list(watchdog.stalls) == []
+        for _ in range(2):
+            QtCore.QTimer.singleShot(0, slow_handler)
+            run_loop(app, 0.4)
+    finally:
+        watchdog.stop(timeout=2)
+
+    [offender] = watchdog.top_offenders()
+    assert offender["site"].startswith("tests/test_stall_watchdog.py:") and offender["site"].endswith("in slow_handler")
+    assert offender["count"] == 2 and 250 <= offender["max_ms"] <= 600
+    assert "slow_handler" in offender["stack"]
@@ -0,0 +1,213 @@
+# tests/test_sync.py
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select, create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import (CertificateRequest, CertificateRequestEvent, CertificatePayment, Service,
+                        Notification, DocumentUpload, Request, Payment)
+from app.request_events import set_request_status
+from app.sync import ReplicaSync, ensure_replica, sync_journal
+from conftest import sample_resident
+
+
+@pytest.fixture
+def engines(make_engine):
+    remote = make_engine("central")
+    local = make_engine("replica")
+    ensure_replica(local)
+    return local, remote
+
+
+def add_resident(db, resident_id=None):
+    resident = sample_resident(resident_id)
+    db.add(resident)
+    db.flush()
+    return resident
+
+
+def add_request(db, resident_id, status="Pending", updated_at=None):
+    req = CertificateRequest(resident_id=resident_id, certificate_type="Barangay Clearance", first_name="juan",
+                             last_name="cruz", purpose="work", quantity=1,
+                             created_at=datetime(2025, 1, 1), updated_at=updated_at or datetime(2025, 1, 1))
+    set_request_status(req, status, actor="test")
+    db.add(req)
+    db.flush()
+    return req
+
+
+def test_offline_requests_get_server_ids_and_keep_their_history(engines):
+    local, remote = engines
+    Remote, Local = sessionmaker(bind=remote), sessionmaker(bind=local)
+    db = Remote()
+    resident_id = add_resident(db).resident_id
+    add_request(db, resident_id)                           # request 1 exists upstream
+    db.commit()
+    db.close()
+    sync = ReplicaSync(local, remote, batch_size=3)
+    assert sync.sync_once()["online"]
+
+    # Another station files request 2 upstream while this one files two requests offline
+    db = Remote()
+    add_request(db, resident_id)
+    db.commit()
+    db.close()
+    db = Local()
+    assert db.query(CertificateRequest).count() == 1
+    offline = [add_request(db, resident_id).request_id for _ in range(2)]
+    db.commit()
+    db.close()
+    assert offline == [2, 3]                               # 2 collides with the other station's request
+
+    result = sync.sync_once()
+    assert result["online"] and result["conflicts"] == 0
+
+    def ids(engine, column):
+        with engine.connect() as conn:
+            return conn.execute(select(column).order_by(column)).scalars().all()
+
+    assert ids(remote, CertificateRequest.request_id) == ids(local, CertificateRequest.request_id) == [1, 2, 3, 4]
+    # Events follow their request's new id
+    assert ids(remote, CertificateRequestEvent.request_id) == ids(local, CertificateRequestEvent.request_id) \
+        == [1, 2, 3, 4]
+    with local.connect() as conn:
+        journal = conn.execute(select(sync_journal)).all()
+    assert journal == []
+
+
+def test_conflict_rules(engines):
+    local, remote = engines
+    Remote, Local = sessionmaker(bind=remote), sessionmaker(bind=local)
+    db = Remote()
+    resident_id = add_resident(db).resident_id
+    req = add_request(db, resident_id)
+    db.add(CertificatePayment(request_id=req.request_id, resident_id=resident_id, total_amount=50,
+                              is_paid=False, updated_at=datetime(2025, 1, 1)))
+    db.commit()
+    db.close()
+    sync = ReplicaSync(local, remote)
+    sync.sync_once()
+
+    later = datetime(2025, 1, 2)
+    db = Remote()                                          # upstream: completed and paid
+    set_request_status(db.get(CertificateRequest, 1), "Completed", actor="hall")
+    payment = db.query(CertificatePayment).one()
+    payment.is_paid, payment.updated_at = True, later
+    db.commit()
+    db.close()
+    db = Local()                                           # offline, and newer: under review, unpaid
+    req = db.get(CertificateRequest, 1)
+    set_request_status(req, "Under Review", actor="desk")
+    req.updated_at = later + timedelta(days=1)
+    payment = db.query(CertificatePayment).one()
+    payment.payment_method, payment.updated_at = "GCash", later + timedelta(days=1)
+    db.commit()
+    db.close()
+
+    sync.sync_once()
+    for engine in (remote, local):
+        db = sessionmaker(bind=engine)()
+        assert db.get(CertificateRequest, 1).status == "Completed"    # later stage wins
+        assert db.query(CertificatePayment).one().is_paid is True     # paid is never undone
+        db.close()
+
+
+def test_reference_tables_are_refreshed_and_offline_is_harmless(engines, tmp_path):
+    local, remote = engines
+    db = sessionmaker(bind=remote)()
+    db.add_all([Service(name="Barangay Clearance", fee=50), Service(name="Barangay ID", fee=100)])
+    db.commit()
+    sync = ReplicaSync(local, remote)
+    sync.sync_once()
+    db.delete(db.query(Service).filter_by(name="Barangay ID").one())
+    db.commit()
+    db.close()
+    sync.sync_once()
+    db = sessionmaker(bind=local)()
+    assert [s.name for s in db.query(Service)] == ["Barangay Clearance"]
+    db.add(Service(name="Business Permit", fee=500))
+    db.commit()
+    db.close()
+
+    offline = ReplicaSync(local, create_engine(f"sqlite:///{tmp_path / 'missing' / 'central.db'}"))
+    assert offline.sync_once() == {"online": False, "pushed": 0, "conflicts": 0, "pulled": 0}
+    assert offline.pending_count() == 1                    # kept for the next successful sync
+
+
+def test_remote_row_with_the_id_of_an_unpushed_local_row_is_not_lost(engines):
+    local, remote = engines
+    Remote, Local = sessionmaker(bind=remote), sessionmaker(bind=local)
+    db = Remote()
+    resident_id = add_resident(db).resident_id
+    db.add(Notification(resident_id=resident_id, title="First"))
+    db.commit()
+    db.close()
+    sync = ReplicaSync(local, remote)
+    sync.sync_once()
+
+    db = Remote()                                          # another station posts #2
+    db.add(Notification(resident_id=resident_id, title="From the hall"))
+    db.commit()
+    db.close()
+    db = Local()                                           # written here after the push, before the pull
+    db.add(Notification(resident_id=resident_id, title="From this station"))
+    db.commit()
+    assert db.query(Notification.notification_id).order_by(Notification.notification_id.desc()).first()[0] == 2
+    db.close()
+
+    sync.pull()
+    db = Local()
+    assert [(n.notification_id, n.title) for n in db.query(Notification).order_by(Notification.title)] \
+        == [(1, "First"), (2, "From the hall"), (-1, "From this station")]
+    db.close()
+    sync.sync_once()
+    for engine in (remote, local):
+        db = sessionmaker(bind=engine)()
+        assert [(n.notification_id, n.title) for n in db.query(Notification).order_by(Notification.notification_id)] \
+            == [(1, "First"), (2, "From the hall"), (3, "From this station")]
+        db.close()
+
+
+def test_offline_uploads_and_legacy_requests_reach_the_server(engines):
+    local, remote = engines
+    Remote, Local = sessionmaker(bind=remote), sessionmaker(bind=local)
+    db = Remote()
+    resident_id = add_resident(db).resident_id
+    db.add(Service(service_id=1, name="Barangay Clearance", fee=50))
+    db.flush()
+    db.add(Request(resident_id=resident_id, service_id=1, status="Pending"))    # request 1 exists upstream
+    db.commit()
+    db.close()
+    sync = ReplicaSync(local, remote)
+    sync.sync_once()
+
+    db = Local()                                           # offline: a request with its payment proof
+    req = Request(resident_id=resident_id, service_id=1, status="Payment Pending")
+    db.add(req)
+    db.flush()
+    upload = DocumentUpload(resident_id=resident_id, request_id=req.request_id, doc_type="PaymentProof",
+                            filename="proof.jpg", file_path="uploads/proof.jpg")
+    db.add(upload)
+    db.flush()
+    req.payment_proof_upload_id = upload.upload_id
+    db.add(Payment(request_id=req.request_id, resident_id=resident_id, amount=50, method="GCash",
+                   proof_upload_id=upload.upload_id))
+    db.commit()
+    db.close()
+    db = Remote()                                          # meanwhile another station takes ids 2 upstream
+    db.add(Request(resident_id=resident_id, service_id=1, status="Pending"))
+    db.add(DocumentUpload(resident_id=resident_id, doc_type="ID", filename="id.jpg", file_path="uploads/id.jpg"))
+    db.commit()
+    db.close()
+
+    assert sync.sync_once()["conflicts"] == 0
+    assert sync.pending_count() == 0
+    for engine in (remote, local):
+        db = sessionmaker(bind=engine)()
+        req = db.query(Request).filter_by(status="Payment Pending").one()
+        upload = db.query(DocumentUpload).filter_by(filename="proof.jpg").one()
+        payment = db.query(Payment).one()
+        assert req.request_id == 3 and upload.upload_id == 2
+        assert (req.payment_proof_upload_id, upload.request_id) == (2, 3)
+        assert (payment.request_id, payment.proof_upload_id) == (3, 2)
+        assert db.query(DocumentUpload).count() == 2
+        db.close()
@@ -0,0 +1,60 @@
+# tests/test_upload_maintenance.py
+import os
+import hashlib
+from app.models import Announcement
+from app.upload_maintenance import build_reference_set, iter_referenced_paths, scan_uploads, quarantine_files
+
+
+def put(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    old = 1_000_000_000  # well past the grace period
+    os.utime(path, (old, old))
+    return path
+
+
+def stored(root, data, folder="store"):
+    digest = hashlib.sha256(data).hexdigest()
+    return put(root / folder / digest[:2] / f"{digest}.jpg", data)
+
+
+def test_scan_classifies_files(tmp_path):
+    root = tmp_path / "uploads"
+    kept = stored(root, b"resident photo")
+    orphan = stored(root, b"old official photo")
+    corrupt = stored(root, b"id scan")
+    corrupt.write_bytes(b"bit rot")
+    os.utime(corrupt, (1_000_000_000, 1_000_000_000))
+    legacy = put(root / "5_psa.pdf", b"%PDF")
+    fresh = root / "tmp" / "new.part"
+    fresh.parent.mkdir()
+    fresh.write_bytes(b"upload in progress")
+
+    references = build_reference_set([str(kept), str(corrupt), str(legacy), str(root / "gone.jpg")])
+    result = scan_uploads(references, root, workers=2, grace_hours=1)
+
+    assert result["scanned"] == 5
+    assert result["orphans"] == [str(orphan)]
+    assert [path for path, _ in result["corrupt"]] == [str(corrupt)]
+    assert result["missing"] == [os.path.normcase(str(root / "gone.jpg"))]
+
+
+def test_quarantine_keeps_relative_layout(tmp_path):
+    root = tmp_path / "uploads"
+    orphan = stored(root, b"deleted announcement image")
+    target = quarantine_files([str(orphan)], root)
+
+    assert not orphan.exists()
+    assert (target / orphan.relative_to(root)).read_bytes() == b"deleted announcement image"
+    result = scan_uploads(set(), root, workers=1, grace_hours=0)
+    assert result["scanned"] == 0
+
+
+def test_images_of_deleted_announcements_are_not_referenced(Session, tmp_path):
+    db = Session()
+    db.add(Announcement(title="Clean-up drive", image_path=str(tmp_path / "shown.jpg"), visible=True))
+    db.add(Announcement(title="Cancelled", image_path=str(tmp_path / "deleted.jpg"), visible=False))
+    db.commit()
+    db.close()
+
+    assert set(iter_referenced_paths(Session)) == {str(tmp_path / "shown.jpg")}
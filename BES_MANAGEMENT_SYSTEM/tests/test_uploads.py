@@ -0,0 +1,90 @@
+# tests/test_uploads.py
+import pytest
+import app.uploads as uploads
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "STORE_FOLDER", tmp_path / "store")
+    monkeypatch.setattr(uploads, "TEMP_FOLDER", tmp_path / "tmp")
+    monkeypatch.setattr(uploads, "ORIGINALS_FOLDER", tmp_path / "originals")
+    return tmp_path
+
+
+def write_file(path, data):
+    path.write_bytes(data)
+    return path
+
+
+def test_same_content_is_stored_once(store, tmp_path):
+    first = write_file(tmp_path / "id_front.jpg", b"x" * 3000)
+    second = write_file(tmp_path / "copy of id.jpg", b"x" * 3000)
+
+    a = uploads.store_upload(first)
+    b = uploads.store_upload(second)
+
+    assert a["success"] and b["success"]
+    assert a["path"] == b["path"]
+    assert not a["deduplicated"] and b["deduplicated"]
+    assert len(list((store / "store").rglob("*.jpg"))) == 1
+    assert list((store / "tmp").iterdir()) == []
+
+
+def test_oversize_file_rejected_before_copy(store, tmp_path):
+    big = write_file(tmp_path / "big.png", b"0" * 2048)
+    result = uploads.store_upload(big, max_size=1024)
+    assert not result["success"]
+    assert "too large" in result["error"]
+    assert not (store / "tmp").exists()
+
+
+def test_disallowed_extension_rejected(store, tmp_path):
+    script = write_file(tmp_path / "photo.exe", b"MZ")
+    result = uploads.store_upload(script)
+    assert not result["success"]
+    assert "not allowed" in result["error"]
+
+
+def test_streams_in_chunks(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "CHUNK_SIZE", 1000)
+    src = write_file(tmp_path / "scan.pdf", b"p" * 2500)
+    seen = []
+    result = uploads.store_upload(src, progress=lambda done, total: seen.append((done, total)))
+    assert result["success"] and result["size"] == 2500
+    assert seen == [(1000, 2500), (2000, 2500), (2500, 2500)]
+
+
+def make_jpeg(path, width, height, transformation=None):
+    QtGui = pytest.importorskip("PyQt5.QtGui")
+    image = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor("steelblue"))
+    writer = QtGui.QImageWriter(str(path))
+    writer.setQuality(100)
+    if transformation is not None:
+        writer.setTransformation(transformation)
+    assert writer.write(image)
+    return path
+
+
+def test_photo_is_downscaled_and_reencoded(store, tmp_path):
+    QtGui = pytest.importorskip("PyQt5.QtGui")
+    src = make_jpeg(tmp_path / "phone.jpg", 4000, 3000)
+    result = uploads.store_upload(src, kind="photo")
+
+    assert result["success"]
+    assert result["path"].endswith(".jpg")
+    assert result["size"] < result["original_size"]
+    assert result["original_path"] is None
+    stored = QtGui.QImage(result["path"])
+    assert (stored.width(), stored.height()) == (1024, 768)
+
+
+def test_orientation_applied_and_id_original_kept(store, tmp_path):
+    QtGui = pytest.importorskip("PyQt5.QtGui")
+    src = make_jpeg(tmp_path / "id.jpg", 400, 200, QtGui.QImageIOHandler.TransformationRotate90)
+    result = uploads.store_upload(src, kind="id")
+
+    assert result["success"]
+    stored = QtGui.QImage(result["path"])
+    assert (stored.width(), stored.height()) == (200, 400)
+    assert open(result["original_path"], "rb").read() == src.read_bytes()
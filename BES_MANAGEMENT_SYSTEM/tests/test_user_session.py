@@ -0,0 +1,59 @@
+# tests/test_user_session.py
+from datetime import timedelta
+import pytest
+from app import auth, user_session
+from app.config import get_philippine_time
+from app.models import Resident, Account, OTP
+from app.controllers import auth_controllers
+from app.controllers.auth_controllers import AuthController
+from app.user_session import UserSession, load_session, refresh_session
+
+
+@pytest.fixture
+def Session(Session, resident, monkeypatch):
+    for module in (auth, user_session, auth_controllers):
+        monkeypatch.setattr(module, "SessionLocal", Session)
+    db = Session()
+    db.add(Account(account_id=1, resident_id=1, username="juan", password_hash="x", user_role="Resident"))
+    db.add(Account(account_id=2, username="staff", password_hash="x", user_role="Staff"))
+    db.commit()
+    db.close()
+    return Session
+
+
+def test_session_is_loaded_in_one_row_and_refreshed_by_account_id(Session):
+    juan = load_session("juan")
+    assert juan == UserSession(1, "juan", "Resident", 1, "Juan", "Cruz")
+    assert not juan.is_admin() and juan.display_name() == "Juan Cruz"
+
+    # Staff account without a resident profile
+    staff = load_session("staff")
+    assert staff.is_admin() and staff.resident_id is None and staff.display_name() == "staff"
+    assert load_session("nobody") is None
+
+    db = Session()
+    db.get(Resident, 1).first_name = "Juanito"
+    db.commit()
+    db.close()
+    assert refresh_session(juan).first_name == "Juanito"
+    # An account that went away keeps the session it had
+    gone = juan._replace(account_id=99)
+    assert refresh_session(gone) is gone
+
+
+def test_verify_login_otp_returns_the_session_and_records_last_login(Session):
+    db = Session()
+    db.add(OTP(account_id=1, code="123456", purpose="login", is_used=False,
+               expires_at=get_philippine_time() + timedelta(minutes=5)))
+    db.commit()
+    db.close()
+
+    assert AuthController.verify_login_otp("juan", "000000")["success"] is False
+    result = AuthController.verify_login_otp("juan", "123456")
+    assert result["success"] is True
+    assert result["session"] == UserSession(1, "juan", "Resident", 1, "Juan", "Cruz")
+
+    db = Session()
+    assert db.get(Account, 1).last_login is not None
+    assert db.query(OTP).one().is_used
+    db.close()